@@ -0,0 +1,137 @@
+# api_service/app/api/export.py
+"""
+Bulk candle export.
+
+Rows arrive as chunks from a server-side cursor (see
+MockDataAccessor.astream) and are encoded chunk by chunk into a
+StreamingResponse, so memory stays flat regardless of the range size.
+
+Formats: NDJSON, CSV and Arrow IPC stream (Arrow needs pyarrow).
+"""
+
+import csv
+import importlib.util
+import io
+import json
+from typing import AsyncIterator, Optional, Sequence
+
+from fastapi.responses import JSONResponse, StreamingResponse
+
+from api_service.app.semantics.base import SemanticType
+
+ARROW_AVAILABLE = importlib.util.find_spec("pyarrow") is not None
+
+EXPORT_MEDIA_TYPES = {
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv",
+    "arrow": "application/vnd.apache.arrow.stream",
+}
+
+EXPORT_COLUMNS = ("timestamp", "open", "high", "low", "close", "volume")
+
+# end-of-stream marker of the Arrow IPC streaming format
+ARROW_EOS = b"\xff\xff\xff\xff\x00\x00\x00\x00"
+
+
+def negotiate_export_format(format: Optional[str], accept: Optional[str]) -> Optional[str]:
+    """
+    Export format from the `format` parameter, else from the Accept header.
+    None -> regular JSON response.
+    """
+    if format:
+        return format if format in EXPORT_MEDIA_TYPES else None
+
+    if not accept:
+        return None
+
+    media_types = {media: name for name, media in EXPORT_MEDIA_TYPES.items()}
+
+    for part in accept.split(","):
+        media = part.split(";", 1)[0].strip().lower()
+        if media in media_types:
+            return media_types[media]
+
+    return None
+
+
+#-----------------------------
+# encoders (one bytes block per row chunk)
+#-----------------------------
+
+async def encode_ndjson(chunks: AsyncIterator[Sequence]) -> AsyncIterator[bytes]:
+    async for rows in chunks:
+        yield "".join(
+            json.dumps({column: row[column] for column in EXPORT_COLUMNS}) + "\n"
+            for row in rows
+        ).encode("utf-8")
+
+
+async def encode_csv(chunks: AsyncIterator[Sequence]) -> AsyncIterator[bytes]:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer, lineterminator="\n")
+
+    writer.writerow(EXPORT_COLUMNS)
+    yield buffer.getvalue().encode("utf-8")
+
+    async for rows in chunks:
+        buffer.seek(0)
+        buffer.truncate()
+        writer.writerows([row[column] for column in EXPORT_COLUMNS] for row in rows)
+        yield buffer.getvalue().encode("utf-8")
+
+
+async def encode_arrow(chunks: AsyncIterator[Sequence]) -> AsyncIterator[bytes]:
+    """
+    Arrow IPC stream: schema message, one record batch per chunk, EOS.
+    """
+    import pyarrow as pa
+
+    schema = pa.schema(
+        [("timestamp", pa.int64())]
+        + [(column, pa.float64()) for column in EXPORT_COLUMNS[1:]]
+    )
+
+    yield schema.serialize().to_pybytes()
+
+    async for rows in chunks:
+        batch = pa.record_batch(
+            [[row[column] for row in rows] for column in EXPORT_COLUMNS],
+            schema=schema,
+        )
+        yield batch.serialize().to_pybytes()
+
+    yield ARROW_EOS
+
+
+EXPORT_ENCODERS = {
+    "ndjson": encode_ndjson,
+    "csv": encode_csv,
+    "arrow": encode_arrow,
+}
+
+
+def export_unavailable_response(export_format: str) -> Optional[JSONResponse]:
+    if export_format == "arrow" and not ARROW_AVAILABLE:
+        return JSONResponse(
+            status_code=406,
+            content={
+                "type": SemanticType.ERROR.value,
+                "message": "arrow export requires pyarrow",
+                "data": None,
+            },
+        )
+    return None
+
+
+def build_export_response(result, export_format: str):
+    """
+    StreamingResponse for a successful export, the semantic result otherwise
+    (errors keep the regular JSON shape).
+    """
+    if result.type != SemanticType.SUCCESS.value:
+        return result
+
+    return StreamingResponse(
+        EXPORT_ENCODERS[export_format](result.data),
+        media_type=EXPORT_MEDIA_TYPES[export_format],
+    )
@@ -0,0 +1,175 @@
+# api_service/app/api/flow/consumption/leased_consumption.py
+
+import os
+import time
+from dataclasses import dataclass
+from typing import Callable, Dict, Optional
+
+from api_service.app.api.flow.consumption.snapshot import ConsumptionSnapshot
+from api_service.app.policy.base import RATE_LIMIT_CAPACITY
+
+# units reserved in Redis per round trip (1 disables leasing)
+RATE_LIMIT_LEASE_UNITS = int(os.getenv("RATE_LIMIT_LEASE_UNITS", "10"))
+# leases are only handed out while the consumer is below this share of capacity
+RATE_LIMIT_LEASE_MAX_SHARE = float(os.getenv("RATE_LIMIT_LEASE_MAX_SHARE", "0.5"))
+# unused leases of idle consumers are dropped past this many entries
+RATE_LIMIT_LEASE_MAX_CONSUMERS = int(os.getenv("RATE_LIMIT_LEASE_MAX_CONSUMERS", "10000"))
+
+
+@dataclass
+class QuotaLease:
+    """
+    Units already reserved in Redis for one consumer in this process.
+
+    consumed_at_lease: Redis count right after the reservation (includes
+    the whole lease), so base + used is the count the consumer would see
+    had every request gone to Redis.
+    """
+    size: int
+    consumed_at_lease: int
+    remaining_window_seconds: int
+    leased_at: float
+    used: int = 0
+
+    @property
+    def available(self) -> int:
+        return self.size - self.used
+
+    @property
+    def consumed_units(self) -> int:
+        return max(self.used, self.consumed_at_lease - self.size + self.used)
+
+
+class LeasedConsumptionState:
+    """
+    Per-process pre-admission in front of a Redis consumption state.
+
+    A request is admitted from the consumer's local lease when it still
+    has units; otherwise a slice of `lease_units` is reserved in Redis in
+    one call. Redis is therefore hit about once per `lease_units`
+    requests per consumer and process.
+
+    Accuracy:
+    - units are reserved before use, so Redis never under-counts
+    - a slice is only reserved if it still fits under capacity (checked
+      inside the script); otherwise just the request's units are charged,
+      so a rejected slice never stays in the window
+    - over-count is bounded by one unused lease per process and consumer
+    - close to capacity (above lease_max_share) every request goes to
+      Redis with its exact units, so decisions near the limit are exact
+    """
+
+    def __init__(
+        self,
+        inner,
+        capacity: int = RATE_LIMIT_CAPACITY,
+        lease_units: int = RATE_LIMIT_LEASE_UNITS,
+        lease_max_share: float = RATE_LIMIT_LEASE_MAX_SHARE,
+        max_consumers: int = RATE_LIMIT_LEASE_MAX_CONSUMERS,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.inner = inner
+        self.window_seconds = inner.window_seconds
+        self.capacity = capacity
+        self.lease_units = lease_units
+        self.lease_max_share = lease_max_share
+        self.max_consumers = max_consumers
+        self.clock = clock
+
+        self.leases: Dict[str, QuotaLease] = {}
+
+    def observe_and_update(self, consumer_ref: str, units: int = 1) -> ConsumptionSnapshot:
+        snapshot = self._take_local(consumer_ref, units)
+        if snapshot is not None:
+            return snapshot
+
+        size = self._lease_size(consumer_ref, units)
+        snapshot, size = self.inner.observe_and_reserve(consumer_ref, units, size)
+
+        return self._store_lease(consumer_ref, size, units, snapshot)
+
+    async def aobserve_and_update(self, consumer_ref: str, units: int = 1) -> ConsumptionSnapshot:
+        snapshot = self._take_local(consumer_ref, units)
+        if snapshot is not None:
+            return snapshot
+
+        size = self._lease_size(consumer_ref, units)
+        snapshot, size = await self.inner.aobserve_and_reserve(consumer_ref, units, size)
+
+        return self._store_lease(consumer_ref, size, units, snapshot)
+
+    # ---------------- helpers ----------------
+
+    def _take_local(self, consumer_ref: str, units: int) -> Optional[ConsumptionSnapshot]:
+        lease = self.leases.get(consumer_ref)
+        now = self.clock()
+
+        if lease is None or lease.available < units or self._expired(lease, now):
+            return None
+
+        lease.used += units
+
+        return ConsumptionSnapshot(
+            consumer_ref=consumer_ref,
+            consumed_units=lease.consumed_units,
+            remaining_window_seconds=max(
+                0, lease.remaining_window_seconds - int(now - lease.leased_at)
+            ),
+        )
+
+    def _lease_size(self, consumer_ref: str, units: int) -> int:
+        if self.lease_units <= units:
+            return units
+
+        last = self.leases.get(consumer_ref)
+        last_consumed = 0
+
+        if last is not None and not self._expired(last, self.clock()):
+            last_consumed = last.consumed_units
+
+        if last_consumed + self.lease_units > self.capacity * self.lease_max_share:
+            return units
+
+        return self.lease_units
+
+    def _store_lease(
+        self,
+        consumer_ref: str,
+        size: int,
+        units: int,
+        snapshot: ConsumptionSnapshot,
+    ) -> ConsumptionSnapshot:
+
+        lease = QuotaLease(
+            size=size,
+            consumed_at_lease=snapshot.consumed_units,
+            remaining_window_seconds=snapshot.remaining_window_seconds,
+            leased_at=self.clock(),
+            used=units,
+        )
+
+        if len(self.leases) >= self.max_consumers:
+            self._prune(lease.leased_at)
+
+        self.leases[consumer_ref] = lease
+
+        return ConsumptionSnapshot(
+            consumer_ref=consumer_ref,
+            consumed_units=lease.consumed_units,
+            remaining_window_seconds=snapshot.remaining_window_seconds,
+        )
+
+    def _expired(self, lease: QuotaLease, now: float) -> bool:
+        # the count a lease was taken against is only meaningful for one window
+        return now - lease.leased_at >= self.window_seconds
+
+    def _prune(self, now: float) -> None:
+        expired = [
+            ref for ref, lease in self.leases.items()
+            if lease.available == 0 or self._expired(lease, now)
+        ]
+        for ref in expired:
+            del self.leases[ref]
+
+        if len(self.leases) >= self.max_consumers:
+            self.leases.clear()
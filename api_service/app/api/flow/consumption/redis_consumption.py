@@ -1,22 +1,125 @@
 # api_service/app/api/flow/consumption/redis_consumption.py
 
 import logging
+import os
 import time
 import uuid
+from typing import Tuple
 
 from api_service.app.api.flow.consumption.snapshot import ConsumptionSnapshot
-from core.redis_client import build_redis_client
+from api_service.app.policy.base import RATE_LIMIT_CAPACITY
+from core.redis_client import build_async_redis_client, build_redis_client
 
 logger = logging.getLogger(__name__)
 
+RATE_LIMIT_MODE_SLIDING_LOG = "sliding_log"
+RATE_LIMIT_MODE_TOKEN_BUCKET = "token_bucket"
+
+RATE_LIMIT_MODE = os.getenv("RATE_LIMIT_MODE", RATE_LIMIT_MODE_SLIDING_LOG)
+
+
+# Sliding log: one ZSET member per unit (score = seconds).
+# KEYS[1] = key, ARGV = now, window_seconds, units, member prefix, lease, capacity
+# lease > units reserves that many units instead, but only if they fit
+# under capacity; otherwise just `units` are charged.
+# returns {consumed_units, reset_ms, reserved_units}
+SLIDING_LOG_SCRIPT = """
+local key = KEYS[1]
+local now = tonumber(ARGV[1])
+local window = tonumber(ARGV[2])
+local units = tonumber(ARGV[3])
+local lease = tonumber(ARGV[5])
+local capacity = tonumber(ARGV[6])
+
+redis.call('ZREMRANGEBYSCORE', key, 0, now - window)
+
+if lease > units and redis.call('ZCARD', key) + lease <= capacity then
+    units = lease
+end
+
+for i = 1, units do
+    redis.call('ZADD', key, now, ARGV[4] .. ':' .. i)
+end
+
+local consumed = redis.call('ZCARD', key)
+redis.call('EXPIRE', key, window)
+
+local reset_ms = window * 1000
+local oldest = redis.call('ZRANGE', key, 0, 0, 'WITHSCORES')
+if oldest[2] then
+    reset_ms = math.max(0, (tonumber(oldest[2]) + window - now) * 1000)
+end
+
+return {consumed, math.floor(reset_ms), units}
+"""
+
+# Token bucket as GCRA: one number per consumer (theoretical arrival time, ms).
+# KEYS[1] = key, ARGV = now_ms, window_ms, capacity, units, lease
+# (lease as in the sliding log)
+# returns {consumed_units, reset_ms, reserved_units}; a rejected call does not consume
+TOKEN_BUCKET_SCRIPT = """
+local key = KEYS[1]
+local now = tonumber(ARGV[1])
+local window = tonumber(ARGV[2])
+local capacity = tonumber(ARGV[3])
+local units = tonumber(ARGV[4])
+local lease = tonumber(ARGV[5])
+local emission = window / capacity
+
+local tat = tonumber(redis.call('GET', key)) or now
+if tat < now then
+    tat = now
+end
+
+if lease > units and tat + lease * emission - now <= window then
+    units = lease
+end
+
+local new_tat = tat + units * emission
+
+if new_tat - now <= window then
+    tat = new_tat
+    if tat > now then
+        redis.call('SET', key, tat, 'PX', math.ceil(tat - now))
+    end
+end
+
+local consumed = math.ceil((new_tat - now) / emission - 1e-9)
+return {consumed, math.ceil(tat - now), units}
+"""
+
 
 class RedisSlidingWindowConsumptionState:
     """
-    Redis-backed Sliding Window consumption tracker.
+    Redis-backed consumption tracker; the whole update is one Lua script
+    (EVALSHA), i.e. one round trip per request.
+
+    mode:
+    - sliding_log:  exact sliding window, one ZSET member per unit
+    - token_bucket: GCRA, one key with one number per consumer (O(1));
+                    paced by capacity units per window
+
+    - observe_and_update:  sync client (blocking)
+    - aobserve_and_update: redis.asyncio client
     """
-    def __init__(self, window_seconds: int):
+    def __init__(
+        self,
+        window_seconds: int,
+        mode: str = RATE_LIMIT_MODE,
+        capacity: int = RATE_LIMIT_CAPACITY,
+    ):
+        if mode not in (RATE_LIMIT_MODE_SLIDING_LOG, RATE_LIMIT_MODE_TOKEN_BUCKET):
+            raise ValueError(f"Unsupported rate limit mode: {mode}")
+
         self.window_seconds = window_seconds
+        self.mode = mode
+        self.capacity = capacity
         self.redis = build_redis_client()
+        # EVALSHA, with EVAL fallback when the script is not cached yet
+        self.script = self.redis.register_script(self._script_source())
+        # registered once per async client (the client is rebuilt per event loop)
+        self._async_client = None
+        self._async_script = None
 
     def observe_and_update(
         self,
@@ -24,58 +127,113 @@ class RedisSlidingWindowConsumptionState:
         units: int = 1,
     ) -> ConsumptionSnapshot:
 
-        now = time.time()
-        window_start = now - self.window_seconds
+        snapshot, _ = self.observe_and_reserve(consumer_ref, units)
+        return snapshot
 
-        key = f"rate_limit:{consumer_ref}"
+    async def aobserve_and_update(
+        self,
+        consumer_ref: str,
+        units: int = 1,
+    ) -> ConsumptionSnapshot:
 
+        snapshot, _ = await self.aobserve_and_reserve(consumer_ref, units)
+        return snapshot
 
+    def observe_and_reserve(
+        self,
+        consumer_ref: str,
+        units: int = 1,
+        lease_units: int = 0,
+    ) -> Tuple[ConsumptionSnapshot, int]:
+        """
+        Charge `lease_units` if they still fit under capacity, else `units`
+        (decided atomically in the script). Returns the snapshot and the
+        number of units actually charged.
+        """
         try:
-            pipe = self.redis.pipeline()
-
-            pipe.zremrangebyscore(key, 0, window_start)
+            consumed_units, reset_ms, reserved = self.script(
+                keys=[self._key(consumer_ref)],
+                args=self._script_args(units, lease_units),
+            )
 
-            for _ in range(units):
-                member = str(uuid.uuid4())
-                pipe.zadd(key, {member: now})
+            return self._make_snapshot(consumer_ref, consumed_units, reset_ms), int(reserved)
 
-            pipe.zcard(key)
-            pipe.expire(key, self.window_seconds)
+        except Exception:
+            return self._degraded_snapshot(consumer_ref), units
 
-            result = pipe.execute()
+    async def aobserve_and_reserve(
+        self,
+        consumer_ref: str,
+        units: int = 1,
+        lease_units: int = 0,
+    ) -> Tuple[ConsumptionSnapshot, int]:
 
-            consumed_units = result[-2]
+        try:
+            consumed_units, reset_ms, reserved = await self._get_async_script()(
+                keys=[self._key(consumer_ref)],
+                args=self._script_args(units, lease_units),
+            )
 
-            oldest_items = self.redis.zrange(key, 0, 0, withscores=True)
+            return self._make_snapshot(consumer_ref, consumed_units, reset_ms), int(reserved)
 
-            if oldest_items:
-                oldest_timestamp = oldest_items[0][1]
-                remaining_window_seconds = int(
-                    max(0, self.window_seconds - (now - oldest_timestamp))
-                )
-            else:
-                remaining_window_seconds = self.window_seconds
-            
-            return ConsumptionSnapshot(
-                consumer_ref=consumer_ref,
-                consumed_units=consumed_units,
-                remaining_window_seconds=remaining_window_seconds
-            )
-        
         except Exception:
-            logger.exception(
-                "Redis sliding-window rate limit unavailable",
-                extra={
-                    "service": "api-service",
-                    "event": "rate_limit.redis_unavailable",
-                    "status": "degraded",
-                    "operation": "rate_limit",
-                    "consumer_ref": consumer_ref,
-                },
-            )
+            return self._degraded_snapshot(consumer_ref), units
+
+    def _get_async_script(self):
+        client = build_async_redis_client()
+
+        if client is not self._async_client:
+            self._async_script = client.register_script(self._script_source())
+            self._async_client = client
+
+        return self._async_script
+
+    def _key(self, consumer_ref: str) -> str:
+        if self.mode == RATE_LIMIT_MODE_TOKEN_BUCKET:
+            return f"rate_limit:bucket:{consumer_ref}"
+        return f"rate_limit:{consumer_ref}"
+
+    def _script_source(self) -> str:
+        if self.mode == RATE_LIMIT_MODE_TOKEN_BUCKET:
+            return TOKEN_BUCKET_SCRIPT
+        return SLIDING_LOG_SCRIPT
+
+    def _script_args(self, units: int, lease_units: int = 0) -> list:
+        now = time.time()
+
+        if self.mode == RATE_LIMIT_MODE_TOKEN_BUCKET:
+            return [int(now * 1000), self.window_seconds * 1000, self.capacity, units, lease_units]
+
+        # one uuid per call; members are <uuid>:<n> for each unit
+        return [now, self.window_seconds, units, str(uuid.uuid4()), lease_units, self.capacity]
+
+    def _make_snapshot(
+        self,
+        consumer_ref: str,
+        consumed_units: int,
+        reset_ms: int,
+    ) -> ConsumptionSnapshot:
 
-            return ConsumptionSnapshot(
-                consumer_ref=consumer_ref,
-                consumed_units=1,
-                remaining_window_seconds=self.window_seconds,
-            )
\ No newline at end of file
+        return ConsumptionSnapshot(
+            consumer_ref=consumer_ref,
+            consumed_units=int(consumed_units),
+            remaining_window_seconds=min(self.window_seconds, int(reset_ms) // 1000),
+        )
+
+    def _degraded_snapshot(self, consumer_ref: str) -> ConsumptionSnapshot:
+        logger.exception(
+            "Redis sliding-window rate limit unavailable",
+            extra={
+                "service": "api-service",
+                "event": "rate_limit.redis_unavailable",
+                "status": "degraded",
+                "operation": "rate_limit",
+                "consumer_ref": consumer_ref,
+            },
+        )
+
+        return ConsumptionSnapshot(
+            consumer_ref=consumer_ref,
+            consumed_units=1,
+            remaining_window_seconds=self.window_seconds,
+        )
@@ -1,15 +1,28 @@
 # api_service/app/api/main.py
+import asyncio
 import logging
-from typing import Optional
-from fastapi import FastAPI, Request
+from typing import Literal, Optional
+from fastapi import FastAPI, Query, Request
 from fastapi.responses import Response
 from contextlib import asynccontextmanager
+from api_service.app.api.export import (
+    build_export_response,
+    export_unavailable_response,
+    negotiate_export_format,
+)
 from api_service.app.api.flow.execution import ExecutionOrchestrator
 from api_service.app.attribution.http_impl import HttpAttributionResolver
 from api_service.app.policy.mock_impl import MockPolicyEngine
 from api_service.app.dataAccess.mock_impl import MockDataAccessor, MockMetaDataAccessor
+from api_service.app.dataAccess.identifier_resolver import IdentifierResolver
+from api_service.app.dataAccess.metadata_snapshot import MetadataStore
+from api_service.app.dataAccess.pagination import CANDLES_MAX_LIMIT
 from api_service.app.semantics.mock_impl import MockSemanticAnnotator
+from core.metadata_version import alisten_metadata_versions
 from core.observability.logging_config import configure_logging
+from core.redis_client import aclose_async_redis_client
+from database.async_session import dispose_async_engine
+from database.candle_archive import ARCHIVE_AVAILABLE, CANDLE_ARCHIVE_DIR, CandleArchive
 
 configure_logging()
 
@@ -25,8 +38,24 @@ for name in list(logging.root.manager.loggerDict.keys()):
         sqlalchemy_logger.propagate = False
         sqlalchemy_logger.disabled = True
 
+identifier_resolver = IdentifierResolver()
+metadata_store = MetadataStore()
+# archived candles are read only where the Parquet archive is mounted
+candle_archive = (
+    CandleArchive(CANDLE_ARCHIVE_DIR) if CANDLE_ARCHIVE_DIR and ARCHIVE_AVAILABLE else None
+)
+
+
+def on_metadata_version(version: str) -> None:
+    identifier_resolver.invalidate(version)
+    metadata_store.invalidate(version)
+
+
 @asynccontextmanager
 async def lifespan(app: FastAPI):
+    # syncer pushes metadata version bumps; snapshots reload on next use
+    version_listener = asyncio.create_task(alisten_metadata_versions(on_metadata_version))
+
     logger.info(
         "API service started",
         extra={
@@ -39,6 +68,16 @@ async def lifespan(app: FastAPI):
 
     yield
 
+    version_listener.cancel()
+    try:
+        await version_listener
+    except asyncio.CancelledError:
+        pass
+
+    # async pools are bound to this event loop
+    await dispose_async_engine()
+    await aclose_async_redis_client()
+
     logger.info(
         "API service stopped",
         extra={
@@ -55,8 +94,13 @@ app = FastAPI(lifespan=lifespan)
 orchestrator = ExecutionOrchestrator(
     attribution=HttpAttributionResolver(),
     policy=MockPolicyEngine(),
-    data=MockDataAccessor(),
-    metadata=MockMetaDataAccessor(),
+    data=MockDataAccessor(
+        resolver=identifier_resolver,
+        recent_cache=True,
+        archive=candle_archive,
+        resample=True,
+    ),
+    metadata=MockMetaDataAccessor(store=metadata_store),
     semantics=MockSemanticAnnotator(),
 )
 
@@ -83,7 +127,11 @@ async def get_candles(
     market: str, 
     symbol: str, 
     interval: str, 
-    limit: int = 100
+    limit: int = Query(100, ge=1, le=CANDLES_MAX_LIMIT),
+    start: Optional[int] = Query(None, ge=0),
+    end: Optional[int] = Query(None, ge=0),
+    cursor: Optional[str] = None,
+    export_format: Optional[Literal["json", "ndjson", "csv", "arrow"]] = Query(None, alias="format"),
 ):
     payload = {
         "exchange": exchange,
@@ -93,7 +141,27 @@ async def get_candles(
         "limit": limit
     }
 
-    result = orchestrator.handle_request(
+    # open-time range in ms ([start, end)); a cursor continues a previous page
+    for key, value in (("start", start), ("end", end), ("cursor", cursor)):
+        if value is not None:
+            payload[key] = value
+
+    # export mode: stream the whole range instead of one JSON page
+    export = negotiate_export_format(export_format, request.headers.get("accept"))
+
+    if export is not None:
+        unavailable = export_unavailable_response(export)
+        if unavailable is not None:
+            return unavailable
+
+        result = await orchestrator.ahandle_request(
+            request=request,
+            route="export_candles",
+            payload=payload
+        )
+        return build_export_response(result, export)
+
+    result = await orchestrator.ahandle_request(
         request=request,
         route="get_candles",
         payload=payload
@@ -116,7 +184,7 @@ async def get_metadata(
         "interval": interval
     }
 
-    result = orchestrator.handle_request(
+    result = await orchestrator.ahandle_request(
         request=request,
         route="get_metadata",
         payload=payload
@@ -0,0 +1,93 @@
+# api_service/app/cache/fill_lock.py
+
+import asyncio
+import logging
+import os
+import time
+import uuid
+from typing import Awaitable, Callable, Optional, TypeVar
+
+from core.redis_client import build_async_redis_client
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+# lock lifetime; a crashed holder blocks other fills at most this long
+CACHE_FILL_LOCK_TTL_SECONDS = int(os.getenv("CACHE_FILL_LOCK_TTL_SECONDS", "5"))
+# how long a waiter polls the cache before loading itself
+CACHE_FILL_WAIT_SECONDS = float(os.getenv("CACHE_FILL_WAIT_SECONDS", "2"))
+CACHE_FILL_POLL_SECONDS = float(os.getenv("CACHE_FILL_POLL_SECONDS", "0.05"))
+
+
+def build_fill_lock_key(name: str) -> str:
+    return f"lock:api:fill:{name}"
+
+
+async def afill_with_lock(
+    lock_key: str,
+    read: Callable[[], Awaitable[Optional[T]]],
+    load: Callable[[], Awaitable[T]],
+    ttl_seconds: int = CACHE_FILL_LOCK_TTL_SECONDS,
+    wait_seconds: float = CACHE_FILL_WAIT_SECONDS,
+    poll_seconds: float = CACHE_FILL_POLL_SECONDS,
+) -> T:
+    """
+    Cross-process cache fill: one API process runs `load` (DB query +
+    cache write) while the others poll `read` until the cache is filled.
+
+    Waiters load themselves when the lock disappears without a usable
+    cache entry or after wait_seconds. Redis errors -> plain load.
+    """
+    redis_client = build_async_redis_client()
+    lock_token = str(uuid.uuid4())
+
+    try:
+        acquired = await redis_client.set(lock_key, lock_token, nx=True, ex=ttl_seconds)
+    except Exception:
+        logger.exception(
+            "Cache fill lock unavailable",
+            extra={
+                "service": "api-service",
+                "event": "cache.fill_lock.unavailable",
+                "status": "degraded",
+                "operation": "cache_fill",
+            },
+        )
+        return await load()
+
+    if acquired:
+        try:
+            return await load()
+        finally:
+            try:
+                current_token = await redis_client.get(lock_key)
+
+                if current_token == lock_token:
+                    await redis_client.delete(lock_key)
+            except Exception:
+                # expires on its own after ttl_seconds
+                pass
+
+    deadline = time.monotonic() + wait_seconds
+    cached = None
+
+    while time.monotonic() < deadline:
+        await asyncio.sleep(poll_seconds)
+
+        cached = await read()
+        if cached is not None:
+            return cached
+
+        try:
+            if not await redis_client.exists(lock_key):
+                # holder finished between the two calls -> one last look
+                cached = await read()
+                break
+        except Exception:
+            break
+
+    if cached is not None:
+        return cached
+
+    return await load()
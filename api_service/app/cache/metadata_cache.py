@@ -7,7 +7,7 @@ import logging
 
 logger = logging.getLogger(__name__)
 
-from core.redis_client import build_redis_client
+from core.redis_client import build_async_redis_client, build_redis_client
 
 METADATA_CACHE_TTL_SECONDS = 300
 METADATA_CACHE_VERSION  = "v1"
@@ -83,4 +83,57 @@ def set_cached_metadata(payload: dict[str, Any], metadata: dict[str, Any]) -> No
                 "operation": "cache_write",
             },
         )
-        return None
\ No newline at end of file
+        return None
+
+
+async def aget_cached_metadata(payload: dict[str, Any]) -> dict[str, Any] | None:
+    """
+    Non-blocking variant of get_cached_metadata (redis.asyncio).
+    """
+    try:
+        cache_key = build_metadata_cache_key(payload)
+        client = build_async_redis_client()
+
+        cached_value = await client.get(cache_key)
+
+        if cached_value is None:
+            return None
+
+        return json.loads(cached_value)
+    except Exception:
+        logger.exception(
+            "Redis metadata cache read failed",
+            extra={
+                "service": "api-service",
+                "event": "metadata.cache.read_failed",
+                "status": "degraded",
+                "operation": "cache_read",
+            },
+        )
+        return None
+
+
+async def aset_cached_metadata(payload: dict[str, Any], metadata: dict[str, Any]) -> None:
+    try:
+        cache_key = build_metadata_cache_key(payload)
+        client = build_async_redis_client()
+
+        await client.set(
+            cache_key,
+            json.dumps(
+                metadata,
+                sort_keys=True,
+                separators=(",", ":")),
+            ex=METADATA_CACHE_TTL_SECONDS,
+        )
+    except Exception:
+        logger.exception(
+            "Redis metadata cache write failed",
+            extra={
+                "service": "api-service",
+                "event": "metadata.cache.write_failed",
+                "status": "degraded",
+                "operation": "cache_write",
+            },
+        )
+        return None
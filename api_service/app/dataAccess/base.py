@@ -1,5 +1,6 @@
 #api_service/app/dataAccess/base.py
 
+import asyncio
 from dataclasses import dataclass
 
 @dataclass
@@ -7,6 +8,8 @@ class DataResault:
     available: bool
     message: str
     payload: object | None = None
+    # opaque keyset token for the next page (None on the last page)
+    next_cursor: str | None = None
 
 @dataclass
 class MetadataResult:
@@ -18,6 +21,22 @@ class DataAccessor:
     def fetch(self, request, payload: dict) -> DataResault:
         raise NotImplemented
 
+    async def afetch(self, request, payload: dict) -> DataResault:
+        """
+        Non-blocking fetch for the async request path.
+        Default: run the sync fetch in a worker thread.
+        """
+        return await asyncio.to_thread(self.fetch, request, payload)
+
+    async def astream(self, request, payload: dict) -> DataResault:
+        """
+        Export mode: payload is an async iterator of row chunks.
+        """
+        raise NotImplementedError
+
 class MetadataAccessor:
     def fetch(self, request, payload: dict) -> MetadataResult:
-        raise NotImplemented
\ No newline at end of file
+        raise NotImplemented
+
+    async def afetch(self, request, payload: dict) -> MetadataResult:
+        return await asyncio.to_thread(self.fetch, request, payload)
@@ -0,0 +1,186 @@
+#api_service/app/dataAccess/identifier_resolver.py
+
+import logging
+import os
+import time
+from dataclasses import dataclass, field
+from typing import Callable, Dict, Optional, Tuple
+
+from sqlalchemy import text
+
+from api_service.app.dataAccess.versioned_snapshot import VersionedSnapshot
+from core.metadata_version import aread_metadata_version, read_metadata_version
+from database.async_session import get_async_session
+from database.session import get_session
+
+logger = logging.getLogger(__name__)
+
+# hard upper bound on snapshot age, even without a version signal
+IDENTIFIER_CACHE_TTL_SECONDS = int(os.getenv("IDENTIFIER_CACHE_TTL_SECONDS", "300"))
+# how often the Redis version key is compared (not on every request)
+IDENTIFIER_VERSION_CHECK_SECONDS = float(os.getenv("IDENTIFIER_VERSION_CHECK_SECONDS", "5"))
+# an unknown key triggers a reload at most this often (new markets, no stampede)
+IDENTIFIER_MISS_REFRESH_SECONDS = float(os.getenv("IDENTIFIER_MISS_REFRESH_SECONDS", "5"))
+
+
+EXCHANGES_SNAPSHOT_QUERY = text("""select id, name from exchanges""")
+
+INTERVALS_SNAPSHOT_QUERY = text("""select id, interval from intervals""")
+
+MARKETS_SNAPSHOT_QUERY = text("""
+    select
+        e.name as exchange,
+        em.market_type,
+        cs.symbol,
+        em.id as exchange_market_id
+    from exchange_markets em
+    join exchanges e on em.exchange_id = e.id
+    join canonical_symbols cs on em.canonical_symbol_id = cs.id
+""")
+
+# (exchange, market_type, canonical symbol)
+MarketKey = Tuple[str, str, str]
+
+
+@dataclass(frozen=True)
+class Resolution:
+    """
+    exchange_market_id / interval_id, or the first lookup that failed
+    (same messages as the per-request lookups).
+    """
+    exchange_market_id: Optional[int] = None
+    interval_id: Optional[int] = None
+    message: Optional[str] = None
+
+    @property
+    def found(self) -> bool:
+        return self.message is None
+
+
+@dataclass
+class IdentifierSnapshot:
+    exchanges: Dict[str, int] = field(default_factory=dict)
+    markets: Dict[MarketKey, int] = field(default_factory=dict)
+    intervals: Dict[str, int] = field(default_factory=dict)
+
+    version: Optional[str] = None
+    loaded_at: float = 0.0
+
+    def resolve(self, exchange: str, market: str, symbol: str, interval: str) -> Resolution:
+        if exchange not in self.exchanges:
+            return Resolution(message='exchange not find')
+
+        exchange_market_id = self.markets.get(
+            (exchange, market.lower(), symbol.replace("-", "/"))
+        )
+        if not exchange_market_id:
+            return Resolution(message='exchange_market not find')
+
+        interval_id = self.intervals.get(interval)
+        if not interval_id:
+            return Resolution(message='Interval not find')
+
+        return Resolution(exchange_market_id=exchange_market_id, interval_id=interval_id)
+
+
+def build_snapshot(exchanges, markets, intervals, version, loaded_at) -> IdentifierSnapshot:
+    return IdentifierSnapshot(
+        exchanges={row["name"]: row["id"] for row in exchanges},
+        markets={
+            (row["exchange"], row["market_type"], row["symbol"]): row["exchange_market_id"]
+            for row in markets
+        },
+        intervals={row["interval"]: row["id"] for row in intervals},
+        version=version,
+        loaded_at=loaded_at,
+    )
+
+
+class IdentifierResolver(VersionedSnapshot[IdentifierSnapshot]):
+    """
+    Process-local map (exchange, market, symbol, interval)
+        -> (exchange_market_id, interval_id)
+
+    Built from one snapshot of the metadata tables and reloaded when:
+    - the snapshot is older than ttl_seconds
+    - the Redis metadata version changed (pushed, or checked every
+      version_check_seconds)
+    - a key is unknown (at most every miss_refresh_seconds)
+    """
+
+    def __init__(
+        self,
+        ttl_seconds: float = IDENTIFIER_CACHE_TTL_SECONDS,
+        version_check_seconds: float = IDENTIFIER_VERSION_CHECK_SECONDS,
+        miss_refresh_seconds: float = IDENTIFIER_MISS_REFRESH_SECONDS,
+        session_factory: Callable = get_session,
+        async_session_factory: Callable = get_async_session,
+        version_fn: Callable[[], Optional[str]] = read_metadata_version,
+        aversion_fn: Callable = aread_metadata_version,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        super().__init__(
+            ttl_seconds=ttl_seconds,
+            version_check_seconds=version_check_seconds,
+            session_factory=session_factory,
+            async_session_factory=async_session_factory,
+            version_fn=version_fn,
+            aversion_fn=aversion_fn,
+            clock=clock,
+        )
+        self.miss_refresh_seconds = miss_refresh_seconds
+
+    # ---------------- sync ----------------
+
+    def resolve(self, exchange: str, market: str, symbol: str, interval: str) -> Resolution:
+        resolution = self.current().resolve(exchange, market, symbol, interval)
+
+        if not resolution.found and self._can_reload_on_miss():
+            resolution = self.reload().resolve(exchange, market, symbol, interval)
+
+        return resolution
+
+    def _load(self, session, version, loaded_at) -> IdentifierSnapshot:
+        exchanges = session.execute(EXCHANGES_SNAPSHOT_QUERY).mappings().all()
+        markets = session.execute(MARKETS_SNAPSHOT_QUERY).mappings().all()
+        intervals = session.execute(INTERVALS_SNAPSHOT_QUERY).mappings().all()
+
+        return build_snapshot(exchanges, markets, intervals, version, loaded_at)
+
+    # ---------------- async ----------------
+
+    async def aresolve(self, exchange: str, market: str, symbol: str, interval: str) -> Resolution:
+        snapshot = await self.acurrent()
+        resolution = snapshot.resolve(exchange, market, symbol, interval)
+
+        if not resolution.found and self._can_reload_on_miss():
+            snapshot = await self.areload()
+            resolution = snapshot.resolve(exchange, market, symbol, interval)
+
+        return resolution
+
+    async def _aload(self, session, version, loaded_at) -> IdentifierSnapshot:
+        exchanges = (await session.execute(EXCHANGES_SNAPSHOT_QUERY)).mappings().all()
+        markets = (await session.execute(MARKETS_SNAPSHOT_QUERY)).mappings().all()
+        intervals = (await session.execute(INTERVALS_SNAPSHOT_QUERY)).mappings().all()
+
+        return build_snapshot(exchanges, markets, intervals, version, loaded_at)
+
+    # ---------------- helpers ----------------
+
+    def _loaded(self, snapshot: IdentifierSnapshot) -> None:
+        logger.info(
+            "Identifier snapshot loaded",
+            extra={
+                "service": "api-service",
+                "event": "api.identifiers.reloaded",
+                "status": "success",
+                "operation": "identifier_resolver",
+                "metadata_version": snapshot.version,
+                "market_count": len(snapshot.markets),
+                "interval_count": len(snapshot.intervals),
+            },
+        )
+
+    def _can_reload_on_miss(self) -> bool:
+        return self.clock() - self._snapshot.loaded_at >= self.miss_refresh_seconds
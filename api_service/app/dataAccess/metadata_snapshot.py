@@ -0,0 +1,175 @@
+#api_service/app/dataAccess/metadata_snapshot.py
+
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, Dict, List, Mapping, Optional, Tuple
+
+from api_service.app.dataAccess.mock_impl import build_metadata_query
+from api_service.app.dataAccess.versioned_snapshot import (
+    METADATA_SNAPSHOT_TTL_SECONDS,
+    METADATA_VERSION_CHECK_SECONDS,
+    VersionedSnapshot,
+)
+from core.metadata_document import (
+    aread_metadata_document,
+    flatten_metadata_document,
+    group_metadata_rows,
+    read_metadata_document,
+)
+from core.metadata_version import aread_metadata_version, read_metadata_version
+from database.async_session import get_async_session
+from database.session import get_session
+
+logger = logging.getLogger(__name__)
+
+# distinct filter combinations kept precomputed per snapshot
+METADATA_SNAPSHOT_MAX_RESULTS = int(os.getenv("METADATA_SNAPSHOT_MAX_RESULTS", "1024"))
+
+# (exchange, market, symbol, interval); None = not filtered
+FilterKey = Tuple[Optional[str], Optional[str], Optional[str], Optional[str]]
+
+FILTER_COLUMNS = (
+    ("exchange", "exchange"),
+    ("market", "market_type"),
+    ("symbol", "symbol"),
+    ("interval", "interval"),
+)
+
+
+class MetadataSnapshot:
+    """
+    All supported_markets rows (same columns as the metadata query) with
+    the grouped tree per filter combination built on first use.
+
+    Filters follow build_metadata_query: exact match, falsy = not filtered.
+    """
+
+    def __init__(
+        self,
+        rows: List[Mapping],
+        version: Optional[str] = None,
+        loaded_at: float = 0.0,
+        source: str = "database",
+        max_results: int = METADATA_SNAPSHOT_MAX_RESULTS,
+    ) -> None:
+        self.rows = [dict(row) for row in rows]
+        self.version = version
+        self.loaded_at = loaded_at
+        self.source = source
+        self.max_results = max_results
+
+        self._results: "OrderedDict[FilterKey, Tuple[bool, Dict]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def lookup(self, payload) -> Tuple[bool, Dict]:
+        """
+        (available, metadata tree) for the payload filters.
+        """
+        key = tuple(payload.get(name) or None for name, _ in FILTER_COLUMNS)
+
+        with self._lock:
+            result = self._results.get(key)
+            if result is not None:
+                self._results.move_to_end(key)
+                return result
+
+        rows = [
+            row for row in self.rows
+            if all(
+                value is None or row[column] == value
+                for value, (_, column) in zip(key, FILTER_COLUMNS)
+            )
+        ]
+        result = (bool(rows), group_metadata_rows(rows))
+
+        with self._lock:
+            self._results[key] = result
+            if len(self._results) > self.max_results:
+                self._results.popitem(last=False)
+
+        return result
+
+
+class MetadataStore(VersionedSnapshot[MetadataSnapshot]):
+    """
+    Process-local copy of the whole metadata tree; every filter
+    combination is answered from memory.
+
+    Built from the document the syncer materializes after each base sync;
+    the metadata join runs only when that document is missing.
+
+    Reloaded on a new metadata version (pushed by the syncer through
+    pub/sub, or polled) and after ttl_seconds at the latest.
+    """
+
+    def __init__(
+        self,
+        ttl_seconds: float = METADATA_SNAPSHOT_TTL_SECONDS,
+        version_check_seconds: float = METADATA_VERSION_CHECK_SECONDS,
+        session_factory: Callable = get_session,
+        async_session_factory: Callable = get_async_session,
+        version_fn: Callable[[], Optional[str]] = read_metadata_version,
+        aversion_fn: Callable = aread_metadata_version,
+        document_fn: Callable[[], Optional[Dict]] = read_metadata_document,
+        adocument_fn: Callable = aread_metadata_document,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        super().__init__(
+            ttl_seconds=ttl_seconds,
+            version_check_seconds=version_check_seconds,
+            session_factory=session_factory,
+            async_session_factory=async_session_factory,
+            version_fn=version_fn,
+            aversion_fn=aversion_fn,
+            clock=clock,
+        )
+        self.document_fn = document_fn
+        self.adocument_fn = adocument_fn
+
+    def lookup(self, payload) -> Tuple[bool, Dict]:
+        return self.current().lookup(payload)
+
+    async def alookup(self, payload) -> Tuple[bool, Dict]:
+        snapshot = await self.acurrent()
+        return snapshot.lookup(payload)
+
+    def _load(self, session, version, loaded_at) -> MetadataSnapshot:
+        document = self.document_fn()
+        if document is not None:
+            return MetadataSnapshot(
+                flatten_metadata_document(document), version, loaded_at, source="document"
+            )
+
+        query, params = build_metadata_query({})
+        rows = session.execute(query, params).mappings().all()
+
+        return MetadataSnapshot(rows, version, loaded_at)
+
+    async def _aload(self, session, version, loaded_at) -> MetadataSnapshot:
+        document = await self.adocument_fn()
+        if document is not None:
+            return MetadataSnapshot(
+                flatten_metadata_document(document), version, loaded_at, source="document"
+            )
+
+        query, params = build_metadata_query({})
+        rows = (await session.execute(query, params)).mappings().all()
+
+        return MetadataSnapshot(rows, version, loaded_at)
+
+    def _loaded(self, snapshot: MetadataSnapshot) -> None:
+        logger.info(
+            "Metadata snapshot loaded",
+            extra={
+                "service": "api-service",
+                "event": "api.metadata.reloaded",
+                "status": "success",
+                "operation": "metadata_snapshot",
+                "metadata_version": snapshot.version,
+                "source": snapshot.source,
+                "row_count": len(snapshot.rows),
+            },
+        )
@@ -1,79 +1,578 @@
 #api_service/app/dataAccess/mock_impl.py
 
+import asyncio
+from dataclasses import replace
+
 from api_service.app.dataAccess.base import DataResault, DataAccessor, MetadataResult, MetadataAccessor
-from api_service.app.cache.metadata_cache import get_cached_metadata, set_cached_metadata
+from api_service.app.dataAccess.identifier_resolver import Resolution
+from api_service.app.dataAccess.pagination import (
+    EXPORT_CHUNK_ROWS,
+    CandlePage,
+    InvalidCursorError,
+    archive_bounds,
+    archive_needed,
+    build_candles_query,
+    build_export_query,
+    finalize_page,
+    merge_page_rows,
+    merge_rows,
+    page_lower_bound,
+    parse_candle_page,
+)
+from api_service.app.dataAccess.resampling import plan_resample
+from api_service.app.dataAccess.single_flight import SingleFlight, payload_flight_key
+from api_service.app.cache.fill_lock import afill_with_lock, build_fill_lock_key
+from api_service.app.cache.metadata_cache import (
+    aget_cached_metadata,
+    build_metadata_cache_key,
+    aset_cached_metadata,
+    get_cached_metadata,
+    set_cached_metadata,
+)
+from core.candle_cache import (
+    RECENT_CANDLE_FIELDS,
+    aappend_recent_candles,
+    append_recent_candles,
+    aread_recent_candles,
+    read_recent_candles,
+)
+from core.metadata_document import group_metadata_rows
+from database.async_session import get_async_session
+from database.candle_partitions import month_bounds_ms, months_between
 from database.session import get_session
 from sqlalchemy import text
 
+
+EXCHANGE_QUERY = text(
+    """select * from exchanges where name = :exchange """
+)
+
+SYMBOL_QUERY = text(
+    """select * from canonical_symbols where symbol = :symbol limit 1"""
+)
+
+EXCHANGE_MARKET_QUERY = text(
+    """select * from exchange_markets
+    where exchange_id = :ex_id and canonical_symbol_id = :sym_id and market_type = :market_type"""
+)
+
+INTERVAL_QUERY = text(
+    """select * from intervals where interval = :interval """
+)
+
+INTERVAL_NOT_FOUND = 'Interval not find'
+
+
+def _first_id(rows):
+    return rows[0]['id'] if rows else None
+
+
+def _page_result(rows, page, source_page=None, plan=None) -> DataResault:
+    if plan is not None:
+        rows = plan.resample_page(rows, page, source_page)
+
+    rows, next_cursor = finalize_page(rows, page)
+    return DataResault(
+        available=bool(rows),
+        message='success',
+        payload=rows,
+        next_cursor=next_cursor,
+    )
+
+
+def _recent_rows(rows):
+    return [tuple(row[field] for field in RECENT_CANDLE_FIELDS) for row in rows]
+
+
+def _resolve_payload(resolution_fn, payload):
+    return resolution_fn(
+        payload["exchange"],
+        payload["market"],
+        payload["symbol"],
+        payload["interval"],
+    )
+
+
+def _resample_pages(page, plan):
+    """
+    (page, page read from the source series); the same page without a plan.
+    """
+    if plan is None:
+        return page, page
+
+    page = plan.bound_page(page)
+    return page, plan.source_page(page)
+
+
+def _resolve_resampled(resolution: Resolution, payload, resolve):
+    """
+    An interval that is not stored but is a multiple of the base interval
+    resolves to the base series + a ResamplePlan (resampling.py).
+    """
+    if resolution.message != INTERVAL_NOT_FOUND:
+        return resolution, None
+
+    plan = plan_resample(payload["interval"])
+    if plan is None:
+        return resolution, None
+
+    return resolve({**payload, "interval": plan.source_interval}), plan
+
+
+async def _aresolve_resampled(resolution: Resolution, payload, aresolve):
+    if resolution.message != INTERVAL_NOT_FOUND:
+        return resolution, None
+
+    plan = plan_resample(payload["interval"])
+    if plan is None:
+        return resolution, None
+
+    return await aresolve({**payload, "interval": plan.source_interval}), plan
+
+
+def _lookup_ids(session, payload) -> Resolution:
+    """
+    Per-request identifier lookups (exchange, symbol, exchange_market, interval).
+    """
+    normalized_symbol = payload["symbol"].replace("-", "/")
+
+    exchange = session.execute(EXCHANGE_QUERY, payload).mappings().all()
+    exchange_id = _first_id(exchange)
+
+    if not exchange_id:
+        return Resolution(message='exchange not find')
+
+    symbol = session.execute(
+        SYMBOL_QUERY, {"symbol": normalized_symbol}
+    ).mappings().all()
+    symbol_id = _first_id(symbol)
+
+    exchange_market = session.execute(
+        EXCHANGE_MARKET_QUERY, {
+            "ex_id": exchange_id,
+            "sym_id": symbol_id,
+            "market_type": payload["market"].lower(),
+        }
+    ).mappings().all()
+    exchange_market_id = _first_id(exchange_market)
+
+    if not exchange_market_id:
+        return Resolution(message='exchange_market not find')
+
+    interval = session.execute(INTERVAL_QUERY, payload).mappings().all()
+    interval_id = _first_id(interval)
+
+    if not interval_id:
+        return Resolution(message=INTERVAL_NOT_FOUND)
+
+    return Resolution(exchange_market_id=exchange_market_id, interval_id=interval_id)
+
+
+async def _alookup_ids(session, payload) -> Resolution:
+    normalized_symbol = payload["symbol"].replace("-", "/")
+
+    exchange = (await session.execute(EXCHANGE_QUERY, payload)).mappings().all()
+    exchange_id = _first_id(exchange)
+
+    if not exchange_id:
+        return Resolution(message='exchange not find')
+
+    symbol = (await session.execute(
+        SYMBOL_QUERY, {"symbol": normalized_symbol}
+    )).mappings().all()
+    symbol_id = _first_id(symbol)
+
+    exchange_market = (await session.execute(
+        EXCHANGE_MARKET_QUERY, {
+            "ex_id": exchange_id,
+            "sym_id": symbol_id,
+            "market_type": payload["market"].lower(),
+        }
+    )).mappings().all()
+    exchange_market_id = _first_id(exchange_market)
+
+    if not exchange_market_id:
+        return Resolution(message='exchange_market not find')
+
+    interval = (await session.execute(INTERVAL_QUERY, payload)).mappings().all()
+    interval_id = _first_id(interval)
+
+    if not interval_id:
+        return Resolution(message=INTERVAL_NOT_FOUND)
+
+    return Resolution(exchange_market_id=exchange_market_id, interval_id=interval_id)
+
+
+async def stream_candle_rows(
+    resolution: Resolution,
+    page,
+    chunk_rows: int = EXPORT_CHUNK_ROWS,
+    archive=None,
+):
+    """
+    Yield candle rows in chunks of up to chunk_rows from a server-side
+    cursor, so an export never holds the whole range in memory.
+
+    With an archive, the part of the range below the archive boundary is
+    read month by month from Parquet first (merged with any DB rows not
+    archived yet); the DB stream then continues at the boundary.
+    """
+    async with get_async_session() as session:
+
+        if archive is not None:
+            boundary = await asyncio.to_thread(
+                archive.boundary, resolution.exchange_market_id, resolution.interval_id
+            )
+            lower = page_lower_bound(page)
+
+            if boundary is not None and (lower is None or lower < boundary):
+                async for rows in _archived_chunks(
+                    session, archive, resolution, page, boundary, chunk_rows
+                ):
+                    yield rows
+
+                page = replace(page, start=boundary, after=None)
+
+        query, params = build_export_query(
+            resolution.exchange_market_id, resolution.interval_id, page
+        )
+
+        result = await session.stream(
+            query.execution_options(yield_per=chunk_rows), params
+        )
+        async for rows in result.mappings().partitions():
+            yield rows
+
+
+async def _archived_chunks(session, archive, resolution: Resolution, page, boundary, chunk_rows):
+    exchange_market_id, interval_id = resolution.exchange_market_id, resolution.interval_id
+
+    months = await asyncio.to_thread(archive.months, exchange_market_id, interval_id)
+    if not months:
+        return
+
+    start, end = archive_bounds(page, boundary)
+    lower = month_bounds_ms(months[0])[0] if start is None else start
+
+    for month in months_between(lower, end):
+        month_start, month_end = month_bounds_ms(month)
+        month_page = CandlePage(start=max(lower, month_start), end=min(end, month_end))
+
+        archived = await asyncio.to_thread(
+            archive.read_range, exchange_market_id, interval_id, month_page.start, month_page.end
+        )
+        query, params = build_export_query(exchange_market_id, interval_id, month_page)
+        db_rows = (await session.execute(query, params)).mappings().all()
+
+        rows = merge_rows(db_rows, archived)
+        for offset in range(0, len(rows), chunk_rows):
+            yield rows[offset:offset + chunk_rows]
+
+
 class MockDataAccessor(DataAccessor):
+    """
+    resolver: optional IdentifierResolver. When set, ids come from its
+    in-memory snapshot and only the candles query hits the database;
+    without it every request runs the four lookup queries first.
+
+    recent_cache: read the Redis recent-candles cache (core/candle_cache.py)
+    before PostgreSQL; "latest candles" DB reads seed it on a miss.
+
+    archive: optional CandleArchive (database/candle_archive.py). Pages
+    and exports reaching below its boundary merge Parquet rows with the
+    DB rows, so archived history reads like any other range.
+
+    resample: serve intervals that are not stored (e.g. "2h") by
+    resampling the base interval at query time (resampling.py).
+
+    Candles are read with a keyset query (see pagination.py): the latest
+    `limit` candles by default, or a forward page from `start` / `cursor`.
+    """
+
+    def __init__(self, resolver=None, recent_cache: bool = False, archive=None, resample: bool = False):
+        self.resolver = resolver
+        self.recent_cache = recent_cache
+        self.archive = archive
+        self.resample = resample
+        self.flights = SingleFlight()
+
     def fetch(self, request, payload: dict) -> DataResault:
 
+        try:
+            page = parse_candle_page(payload)
+        except InvalidCursorError as exc:
+            return DataResault(available=False, message=str(exc), payload=[])
+
+        if self.resolver is not None:
+            resolution, plan = self._resample_resolution(
+                _resolve_payload(self.resolver.resolve, payload),
+                payload,
+                lambda source: _resolve_payload(self.resolver.resolve, source),
+            )
+
+            if not resolution.found:
+                return DataResault(available=False, message=resolution.message, payload=[])
+
+            page, source_page = _resample_pages(page, plan)
+            rows = self._read_cached(resolution, source_page)
+
+            if rows is None:
+                with get_session() as session:
+                    rows = self._query_candles(session, resolution, source_page)
+
+            return _page_result(rows, page, source_page, plan)
+
         with get_session() as session:
+            resolution, plan = self._resample_resolution(
+                _lookup_ids(session, payload),
+                payload,
+                lambda source: _lookup_ids(session, source),
+            )
+
+            if not resolution.found:
+                return DataResault(available=False, message=resolution.message, payload=[])
+
+            page, source_page = _resample_pages(page, plan)
+            rows = self._read_cached(resolution, source_page)
+
+            if rows is None:
+                rows = self._query_candles(session, resolution, source_page)
+
+        return _page_result(rows, page, source_page, plan)
+
+    async def afetch(self, request, payload: dict) -> DataResault:
+        """
+        Same lookups as fetch, over the asyncpg engine (does not block the loop).
+
+        Identical concurrent requests share one in-flight fetch.
+        """
+        return await self.flights.do(
+            payload_flight_key("get_candles", payload),
+            lambda: self._afetch_page(payload),
+        )
+
+    async def _afetch_page(self, payload: dict) -> DataResault:
+        try:
+            page = parse_candle_page(payload)
+        except InvalidCursorError as exc:
+            return DataResault(available=False, message=str(exc), payload=[])
+
+        if self.resolver is not None:
+            resolution, plan = await self._aresample_resolution(
+                await _resolve_payload(self.resolver.aresolve, payload),
+                payload,
+                lambda source: _resolve_payload(self.resolver.aresolve, source),
+            )
+
+            if not resolution.found:
+                return DataResault(available=False, message=resolution.message, payload=[])
+
+            page, source_page = _resample_pages(page, plan)
+
+            async def load():
+                async with get_async_session() as session:
+                    return await self._aquery_candles(session, resolution, source_page)
+
+            rows = await self._aread_cached(resolution, source_page)
+
+            if rows is None:
+                rows = await self._afill(resolution, source_page, load)
+
+            return _page_result(rows, page, source_page, plan)
+
+        async with get_async_session() as session:
+            resolution, plan = await self._aresample_resolution(
+                await _alookup_ids(session, payload),
+                payload,
+                lambda source: _alookup_ids(session, source),
+            )
+
+            if not resolution.found:
+                return DataResault(available=False, message=resolution.message, payload=[])
+
+            page, source_page = _resample_pages(page, plan)
+            rows = await self._aread_cached(resolution, source_page)
+
+            if rows is None:
+                rows = await self._afill(
+                    resolution, source_page,
+                    lambda: self._aquery_candles(session, resolution, source_page),
+                )
+
+        return _page_result(rows, page, source_page, plan)
+
+    # ---------------- query-time resampling ----------------
+
+    def _resample_resolution(self, resolution: Resolution, payload, resolve):
+        if not self.resample:
+            return resolution, None
+        return _resolve_resampled(resolution, payload, resolve)
+
+    async def _aresample_resolution(self, resolution: Resolution, payload, aresolve):
+        if not self.resample:
+            return resolution, None
+        return await _aresolve_resampled(resolution, payload, aresolve)
+
+    # ---------------- candles read (cache first, then DB) ----------------
+
+    def _read_cached(self, resolution: Resolution, page):
+        if not self.recent_cache:
+            return None
+        return read_recent_candles(
+            resolution.exchange_market_id, resolution.interval_id,
+            page.fetch_count, page.start, page.end, page.after,
+        )
+
+    async def _aread_cached(self, resolution: Resolution, page):
+        if not self.recent_cache:
+            return None
+        return await aread_recent_candles(
+            resolution.exchange_market_id, resolution.interval_id,
+            page.fetch_count, page.start, page.end, page.after,
+        )
+
+    def _query_candles(self, session, resolution: Resolution, page):
+        query, params = build_candles_query(
+            resolution.exchange_market_id, resolution.interval_id, page
+        )
+        rows = session.execute(query, params).mappings().all()
+        rows = self._with_archive(resolution, page, rows)
+
+        if self.recent_cache and page.is_latest and rows:
+            append_recent_candles(
+                resolution.exchange_market_id, resolution.interval_id, _recent_rows(rows)
+            )
+        return rows
+
+    async def _afill(self, resolution: Resolution, page, load):
+        """
+        A latest-candles miss fills the shared cache: one API process runs
+        the DB query, the others wait for the seeded key.
+        """
+        if not (self.recent_cache and page.is_latest):
+            return await load()
+
+        return await afill_with_lock(
+            build_fill_lock_key(
+                f"candles:{resolution.exchange_market_id}:{resolution.interval_id}"
+            ),
+            read=lambda: self._aread_cached(resolution, page),
+            load=load,
+        )
 
-            symbolname = payload["symbol"]
-            normalized_symbol = symbolname.replace("-", "/")
-
-            exchange = session.execute(
-                text(
-                    """select * from exchanges where name = :exchange """
-                ), payload
-            ).mappings().all()
-            exchange_id = exchange[0]['id'] if exchange else None
-
-            if not exchange_id:
-                return DataResault(available=False, message='exchange not find', payload=[])
-
-            symbol = session.execute(
-                text(
-                    """select * from canonical_symbols where symbol = :symbol limit 1"""
-                ),{"symbol": normalized_symbol}
-            ).mappings().all()
-            symbol_id = symbol[0]['id'] if symbol else None
-
-
-            exchange_market = session.execute(
-                text(
-                    """select * from exchange_markets 
-                    where exchange_id = :ex_id and canonical_symbol_id = :sym_id and market_type = :market_type"""
-                ), {"ex_id": exchange_id, 
-                    "sym_id" : symbol_id, 
-                    "market_type" : payload["market"].lower()
-                    }
-            ).mappings().all()
-            exchange_market_id = exchange_market[0]['id'] if exchange_market else None
-            
-            if not exchange_market_id:
-                return DataResault(available=False, message='exchange_market not find', payload=[])
-
-
-            interval = session.execute(
-                text(
-                    """select * from intervals where interval = :interval """
-                ),payload
-            ).mappings().all()
-            Interval_id = interval[0]['id'] if interval else None
-
-            if not Interval_id:
-                return DataResault(available=False, message='Interval not find', payload=[])
-
-            rows = session.execute(
-                text("""
-                    select * from candles 
-                     where exchange_market_id = :ex_market_id and 
-                     interval_id = :interval  
-                     limit 5
-                """), {"ex_market_id": exchange_market_id, "interval": Interval_id}
-            ).mappings().all()
+    async def _aquery_candles(self, session, resolution: Resolution, page):
+        query, params = build_candles_query(
+            resolution.exchange_market_id, resolution.interval_id, page
+        )
+        rows = (await session.execute(query, params)).mappings().all()
+
+        if self.archive is not None:
+            # Parquet reads are blocking file IO
+            rows = await asyncio.to_thread(self._with_archive, resolution, page, rows)
+
+        if self.recent_cache and page.is_latest and rows:
+            await aappend_recent_candles(
+                resolution.exchange_market_id, resolution.interval_id, _recent_rows(rows)
+            )
+        return rows
+
+    def _with_archive(self, resolution: Resolution, page, rows):
+        if self.archive is None:
+            return rows
+
+        boundary = self.archive.boundary(resolution.exchange_market_id, resolution.interval_id)
+        if not archive_needed(page, boundary, rows):
+            return rows
+
+        start, end = archive_bounds(page, boundary)
+        archived = self.archive.read_range(
+            resolution.exchange_market_id, resolution.interval_id,
+            start, end, limit=page.fetch_count, descending=not page.forward,
+        )
+        return merge_page_rows(rows, archived, page)
+
+    async def astream(self, request, payload: dict) -> DataResault:
+        """
+        Export mode: identifiers are resolved up front (errors come back as
+        a normal result); payload is an async iterator of row chunks over
+        the whole [start, end) range, read lazily while the response is sent.
+        """
+        try:
+            page = parse_candle_page(payload)
+        except InvalidCursorError as exc:
+            return DataResault(available=False, message=str(exc), payload=[])
+
+        if self.resolver is not None:
+            resolution = await _resolve_payload(self.resolver.aresolve, payload)
+        else:
+            async with get_async_session() as session:
+                resolution = await _alookup_ids(session, payload)
+
+        if not resolution.found:
+            return DataResault(available=False, message=resolution.message, payload=[])
 
         return DataResault(
-            available=bool(rows),
+            available=True,
             message='success',
-            payload=rows
+            payload=stream_candle_rows(resolution, page, archive=self.archive),
         )
 
+
+def build_metadata_query(payload):
+    base_query = """
+            select
+                e.name as exchange,
+                REPLACE(cs.symbol, '/', '-') AS symbol,
+                em.exchange_symbol,
+                i.interval,
+                em.market_type,
+                s.status
+            from supported_markets s
+            join intervals i on s.interval_id = i.id
+            join exchange_markets em on s.exchange_market_id = em.id
+            join exchanges e on em.exchange_id = e.id
+            join canonical_symbols cs on em.canonical_symbol_id = cs.id
+            where 1 = 1
+            """
+
+    params = {}
+
+    if payload.get("exchange"):
+        base_query += " and e.name = :exchange"
+        params["exchange"] = payload["exchange"]
+
+    if payload.get("market"):
+        base_query += " and em.market_type = :market"
+        params["market"] = payload["market"]
+
+    if payload.get("symbol"):
+        base_query += " and REPLACE(cs.symbol, '/', '-') = :symbol"
+        params["symbol"] = payload["symbol"]
+
+    if payload.get("interval"):
+        base_query += " and i.interval = :interval"
+        params["interval"] = payload["interval"]
+
+    return text(base_query), params
+
+
 class MockMetaDataAccessor(MetadataAccessor):
+    """
+    store: optional MetadataStore. When set, every request is answered
+    from its in-memory snapshot (no Redis / DB round trip); otherwise
+    Redis cache -> DB per filter combination.
+    """
+
+    def __init__(self, store=None):
+        self.store = store
+        self.flights = SingleFlight()
+
     def fetch(self, request, payload) -> MetadataResult:
 
+        if self.store is not None:
+            available, result = self.store.lookup(payload)
+            return MetadataResult(available=available, message=None, payload=result)
+
         cached_metadata = get_cached_metadata(payload)
 
         if cached_metadata is not None:
@@ -86,89 +585,73 @@ class MockMetaDataAccessor(MetadataAccessor):
 
         with get_session() as session:
 
-            base_query = """
-                    select 
-                        e.name as exchange, 
-                        REPLACE(cs.symbol, '/', '-') AS symbol, 
-                        em.exchange_symbol, 
-                        i.interval, 
-                        em.market_type, 
-                        s.status
-                    from supported_markets s
-                    join intervals i on s.interval_id = i.id 
-                    join exchange_markets em on s.exchange_market_id = em.id
-                    join exchanges e on em.exchange_id = e.id
-                    join canonical_symbols cs on em.canonical_symbol_id = cs.id
-                    where 1 = 1
-                    """
-
-            params = {}
+            query, params = build_metadata_query(payload)
 
-            if payload.get("exchange"):
-                base_query += " and e.name = :exchange"
-                params["exchange"] = payload["exchange"]
+            rows = session.execute(query, params).mappings().all()
 
-            if payload.get("market"):
-                base_query += " and em.market_type = :market"
-                params["market"] = payload["market"]
+            result = group_metadata_rows(rows)
 
-            if payload.get("symbol"):
-                base_query += " and REPLACE(cs.symbol, '/', '-') = :symbol"
-                params["symbol"] = payload["symbol"]   
-
-            if payload.get("interval"):
-                base_query += " and i.interval = :interval"
-                params["interval"] = payload["interval"]
+            if rows:
+                set_cached_metadata(payload=payload, metadata=result)
 
-            rows = session.execute(text(base_query),params).mappings().all()
+        return MetadataResult(
+            available=bool(rows),
+            message= None,
+            payload=result,
+        )
 
+    async def afetch(self, request, payload) -> MetadataResult:
+        """
+        Identical concurrent requests share one in-flight fetch; on a cache
+        miss one API process refills the entry while the others wait for it.
+        """
+        if self.store is not None:
+            available, result = await self.store.alookup(payload)
+            return MetadataResult(available=available, message=None, payload=result)
+
+        return await self.flights.do(
+            payload_flight_key("get_metadata", payload),
+            lambda: self._afetch_metadata(payload),
+        )
 
-            exchanges = {}
+    async def _afetch_metadata(self, payload) -> MetadataResult:
 
-            for row in rows:
-                ex = row['exchange']
-                symbol = row["symbol"]
-                market_type = row["market_type"]
+        cached = await self._aread_cached(payload)
 
+        if cached is not None:
+            return cached
 
-                if ex not in exchanges:
-                    exchanges[ex] = {}
+        return await afill_with_lock(
+            build_fill_lock_key(build_metadata_cache_key(payload)),
+            read=lambda: self._aread_cached(payload),
+            load=lambda: self._aload(payload),
+        )
 
-                key = (symbol, market_type)
+    async def _aread_cached(self, payload) -> MetadataResult | None:
+        cached_metadata = await aget_cached_metadata(payload)
 
-                if key not in exchanges[ex]:
-                    exchanges[ex][key] = {
-                        "symbol" : symbol,
-                        "exchange_symbol" : row["exchange_symbol"],
-                        "market_type" : market_type,
-                        "intervals" : set() 
-                    }
-                exchanges[ex][key]["intervals"].add(row["interval"])
+        if cached_metadata is None:
+            return None
 
+        return MetadataResult(
+            available=True,
+            message=None,
+            payload=cached_metadata
+        )
 
-            result = {"exchanges": []}
+    async def _aload(self, payload) -> MetadataResult:
+        query, params = build_metadata_query(payload)
 
-            for ex_name, markets in exchanges.items():
-                exchange_obj = {
-                    "name": ex_name,
-                    "markets": []
-                }
+        async with get_async_session() as session:
+            rows = (await session.execute(query, params)).mappings().all()
 
-                for market in markets.values():  # 👈 کلید tuple دیگه استفاده نمیشه
-                    exchange_obj["markets"].append({
-                        "symbol": market["symbol"],
-                        "exchange_symbol": market["exchange_symbol"],
-                        "market_type": market["market_type"],
-                        "intervals": sorted(list(market["intervals"]))
-                    })
+        result = group_metadata_rows(rows)
 
-                result["exchanges"].append(exchange_obj)
-            
-            if rows:
-                set_cached_metadata(payload=payload, metadata=result)
+        if rows:
+            await aset_cached_metadata(payload=payload, metadata=result)
 
         return MetadataResult(
             available=bool(rows),
-            message= None,
+            message=None,
             payload=result,
-        )
\ No newline at end of file
+        )
@@ -0,0 +1,222 @@
+#api_service/app/dataAccess/pagination.py
+
+import base64
+import binascii
+import json
+import os
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Tuple
+
+from sqlalchemy import text
+
+CANDLES_DEFAULT_LIMIT = 100
+CANDLES_MAX_LIMIT = int(os.getenv("CANDLES_MAX_LIMIT", "1000"))
+# rows fetched per round trip from the server-side cursor in export mode
+EXPORT_CHUNK_ROWS = int(os.getenv("EXPORT_CHUNK_ROWS", "5000"))
+
+CANDLE_COLUMNS = "timestamp, open, high, low, close, volume"
+
+
+class InvalidCursorError(ValueError):
+    pass
+
+
+@dataclass(frozen=True)
+class CandlePage:
+    """
+    One page request on a (exchange_market_id, interval_id) series.
+
+    - after: keyset position from a cursor (exclusive)
+    - start / end: open-time bounds, start inclusive, end exclusive
+    - no start and no cursor -> the latest `limit` candles
+    """
+    limit: int = CANDLES_DEFAULT_LIMIT
+    start: Optional[int] = None
+    end: Optional[int] = None
+    after: Optional[int] = None
+
+    @property
+    def forward(self) -> bool:
+        return self.start is not None or self.after is not None
+
+    @property
+    def fetch_count(self) -> int:
+        # forward pages read one extra row to detect a next page
+        return self.limit + 1 if self.forward else self.limit
+
+    @property
+    def is_latest(self) -> bool:
+        # newest candles with no bound: a complete suffix of the series
+        return not self.forward and self.end is None
+
+
+def encode_cursor(after: int, end: Optional[int]) -> str:
+    raw = json.dumps({"after": after, "end": end}, separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[int, Optional[int]]:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        data = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+        after, end = data["after"], data.get("end")
+    except (binascii.Error, UnicodeError, ValueError, KeyError, TypeError):
+        raise InvalidCursorError("invalid cursor")
+
+    if not isinstance(after, int) or not (end is None or isinstance(end, int)):
+        raise InvalidCursorError("invalid cursor")
+
+    return after, end
+
+
+def parse_candle_page(payload: Dict[str, Any]) -> CandlePage:
+    """
+    Build a CandlePage from the request payload.
+
+    A cursor carries its own position and end bound, so start/end are
+    ignored when it is present.
+    """
+    limit = min(max(int(payload.get("limit") or CANDLES_DEFAULT_LIMIT), 1), CANDLES_MAX_LIMIT)
+
+    cursor = payload.get("cursor")
+    if cursor:
+        after, end = decode_cursor(cursor)
+        return CandlePage(limit=limit, end=end, after=after)
+
+    return CandlePage(limit=limit, start=payload.get("start"), end=payload.get("end"))
+
+
+def _series_conditions(exchange_market_id: int, interval_id: int, page: CandlePage):
+    conditions = [
+        "exchange_market_id = :ex_market_id",
+        "interval_id = :interval",
+    ]
+    params: Dict[str, Any] = {
+        "ex_market_id": exchange_market_id,
+        "interval": interval_id,
+    }
+
+    if page.after is not None:
+        conditions.append("timestamp > :after")
+        params["after"] = page.after
+    elif page.start is not None:
+        conditions.append("timestamp >= :start")
+        params["start"] = page.start
+
+    if page.end is not None:
+        conditions.append("timestamp < :end")
+        params["end"] = page.end
+
+    return conditions, params
+
+
+def build_candles_query(exchange_market_id: int, interval_id: int, page: CandlePage):
+    """
+    Keyset query served by uq_candle_market_interval_ts
+    (exchange_market_id, interval_id, timestamp).
+
+    Forward pages fetch limit + 1 rows to know whether a next page exists;
+    the latest page scans the index backwards and is reversed by the caller.
+    """
+    conditions, params = _series_conditions(exchange_market_id, interval_id, page)
+
+    order = "asc" if page.forward else "desc"
+    params["limit"] = page.fetch_count
+
+    query = text(
+        f"select {CANDLE_COLUMNS} from candles "
+        f"where {' and '.join(conditions)} "
+        f"order by timestamp {order} "
+        f"limit :limit"
+    )
+
+    return query, params
+
+
+def build_export_query(exchange_market_id: int, interval_id: int, page: CandlePage):
+    """
+    Same index range scan as build_candles_query, ascending and unbounded
+    (limit is ignored); meant to be consumed through a server-side cursor.
+    """
+    conditions, params = _series_conditions(exchange_market_id, interval_id, page)
+
+    query = text(
+        f"select {CANDLE_COLUMNS} from candles "
+        f"where {' and '.join(conditions)} "
+        f"order by timestamp asc"
+    )
+
+    return query, params
+
+
+def finalize_page(rows: List[Any], page: CandlePage) -> Tuple[List[Any], Optional[str]]:
+    """
+    Rows in ascending order + next cursor (None on the last page).
+    """
+    rows = list(rows)
+
+    if not page.forward:
+        rows.reverse()
+        return rows, None
+
+    if len(rows) <= page.limit:
+        return rows, None
+
+    rows = rows[:page.limit]
+    return rows, encode_cursor(rows[-1]["timestamp"], page.end)
+
+
+# ---------------- cold archive (database/candle_archive.py) ----------------
+
+def page_lower_bound(page: CandlePage) -> Optional[int]:
+    """
+    Smallest open time the page can contain (None = unbounded).
+    """
+    if page.after is not None:
+        return page.after + 1
+    return page.start
+
+
+def archive_needed(page: CandlePage, boundary: Optional[int], db_rows: List[Any]) -> bool:
+    """
+    Whether archived rows (open time < boundary) can be part of the page,
+    given the rows the DB query returned.
+    """
+    if boundary is None:
+        return False
+
+    lower = page_lower_bound(page)
+    if lower is not None and lower >= boundary:
+        return False
+
+    if page.forward:
+        # ascending: archived rows come before every DB row above the boundary
+        return True
+
+    # descending: only once the DB rows run out or cross the boundary
+    return len(db_rows) < page.fetch_count or db_rows[-1]["timestamp"] < boundary
+
+
+def archive_bounds(page: CandlePage, boundary: int) -> Tuple[Optional[int], int]:
+    """
+    [start, end) of the archive read for a page.
+    """
+    end = boundary if page.end is None else min(page.end, boundary)
+    return page_lower_bound(page), end
+
+
+def merge_rows(db_rows: List[Any], archived_rows: List[Any], descending: bool = False) -> List[Any]:
+    """
+    Union of both sources ordered by open time; DB rows win on equal open times.
+    """
+    by_timestamp = {row["timestamp"]: row for row in archived_rows}
+    by_timestamp.update((row["timestamp"], row) for row in db_rows)
+
+    return [by_timestamp[ts] for ts in sorted(by_timestamp, reverse=descending)]
+
+
+def merge_page_rows(db_rows: List[Any], archived_rows: List[Any], page: CandlePage) -> List[Any]:
+    """
+    Both sources in page order -> the first fetch_count rows of their union.
+    """
+    return merge_rows(db_rows, archived_rows, descending=not page.forward)[:page.fetch_count]
@@ -0,0 +1,116 @@
+#api_service/app/dataAccess/resampling.py
+"""
+Query-time resampling of intervals that are not stored.
+
+An interval missing from the intervals table (e.g. "2h", "30m", "12h")
+that is a whole multiple of the base interval is served from the base
+series: the page is translated into a base-interval page, read through
+the normal path (recent cache / PostgreSQL / archive) and aggregated
+with core/candle_resample.py. Stored intervals (fetched, or rolled up
+by the syncer) never take this path.
+
+Like stored candles, only closed buckets are returned.
+"""
+
+import os
+from dataclasses import dataclass, replace
+from typing import Any, List, Optional
+
+from api_service.app.dataAccess.pagination import CandlePage, page_lower_bound
+from core.candle_resample import align_down, align_up, can_resample, parse_interval_ms, resample_rows
+from core.exceptions import MappingError
+from core.mapping.derived_interval_mapping import RESAMPLE_BASE_INTERVAL
+from core.mapping.interval_ms_mapping import INTERVAL_MS_MAPPING
+
+# upper bound on base rows read for one resampled page (caps the limit)
+RESAMPLE_MAX_SOURCE_ROWS = int(os.getenv("RESAMPLE_MAX_SOURCE_ROWS", "100000"))
+
+
+@dataclass(frozen=True)
+class ResamplePlan:
+    interval_ms: int
+    source_interval: str
+    source_ms: int
+
+    @property
+    def ratio(self) -> int:
+        return self.interval_ms // self.source_ms
+
+    def bound_page(self, page: CandlePage) -> CandlePage:
+        """
+        The page with its limit capped to RESAMPLE_MAX_SOURCE_ROWS base rows.
+        """
+        max_limit = max(RESAMPLE_MAX_SOURCE_ROWS // self.ratio - 2, 1)
+        return page if page.limit <= max_limit else replace(page, limit=max_limit)
+
+    def source_page(self, page: CandlePage) -> CandlePage:
+        """
+        Base-interval page covering the buckets of `page`, one bucket
+        longer so a bucket cut by the row limit can be dropped.
+        """
+        end = None if page.end is None else align_up(page.end, self.interval_ms)
+        rows = (page.limit + 2) * self.ratio
+
+        if page.forward:
+            start = align_up(page_lower_bound(page), self.interval_ms)
+            # forward pages fetch limit + 1 rows
+            return CandlePage(limit=rows - 1, start=start, end=end)
+
+        return CandlePage(limit=rows, end=end)
+
+    def resample_page(
+        self,
+        rows: List[Any],
+        page: CandlePage,
+        source_page: CandlePage,
+    ) -> List[Any]:
+        """
+        Base rows of source_page (in its order) -> up to page.fetch_count
+        buckets in page order (ascending, or newest first for the latest page).
+        """
+        if not rows:
+            return []
+
+        ascending = list(rows) if page.forward else list(reversed(rows))
+        cut = len(rows) >= source_page.fetch_count
+
+        # the newest bucket is open until its last base candle is stored
+        closed_before = ascending[-1]["timestamp"] + self.source_ms
+
+        if cut and page.forward:
+            # rows stopped inside the last bucket
+            closed_before = min(closed_before, align_down(ascending[-1]["timestamp"], self.interval_ms))
+
+        buckets = resample_rows(ascending, self.interval_ms, closed_before)
+
+        if page.forward:
+            return buckets[:page.fetch_count]
+
+        if cut and buckets and buckets[0]["timestamp"] != ascending[0]["timestamp"]:
+            # rows stopped inside the oldest bucket
+            buckets = buckets[1:]
+
+        buckets.reverse()
+        return buckets[:page.fetch_count]
+
+
+def plan_resample(interval: str) -> Optional[ResamplePlan]:
+    """
+    Plan for an interval built from the base interval, or None when it
+    is not a whole multiple of it.
+    """
+    try:
+        interval_ms = parse_interval_ms(interval)
+    except MappingError:
+        return None
+
+    source_ms = INTERVAL_MS_MAPPING[RESAMPLE_BASE_INTERVAL]
+
+    if not can_resample(source_ms, interval_ms):
+        return None
+
+    return ResamplePlan(
+        interval_ms=interval_ms,
+        source_interval=RESAMPLE_BASE_INTERVAL.value,
+        source_ms=source_ms,
+    )
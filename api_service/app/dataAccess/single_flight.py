@@ -0,0 +1,45 @@
+#api_service/app/dataAccess/single_flight.py
+
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, Hashable
+
+
+def payload_flight_key(route: str, payload: dict) -> tuple:
+    """
+    Identical requests -> identical key (parameter order does not matter).
+    """
+    return (route,) + tuple(sorted((k, v) for k, v in payload.items() if v is not None))
+
+
+class SingleFlight:
+    """
+    In-process request coalescing: concurrent calls with the same key
+    share one in-flight coroutine and all receive its result (or error).
+
+    The shared task is shielded, so a caller that goes away (client
+    disconnect) does not cancel the fetch for everyone else.
+    """
+
+    def __init__(self) -> None:
+        self._calls: Dict[Hashable, asyncio.Task] = {}
+
+    def in_flight(self, key: Hashable) -> bool:
+        return key in self._calls
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable[Any]]) -> Any:
+        task = self._calls.get(key)
+
+        if task is None:
+            task = asyncio.ensure_future(fn())
+            self._calls[key] = task
+            task.add_done_callback(lambda done: self._forget(key, done))
+
+        return await asyncio.shield(task)
+
+    def _forget(self, key: Hashable, task: asyncio.Task) -> None:
+        if self._calls.get(key) is task:
+            del self._calls[key]
+
+        # every waiter may be gone; mark the error as retrieved
+        if not task.cancelled():
+            task.exception()
@@ -0,0 +1,169 @@
+#api_service/app/dataAccess/versioned_snapshot.py
+
+import os
+import threading
+import time
+from typing import Callable, Generic, Optional, TypeVar
+
+from api_service.app.dataAccess.single_flight import SingleFlight
+from core.metadata_version import aread_metadata_version, read_metadata_version
+from database.async_session import get_async_session
+from database.session import get_session
+
+# hard upper bound on snapshot age, even without a version signal
+METADATA_SNAPSHOT_TTL_SECONDS = int(os.getenv("METADATA_SNAPSHOT_TTL_SECONDS", "300"))
+# how often the Redis version key is polled (pub/sub pushes changes sooner)
+METADATA_VERSION_CHECK_SECONDS = float(os.getenv("METADATA_VERSION_CHECK_SECONDS", "5"))
+
+S = TypeVar("S")
+
+
+def _is_newer(version: Optional[str], than: Optional[str]) -> bool:
+    # versions are INCR counters; a late, older push must not force reloads
+    if version is None:
+        return False
+    if than is None:
+        return True
+    try:
+        return int(version) > int(than)
+    except ValueError:
+        return version != than
+
+
+class VersionedSnapshot(Generic[S]):
+    """
+    Process-local snapshot of metadata tables, tagged with the Redis
+    metadata version it was built from.
+
+    Reloaded when:
+    - the snapshot is older than ttl_seconds
+    - the version pushed through invalidate() differs (pub/sub)
+    - the polled Redis version changed (every version_check_seconds)
+
+    Subclasses build the snapshot in _load / _aload; the snapshot object
+    must expose `version` and `loaded_at`.
+    """
+
+    def __init__(
+        self,
+        ttl_seconds: float = METADATA_SNAPSHOT_TTL_SECONDS,
+        version_check_seconds: float = METADATA_VERSION_CHECK_SECONDS,
+        session_factory: Callable = get_session,
+        async_session_factory: Callable = get_async_session,
+        version_fn: Callable[[], Optional[str]] = read_metadata_version,
+        aversion_fn: Callable = aread_metadata_version,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.ttl_seconds = ttl_seconds
+        self.version_check_seconds = version_check_seconds
+        self.session_factory = session_factory
+        self.async_session_factory = async_session_factory
+        self.version_fn = version_fn
+        self.aversion_fn = aversion_fn
+        self.clock = clock
+
+        self._snapshot: Optional[S] = None
+        self._version_checked_at = 0.0
+        self._pushed_version: Optional[str] = None
+        self._lock = threading.Lock()
+        self._flights = SingleFlight()
+
+    # ---------------- snapshot access ----------------
+
+    def current(self) -> S:
+        now = self.clock()
+
+        if self._needs_reload(now, self._current_version(now, self.version_fn)):
+            self.reload()
+
+        return self._snapshot
+
+    async def acurrent(self) -> S:
+        now = self.clock()
+
+        version = None
+        if self._version_check_due(now):
+            version = await self.aversion_fn()
+            self._version_checked_at = now
+
+        if self._needs_reload(now, version):
+            await self.areload()
+
+        return self._snapshot
+
+    def invalidate(self, version: Optional[str] = None) -> None:
+        """
+        Version change pushed from outside (pub/sub); None forces a reload.
+        """
+        if version is None:
+            self._snapshot = None
+        self._pushed_version = version
+
+    # ---------------- reload ----------------
+
+    def reload(self) -> S:
+        with self._lock:
+            version = self.version_fn()
+
+            with self.session_factory() as session:
+                snapshot = self._load(session, version, self.clock())
+
+            return self._store(snapshot)
+
+    async def areload(self) -> S:
+        # concurrent callers share one reload
+        return await self._flights.do("reload", self._areload)
+
+    async def _areload(self) -> S:
+        version = await self.aversion_fn()
+
+        async with self.async_session_factory() as session:
+            snapshot = await self._aload(session, version, self.clock())
+
+        return self._store(snapshot)
+
+    def _load(self, session, version: Optional[str], loaded_at: float) -> S:
+        raise NotImplementedError
+
+    async def _aload(self, session, version: Optional[str], loaded_at: float) -> S:
+        raise NotImplementedError
+
+    def _loaded(self, snapshot: S) -> None:
+        """
+        Hook called after every reload (logging).
+        """
+
+    # ---------------- helpers ----------------
+
+    def _store(self, snapshot: S) -> S:
+        self._snapshot = snapshot
+        self._version_checked_at = snapshot.loaded_at
+
+        # keep a pushed version this reload raced with (read an older one)
+        if not _is_newer(self._pushed_version, snapshot.version):
+            self._pushed_version = None
+
+        self._loaded(snapshot)
+        return snapshot
+
+    def _version_check_due(self, now: float) -> bool:
+        return (
+            self._snapshot is not None
+            and now - self._version_checked_at >= self.version_check_seconds
+        )
+
+    def _current_version(self, now: float, version_fn) -> Optional[str]:
+        if not self._version_check_due(now):
+            return None
+        self._version_checked_at = now
+        return version_fn()
+
+    def _needs_reload(self, now: float, version: Optional[str]) -> bool:
+        snapshot = self._snapshot
+        if snapshot is None:
+            return True
+        if now - snapshot.loaded_at >= self.ttl_seconds:
+            return True
+        if _is_newer(self._pushed_version, snapshot.version):
+            return True
+        return version is not None and version != snapshot.version
@@ -1,8 +1,13 @@
 #api_service/app/policy/base.py
 
+import os
 from enum import Enum
 from dataclasses import dataclass
 
+# units per consumer and 60 s window; the policy limit, also used by the
+# Redis limiter (token bucket pacing) and the leased pre-admission
+RATE_LIMIT_CAPACITY = int(os.getenv("RATE_LIMIT_CAPACITY", "50"))
+
 class PolicyDecisionType(Enum):
     ALLOW = "allow"
     DENY = "deny"
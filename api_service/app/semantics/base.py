@@ -14,6 +14,7 @@ class SemanticResult:
     type: SemanticType
     message: str | None = None
     data: object | None = None
+    next_cursor: str | None = None
 
 class SemanticAnnotator:
     def annotate(self, policy_decision = None, data_result = None) -> SemanticResult:
@@ -21,7 +21,8 @@ class MockSemanticAnnotator(SemanticAnnotator):
         return SemanticResult(
             type = SemanticType.SUCCESS.value,
             message= None,
-            data= data_result.payload
+            data= data_result.payload,
+            next_cursor= getattr(data_result, "next_cursor", None)
         ) 
 
 
@@ -3,12 +3,19 @@
 from __future__ import annotations
 
 from abc import ABC, abstractmethod
-from typing import Any, List
+from functools import partial
+from typing import Any, Awaitable, Callable, List
 
 from core.mapping.interval_mapping import map_interval
 from core.mapping.symbol_mapping import map_symbol
 
 from core.models.candle import Candle
+from core.models.candle_batch import (
+    REASON_UNPARSEABLE,
+    CandleBatch,
+    CandleRow,
+    QuarantinedCandle,
+)
 from core.models.enums import Exchange, MarketType, Interval
 from core.exceptions import (
     AdapterError,
@@ -26,6 +33,10 @@ class BaseAdapter(ABC):
     market_type: MarketType
 
 
+    # largest page the exchange returns for one klines request
+    max_page_size: int = 500
+
+
     #-----------------------------
     # public high level api
     #-----------------------------
@@ -44,43 +55,300 @@ class BaseAdapter(ABC):
         3) validate raw response
         4) convert each raw item into a canonical Candle
         """
+        return self._run_pipeline(
+            symbol,
+            interval,
+            lambda exchange_symbol, exchange_interval: self.fetch_raw_candles(
+                exchange_symbol,
+                exchange_interval,
+                limit,
+            ),
+        )
+
+    def fetch_candles_range(
+        self,
+        symbol: str,
+        interval: Interval,
+        start_time: int,
+        end_time: int,
+        limit: int | None = None,
+    ) -> List[Candle]:
+        """
+        Fetch one page of candles whose open time is in [start_time, end_time).
+
+        Same pipeline as fetch_candles; used by backfill / gap repair.
+        Callers page through larger ranges (see max_page_size).
+        """
+        page_limit = limit or self.max_page_size
+
+        return self._run_pipeline(
+            symbol,
+            interval,
+            lambda exchange_symbol, exchange_interval: self.fetch_raw_candles_range(
+                exchange_symbol,
+                exchange_interval,
+                start_time,
+                end_time,
+                page_limit,
+            ),
+        )
+
+    async def afetch_candles(
+        self,
+        symbol: str,
+        interval: Interval,
+        limit: int = 500,
+    ) -> List[Candle]:
+        """
+        Async variant of fetch_candles.
+
+        Same pipeline and error contract, but the exchange call goes
+        through afetch_raw_candles (shared keep-alive AsyncClient).
+        """
+        return await self._arun_pipeline(
+            symbol,
+            interval,
+            lambda exchange_symbol, exchange_interval: self.afetch_raw_candles(
+                exchange_symbol,
+                exchange_interval,
+                limit,
+            ),
+        )
+
+    async def afetch_candles_range(
+        self,
+        symbol: str,
+        interval: Interval,
+        start_time: int,
+        end_time: int,
+        limit: int | None = None,
+    ) -> List[Candle]:
+        """
+        Async variant of fetch_candles_range.
+        """
+        page_limit = limit or self.max_page_size
+
+        return await self._arun_pipeline(
+            symbol,
+            interval,
+            lambda exchange_symbol, exchange_interval: self.afetch_raw_candles_range(
+                exchange_symbol,
+                exchange_interval,
+                start_time,
+                end_time,
+                page_limit,
+            ),
+        )
+
+    #-----------------------------
+    # columnar api (CandleBatch, no per-row Candle objects)
+    #-----------------------------
+    def fetch_candle_batch(
+        self,
+        symbol: str,
+        interval: Interval,
+        limit: int = 500,
+        quarantine: bool = False,
+    ) -> CandleBatch:
+        """
+        Same pipeline as fetch_candles, but rows go straight into a
+        columnar CandleBatch (see to_row) and are validated column-wise.
+
+        quarantine=True drops invalid / unparseable rows into
+        batch.quarantined instead of raising CandleValidationError.
+        """
+        return self._run_pipeline(
+            symbol,
+            interval,
+            lambda exchange_symbol, exchange_interval: self.fetch_raw_candles(
+                exchange_symbol,
+                exchange_interval,
+                limit,
+            ),
+            build=partial(self._build_candle_batch, quarantine=quarantine),
+        )
+
+    def fetch_candle_batch_range(
+        self,
+        symbol: str,
+        interval: Interval,
+        start_time: int,
+        end_time: int,
+        limit: int | None = None,
+        quarantine: bool = False,
+    ) -> CandleBatch:
+        """
+        Columnar variant of fetch_candles_range.
+        """
+        page_limit = limit or self.max_page_size
+
+        return self._run_pipeline(
+            symbol,
+            interval,
+            lambda exchange_symbol, exchange_interval: self.fetch_raw_candles_range(
+                exchange_symbol,
+                exchange_interval,
+                start_time,
+                end_time,
+                page_limit,
+            ),
+            build=partial(self._build_candle_batch, quarantine=quarantine),
+        )
+
+    async def afetch_candle_batch(
+        self,
+        symbol: str,
+        interval: Interval,
+        limit: int = 500,
+        quarantine: bool = False,
+    ) -> CandleBatch:
+        """
+        Async variant of fetch_candle_batch.
+        """
+        return await self._arun_pipeline(
+            symbol,
+            interval,
+            lambda exchange_symbol, exchange_interval: self.afetch_raw_candles(
+                exchange_symbol,
+                exchange_interval,
+                limit,
+            ),
+            build=partial(self._build_candle_batch, quarantine=quarantine),
+        )
+
+    def _run_pipeline(
+        self,
+        symbol: str,
+        interval: Interval,
+        raw_fetcher: Callable[[str, str], list[Any]],
+        build: Callable[[list[Any], str, Interval], Any] | None = None,
+    ) -> Any:
+        build = build or self._build_candles
         try:          
             # step 1: symbol & interval mapping
             exchange_symbol = self.normalize_symbol(symbol)
             exchange_interval = self.normalize_interval(interval)
             
             # step 2: call exchange api
-            raw_items = self.fetch_raw_candles(
-                exchange_symbol,
-                exchange_interval,
-                limit,
-            )
+            raw_items = raw_fetcher(exchange_symbol, exchange_interval)
 
-            # step 3: validate raw response
-            self.validate_response(raw_items)
+            # step 3 + 4: validate raw response & map to canonical Candle
+            return build(raw_items, symbol, interval)
 
-            # step 4: map raw items to canonical Candle
-            candles: List[Candle] = []
-            for item in raw_items:
-                candle = self.to_candle(
-                    raw_item = item,
-                    symbol = symbol,
-                    interval = interval,
-                    )
-                self._validate_candle(candle)
-                candles.append(candle)
-            return candles
+        except MappingError:
+            raise
+        except CandleValidationError:
+            raise
+        except Exception as e:
+            raise self._wrap_error(e, symbol, interval) from e
+
+    async def _arun_pipeline(
+        self,
+        symbol: str,
+        interval: Interval,
+        raw_fetcher: Callable[[str, str], Awaitable[list[Any]]],
+        build: Callable[[list[Any], str, Interval], Any] | None = None,
+    ) -> Any:
+        build = build or self._build_candles
+        try:
+            exchange_symbol = self.normalize_symbol(symbol)
+            exchange_interval = self.normalize_interval(interval)
+
+            raw_items = await raw_fetcher(exchange_symbol, exchange_interval)
+
+            return build(raw_items, symbol, interval)
 
         except MappingError:
             raise
         except CandleValidationError:
             raise
         except Exception as e:
-            raise AdapterError(
-                f"Error fetching candles from {self.exchange.value} "
-                f"for {symbol} at {interval.value}: {str(e)}"
-            ) from e
-            
+            raise self._wrap_error(e, symbol, interval) from e
+
+    def _wrap_error(
+        self,
+        error: Exception,
+        symbol: str,
+        interval: Interval,
+    ) -> AdapterError:
+        return AdapterError(
+            f"Error fetching candles from {self.exchange.value} "
+            f"for {symbol} at {interval.value}: {str(error)}"
+        )
+
+    def _build_candles(
+        self,
+        raw_items: list[Any],
+        symbol: str,
+        interval: Interval,
+    ) -> List[Candle]:
+        """
+        Validate raw response and convert each raw item into a canonical Candle.
+        Shared by the sync and async pipelines.
+        """
+        self.validate_response(raw_items)
+
+        candles: List[Candle] = []
+        for item in raw_items:
+            candle = self.to_candle(
+                raw_item = item,
+                symbol = symbol,
+                interval = interval,
+                )
+            self._validate_candle(candle)
+            candles.append(candle)
+        return candles
+
+    def _build_candle_batch(
+        self,
+        raw_items: list[Any],
+        symbol: str,
+        interval: Interval,
+        quarantine: bool = False,
+    ) -> CandleBatch:
+        """
+        Validate raw response and append each raw item to a CandleBatch.
+
+        quarantine=False: first bad row raises (same contract as _build_candles)
+        quarantine=True: bad rows are dropped and listed in batch.quarantined
+        """
+        self.validate_response(raw_items)
+
+        batch = CandleBatch(
+            exchange=self.exchange,
+            market_type=self.market_type,
+            symbol=symbol,
+            interval=interval,
+        )
+
+        if not quarantine:
+            for item in raw_items:
+                batch.append(*self.to_row(item, symbol, interval))
+
+            batch.validate()
+            return batch
+
+        unparseable: List[QuarantinedCandle] = []
+        source_index: List[int] = []
+
+        for index, item in enumerate(raw_items):
+            try:
+                row = self.to_row(item, symbol, interval)
+            except (KeyError, IndexError, TypeError, ValueError):
+                unparseable.append(
+                    QuarantinedCandle(index=index, open_timestamp=None, reason=REASON_UNPARSEABLE)
+                )
+                continue
+
+            batch.append(*row)
+            source_index.append(index)
+
+        batch = batch.quarantine(source_index)
+        if unparseable:
+            batch.quarantined.extend(unparseable)
+            batch.quarantined.sort(key=lambda q: q.index)
+        return batch
+
     @abstractmethod
     def fetch_raw_candles(
         self,
@@ -96,6 +364,53 @@ class BaseAdapter(ABC):
         - return raw response itmes (whith no normalization or mapping)
         """
         raise NotImplementedError
+
+    async def afetch_raw_candles(
+        self,
+        exchange_symbol: str,
+        exchange_interval: str,
+        limit: int,
+    ) -> list[Any]:
+        """
+        Async counterpart of fetch_raw_candles.
+
+        Adapters that support the async pipeline override this method.
+        """
+        raise NotImplementedError(
+            f"{type(self).__name__} does not support async fetching"
+        )
+
+    def fetch_raw_candles_range(
+        self,
+        exchange_symbol: str,
+        exchange_interval: str,
+        start_time: int,
+        end_time: int,
+        limit: int,
+    ) -> list[Any]:
+        """
+        fetch raw candles with open time in [start_time, end_time).
+
+        Adapters that support historical paging override this method.
+        """
+        raise NotImplementedError(
+            f"{type(self).__name__} does not support time-range fetching"
+        )
+
+    async def afetch_raw_candles_range(
+        self,
+        exchange_symbol: str,
+        exchange_interval: str,
+        start_time: int,
+        end_time: int,
+        limit: int,
+    ) -> list[Any]:
+        """
+        Async counterpart of fetch_raw_candles_range.
+        """
+        raise NotImplementedError(
+            f"{type(self).__name__} does not support async time-range fetching"
+        )
     #-----------------------------
 
     def normalize_symbol(self, symbol: str) -> str:
@@ -130,6 +445,31 @@ class BaseAdapter(ABC):
         raise NotImplementedError
     #-----------------------------
 
+    def to_row(
+        self,
+        raw_item: Any,
+        symbol: str,
+        interval: Interval,
+    ) -> CandleRow:
+        """
+        Convert a raw exchange item to a plain candle row
+        (open_ts, close_ts, open, high, low, close, volume).
+
+        Default goes through to_candle; adapters override it to skip
+        the intermediate Candle object.
+        """
+        candle = self.to_candle(raw_item=raw_item, symbol=symbol, interval=interval)
+        return (
+            candle.open_timestamp,
+            candle.close_timestamp,
+            candle.open,
+            candle.high,
+            candle.low,
+            candle.close,
+            candle.volume,
+        )
+    #-----------------------------
+
     def validate_response(self, raw_items: list[Any]) -> None:
         """
         validate the raw itmes received from exchange api.
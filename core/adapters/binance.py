@@ -1,14 +1,22 @@
 from typing import List, Any
-import requests
 from core.adapters.base import BaseAdapter
+from core.adapters.http_client import (
+    HTTP_TIMEOUT_SECONDS,
+    get_async_http_client,
+    get_http_session,
+)
 
 from core.models.candle import Candle
+from core.models.candle_batch import CandleRow
 from core.models.enums import Exchange, MarketType, Interval
 
 class BinanceAdapter(BaseAdapter):
     
     exchange = Exchange.BINANCE
 
+    # spot caps klines at 1000 per request (futures allows 1500)
+    max_page_size = 1000
+
     def __init__(self, market_type: MarketType):
         self.market_type = market_type
 
@@ -25,16 +33,95 @@ class BinanceAdapter(BaseAdapter):
         """
 
         endpoint = self._get_klines_endpoint()
-        params = {
+        params = self._build_klines_params(exchange_symbol, exchange_interval, limit)
+
+        session = get_http_session(self.exchange)
+        response = session.get(endpoint, params=params, timeout=HTTP_TIMEOUT_SECONDS)
+        response.raise_for_status()
+
+        return response.json()
+
+    async def afetch_raw_candles(
+            self,
+            exchange_symbol: str,
+            exchange_interval: str,
+            limit: int
+            ) -> List[Any]:
+        """
+        Async fetch through the shared keep-alive AsyncClient.
+        """
+        endpoint = self._get_klines_endpoint()
+        params = self._build_klines_params(exchange_symbol, exchange_interval, limit)
+
+        client = get_async_http_client(self.exchange)
+        response = await client.get(endpoint, params=params)
+        response.raise_for_status()
+
+        return response.json()
+
+    def fetch_raw_candles_range(
+            self,
+            exchange_symbol: str,
+            exchange_interval: str,
+            start_time: int,
+            end_time: int,
+            limit: int
+            ) -> List[Any]:
+        """
+        Fetch one page of klines with open time in [start_time, end_time).
+        """
+        endpoint = self._get_klines_endpoint()
+        params = self._build_klines_params(
+            exchange_symbol, exchange_interval, limit, start_time, end_time
+        )
+
+        session = get_http_session(self.exchange)
+        response = session.get(endpoint, params=params, timeout=HTTP_TIMEOUT_SECONDS)
+        response.raise_for_status()
+
+        return response.json()
+
+    async def afetch_raw_candles_range(
+            self,
+            exchange_symbol: str,
+            exchange_interval: str,
+            start_time: int,
+            end_time: int,
+            limit: int
+            ) -> List[Any]:
+        endpoint = self._get_klines_endpoint()
+        params = self._build_klines_params(
+            exchange_symbol, exchange_interval, limit, start_time, end_time
+        )
+
+        client = get_async_http_client(self.exchange)
+        response = await client.get(endpoint, params=params)
+        response.raise_for_status()
+
+        return response.json()
+
+    def _build_klines_params(
+            self,
+            exchange_symbol: str,
+            exchange_interval: str,
+            limit: int,
+            start_time: int | None = None,
+            end_time: int | None = None,
+            ) -> dict[str, Any]:
+        params: dict[str, Any] = {
             "symbol": exchange_symbol,
             "interval": exchange_interval,
-            "limit": limit,
+            "limit": min(limit, self.max_page_size),
         }
-        response = requests.get(endpoint, params=params, timeout=10)
-        response.raise_for_status()
 
-        return response.json()
-        
+        # Binance startTime/endTime are both inclusive
+        if start_time is not None:
+            params["startTime"] = start_time
+        if end_time is not None:
+            params["endTime"] = end_time - 1
+
+        return params
+
 
     def to_candle(
             self, 
@@ -59,6 +146,25 @@ class BinanceAdapter(BaseAdapter):
             interval=interval,
         )
     
+    def to_row(
+            self,
+            raw_item: Any,
+            symbol: str,
+            interval: Interval
+            ) -> CandleRow:
+        """
+        Raw kline straight to a columnar row (no Candle object).
+        """
+        return (
+            int(raw_item[0]),
+            int(raw_item[6]),
+            float(raw_item[1]),
+            float(raw_item[2]),
+            float(raw_item[3]),
+            float(raw_item[4]),
+            float(raw_item[5]),
+        )
+
     def _get_klines_endpoint(self) -> str:
         """
         Get the appropriate klines endpoint based on market type.
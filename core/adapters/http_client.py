@@ -0,0 +1,104 @@
+# core/adapters/http_client.py
+"""
+Shared HTTP connection pools for exchange adapters.
+
+One keep-alive pool per exchange, reused by every adapter instance,
+so fetching hundreds of symbols per cycle does not pay a TCP+TLS
+handshake per request.
+
+- get_http_session(exchange)       -> pooled requests.Session (sync path)
+- get_async_http_client(exchange)  -> pooled httpx.AsyncClient (async path)
+- aclose_http_clients()            -> shutdown hook for the async pools
+"""
+
+from __future__ import annotations
+
+import importlib.util
+import os
+import threading
+
+import httpx
+import requests
+from requests.adapters import HTTPAdapter
+
+from core.models.enums import Exchange
+
+HTTP_TIMEOUT_SECONDS = float(os.getenv("HTTP_TIMEOUT_SECONDS", "10"))
+HTTP_MAX_CONNECTIONS = int(os.getenv("HTTP_MAX_CONNECTIONS", "20"))
+HTTP_MAX_KEEPALIVE_CONNECTIONS = int(os.getenv("HTTP_MAX_KEEPALIVE_CONNECTIONS", "10"))
+HTTP_KEEPALIVE_EXPIRY_SECONDS = float(os.getenv("HTTP_KEEPALIVE_EXPIRY_SECONDS", "30"))
+
+# HTTP/2 needs the optional `h2` package (httpx[http2])
+HTTP2_AVAILABLE = importlib.util.find_spec("h2") is not None
+
+_sessions: dict[Exchange, requests.Session] = {}
+_async_clients: dict[Exchange, httpx.AsyncClient] = {}
+_lock = threading.Lock()
+
+
+def get_http_session(exchange: Exchange) -> requests.Session:
+    """
+    Return the shared keep-alive requests.Session for an exchange.
+    """
+    with _lock:
+        session = _sessions.get(exchange)
+
+        if session is None:
+            session = requests.Session()
+            adapter = HTTPAdapter(
+                pool_connections=1,
+                pool_maxsize=HTTP_MAX_CONNECTIONS,
+            )
+            session.mount("https://", adapter)
+            session.mount("http://", adapter)
+            _sessions[exchange] = session
+
+        return session
+
+
+def get_async_http_client(exchange: Exchange) -> httpx.AsyncClient:
+    """
+    Return the shared httpx.AsyncClient for an exchange.
+
+    The client is created lazily and bound to the running event loop,
+    so it must be used from a single loop and closed with
+    aclose_http_clients() before that loop stops.
+    """
+    client = _async_clients.get(exchange)
+
+    if client is None or client.is_closed:
+        client = httpx.AsyncClient(
+            http2=HTTP2_AVAILABLE,
+            timeout=HTTP_TIMEOUT_SECONDS,
+            limits=httpx.Limits(
+                max_connections=HTTP_MAX_CONNECTIONS,
+                max_keepalive_connections=HTTP_MAX_KEEPALIVE_CONNECTIONS,
+                keepalive_expiry=HTTP_KEEPALIVE_EXPIRY_SECONDS,
+            ),
+        )
+        _async_clients[exchange] = client
+
+    return client
+
+
+async def aclose_http_clients() -> None:
+    """
+    Close every async client (call on shutdown of the event loop).
+    """
+    clients = list(_async_clients.values())
+    _async_clients.clear()
+
+    for client in clients:
+        await client.aclose()
+
+
+def close_http_sessions() -> None:
+    """
+    Close every sync session (call on process shutdown).
+    """
+    with _lock:
+        sessions = list(_sessions.values())
+        _sessions.clear()
+
+    for session in sessions:
+        session.close()
@@ -1,14 +1,22 @@
 from core.adapters.base import BaseAdapter
+from core.adapters.http_client import (
+    HTTP_TIMEOUT_SECONDS,
+    get_async_http_client,
+    get_http_session,
+)
 from typing import List, Any
 from core.models.enums import MarketType, Exchange, Interval
 from core.models.candle import Candle
-import requests
+from core.models.candle_batch import CandleRow
 import time
 
 class HyperliquidAdapter(BaseAdapter):
 
     exchange = Exchange.HYPERLIQUID
 
+    # candleSnapshot returns at most 5000 candles per request
+    max_page_size = 5000
+
     INTERVAL_MS = {
     "1m": 60_000,
     "3m": 3 * 60_000,
@@ -36,14 +44,92 @@ class HyperliquidAdapter(BaseAdapter):
             limit: int
             ) -> List[Any]:
         
-        end_time = int(time.time() * 1000)
-        interval_ms = self.INTERVAL_MS[exchange_interval]
-        start_time = end_time - (interval_ms * limit)
+        endpoint = self._get_klines_endpoint()
+        payload = self._build_candle_snapshot_payload(
+            exchange_symbol, exchange_interval, limit
+        )
+
+        session = get_http_session(self.exchange)
+        response = session.post(
+            endpoint, 
+            json=payload, 
+            timeout=HTTP_TIMEOUT_SECONDS)
+        response.raise_for_status()
+        return response.json()
+
+    async def afetch_raw_candles(
+            self, 
+            exchange_symbol: str, 
+            exchange_interval: str, 
+            limit: int
+            ) -> List[Any]:
+        """
+        Async fetch through the shared keep-alive AsyncClient.
+        """
+        endpoint = self._get_klines_endpoint()
+        payload = self._build_candle_snapshot_payload(
+            exchange_symbol, exchange_interval, limit
+        )
 
+        client = get_async_http_client(self.exchange)
+        response = await client.post(endpoint, json=payload)
+        response.raise_for_status()
+        return response.json()
+
+    def fetch_raw_candles_range(
+            self, 
+            exchange_symbol: str, 
+            exchange_interval: str, 
+            start_time: int,
+            end_time: int,
+            limit: int
+            ) -> List[Any]:
+        """
+        Fetch candles with open time in [start_time, end_time).
+        """
+        endpoint = self._get_klines_endpoint()
+        payload = self._build_range_payload(
+            exchange_symbol, exchange_interval, start_time, end_time, limit
+        )
 
+        session = get_http_session(self.exchange)
+        response = session.post(
+            endpoint, 
+            json=payload, 
+            timeout=HTTP_TIMEOUT_SECONDS)
+        response.raise_for_status()
+        return response.json()
+
+    async def afetch_raw_candles_range(
+            self, 
+            exchange_symbol: str, 
+            exchange_interval: str, 
+            start_time: int,
+            end_time: int,
+            limit: int
+            ) -> List[Any]:
         endpoint = self._get_klines_endpoint()
+        payload = self._build_range_payload(
+            exchange_symbol, exchange_interval, start_time, end_time, limit
+        )
+
+        client = get_async_http_client(self.exchange)
+        response = await client.post(endpoint, json=payload)
+        response.raise_for_status()
+        return response.json()
+
+    def _build_candle_snapshot_payload(
+            self, 
+            exchange_symbol: str, 
+            exchange_interval: str, 
+            limit: int
+            ) -> dict[str, Any]:
 
-        payload = {
+        end_time = int(time.time() * 1000)
+        interval_ms = self.INTERVAL_MS[exchange_interval]
+        start_time = end_time - (interval_ms * limit)
+
+        return {
         "type": "candleSnapshot",
         "req": {
             "coin": exchange_symbol,
@@ -53,12 +139,28 @@ class HyperliquidAdapter(BaseAdapter):
             },
         }
 
-        response = requests.post(
-            endpoint, 
-            json=payload, 
-            timeout=10)
-        response.raise_for_status()
-        return response.json()
+    def _build_range_payload(
+            self, 
+            exchange_symbol: str, 
+            exchange_interval: str, 
+            start_time: int,
+            end_time: int,
+            limit: int
+            ) -> dict[str, Any]:
+
+        # never ask for more than one page; endTime is inclusive
+        interval_ms = self.INTERVAL_MS[exchange_interval]
+        page_end = min(end_time, start_time + interval_ms * min(limit, self.max_page_size))
+
+        return {
+        "type": "candleSnapshot",
+        "req": {
+            "coin": exchange_symbol,
+            "interval": exchange_interval,
+            "startTime": start_time,
+            "endTime": page_end - 1,
+            },
+        }
 
     def to_candle(
             self, 
@@ -81,6 +183,23 @@ class HyperliquidAdapter(BaseAdapter):
             interval=interval,
         )
 
+    def to_row(
+            self, 
+            raw_item : dict[str, Any], 
+            symbol : str, 
+            interval : Interval
+        ) -> CandleRow:
+
+        return (
+            int(raw_item["t"]),
+            int(raw_item["T"]),
+            float(raw_item["o"]),
+            float(raw_item["h"]),
+            float(raw_item["l"]),
+            float(raw_item["c"]),
+            float(raw_item["v"]),
+        )
+
 
     def _get_klines_endpoint(self) -> str:
 
@@ -0,0 +1,237 @@
+# core/candle_cache.py
+"""
+Recent-candles cache.
+
+One Redis ZSET per (exchange_market_id, interval_id) holding the newest
+RECENT_CANDLES_CACHE_SIZE stored candles (member = compact JSON row,
+score = open timestamp).
+
+Invariant: the set contains every stored candle with a timestamp >= its
+lowest member, so any read at or above that floor can be answered
+without PostgreSQL.
+
+Writers:
+- ingestion appends new candles after commit
+- the API seeds a key from a "latest candles" DB read on a miss
+- backfill / gap repair invalidate the key (rows were added below the top)
+
+Every key gets a TTL when it is created (not refreshed on append), so a
+key that drifted from the DB after a missed write is rebuilt within
+RECENT_CANDLES_TTL_SECONDS. PostgreSQL stays the source of truth: all
+failures are logged and reported as a miss.
+"""
+
+import json
+import logging
+import os
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Set, Tuple
+
+from core.redis_client import build_async_redis_client, build_redis_client
+
+logger = logging.getLogger(__name__)
+
+RECENT_CANDLES_CACHE_SIZE = int(os.getenv("RECENT_CANDLES_CACHE_SIZE", "500"))
+RECENT_CANDLES_TTL_SECONDS = int(os.getenv("RECENT_CANDLES_TTL_SECONDS", "900"))
+
+RECENT_CANDLE_FIELDS = ("timestamp", "open", "high", "low", "close", "volume")
+
+# (timestamp, open, high, low, close, volume)
+RecentCandleRow = Tuple[int, float, float, float, float, float]
+
+# keys whose last write failed; rebuilt from scratch on the next append
+_dirty_keys: Set[str] = set()
+
+
+def recent_candles_key(exchange_market_id: int, interval_id: int) -> str:
+    return f"candles:recent:{exchange_market_id}:{interval_id}"
+
+
+def encode_recent_candle(row: Sequence) -> str:
+    return json.dumps(list(row), separators=(",", ":"))
+
+
+def decode_recent_candle(member: str) -> Dict[str, Any]:
+    return dict(zip(RECENT_CANDLE_FIELDS, json.loads(member)))
+
+
+# -------------------------
+# write
+# -------------------------
+
+def _queue_write(pipe, key: str, rows: List[RecentCandleRow], size: int, ttl_seconds: int) -> None:
+    # replace the covered range so a re-written candle never appears twice
+    pipe.zremrangebyscore(key, rows[0][0], rows[-1][0])
+    pipe.zadd(key, {encode_recent_candle(row): row[0] for row in rows})
+    pipe.zremrangebyrank(key, 0, -(size + 1))
+    pipe.expire(key, ttl_seconds, nx=True)
+
+
+def append_recent_candles(
+    exchange_market_id: int,
+    interval_id: int,
+    rows: Iterable[RecentCandleRow],
+    size: int = RECENT_CANDLES_CACHE_SIZE,
+    ttl_seconds: int = RECENT_CANDLES_TTL_SECONDS,
+) -> bool:
+    """
+    Add candles (ascending, contiguous with what is already stored) and
+    trim to the newest `size`. Never raises.
+    """
+    rows = sorted(rows)
+    if not rows:
+        return True
+
+    key = recent_candles_key(exchange_market_id, interval_id)
+
+    try:
+        pipe = build_redis_client().pipeline(transaction=True)
+        if key in _dirty_keys:
+            pipe.delete(key)
+        _queue_write(pipe, key, rows, size, ttl_seconds)
+        pipe.execute()
+    except Exception:
+        _dirty_keys.add(key)
+        _log_degraded("Recent candles cache write failed", "candles.cache.write_failed", key)
+        return False
+
+    _dirty_keys.discard(key)
+    return True
+
+
+async def aappend_recent_candles(
+    exchange_market_id: int,
+    interval_id: int,
+    rows: Iterable[RecentCandleRow],
+    size: int = RECENT_CANDLES_CACHE_SIZE,
+    ttl_seconds: int = RECENT_CANDLES_TTL_SECONDS,
+) -> bool:
+    rows = sorted(rows)
+    if not rows:
+        return True
+
+    key = recent_candles_key(exchange_market_id, interval_id)
+
+    try:
+        pipe = build_async_redis_client().pipeline(transaction=True)
+        _queue_write(pipe, key, rows, size, ttl_seconds)
+        await pipe.execute()
+    except Exception:
+        _log_degraded("Recent candles cache write failed", "candles.cache.write_failed", key)
+        return False
+
+    return True
+
+
+def invalidate_recent_candles(exchange_market_id: int, interval_id: int) -> None:
+    key = recent_candles_key(exchange_market_id, interval_id)
+
+    try:
+        build_redis_client().delete(key)
+    except Exception:
+        _dirty_keys.add(key)
+        _log_degraded("Recent candles cache invalidation failed", "candles.cache.invalidate_failed", key)
+
+
+# -------------------------
+# read
+# -------------------------
+
+def _score_bounds(start: Optional[int], end: Optional[int], after: Optional[int]) -> Tuple[str, str]:
+    if after is not None:
+        low = f"({after}"
+    elif start is not None:
+        low = str(start)
+    else:
+        low = "-inf"
+
+    high = f"({end}" if end is not None else "+inf"
+    return low, high
+
+
+def _queue_read(pipe, key: str, limit: int, start, end, after) -> None:
+    low, high = _score_bounds(start, end, after)
+
+    pipe.zrange(key, 0, 0, withscores=True)
+    if start is None and after is None:
+        pipe.zrevrangebyscore(key, high, low, start=0, num=limit)
+    else:
+        pipe.zrangebyscore(key, low, high, start=0, num=limit)
+
+
+def _select_rows(floor_items, members, limit: int, start, after) -> Optional[List[Dict[str, Any]]]:
+    if not floor_items:
+        return None
+
+    floor = int(floor_items[0][1])
+
+    if start is None and after is None:
+        # latest rows: complete only when the set holds at least `limit` of them
+        if len(members) < limit:
+            return None
+    else:
+        lower = after if after is not None else start
+        if lower < floor:
+            return None
+
+    return [decode_recent_candle(member) for member in members]
+
+
+def read_recent_candles(
+    exchange_market_id: int,
+    interval_id: int,
+    limit: int,
+    start: Optional[int] = None,
+    end: Optional[int] = None,
+    after: Optional[int] = None,
+) -> Optional[List[Dict[str, Any]]]:
+    """
+    Same rows (and order) as the DB keyset query, or None when the cache
+    cannot answer the request completely:
+
+    - no start / after: newest `limit` rows below end, descending
+    - start or after:   up to `limit` rows from there, ascending
+    """
+    key = recent_candles_key(exchange_market_id, interval_id)
+
+    try:
+        pipe = build_redis_client().pipeline(transaction=False)
+        _queue_read(pipe, key, limit, start, end, after)
+        floor_items, members = pipe.execute()
+    except Exception:
+        _log_degraded("Recent candles cache read failed", "candles.cache.read_failed", key)
+        return None
+
+    return _select_rows(floor_items, members, limit, start, after)
+
+
+async def aread_recent_candles(
+    exchange_market_id: int,
+    interval_id: int,
+    limit: int,
+    start: Optional[int] = None,
+    end: Optional[int] = None,
+    after: Optional[int] = None,
+) -> Optional[List[Dict[str, Any]]]:
+    key = recent_candles_key(exchange_market_id, interval_id)
+
+    try:
+        pipe = build_async_redis_client().pipeline(transaction=False)
+        _queue_read(pipe, key, limit, start, end, after)
+        floor_items, members = await pipe.execute()
+    except Exception:
+        _log_degraded("Recent candles cache read failed", "candles.cache.read_failed", key)
+        return None
+
+    return _select_rows(floor_items, members, limit, start, after)
+
+
+def _log_degraded(message: str, event: str, key: str) -> None:
+    logger.exception(
+        message,
+        extra={
+            "event": event,
+            "status": "degraded",
+            "operation": "recent_candles_cache",
+            "cache_key": key,
+        },
+    )
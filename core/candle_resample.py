@@ -0,0 +1,192 @@
+# core/candle_resample.py
+"""
+OHLCV resampling: derive a higher interval from stored candles of a
+lower one (e.g. 1h from 1m).
+
+Candles are grouped into buckets by open time:
+
+    bucket_start(ts) = ts - (ts - offset) % interval_ms
+
+UTC-aligned like the exchanges: days start at 00:00 UTC, weeks on
+Monday 00:00 UTC (offset of 4 days, the epoch is a Thursday).
+
+Per bucket: open = first open, close = last close, high = max(high),
+low = min(low), volume = sum(volume). The source is held as typed
+columns (array('q') / array('d')); each bucket is one slice per column
+reduced by the C builtins max / min / sum, no per-row Python objects.
+
+Only closed buckets are emitted: a bucket whose end is after
+`closed_before` (end of the last stored source candle) is still open.
+Buckets with missing source candles are emitted with what is stored.
+"""
+
+from __future__ import annotations
+
+import re
+from array import array
+from bisect import bisect_left
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, List, Mapping, Optional
+
+from core.exceptions import MappingError
+
+DAY_MS = 24 * 60 * 60 * 1000
+WEEK_MS = 7 * DAY_MS
+# 1970-01-01 is a Thursday; weeks open on Monday
+WEEK_OFFSET_MS = 4 * DAY_MS
+
+RESAMPLE_FIELDS = ("timestamp", "open", "high", "low", "close", "volume")
+
+_UNIT_MS = {
+    "m": 60_000,
+    "h": 60 * 60_000,
+    "d": DAY_MS,
+    "w": WEEK_MS,
+}
+
+_INTERVAL_PATTERN = re.compile(r"^([1-9][0-9]*)([mhdw])$")
+
+
+#-----------------------------
+# intervals / alignment
+#-----------------------------
+
+def parse_interval_ms(interval: str) -> int:
+    """
+    "15m" / "2h" / "1d" / "1w" -> milliseconds.
+    """
+    match = _INTERVAL_PATTERN.match(interval)
+    if match is None:
+        raise MappingError(f"Unsupported interval: {interval}")
+
+    return int(match.group(1)) * _UNIT_MS[match.group(2)]
+
+
+def bucket_offset_ms(interval_ms: int) -> int:
+    return WEEK_OFFSET_MS if interval_ms % WEEK_MS == 0 else 0
+
+
+def align_down(timestamp: int, interval_ms: int) -> int:
+    """
+    Open time of the bucket containing timestamp.
+    """
+    return timestamp - (timestamp - bucket_offset_ms(interval_ms)) % interval_ms
+
+
+def align_up(timestamp: int, interval_ms: int) -> int:
+    """
+    First bucket open time >= timestamp.
+    """
+    start = align_down(timestamp, interval_ms)
+    return start if start == timestamp else start + interval_ms
+
+
+def can_resample(source_ms: int, target_ms: int) -> bool:
+    """
+    Every target bucket is made of whole source buckets.
+    """
+    return (
+        target_ms > source_ms
+        and target_ms % source_ms == 0
+        and bucket_offset_ms(target_ms) % source_ms == 0
+    )
+
+
+#-----------------------------
+# columns
+#-----------------------------
+
+def _int_column() -> array:
+    return array("q")
+
+
+def _float_column() -> array:
+    return array("d")
+
+
+@dataclass
+class CandleColumns:
+    """
+    Candles of one series as typed columns, ascending by open time.
+    """
+    timestamp: array = field(default_factory=_int_column)
+    open: array = field(default_factory=_float_column)
+    high: array = field(default_factory=_float_column)
+    low: array = field(default_factory=_float_column)
+    close: array = field(default_factory=_float_column)
+    volume: array = field(default_factory=_float_column)
+
+    @classmethod
+    def from_rows(cls, rows: Iterable[Mapping[str, Any]]) -> "CandleColumns":
+        columns = cls()
+        for row in rows:
+            columns.timestamp.append(row["timestamp"])
+            columns.open.append(row["open"])
+            columns.high.append(row["high"])
+            columns.low.append(row["low"])
+            columns.close.append(row["close"])
+            columns.volume.append(row["volume"])
+        return columns
+
+    def __len__(self) -> int:
+        return len(self.timestamp)
+
+    def values(self) -> Iterable[tuple]:
+        # (timestamp, open, high, low, close, volume)
+        return zip(self.timestamp, self.open, self.high, self.low, self.close, self.volume)
+
+    def rows(self) -> List[Dict[str, Any]]:
+        return [dict(zip(RESAMPLE_FIELDS, values)) for values in self.values()]
+
+
+#-----------------------------
+# resampling
+#-----------------------------
+
+def resample_columns(
+    source: CandleColumns,
+    interval_ms: int,
+    closed_before: Optional[int] = None,
+) -> CandleColumns:
+    """
+    Aggregate ascending source candles into interval_ms buckets.
+
+    closed_before: buckets ending after it are dropped (still open).
+    """
+    ts = source.timestamp
+    result = CandleColumns()
+
+    count = len(ts)
+    i = 0
+
+    while i < count:
+        start = align_down(ts[i], interval_ms)
+        end = start + interval_ms
+
+        if closed_before is not None and end > closed_before:
+            break
+
+        # first row of the next bucket (timestamps are sorted)
+        j = bisect_left(ts, end, i)
+
+        result.timestamp.append(start)
+        result.open.append(source.open[i])
+        result.high.append(max(source.high[i:j]))
+        result.low.append(min(source.low[i:j]))
+        result.close.append(source.close[j - 1])
+        result.volume.append(sum(source.volume[i:j]))
+
+        i = j
+
+    return result
+
+
+def resample_rows(
+    rows: Iterable[Mapping[str, Any]],
+    interval_ms: int,
+    closed_before: Optional[int] = None,
+) -> List[Dict[str, Any]]:
+    """
+    resample_columns over candle row mappings (ascending).
+    """
+    return resample_columns(CandleColumns.from_rows(rows), interval_ms, closed_before).rows()
@@ -0,0 +1,17 @@
+# core/mapping/derived_interval_mapping.py
+
+from core.models.enums import Interval
+
+# the only interval fetched from the exchanges for resampled markets
+RESAMPLE_BASE_INTERVAL = Interval.M1
+
+# built from stored RESAMPLE_BASE_INTERVAL candles by the syncer rollup
+# (supported_markets rows with status "derived"), never fetched
+DERIVED_INTERVALS: list[Interval] = [
+    Interval.M5,
+    Interval.M15,
+    Interval.H1,
+    Interval.H4,
+    Interval.D1,
+    Interval.W1,
+]
@@ -14,8 +14,7 @@ SUPPORTED_MARKET_MAPPING = [
     # (Exchange.BINANCE, "ETH/USDT", Interval.M5, MarketType.FUTURES),
 
     # Hyperliquid (FUTURES)
+    # 5m and up are derived from 1m (derived_interval_mapping.py)
     (Exchange.HYPERLIQUID, "BTC/USDC", Interval.M1, MarketType.FUTURES),
-    (Exchange.HYPERLIQUID, "BTC/USDC", Interval.M5, MarketType.FUTURES),
     (Exchange.HYPERLIQUID, "ETH/USDC", Interval.M1, MarketType.FUTURES),
-    (Exchange.HYPERLIQUID, "ETH/USDC", Interval.M5, MarketType.FUTURES),
 ]
@@ -0,0 +1,145 @@
+# core/metadata_document.py
+"""
+Materialized metadata document.
+
+After every base sync the syncer groups all supported markets into the
+exchange -> markets -> intervals document served by the metadata
+endpoint and stores it in Redis under one key. API processes build
+their in-memory metadata snapshot from it (one GET instead of the
+five-table join) and fall back to PostgreSQL when it is missing.
+
+The document is written before the metadata version is bumped, so it
+is never older than the version an API process reads next to it.
+"""
+
+import json
+import logging
+from typing import Dict, List, Optional
+
+from core.redis_client import build_async_redis_client, build_redis_client
+
+logger = logging.getLogger(__name__)
+
+METADATA_DOCUMENT_KEY = "metadata:document"
+
+
+def group_metadata_rows(rows):
+    exchanges = {}
+
+    for row in rows:
+        ex = row['exchange']
+        symbol = row["symbol"]
+        market_type = row["market_type"]
+
+
+        if ex not in exchanges:
+            exchanges[ex] = {}
+
+        key = (symbol, market_type)
+
+        if key not in exchanges[ex]:
+            exchanges[ex][key] = {
+                "symbol" : symbol,
+                "exchange_symbol" : row["exchange_symbol"],
+                "market_type" : market_type,
+                "intervals" : set()
+            }
+        exchanges[ex][key]["intervals"].add(row["interval"])
+
+
+    result = {"exchanges": []}
+
+    for ex_name, markets in exchanges.items():
+        exchange_obj = {
+            "name": ex_name,
+            "markets": []
+        }
+
+        for market in markets.values():  # 👈 کلید tuple دیگه استفاده نمیشه
+            exchange_obj["markets"].append({
+                "symbol": market["symbol"],
+                "exchange_symbol": market["exchange_symbol"],
+                "market_type": market["market_type"],
+                "intervals": sorted(list(market["intervals"]))
+            })
+
+        result["exchanges"].append(exchange_obj)
+
+    return result
+
+
+def flatten_metadata_document(document: Dict) -> List[Dict]:
+    """
+    Back to one row per (exchange, market, interval), the shape of the
+    metadata query rows (without status).
+    """
+    return [
+        {
+            "exchange": exchange["name"],
+            "symbol": market["symbol"],
+            "exchange_symbol": market["exchange_symbol"],
+            "market_type": market["market_type"],
+            "interval": interval,
+        }
+        for exchange in document["exchanges"]
+        for market in exchange["markets"]
+        for interval in market["intervals"]
+    ]
+
+
+def write_metadata_document(document: Dict) -> bool:
+    """
+    Store the document. On failure the old one is dropped (best effort) so
+    readers fall back to PostgreSQL instead of serving stale metadata.
+    """
+    redis_client = build_redis_client()
+
+    try:
+        redis_client.set(METADATA_DOCUMENT_KEY, json.dumps(document, separators=(",", ":")))
+        return True
+    except Exception:
+        logger.exception(
+            "Metadata document write failed",
+            extra={
+                "event": "metadata.document.write_failed",
+                "status": "degraded",
+                "operation": "metadata_document",
+            },
+        )
+
+    try:
+        redis_client.delete(METADATA_DOCUMENT_KEY)
+    except Exception:
+        pass
+
+    return False
+
+
+def read_metadata_document() -> Optional[Dict]:
+    """
+    The materialized document, or None when missing / Redis is unavailable.
+    """
+    try:
+        raw = build_redis_client().get(METADATA_DOCUMENT_KEY)
+    except Exception:
+        return None
+
+    return _decode(raw)
+
+
+async def aread_metadata_document() -> Optional[Dict]:
+    try:
+        raw = await build_async_redis_client().get(METADATA_DOCUMENT_KEY)
+    except Exception:
+        return None
+
+    return _decode(raw)
+
+
+def _decode(raw: Optional[str]) -> Optional[Dict]:
+    if not raw:
+        return None
+    try:
+        return json.loads(raw)
+    except ValueError:
+        return None
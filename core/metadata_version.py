@@ -0,0 +1,101 @@
+# core/metadata_version.py
+"""
+Metadata version signal.
+
+The syncer bumps one Redis counter after every base sync and publishes
+the new value; API processes compare it with the version their
+in-memory metadata snapshots were built from and reload when it changed.
+The channel only makes the change visible sooner: a missed message is
+caught by the version poll.
+"""
+
+import asyncio
+import logging
+from typing import Callable, Optional
+
+from core.redis_client import build_async_redis_client, build_redis_client
+
+logger = logging.getLogger(__name__)
+
+METADATA_VERSION_KEY = "metadata:version"
+METADATA_VERSION_CHANNEL = "metadata:version:changed"
+
+# pause before re-subscribing after the pub/sub connection dropped
+METADATA_LISTEN_RETRY_SECONDS = 5
+
+
+def bump_metadata_version() -> Optional[int]:
+    """
+    Signal that metadata tables changed. Never raises (TTL refresh covers a miss).
+    """
+    try:
+        redis_client = build_redis_client()
+        version = redis_client.incr(METADATA_VERSION_KEY)
+        redis_client.publish(METADATA_VERSION_CHANNEL, version)
+        return version
+    except Exception:
+        logger.exception(
+            "Metadata version bump failed",
+            extra={
+                "event": "metadata.version.bump_failed",
+                "status": "degraded",
+                "operation": "metadata_version",
+            },
+        )
+        return None
+
+
+def read_metadata_version() -> Optional[str]:
+    """
+    Current version, or None when unset / Redis is unavailable.
+    """
+    try:
+        return build_redis_client().get(METADATA_VERSION_KEY)
+    except Exception:
+        return None
+
+
+async def aread_metadata_version() -> Optional[str]:
+    try:
+        return await build_async_redis_client().get(METADATA_VERSION_KEY)
+    except Exception:
+        return None
+
+
+async def alisten_metadata_versions(
+    on_version: Callable[[str], None],
+    retry_seconds: float = METADATA_LISTEN_RETRY_SECONDS,
+) -> None:
+    """
+    Call on_version(version) for every published bump; runs until cancelled
+    and re-subscribes after connection errors.
+    """
+    while True:
+        pubsub = build_async_redis_client().pubsub()
+
+        try:
+            await pubsub.subscribe(METADATA_VERSION_CHANNEL)
+
+            async for message in pubsub.listen():
+                if message.get("type") == "message":
+                    on_version(message["data"])
+
+        except asyncio.CancelledError:
+            raise
+
+        except Exception:
+            logger.exception(
+                "Metadata version listener disconnected",
+                extra={
+                    "event": "metadata.version.listen_failed",
+                    "status": "degraded",
+                    "operation": "metadata_version",
+                },
+            )
+            await asyncio.sleep(retry_seconds)
+
+        finally:
+            try:
+                await pubsub.aclose()
+            except Exception:
+                pass
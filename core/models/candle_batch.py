@@ -0,0 +1,439 @@
+#core/models/candle_batch.py
+"""
+Columnar candle container.
+
+One CandleBatch holds a page of candles for a single
+(exchange, market_type, symbol, interval) as typed arrays:
+
+- timestamps in array('q'), OHLCV in array('d')
+- metadata stored once instead of per row
+- validated column by column: each invariant is one C-level
+  map/any over whole arrays (no per-row tuples); only a page that
+  has a bad row falls back to a row-wise pass that assigns reasons.
+  Bad rows can be quarantined (dropped + reported) instead of
+  failing the whole page
+
+It is also a read-only sequence of Candle: indexing materializes a
+single Candle on demand, and slicing returns another CandleBatch, so
+code written against List[Candle] keeps working.
+"""
+
+from __future__ import annotations
+
+from array import array
+from bisect import bisect_left, bisect_right
+from collections import Counter
+from dataclasses import dataclass, field
+from itertools import compress, repeat
+from math import isfinite
+from operator import ge, gt, le
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Tuple, Union, overload
+
+from core.models.candle import Candle
+from core.models.enums import Exchange, Interval, MarketType
+from core.exceptions import CandleValidationError
+
+# (open_timestamp, close_timestamp, open, high, low, close, volume)
+CandleRow = Tuple[int, int, float, float, float, float, float]
+
+
+#-----------------------------
+# validation reason codes
+#-----------------------------
+
+REASON_UNPARSEABLE = "unparseable"
+REASON_OPEN_TIMESTAMP = "open_timestamp_not_positive"
+REASON_CLOSE_TIMESTAMP = "close_not_after_open"
+REASON_PRICE_NOT_FINITE = "price_not_finite"
+REASON_HIGH_BELOW_BODY = "high_below_open_close"
+REASON_LOW_ABOVE_BODY = "low_above_open_close"
+REASON_VOLUME_NEGATIVE = "volume_negative"
+
+REASON_MESSAGES: Dict[str, str] = {
+    REASON_UNPARSEABLE: "Candle row could not be parsed",
+    REASON_OPEN_TIMESTAMP: "Open timestamp must be positive",
+    REASON_CLOSE_TIMESTAMP: "close timestamp must be after open timestamp",
+    REASON_PRICE_NOT_FINITE: "Candle prices must be finite numbers",
+    REASON_HIGH_BELOW_BODY: "Candle high price is less than open/close price",
+    REASON_LOW_ABOVE_BODY: "Candle low price is greater than open/close price",
+    REASON_VOLUME_NEGATIVE: "Candle volume must be non-negative",
+}
+
+_INF = float("inf")
+
+
+@dataclass(frozen=True)
+class QuarantinedCandle:
+    """
+    A raw row rejected by validation.
+
+    index: position in the exchange response
+    open_timestamp: None when the row could not be parsed
+    """
+    index: int
+    open_timestamp: Optional[int]
+    reason: str
+
+
+@dataclass
+class BatchValidation:
+    """
+    Result of one validation pass.
+
+    mask[i] == 1 -> row i is valid; reasons maps invalid rows to a reason code.
+    """
+    mask: bytearray
+    reasons: Dict[int, str]
+
+    @property
+    def invalid_count(self) -> int:
+        return len(self.reasons)
+
+    @property
+    def is_valid(self) -> bool:
+        return not self.reasons
+
+
+def reason_counts(quarantined: Iterable[QuarantinedCandle]) -> Dict[str, int]:
+    return dict(Counter(q.reason for q in quarantined))
+
+
+def _int_column() -> array:
+    return array("q")
+
+
+def _float_column() -> array:
+    return array("d")
+
+
+@dataclass
+class CandleBatch:
+    exchange: Exchange
+    market_type: MarketType
+    symbol: str
+    interval: Interval
+
+    open_timestamp: array = field(default_factory=_int_column)
+    close_timestamp: array = field(default_factory=_int_column)
+    open: array = field(default_factory=_float_column)
+    high: array = field(default_factory=_float_column)
+    low: array = field(default_factory=_float_column)
+    close: array = field(default_factory=_float_column)
+    volume: array = field(default_factory=_float_column)
+
+    # rows dropped by quarantine(); carried along by slicing / sorting
+    quarantined: List[QuarantinedCandle] = field(default_factory=list)
+
+    #-----------------------------
+    # construction
+    #-----------------------------
+
+    @classmethod
+    def from_rows(
+        cls,
+        rows: Iterable[CandleRow],
+        exchange: Exchange,
+        market_type: MarketType,
+        symbol: str,
+        interval: Interval,
+    ) -> "CandleBatch":
+        batch = cls(exchange, market_type, symbol, interval)
+        for row in rows:
+            batch.append(*row)
+        return batch
+
+    @classmethod
+    def from_candles(cls, candles: Sequence[Candle]) -> "CandleBatch":
+        """
+        Build a batch from canonical candles (all with the same metadata).
+        """
+        if not candles:
+            raise ValueError("Cannot infer batch metadata from an empty candle list")
+
+        first = candles[0]
+        return cls.from_rows(
+            (
+                (c.open_timestamp, c.close_timestamp, c.open, c.high, c.low, c.close, c.volume)
+                for c in candles
+            ),
+            first.exchange,
+            first.market_type,
+            first.symbol,
+            first.interval,
+        )
+
+    def append(
+        self,
+        open_timestamp: int,
+        close_timestamp: int,
+        open: float,
+        high: float,
+        low: float,
+        close: float,
+        volume: float,
+    ) -> None:
+        self.open_timestamp.append(open_timestamp)
+        self.close_timestamp.append(close_timestamp)
+        self.open.append(open)
+        self.high.append(high)
+        self.low.append(low)
+        self.close.append(close)
+        self.volume.append(volume)
+
+    #-----------------------------
+    # sequence protocol
+    #-----------------------------
+
+    def __len__(self) -> int:
+        return len(self.open_timestamp)
+
+    def __bool__(self) -> bool:
+        return len(self.open_timestamp) > 0
+
+    @overload
+    def __getitem__(self, index: int) -> Candle: ...
+
+    @overload
+    def __getitem__(self, index: slice) -> "CandleBatch": ...
+
+    def __getitem__(self, index: Union[int, slice]) -> Union[Candle, "CandleBatch"]:
+        if isinstance(index, slice):
+            return self._take(index)
+
+        return Candle(
+            open_timestamp=self.open_timestamp[index],
+            close_timestamp=self.close_timestamp[index],
+            open=self.open[index],
+            high=self.high[index],
+            low=self.low[index],
+            close=self.close[index],
+            volume=self.volume[index],
+            exchange=self.exchange,
+            market_type=self.market_type,
+            symbol=self.symbol,
+            interval=self.interval,
+        )
+
+    def __iter__(self) -> Iterator[Candle]:
+        for i in range(len(self)):
+            yield self[i]
+
+    def _take(self, index: slice) -> "CandleBatch":
+        # array slicing is a C-level memcpy per column, no per-row objects
+        return CandleBatch(
+            exchange=self.exchange,
+            market_type=self.market_type,
+            symbol=self.symbol,
+            interval=self.interval,
+            open_timestamp=self.open_timestamp[index],
+            close_timestamp=self.close_timestamp[index],
+            open=self.open[index],
+            high=self.high[index],
+            low=self.low[index],
+            close=self.close[index],
+            volume=self.volume[index],
+            quarantined=self.quarantined,
+        )
+
+    def to_candles(self) -> List[Candle]:
+        return list(self)
+
+    def rows(self) -> Iterator[CandleRow]:
+        return zip(
+            self.open_timestamp,
+            self.close_timestamp,
+            self.open,
+            self.high,
+            self.low,
+            self.close,
+            self.volume,
+        )
+
+    #-----------------------------
+    # ordering / selection (timestamps sorted ascending)
+    #-----------------------------
+
+    def is_sorted(self) -> bool:
+        ts = self.open_timestamp
+        return all(ts[i] < ts[i + 1] for i in range(len(ts) - 1))
+
+    def sorted(self) -> "CandleBatch":
+        """
+        Batch ordered by open_timestamp (self when already ordered).
+        """
+        if self.is_sorted():
+            return self
+
+        order = sorted(range(len(self)), key=self.open_timestamp.__getitem__)
+        batch = CandleBatch.from_rows(
+            (
+                (
+                    self.open_timestamp[i], self.close_timestamp[i],
+                    self.open[i], self.high[i], self.low[i], self.close[i],
+                    self.volume[i],
+                )
+                for i in order
+            ),
+            self.exchange,
+            self.market_type,
+            self.symbol,
+            self.interval,
+        )
+        batch.quarantined = self.quarantined
+        return batch
+
+    def after(self, timestamp: Optional[int]) -> "CandleBatch":
+        """
+        Candles with open_timestamp > timestamp (binary search, sorted batch).
+        """
+        if timestamp is None:
+            return self
+        return self[bisect_right(self.open_timestamp, timestamp):]
+
+    def between(self, start: int, end: int) -> "CandleBatch":
+        """
+        Candles with open_timestamp in [start, end) (sorted batch).
+        """
+        ts = self.open_timestamp
+        return self[bisect_left(ts, start):bisect_left(ts, end)]
+
+    #-----------------------------
+    # validation
+    #-----------------------------
+
+    def all_valid(self) -> bool:
+        """
+        True when no row breaks an invariant, checked column-wise.
+
+        Each rule is a map of an operator over whole columns, consumed
+        by all/any in C; the comparisons are written so that NaN fails
+        them (NaN compares False against everything).
+        """
+        prices = (self.open, self.high, self.low, self.close)
+
+        return (
+            all(map(gt, self.open_timestamp, repeat(0)))
+            and all(map(gt, self.close_timestamp, self.open_timestamp))
+            and all(all(map(isfinite, column)) for column in prices)
+            and all(map(ge, self.high, self.open))
+            and all(map(ge, self.high, self.close))
+            and all(map(le, self.low, self.open))
+            and all(map(le, self.low, self.close))
+            and all(map(ge, self.volume, repeat(0.0)))
+        )
+
+    def check(self) -> BatchValidation:
+        """
+        Validity mask and a reason per invalid row.
+
+        Same rules as BaseAdapter._validate_candle; a row gets the
+        first reason it fails. NaN/inf prices are rejected because NaN
+        compares False against everything and would slip through.
+
+        Clean pages (the common case) are settled by all_valid();
+        only a page with a bad row is walked row by row for reasons.
+        """
+        mask = bytearray(b"\x01") * len(self)
+        reasons: Dict[int, str] = {}
+
+        if self.all_valid():
+            return BatchValidation(mask=mask, reasons=reasons)
+
+        rows = enumerate(zip(
+            self.open_timestamp,
+            self.close_timestamp,
+            self.open,
+            self.high,
+            self.low,
+            self.close,
+            self.volume,
+        ))
+
+        for i, (open_ts, close_ts, o, h, l, c, v) in rows:
+            if open_ts <= 0:
+                reason = REASON_OPEN_TIMESTAMP
+            elif close_ts <= open_ts:
+                reason = REASON_CLOSE_TIMESTAMP
+            elif not (-_INF < o < _INF and -_INF < h < _INF and -_INF < l < _INF and -_INF < c < _INF):
+                reason = REASON_PRICE_NOT_FINITE
+            elif h < (o if o > c else c):
+                reason = REASON_HIGH_BELOW_BODY
+            elif l > (o if o < c else c):
+                reason = REASON_LOW_ABOVE_BODY
+            # NaN fails every comparison, so `not v >= 0` also rejects it
+            elif not v >= 0:
+                reason = REASON_VOLUME_NEGATIVE
+            else:
+                continue
+
+            mask[i] = 0
+            reasons[i] = reason
+
+        return BatchValidation(mask=mask, reasons=reasons)
+
+    def find_invalid(self) -> Optional[Tuple[int, str]]:
+        """
+        First (row index, message) that breaks a core invariant, or None.
+        """
+        validation = self.check()
+        if validation.is_valid:
+            return None
+
+        index = min(validation.reasons)
+        return index, REASON_MESSAGES[validation.reasons[index]]
+
+    def validate(self) -> None:
+        """
+        Raise CandleValidationError on the first invalid row.
+        """
+        invalid = self.find_invalid()
+        if invalid is not None:
+            index, reason = invalid
+            raise CandleValidationError(f"{reason} (row {index})")
+
+    def compress(self, mask: Sequence[int]) -> "CandleBatch":
+        """
+        Keep only rows whose mask entry is truthy.
+        """
+        def keep(column: array) -> array:
+            return array(column.typecode, compress(column, mask))
+
+        return CandleBatch(
+            exchange=self.exchange,
+            market_type=self.market_type,
+            symbol=self.symbol,
+            interval=self.interval,
+            open_timestamp=keep(self.open_timestamp),
+            close_timestamp=keep(self.close_timestamp),
+            open=keep(self.open),
+            high=keep(self.high),
+            low=keep(self.low),
+            close=keep(self.close),
+            volume=keep(self.volume),
+            quarantined=list(self.quarantined),
+        )
+
+    def quarantine(
+        self,
+        source_index: Optional[Sequence[int]] = None,
+    ) -> "CandleBatch":
+        """
+        Drop invalid rows and record them in `quarantined`.
+
+        source_index maps batch rows back to positions in the raw
+        exchange response (defaults to the batch position).
+        """
+        validation = self.check()
+        if validation.is_valid:
+            return self
+
+        clean = self.compress(validation.mask)
+        clean.quarantined.extend(
+            QuarantinedCandle(
+                index=source_index[i] if source_index is not None else i,
+                open_timestamp=self.open_timestamp[i],
+                reason=reason,
+            )
+            for i, reason in sorted(validation.reasons.items())
+        )
+        return clean
@@ -21,3 +21,8 @@ class Interval(Enum):
 class ExchangeStatus(Enum):
     ACTIVE = "active"
     UNSUPPORTED = "unsupported"
+
+class SupportedMarketStatus(Enum):
+    ACTIVE = "active"        # fetched from the exchange
+    INACTIVE = "inactive"
+    DERIVED = "derived"      # resampled from the base interval by the rollup
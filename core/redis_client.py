@@ -4,6 +4,8 @@ import os
 from functools import lru_cache
 
 import redis
+import redis.asyncio
+
 
 @lru_cache(maxsize=1)
 def build_redis_client() -> redis.Redis:
@@ -12,4 +14,26 @@ def build_redis_client() -> redis.Redis:
         port=int(os.getenv("REDIS_PORT", "6379")),
         db=int(os.getenv("REDIS_DB", "0")),
         decode_responses=True,
-    )
\ No newline at end of file
+    )
+
+
+@lru_cache(maxsize=1)
+def build_async_redis_client() -> redis.asyncio.Redis:
+    """
+    Non-blocking client for async request paths.
+
+    Connections belong to the event loop that opened them, so close it
+    with aclose_async_redis_client() before that loop stops.
+    """
+    return redis.asyncio.Redis(
+        host=os.getenv("REDIS_HOST", "localhost"),
+        port=int(os.getenv("REDIS_PORT", "6379")),
+        db=int(os.getenv("REDIS_DB", "0")),
+        decode_responses=True,
+    )
+
+
+async def aclose_async_redis_client() -> None:
+    if build_async_redis_client.cache_info().currsize:
+        await build_async_redis_client().aclose()
+        build_async_redis_client.cache_clear()
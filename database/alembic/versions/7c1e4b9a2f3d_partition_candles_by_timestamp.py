@@ -0,0 +1,132 @@
+"""partition candles by timestamp
+
+Revision ID: 7c1e4b9a2f3d
+Revises: 02823f40446b
+Create Date: 2026-10-18 09:00:00.000000
+
+candles becomes a RANGE (timestamp) partitioned table with one partition
+per UTC month (database/candle_partitions.py) and a default partition.
+Existing rows are copied into the new table; the primary key becomes
+(id, timestamp) because every unique constraint of a partitioned table
+must contain the partition key.
+
+"""
+import time
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+from database.candle_partitions import (
+    CANDLE_PARTITIONS_AHEAD_MONTHS,
+    CANDLES_DEFAULT_PARTITION,
+    add_months,
+    month_bounds_ms,
+    month_of,
+    months_between,
+    partition_name,
+)
+
+
+# revision identifiers, used by Alembic.
+revision: str = '7c1e4b9a2f3d'
+down_revision: Union[str, Sequence[str], None] = '02823f40446b'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    bind = op.get_bind()
+
+    op.rename_table('candles', 'candles_unpartitioned')
+    op.execute('ALTER INDEX candles_pkey RENAME TO candles_unpartitioned_pkey')
+    op.execute(
+        'ALTER TABLE candles_unpartitioned '
+        'RENAME CONSTRAINT uq_candle_market_interval_ts TO uq_candle_market_interval_ts_unpartitioned'
+    )
+
+    op.execute("""
+        CREATE TABLE candles (
+            id BIGINT NOT NULL DEFAULT nextval('candles_id_seq'),
+            exchange_market_id INTEGER NOT NULL REFERENCES exchange_markets (id),
+            interval_id INTEGER NOT NULL REFERENCES intervals (id),
+            timestamp BIGINT NOT NULL,
+            open DOUBLE PRECISION NOT NULL,
+            high DOUBLE PRECISION NOT NULL,
+            low DOUBLE PRECISION NOT NULL,
+            close DOUBLE PRECISION NOT NULL,
+            volume DOUBLE PRECISION NOT NULL,
+            created_at TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT now(),
+            CONSTRAINT candles_pkey PRIMARY KEY (id, timestamp),
+            CONSTRAINT uq_candle_market_interval_ts
+                UNIQUE (exchange_market_id, interval_id, timestamp)
+        ) PARTITION BY RANGE (timestamp)
+    """)
+    op.execute('ALTER SEQUENCE candles_id_seq OWNED BY candles.id')
+    op.execute(f'CREATE TABLE {CANDLES_DEFAULT_PARTITION} PARTITION OF candles DEFAULT')
+
+    # monthly partitions from the oldest stored candle up to a few months ahead
+    now_ms = int(time.time() * 1000)
+    oldest = bind.execute(sa.text('SELECT min(timestamp) FROM candles_unpartitioned')).scalar()
+    _, end = month_bounds_ms(add_months(month_of(now_ms), CANDLE_PARTITIONS_AHEAD_MONTHS))
+
+    for month in months_between(oldest if oldest is not None else now_ms, end):
+        start_ms, end_ms = month_bounds_ms(month)
+        op.execute(
+            f'CREATE TABLE {partition_name(month)} PARTITION OF candles '
+            f'FOR VALUES FROM ({start_ms}) TO ({end_ms})'
+        )
+
+    op.execute("""
+        INSERT INTO candles (
+            id, exchange_market_id, interval_id, timestamp,
+            open, high, low, close, volume, created_at
+        )
+        SELECT
+            id, exchange_market_id, interval_id, timestamp,
+            open, high, low, close, volume, created_at
+        FROM candles_unpartitioned
+    """)
+    op.drop_table('candles_unpartitioned')
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.rename_table('candles', 'candles_partitioned')
+    op.execute('ALTER INDEX candles_pkey RENAME TO candles_partitioned_pkey')
+    op.execute(
+        'ALTER TABLE candles_partitioned '
+        'RENAME CONSTRAINT uq_candle_market_interval_ts TO uq_candle_market_interval_ts_partitioned'
+    )
+
+    op.create_table('candles',
+    sa.Column('id', sa.BigInteger(), server_default=sa.text("nextval('candles_id_seq')"), nullable=False),
+    sa.Column('exchange_market_id', sa.Integer(), nullable=False),
+    sa.Column('interval_id', sa.Integer(), nullable=False),
+    sa.Column('timestamp', sa.BigInteger(), nullable=False),
+    sa.Column('open', sa.Float(), nullable=False),
+    sa.Column('high', sa.Float(), nullable=False),
+    sa.Column('low', sa.Float(), nullable=False),
+    sa.Column('close', sa.Float(), nullable=False),
+    sa.Column('volume', sa.Float(), nullable=False),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+    sa.ForeignKeyConstraint(['exchange_market_id'], ['exchange_markets.id'], ),
+    sa.ForeignKeyConstraint(['interval_id'], ['intervals.id'], ),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('exchange_market_id', 'interval_id', 'timestamp', name='uq_candle_market_interval_ts')
+    )
+    op.execute('ALTER SEQUENCE candles_id_seq OWNED BY candles.id')
+
+    op.execute("""
+        INSERT INTO candles (
+            id, exchange_market_id, interval_id, timestamp,
+            open, high, low, close, volume, created_at
+        )
+        SELECT
+            id, exchange_market_id, interval_id, timestamp,
+            open, high, low, close, volume, created_at
+        FROM candles_partitioned
+    """)
+    # drops every partition with it
+    op.drop_table('candles_partitioned')
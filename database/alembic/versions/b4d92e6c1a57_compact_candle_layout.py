@@ -0,0 +1,76 @@
+"""compact candle layout
+
+Revision ID: b4d92e6c1a57
+Revises: 7c1e4b9a2f3d
+Create Date: 2026-10-18 10:00:00.000000
+
+Applies the compact candle layout when CANDLE_STORAGE_LAYOUT=compact
+(database/candle_layout.py); a no-op for the standard layout.
+
+compact: drop the surrogate id and created_at, make
+(exchange_market_id, interval_id, timestamp) the primary key (it replaces
+uq_candle_market_interval_ts) and add a BRIN index on timestamp.
+
+Dropped columns only free space once rows are rewritten: run
+VACUUM FULL (or pg_repack) per partition afterwards.
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+from database.candle_layout import (
+    CANDLE_LAYOUT_COMPACT,
+    CANDLE_PRIMARY_KEY,
+    CANDLE_STORAGE_LAYOUT,
+    CANDLE_TIMESTAMP_BRIN_INDEX,
+    CANDLE_UNIQUE_CONSTRAINT,
+)
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b4d92e6c1a57'
+down_revision: Union[str, Sequence[str], None] = '7c1e4b9a2f3d'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    if CANDLE_STORAGE_LAYOUT != CANDLE_LAYOUT_COMPACT:
+        return
+
+    op.execute(f'ALTER TABLE candles DROP CONSTRAINT {CANDLE_PRIMARY_KEY}')
+    op.execute(f'ALTER TABLE candles DROP CONSTRAINT {CANDLE_UNIQUE_CONSTRAINT}')
+    op.execute(
+        f'ALTER TABLE candles ADD CONSTRAINT {CANDLE_PRIMARY_KEY} '
+        f'PRIMARY KEY (exchange_market_id, interval_id, timestamp)'
+    )
+    # drops candles_id_seq with it (owned by the column)
+    op.execute('ALTER TABLE candles DROP COLUMN id, DROP COLUMN created_at')
+    op.execute(
+        f'CREATE INDEX {CANDLE_TIMESTAMP_BRIN_INDEX} ON candles USING brin (timestamp)'
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    if CANDLE_STORAGE_LAYOUT != CANDLE_LAYOUT_COMPACT:
+        return
+
+    op.execute(f'DROP INDEX {CANDLE_TIMESTAMP_BRIN_INDEX}')
+    op.execute('CREATE SEQUENCE candles_id_seq')
+    op.execute(
+        "ALTER TABLE candles "
+        "ADD COLUMN id BIGINT NOT NULL DEFAULT nextval('candles_id_seq'), "
+        "ADD COLUMN created_at TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT now()"
+    )
+    op.execute('ALTER SEQUENCE candles_id_seq OWNED BY candles.id')
+    op.execute(f'ALTER TABLE candles DROP CONSTRAINT {CANDLE_PRIMARY_KEY}')
+    op.execute(
+        f'ALTER TABLE candles ADD CONSTRAINT {CANDLE_PRIMARY_KEY} PRIMARY KEY (id, timestamp)'
+    )
+    op.execute(
+        f'ALTER TABLE candles ADD CONSTRAINT {CANDLE_UNIQUE_CONSTRAINT} '
+        f'UNIQUE (exchange_market_id, interval_id, timestamp)'
+    )
@@ -0,0 +1,71 @@
+# database/async_session.py
+import os
+from contextlib import asynccontextmanager
+from functools import lru_cache
+
+from dotenv import load_dotenv
+from sqlalchemy.ext.asyncio import AsyncEngine, async_sessionmaker, create_async_engine
+
+load_dotenv()
+
+# pool for the async (asyncpg) request path of the API service
+ASYNC_DB_POOL_SIZE = int(os.getenv("ASYNC_DB_POOL_SIZE", "10"))
+ASYNC_DB_MAX_OVERFLOW = int(os.getenv("ASYNC_DB_MAX_OVERFLOW", "10"))
+ASYNC_DB_POOL_TIMEOUT_SECONDS = float(os.getenv("ASYNC_DB_POOL_TIMEOUT_SECONDS", "5"))
+
+
+def build_async_database_url():
+    return (
+        f"postgresql+asyncpg://"
+        f"{os.getenv('POSTGRES_USER')}:"
+        f"{os.getenv('POSTGRES_PASSWORD')}@"
+        f"{os.getenv('POSTGRES_HOST', 'localhost')}:"
+        f"{os.getenv('POSTGRES_PORT')}/"
+        f"{os.getenv('POSTGRES_DB')}"
+    )
+
+
+#engin (lazy: asyncpg is only installed for the API service)
+@lru_cache(maxsize=1)
+def get_async_engine() -> AsyncEngine:
+    return create_async_engine(
+        build_async_database_url(),
+        echo=os.getenv("SQL_ECHO", "false").lower() == "true",
+        pool_size=ASYNC_DB_POOL_SIZE,
+        max_overflow=ASYNC_DB_MAX_OVERFLOW,
+        pool_timeout=ASYNC_DB_POOL_TIMEOUT_SECONDS,
+        pool_pre_ping=True,
+    )
+
+
+#Session Facotry
+@lru_cache(maxsize=1)
+def get_async_sessionmaker() -> async_sessionmaker:
+    return async_sessionmaker(
+        bind=get_async_engine(),
+        autoflush=False,
+        expire_on_commit=False,
+    )
+
+
+@asynccontextmanager
+async def get_async_session():
+    session = get_async_sessionmaker()()
+    try:
+        yield session
+        await session.commit()
+    except:
+        await session.rollback()
+        raise
+    finally:
+        await session.close()
+
+
+async def dispose_async_engine() -> None:
+    """
+    Close pooled connections (call on shutdown of the event loop).
+    """
+    if get_async_engine.cache_info().currsize:
+        await get_async_engine().dispose()
+        get_async_sessionmaker.cache_clear()
+        get_async_engine.cache_clear()
@@ -0,0 +1,191 @@
+# database/candle_archive.py
+"""
+Cold tier for old candles: one Parquet file per series and UTC month.
+
+    {CANDLE_ARCHIVE_DIR}/{exchange_market_id}/{interval_id}/2024-03.parquet
+    {CANDLE_ARCHIVE_DIR}/{exchange_market_id}/{interval_id}/boundary.json
+
+boundary.json holds `archived_before`: every candle of the series older
+than it is in the Parquet files (and removed from PostgreSQL by the
+archive job). Readers combine archive rows below the boundary with DB
+rows; rows written to the DB below the boundary later (backfill) are
+folded into the files by the next archive run.
+
+Needs pyarrow (optional dependency, ARCHIVE_AVAILABLE).
+"""
+
+import importlib.util
+import json
+import os
+from typing import Dict, List, Mapping, Optional, Sequence
+
+from database.candle_partitions import Month, month_bounds_ms
+
+ARCHIVE_AVAILABLE = importlib.util.find_spec("pyarrow") is not None
+
+# empty -> archive disabled
+CANDLE_ARCHIVE_DIR = os.getenv("CANDLE_ARCHIVE_DIR", "")
+# candles older than this (rounded down to a month start) are archived
+CANDLE_ARCHIVE_AFTER_DAYS = int(os.getenv("CANDLE_ARCHIVE_AFTER_DAYS", "365"))
+CANDLE_ARCHIVE_COMPRESSION = os.getenv("CANDLE_ARCHIVE_COMPRESSION", "zstd")
+
+ARCHIVE_COLUMNS = ("timestamp", "open", "high", "low", "close", "volume")
+BOUNDARY_FILE = "boundary.json"
+
+
+class CandleArchive:
+    """
+    Parquet files of one archive root. Writes are atomic (temp file +
+    rename), so readers never see a partially written month.
+    """
+
+    def __init__(self, root: str, compression: str = CANDLE_ARCHIVE_COMPRESSION) -> None:
+        self.root = root
+        self.compression = compression
+
+    # ---------------- layout ----------------
+
+    def series_dir(self, exchange_market_id: int, interval_id: int) -> str:
+        return os.path.join(self.root, str(exchange_market_id), str(interval_id))
+
+    def month_path(self, exchange_market_id: int, interval_id: int, month: Month) -> str:
+        return os.path.join(
+            self.series_dir(exchange_market_id, interval_id),
+            f"{month[0]:04d}-{month[1]:02d}.parquet",
+        )
+
+    def months(self, exchange_market_id: int, interval_id: int) -> List[Month]:
+        try:
+            names = os.listdir(self.series_dir(exchange_market_id, interval_id))
+        except FileNotFoundError:
+            return []
+
+        months = []
+        for name in names:
+            if name.endswith(".parquet"):
+                year, month = name[:-len(".parquet")].split("-")
+                months.append((int(year), int(month)))
+
+        return sorted(months)
+
+    # ---------------- boundary ----------------
+
+    def boundary(self, exchange_market_id: int, interval_id: int) -> Optional[int]:
+        """
+        Open time below which the series is served from the archive, or None.
+        """
+        path = os.path.join(self.series_dir(exchange_market_id, interval_id), BOUNDARY_FILE)
+
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                return int(json.load(f)["archived_before"])
+        except FileNotFoundError:
+            return None
+
+    def set_boundary(self, exchange_market_id: int, interval_id: int, archived_before: int) -> None:
+        current = self.boundary(exchange_market_id, interval_id)
+        if current is not None and current >= archived_before:
+            return
+
+        path = os.path.join(self.series_dir(exchange_market_id, interval_id), BOUNDARY_FILE)
+        self._replace(path, json.dumps({"archived_before": archived_before}).encode("utf-8"))
+
+    # ---------------- write ----------------
+
+    def write_month(
+        self,
+        exchange_market_id: int,
+        interval_id: int,
+        month: Month,
+        rows: Sequence[Mapping],
+    ) -> int:
+        """
+        Merge rows into the month file (rows win over archived ones with
+        the same timestamp). Returns the row count of the file.
+        """
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        path = self.month_path(exchange_market_id, interval_id, month)
+
+        merged: Dict[int, Mapping] = {}
+        if os.path.exists(path):
+            merged.update((row["timestamp"], row) for row in pq.read_table(path).to_pylist())
+        merged.update((row["timestamp"], row) for row in rows)
+
+        ordered = [merged[ts] for ts in sorted(merged)]
+        table = pa.table({
+            "timestamp": pa.array([row["timestamp"] for row in ordered], pa.int64()),
+            **{
+                column: pa.array([row[column] for row in ordered], pa.float64())
+                for column in ARCHIVE_COLUMNS[1:]
+            },
+        })
+
+        buffer = pa.BufferOutputStream()
+        pq.write_table(table, buffer, compression=self.compression)
+        # durable before the job deletes the rows from PostgreSQL
+        self._replace(path, buffer.getvalue().to_pybytes())
+
+        return len(ordered)
+
+    # ---------------- read ----------------
+
+    def read_range(
+        self,
+        exchange_market_id: int,
+        interval_id: int,
+        start: Optional[int] = None,
+        end: Optional[int] = None,
+        limit: Optional[int] = None,
+        descending: bool = False,
+    ) -> List[Dict]:
+        """
+        Archived candles with start <= timestamp < end (None = unbounded),
+        ascending or descending, at most `limit` rows. Only the month
+        files overlapping the range are opened.
+        """
+        import pyarrow.parquet as pq
+
+        months = [
+            month for month in self.months(exchange_market_id, interval_id)
+            if (start is None or month_bounds_ms(month)[1] > start)
+            and (end is None or month_bounds_ms(month)[0] < end)
+        ]
+        if descending:
+            months.reverse()
+
+        filters = []
+        if start is not None:
+            filters.append(("timestamp", ">=", start))
+        if end is not None:
+            filters.append(("timestamp", "<", end))
+
+        rows: List[Dict] = []
+
+        for month in months:
+            table = pq.read_table(
+                self.month_path(exchange_market_id, interval_id, month),
+                columns=list(ARCHIVE_COLUMNS),
+                filters=filters or None,
+            )
+            month_rows = table.to_pylist()
+            rows.extend(reversed(month_rows) if descending else month_rows)
+
+            if limit is not None and len(rows) >= limit:
+                return rows[:limit]
+
+        return rows
+
+    # ---------------- helpers ----------------
+
+    def _replace(self, path: str, data: bytes) -> None:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f"{path}.tmp"
+
+        with open(tmp_path, "wb") as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+
+        os.replace(tmp_path, path)
@@ -0,0 +1,37 @@
+# database/candle_layout.py
+"""
+Candle storage layout, chosen per deployment (CANDLE_STORAGE_LAYOUT).
+
+standard: surrogate id + created_at, primary key (id, timestamp) and the
+          unique constraint uq_candle_market_interval_ts
+compact:  natural primary key (exchange_market_id, interval_id,
+          timestamp), no id / created_at, BRIN index on timestamp;
+          ~20 bytes less per row and one B-tree fewer
+
+The models, the ON CONFLICT writers and the migration all read the same
+setting, so it must match the layout the migration produced.
+"""
+
+import os
+
+CANDLE_LAYOUT_STANDARD = "standard"
+CANDLE_LAYOUT_COMPACT = "compact"
+
+CANDLE_STORAGE_LAYOUT = os.getenv("CANDLE_STORAGE_LAYOUT", CANDLE_LAYOUT_STANDARD)
+
+if CANDLE_STORAGE_LAYOUT not in (CANDLE_LAYOUT_STANDARD, CANDLE_LAYOUT_COMPACT):
+    raise ValueError(f"Unsupported candle storage layout: {CANDLE_STORAGE_LAYOUT}")
+
+CANDLE_PRIMARY_KEY = "candles_pkey"
+CANDLE_UNIQUE_CONSTRAINT = "uq_candle_market_interval_ts"
+CANDLE_TIMESTAMP_BRIN_INDEX = "ix_candles_timestamp_brin"
+
+
+def candle_conflict_constraint(layout: str = CANDLE_STORAGE_LAYOUT) -> str:
+    """
+    Constraint on (exchange_market_id, interval_id, timestamp) used by
+    INSERT ... ON CONFLICT.
+    """
+    if layout == CANDLE_LAYOUT_COMPACT:
+        return CANDLE_PRIMARY_KEY
+    return CANDLE_UNIQUE_CONSTRAINT
@@ -0,0 +1,188 @@
+# database/candle_partitions.py
+"""
+Monthly range partitions of the candles table.
+
+candles is partitioned by RANGE (timestamp) (epoch ms, UTC months):
+
+    candles_p2026_01   [2026-01-01, 2026-02-01)
+    candles_p2026_02   ...
+    candles_default    everything without a monthly partition
+
+Queries on (exchange_market_id, interval_id, timestamp range) are pruned
+to the partitions covering the range (plan time for literals, execution
+time for bind parameters); "latest N" reads scan partitions newest first
+and stop early.
+
+Partitions are created ahead of time by the syncer. Rows that landed in
+the default partition are moved into the monthly partition when it is
+created, so the default partition stays small.
+"""
+
+import logging
+import os
+import time
+from datetime import datetime, timezone
+from typing import Iterator, List, Optional, Set, Tuple
+
+from sqlalchemy import text
+
+logger = logging.getLogger(__name__)
+
+CANDLES_TABLE = "candles"
+CANDLES_DEFAULT_PARTITION = "candles_default"
+
+# months created ahead of the current one
+CANDLE_PARTITIONS_AHEAD_MONTHS = int(os.getenv("CANDLE_PARTITIONS_AHEAD_MONTHS", "3"))
+# months kept covered behind the current one (gap repair, late candles)
+CANDLE_PARTITIONS_BACK_MONTHS = int(os.getenv("CANDLE_PARTITIONS_BACK_MONTHS", "1"))
+
+IS_PARTITIONED_QUERY = text("""
+    select 1
+    from pg_partitioned_table pt
+    join pg_class c on c.oid = pt.partrelid
+    where c.relname = :table
+""")
+
+PARTITIONS_QUERY = text("""
+    select c.relname
+    from pg_inherits i
+    join pg_class c on c.oid = i.inhrelid
+    join pg_class p on p.oid = i.inhparent
+    where p.relname = :table
+""")
+
+Month = Tuple[int, int]
+
+
+# -------------------------
+# month arithmetic
+# -------------------------
+
+def month_of(timestamp_ms: int) -> Month:
+    moment = datetime.fromtimestamp(timestamp_ms / 1000, tz=timezone.utc)
+    return moment.year, moment.month
+
+
+def add_months(month: Month, count: int) -> Month:
+    index = month[0] * 12 + (month[1] - 1) + count
+    return index // 12, index % 12 + 1
+
+
+def month_bounds_ms(month: Month) -> Tuple[int, int]:
+    """
+    [start, end) of a UTC month in epoch ms.
+    """
+    start = datetime(month[0], month[1], 1, tzinfo=timezone.utc)
+    end_year, end_month = add_months(month, 1)
+    end = datetime(end_year, end_month, 1, tzinfo=timezone.utc)
+
+    return int(start.timestamp() * 1000), int(end.timestamp() * 1000)
+
+
+def months_between(start_ms: int, end_ms: int) -> Iterator[Month]:
+    """
+    Every month overlapping [start_ms, end_ms).
+    """
+    month = month_of(start_ms)
+    last = month_of(max(start_ms, end_ms - 1))
+
+    while month <= last:
+        yield month
+        month = add_months(month, 1)
+
+
+def partition_name(month: Month) -> str:
+    return f"{CANDLES_TABLE}_p{month[0]:04d}_{month[1]:02d}"
+
+
+# -------------------------
+# DDL
+# -------------------------
+
+def is_partitioned(session) -> bool:
+    return session.execute(IS_PARTITIONED_QUERY, {"table": CANDLES_TABLE}).first() is not None
+
+
+def existing_partitions(session) -> Set[str]:
+    rows = session.execute(PARTITIONS_QUERY, {"table": CANDLES_TABLE}).all()
+    return {row[0] for row in rows}
+
+
+def create_month_partition(session, month: Month) -> None:
+    """
+    Create and attach one monthly partition, moving the rows of that
+    month out of the default partition first (ATTACH fails otherwise).
+    """
+    name = partition_name(month)
+    start, end = month_bounds_ms(month)
+    bounds = {"start": start, "end": end}
+
+    session.execute(text(
+        f"create table {name} (like {CANDLES_TABLE} including defaults including constraints)"
+    ))
+    session.execute(text(
+        f"insert into {name} select * from {CANDLES_DEFAULT_PARTITION} "
+        f"where timestamp >= :start and timestamp < :end"
+    ), bounds)
+    session.execute(text(
+        f"delete from {CANDLES_DEFAULT_PARTITION} "
+        f"where timestamp >= :start and timestamp < :end"
+    ), bounds)
+    session.execute(text(
+        f"alter table {CANDLES_TABLE} attach partition {name} "
+        f"for values from ({start}) to ({end})"
+    ))
+
+
+def ensure_candle_partitions(session, start_ms: int, end_ms: int) -> List[str]:
+    """
+    Create the missing monthly partitions for [start_ms, end_ms); one
+    commit per partition. No-op while candles is not partitioned.
+    Returns the created partition names.
+    """
+    if not is_partitioned(session):
+        return []
+
+    existing = existing_partitions(session)
+    created: List[str] = []
+
+    for month in months_between(start_ms, end_ms):
+        name = partition_name(month)
+        if name in existing:
+            continue
+
+        create_month_partition(session, month)
+        session.commit()
+        created.append(name)
+
+        logger.info(
+            "Candle partition created",
+            extra={
+                "service": "syncer-service",
+                "event": "syncer.partitions.created",
+                "status": "success",
+                "operation": "candle_partitions",
+                "partition": name,
+            },
+        )
+
+    return created
+
+
+def maintain_candle_partitions(
+    session,
+    now_ms: Optional[int] = None,
+    back_months: int = CANDLE_PARTITIONS_BACK_MONTHS,
+    ahead_months: int = CANDLE_PARTITIONS_AHEAD_MONTHS,
+) -> List[str]:
+    """
+    Keep the months around now covered: back_months behind, ahead_months ahead.
+    """
+    if now_ms is None:
+        now_ms = int(time.time() * 1000)
+
+    current = month_of(now_ms)
+    start, _ = month_bounds_ms(add_months(current, -back_months))
+    _, end = month_bounds_ms(add_months(current, ahead_months))
+
+    return ensure_candle_partitions(session, start, end)
@@ -7,8 +7,17 @@ from sqlalchemy import (
     Float,
     DateTime,
     func,
+    Index,
+    PrimaryKeyConstraint,
     UniqueConstraint)
 from sqlalchemy.orm import relationship
+from database.candle_layout import (
+    CANDLE_LAYOUT_COMPACT,
+    CANDLE_PRIMARY_KEY,
+    CANDLE_STORAGE_LAYOUT,
+    CANDLE_TIMESTAMP_BRIN_INDEX,
+    CANDLE_UNIQUE_CONSTRAINT,
+)
 from database.session import Base
  
 #-------------------------------------------------------------------------
@@ -114,7 +123,10 @@ class SupportedMarket(Base):
 class Candle(Base):
     __tablename__ = "candles"
 
-    id = Column(BigInteger, primary_key=True, autoincrement=True)
+    # partitioned by month on timestamp (database/candle_partitions.py);
+    # columns / keys depend on the storage layout (database/candle_layout.py)
+    if CANDLE_STORAGE_LAYOUT != CANDLE_LAYOUT_COMPACT:
+        id = Column(BigInteger, autoincrement=True)
     
     exchange_market_id = Column(
         Integer, ForeignKey("exchange_markets.id"), nullable=False
@@ -131,11 +143,12 @@ class Candle(Base):
     close = Column(Float, nullable=False)
     volume = Column(Float, nullable=False)
 
-    created_at = Column(
-        DateTime(timezone=True),
-        server_default=func.now(),
-        nullable=False,
-    )
+    if CANDLE_STORAGE_LAYOUT != CANDLE_LAYOUT_COMPACT:
+        created_at = Column(
+            DateTime(timezone=True),
+            server_default=func.now(),
+            nullable=False,
+        )
 
     # ORM relationships (read-only usage)
     exchange_market = relationship(
@@ -150,12 +163,27 @@ class Candle(Base):
         lazy="noload",
     )
 
-    __table_args__ = (
-        UniqueConstraint(
-            "exchange_market_id",
-            "interval_id",
-            "timestamp",
-            name="uq_candle_market_interval_ts",
-        ),
-    )
+    if CANDLE_STORAGE_LAYOUT == CANDLE_LAYOUT_COMPACT:
+        __table_args__ = (
+            PrimaryKeyConstraint(
+                "exchange_market_id",
+                "interval_id",
+                "timestamp",
+                name=CANDLE_PRIMARY_KEY,
+            ),
+            Index(CANDLE_TIMESTAMP_BRIN_INDEX, "timestamp", postgresql_using="brin"),
+            {"postgresql_partition_by": "RANGE (timestamp)"},
+        )
+    else:
+        # the primary key has to include the partition key
+        __table_args__ = (
+            PrimaryKeyConstraint("id", "timestamp", name=CANDLE_PRIMARY_KEY),
+            UniqueConstraint(
+                "exchange_market_id",
+                "interval_id",
+                "timestamp",
+                name=CANDLE_UNIQUE_CONSTRAINT,
+            ),
+            {"postgresql_partition_by": "RANGE (timestamp)"},
+        )
 #------------------------------------------------
@@ -0,0 +1,79 @@
+# syncer_service/syncer/backfill/checkpoint.py
+
+from __future__ import annotations
+
+import logging
+from typing import Iterable, Set
+
+from core.redis_client import build_redis_client
+from syncer_service.syncer.backfill.types import BackfillWindow
+from syncer_service.syncer.ingestion.types import IngestionUnit
+
+logger = logging.getLogger(__name__)
+
+BACKFILL_CHECKPOINT_TTL_SECONDS = 7 * 24 * 60 * 60
+
+
+def build_backfill_checkpoint_key(unit: IngestionUnit, start: int, end: int) -> str:
+    return (
+        "backfill:checkpoint:"
+        f"{unit.exchange_name}:"
+        f"{unit.market_type}:"
+        f"{unit.canonical_symbol}:"
+        f"{unit.interval}:"
+        f"{start}:{end}"
+    )
+
+
+class RedisBackfillCheckpoint:
+    """
+    Tracks which windows of one backfill job are already persisted.
+
+    Stored as a Redis SET of window start timestamps, so a re-run of the
+    same [start, end) job resumes where the previous one stopped.
+    Redis is not the source of truth: losing a checkpoint only means
+    re-fetching windows, which is safe because persistence is idempotent.
+    """
+
+    def __init__(self, unit: IngestionUnit, start: int, end: int):
+        self.key = build_backfill_checkpoint_key(unit, start, end)
+        self.redis = build_redis_client()
+
+    def completed(self) -> Set[int]:
+        try:
+            return {int(member) for member in self.redis.smembers(self.key)}
+        except Exception:
+            logger.exception(
+                "Backfill checkpoint read failed",
+                extra={
+                    "service": "syncer-service",
+                    "event": "syncer.backfill.checkpoint_read_failed",
+                    "status": "degraded",
+                    "operation": "backfill",
+                    "checkpoint_key": self.key,
+                },
+            )
+            return set()
+
+    def mark_done(self, windows: Iterable[BackfillWindow]) -> None:
+        members = [window.start for window in windows]
+
+        if not members:
+            return
+
+        try:
+            pipe = self.redis.pipeline()
+            pipe.sadd(self.key, *members)
+            pipe.expire(self.key, BACKFILL_CHECKPOINT_TTL_SECONDS)
+            pipe.execute()
+        except Exception:
+            logger.exception(
+                "Backfill checkpoint write failed",
+                extra={
+                    "service": "syncer-service",
+                    "event": "syncer.backfill.checkpoint_write_failed",
+                    "status": "degraded",
+                    "operation": "backfill",
+                    "checkpoint_key": self.key,
+                },
+            )
@@ -0,0 +1,279 @@
+# syncer_service/syncer/backfill/engine.py
+
+from __future__ import annotations
+
+import logging
+import os
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import Callable, Dict, List, Optional
+
+from core.candle_cache import invalidate_recent_candles
+from database.session import get_session
+
+from syncer_service.syncer.adapters.registry import ADAPTER_REGISTRY
+from syncer_service.syncer.backfill.checkpoint import RedisBackfillCheckpoint
+from syncer_service.syncer.backfill.types import BackfillResult, BackfillWindow
+from syncer_service.syncer.ingestion.fetch import fetch_candles_range_for_unit
+from syncer_service.syncer.ingestion.persistence import (
+    CandleValues,
+    map_candles_to_values,
+    write_candles,
+)
+from syncer_service.syncer.ingestion.logging import log_quarantined_candles
+from syncer_service.syncer.ingestion.rollup import rewind_rollup_watermark
+from syncer_service.syncer.ingestion.types import FetchResult, IngestionUnit
+
+logger = logging.getLogger(__name__)
+
+BACKFILL_MAX_WORKERS = int(os.getenv("BACKFILL_MAX_WORKERS", "4"))
+BACKFILL_BATCH_ROWS = int(os.getenv("BACKFILL_BATCH_ROWS", "50000"))
+
+
+# -------------------------------------------------
+# planning
+# -------------------------------------------------
+
+def closed_candle_boundary(interval_ms: int, now_ms: Optional[int] = None) -> int:
+    """
+    Open time of the currently open candle.
+
+    Every candle with open time < boundary is closed.
+    """
+    if now_ms is None:
+        now_ms = int(time.time() * 1000)
+
+    return now_ms - (now_ms % interval_ms)
+
+
+def plan_backfill_windows(
+    start: int,
+    end: int,
+    interval_ms: int,
+    page_size: int,
+    now_ms: Optional[int] = None,
+) -> List[BackfillWindow]:
+    """
+    Split [start, end) into exchange-sized pages.
+
+    - start is aligned down to the interval grid
+    - end is clamped to the last closed candle (no open candle ingestion)
+    """
+    start = start - (start % interval_ms)
+    end = min(end, closed_candle_boundary(interval_ms, now_ms))
+
+    step = interval_ms * page_size
+    windows: List[BackfillWindow] = []
+
+    cursor = start
+    while cursor < end:
+        window_end = min(cursor + step, end)
+        windows.append(BackfillWindow(start=cursor, end=window_end))
+        cursor = window_end
+
+    return windows
+
+
+def page_size_for_unit(unit: IngestionUnit) -> int:
+    adapter_cls = ADAPTER_REGISTRY.get(unit.exchange_name)
+    if adapter_cls is None:
+        raise ValueError(f"No adapter registered for exchange '{unit.exchange_name}'")
+
+    return adapter_cls.max_page_size
+
+
+# -------------------------------------------------
+# orchestration
+# -------------------------------------------------
+
+def backfill_unit(
+    unit: IngestionUnit,
+    start: int,
+    end: int,
+    *,
+    max_workers: int = BACKFILL_MAX_WORKERS,
+    batch_rows: int = BACKFILL_BATCH_ROWS,
+    page_size: Optional[int] = None,
+    use_checkpoint: bool = True,
+    session_factory: Callable = get_session,
+    fetch_fn: Callable[..., FetchResult] = fetch_candles_range_for_unit,
+    cycle_id: str | None = None,
+) -> BackfillResult:
+    """
+    Load history for one unit over [start, end).
+
+    - windows are fetched in parallel (at most `max_workers` in flight)
+    - rows are written through the COPY writer in batches of `batch_rows`
+    - each batch is its own transaction; its windows are checkpointed
+      only after commit, so a crash never marks unsaved windows as done
+    - a failed window is logged and left for the next run
+    """
+    if page_size is None:
+        page_size = page_size_for_unit(unit)
+
+    windows = plan_backfill_windows(start, end, unit.interval_ms, page_size)
+
+    result = BackfillResult(
+        exchange_name=unit.exchange_name,
+        market_type=unit.market_type,
+        canonical_symbol=unit.canonical_symbol,
+        interval=unit.interval,
+        start=windows[0].start if windows else start,
+        end=windows[-1].end if windows else start,
+        windows_total=len(windows),
+    )
+
+    if not windows:
+        return result
+
+    checkpoint = (
+        RedisBackfillCheckpoint(unit, result.start, result.end)
+        if use_checkpoint else None
+    )
+
+    if checkpoint is not None:
+        done = checkpoint.completed()
+        pending = [w for w in windows if w.start not in done]
+        result.windows_checkpointed = len(windows) - len(pending)
+    else:
+        pending = windows
+
+    started = time.perf_counter()
+
+    log_extra = {
+        "service": "syncer-service",
+        "operation": "backfill",
+        "cycle_id": cycle_id,
+        "exchange": unit.exchange_name,
+        "market_type": unit.market_type,
+        "symbol": unit.canonical_symbol,
+        "interval": unit.interval,
+    }
+
+    logger.info(
+        "Backfill started",
+        extra={
+            **log_extra,
+            "event": "syncer.backfill.started",
+            "status": "started",
+            "start_ts": result.start,
+            "end_ts": result.end,
+            "windows_total": result.windows_total,
+            "windows_pending": len(pending),
+        },
+    )
+
+    buffer_rows: List[CandleValues] = []
+    buffer_windows: List[BackfillWindow] = []
+
+    def flush() -> None:
+        if buffer_windows:
+            if buffer_rows:
+                with session_factory() as session:
+                    counts = write_candles(session, buffer_rows)
+
+                result.inserted_count += counts.inserted
+                result.skipped_count += len(buffer_rows) - counts.inserted - counts.updated
+
+                # rows landed below the cached top -> drop the recent-candles key
+                if counts.inserted:
+                    invalidate_recent_candles(unit.exchange_market_id, unit.interval_id)
+                    # derived buckets over these rows are rebuilt by the rollup catch-up
+                    rewind_rollup_watermark(unit, min(row[2] for row in buffer_rows))
+
+            if checkpoint is not None:
+                checkpoint.mark_done(buffer_windows)
+
+            result.windows_done += len(buffer_windows)
+
+        buffer_rows.clear()
+        buffer_windows.clear()
+
+    queue = iter(pending)
+    in_flight: Dict[Future, BackfillWindow] = {}
+
+    with ThreadPoolExecutor(
+        max_workers=max_workers,
+        thread_name_prefix="candle-backfill",
+    ) as pool:
+
+        def submit_next() -> bool:
+            window = next(queue, None)
+            if window is None:
+                return False
+            future = pool.submit(fetch_fn, unit, window.start, window.end, page_size)
+            in_flight[future] = window
+            return True
+
+        # keep a bounded number of pages in memory
+        for _ in range(max_workers * 2):
+            if not submit_next():
+                break
+
+        while in_flight:
+            completed, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+
+            for future in completed:
+                window = in_flight.pop(future)
+
+                try:
+                    fetch_result = future.result()
+                except Exception as exc:
+                    result.windows_failed += 1
+                    logger.exception(
+                        "Backfill window failed",
+                        extra={
+                            **log_extra,
+                            "event": "syncer.backfill.window_failed",
+                            "status": "error",
+                            "window_start": window.start,
+                            "window_end": window.end,
+                            "error_message": str(exc),
+                        },
+                    )
+                else:
+                    result.fetched_count += fetch_result.fetched_count
+                    if fetch_result.quarantined:
+                        result.quarantined_count += len(fetch_result.quarantined)
+                        log_quarantined_candles(
+                            logger,
+                            unit,
+                            fetch_result.quarantined,
+                            cycle_id=cycle_id,
+                            operation="backfill",
+                        )
+                    buffer_rows.extend(
+                        map_candles_to_values(unit, fetch_result.candles)
+                    )
+                    buffer_windows.append(window)
+
+                submit_next()
+
+            if len(buffer_rows) >= batch_rows:
+                flush()
+
+        flush()
+
+    latency_ms = round((time.perf_counter() - started) * 1000, 2)
+
+    logger.info(
+        "Backfill completed",
+        extra={
+            **log_extra,
+            "event": "syncer.backfill.completed",
+            "status": "success" if result.windows_failed == 0 else "partial_success",
+            "start_ts": result.start,
+            "end_ts": result.end,
+            "windows_total": result.windows_total,
+            "windows_checkpointed": result.windows_checkpointed,
+            "windows_done": result.windows_done,
+            "windows_failed": result.windows_failed,
+            "fetched_count": result.fetched_count,
+            "inserted_count": result.inserted_count,
+            "skipped_count": result.skipped_count,
+            "quarantined_count": result.quarantined_count,
+            "latency_ms": latency_ms,
+        },
+    )
+
+    return result
@@ -0,0 +1,273 @@
+# syncer_service/syncer/backfill/gap_repair.py
+"""
+Gap detection and targeted repair.
+
+Detection:
+- live: ingest_unit enqueues FilterResult.gap_ranges (leading and
+  interior holes of the fetched page) after commit
+- periodic: scan_unit_gaps finds holes already stored in the DB
+  (every scheduler reload, or the run_gap_repair job)
+
+Repair:
+- drain_gap_repairs pops queued ranges and backfills exactly those
+  windows (no full re-fetch)
+
+Queue: one Redis ZSET (member = JSON range, score = enqueue time),
+so the same range is never queued twice. Repair attempts are counted
+per range; a range the exchange cannot fill (no trades, delisted
+history) is dropped after GAP_REPAIR_MAX_ATTEMPTS instead of being
+re-queued by every scan.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import os
+import time
+from dataclasses import asdict
+from typing import Callable, List, Optional, Tuple
+
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+from core.redis_client import build_redis_client
+from syncer_service.syncer.backfill.engine import backfill_unit
+from syncer_service.syncer.ingestion.types import GapRange, IngestionUnit
+
+logger = logging.getLogger(__name__)
+
+GAP_REPAIR_QUEUE_KEY = "queue:syncer:gap_repair"
+GAP_REPAIR_ATTEMPTS_KEY_PREFIX = "gap_repair:attempts"
+GAP_REPAIR_MAX_PER_CYCLE = int(os.getenv("GAP_REPAIR_MAX_PER_CYCLE", "50"))
+GAP_REPAIR_MAX_ATTEMPTS = int(os.getenv("GAP_REPAIR_MAX_ATTEMPTS", "5"))
+GAP_SCAN_LOOKBACK_MS = int(os.getenv("GAP_SCAN_LOOKBACK_HOURS", "24")) * 60 * 60 * 1000
+# attempt counters outlive the scan window, so an exhausted range is not re-scanned
+GAP_REPAIR_ATTEMPTS_TTL_SECONDS = GAP_SCAN_LOOKBACK_MS // 1000
+
+
+# -------------------------------------------------
+# detection
+# -------------------------------------------------
+
+def find_stored_gaps(
+    session: Session,
+    unit: IngestionUnit,
+    start: int,
+    end: int,
+) -> List[GapRange]:
+    """
+    Holes between consecutive stored candles in [start, end).
+
+    Only interior holes are reported (not missing head/tail),
+    computed in SQL with lead() over the unique index.
+    """
+    rows = session.execute(
+        text(
+            """
+            select gap_start, gap_end from (
+                select
+                    timestamp + :interval_ms as gap_start,
+                    lead(timestamp) over (order by timestamp) as gap_end
+                from candles
+                where exchange_market_id = :exchange_market_id
+                  and interval_id = :interval_id
+                  and timestamp >= :start
+                  and timestamp < :end
+            ) t
+            where gap_end > gap_start
+            order by gap_start
+            """
+        ),
+        {
+            "exchange_market_id": unit.exchange_market_id,
+            "interval_id": unit.interval_id,
+            "interval_ms": unit.interval_ms,
+            "start": start,
+            "end": end,
+        },
+    ).all()
+
+    return [(row.gap_start, row.gap_end) for row in rows]
+
+
+def scan_unit_gaps(
+    session: Session,
+    unit: IngestionUnit,
+    lookback_ms: int = GAP_SCAN_LOOKBACK_MS,
+    now_ms: Optional[int] = None,
+) -> int:
+    """
+    Periodic scan: enqueue every stored hole in the lookback window.
+    """
+    if now_ms is None:
+        now_ms = int(time.time() * 1000)
+
+    gaps = find_stored_gaps(session, unit, now_ms - lookback_ms, now_ms)
+
+    return sum(enqueue_gap_repair(unit, start, end) for start, end in gaps)
+
+
+# -------------------------------------------------
+# queue
+# -------------------------------------------------
+
+def _encode_job(unit: IngestionUnit, start: int, end: int) -> str:
+    return json.dumps(
+        {"unit": asdict(unit), "start": start, "end": end},
+        sort_keys=True,
+        separators=(",", ":"),
+    )
+
+
+def _decode_job(member: str) -> Tuple[IngestionUnit, int, int]:
+    job = json.loads(member)
+    return IngestionUnit(**job["unit"]), job["start"], job["end"]
+
+
+def build_gap_attempts_key(unit: IngestionUnit, start: int, end: int) -> str:
+    return (
+        f"{GAP_REPAIR_ATTEMPTS_KEY_PREFIX}:"
+        f"{unit.exchange_market_id}:{unit.interval_id}:{start}:{end}"
+    )
+
+
+def _record_attempt(redis_client, unit: IngestionUnit, start: int, end: int) -> int:
+    key = build_gap_attempts_key(unit, start, end)
+
+    pipe = redis_client.pipeline()
+    pipe.incr(key)
+    pipe.expire(key, GAP_REPAIR_ATTEMPTS_TTL_SECONDS)
+    attempts, _ = pipe.execute()
+
+    return int(attempts)
+
+
+def enqueue_gap_repair(unit: IngestionUnit, start: int, end: int) -> bool:
+    """
+    Queue one missing range. Returns True if it was not queued already
+    and still has repair attempts left.
+    Never raises: a lost job is found again by the periodic scan.
+    """
+    if end <= start:
+        return False
+
+    try:
+        redis_client = build_redis_client()
+
+        attempts = redis_client.get(build_gap_attempts_key(unit, start, end))
+        if attempts is not None and int(attempts) >= GAP_REPAIR_MAX_ATTEMPTS:
+            return False
+
+        added = redis_client.zadd(
+            GAP_REPAIR_QUEUE_KEY,
+            {_encode_job(unit, start, end): time.time()},
+            nx=True,
+        )
+    except Exception:
+        logger.exception(
+            "Gap repair enqueue failed",
+            extra={
+                "service": "syncer-service",
+                "event": "syncer.gap_repair.enqueue_failed",
+                "status": "degraded",
+                "operation": "gap_repair",
+                "exchange": unit.exchange_name,
+                "market_type": unit.market_type,
+                "symbol": unit.canonical_symbol,
+                "interval": unit.interval,
+            },
+        )
+        return False
+
+    if added:
+        logger.info(
+            "Gap repair enqueued",
+            extra={
+                "service": "syncer-service",
+                "event": "syncer.gap_repair.enqueued",
+                "status": "success",
+                "operation": "gap_repair",
+                "exchange": unit.exchange_name,
+                "market_type": unit.market_type,
+                "symbol": unit.canonical_symbol,
+                "interval": unit.interval,
+                "gap_start": start,
+                "gap_end": end,
+                "missing_count": (end - start) // unit.interval_ms,
+            },
+        )
+
+    return bool(added)
+
+
+def drain_gap_repairs(
+    max_jobs: int = GAP_REPAIR_MAX_PER_CYCLE,
+    repair_fn: Callable = backfill_unit,
+    cycle_id: str | None = None,
+) -> int:
+    """
+    Pop up to `max_jobs` queued ranges (oldest first) and backfill them.
+
+    A failed job is put back on the queue for a later cycle until it
+    has used GAP_REPAIR_MAX_ATTEMPTS. Returns the number of repaired ranges.
+    """
+    redis_client = build_redis_client()
+    repaired = 0
+    failed_members: List[str] = []
+
+    for _ in range(max_jobs):
+        popped = redis_client.zpopmin(GAP_REPAIR_QUEUE_KEY, 1)
+        if not popped:
+            break
+
+        member, _score = popped[0]
+        unit, start, end = _decode_job(member)
+        attempts = _record_attempt(redis_client, unit, start, end)
+
+        try:
+            result = repair_fn(
+                unit,
+                start,
+                end,
+                use_checkpoint=False,
+                cycle_id=cycle_id,
+            )
+            if result.windows_failed:
+                raise RuntimeError(f"{result.windows_failed} gap window(s) failed")
+            repaired += 1
+
+        except Exception as exc:
+            exhausted = attempts >= GAP_REPAIR_MAX_ATTEMPTS
+            if not exhausted:
+                failed_members.append(member)
+
+            logger.exception(
+                "Gap repair failed",
+                extra={
+                    "service": "syncer-service",
+                    "event": "syncer.gap_repair.failed",
+                    "status": "error",
+                    "operation": "gap_repair",
+                    "cycle_id": cycle_id,
+                    "exchange": unit.exchange_name,
+                    "market_type": unit.market_type,
+                    "symbol": unit.canonical_symbol,
+                    "interval": unit.interval,
+                    "gap_start": start,
+                    "gap_end": end,
+                    "attempts": attempts,
+                    "requeued": not exhausted,
+                    "error_message": str(exc),
+                },
+            )
+
+    # re-queue after the loop so a failing job is not retried in this drain
+    if failed_members:
+        redis_client.zadd(
+            GAP_REPAIR_QUEUE_KEY,
+            {member: time.time() for member in failed_members},
+            nx=True,
+        )
+
+    return repaired
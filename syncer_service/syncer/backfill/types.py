@@ -0,0 +1,45 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+
+
+# =========================
+# Backfill Window
+# =========================
+
+@dataclass(frozen=True)
+class BackfillWindow:
+    """
+    One exchange page of history: candles with open time in [start, end).
+    """
+    start: int
+    end: int
+
+
+# =========================
+# Backfill Summary (Audit)
+# =========================
+
+@dataclass
+class BackfillResult:
+    # unit identity
+    exchange_name: str
+    market_type: str
+    canonical_symbol: str
+    interval: str
+
+    # requested range (aligned / clamped)
+    start: int
+    end: int
+
+    # windows
+    windows_total: int = 0
+    windows_checkpointed: int = 0
+    windows_done: int = 0
+    windows_failed: int = 0
+
+    # counts
+    fetched_count: int = 0
+    inserted_count: int = 0
+    skipped_count: int = 0
+    quarantined_count: int = 0
@@ -0,0 +1,192 @@
+from __future__ import annotations
+
+import logging
+import os
+import threading
+from collections import defaultdict
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Optional
+
+from syncer_service.syncer.ingestion.pipeline import ingest_unit
+from syncer_service.syncer.ingestion.types import IngestionUnit
+from syncer_service.syncer.redis_lock import candle_sync_lock
+
+logger = logging.getLogger(__name__)
+
+INGESTION_MAX_WORKERS = int(os.getenv("INGESTION_MAX_WORKERS", "8"))
+INGESTION_PER_EXCHANGE_CONCURRENCY = int(
+    os.getenv("INGESTION_PER_EXCHANGE_CONCURRENCY", "4")
+)
+
+UNIT_SUCCESS = "success"
+UNIT_SKIPPED = "skipped"
+UNIT_FAILED = "failed"
+
+
+@dataclass
+class ExecutionReport:
+    success: int = 0
+    failed: int = 0
+    skipped: int = 0
+
+
+class IngestionExecutor:
+    """
+    Run ingestion units with bounded concurrency.
+
+    Rules:
+    - At most `max_workers` units run at the same time
+    - At most `per_exchange_concurrency` units hit the same exchange at once
+    - Every unit keeps its own Redis lock and its own DB transaction
+    - max_workers == 1 runs the units sequentially in the caller thread
+
+    run() executes one batch and waits for all of it; submit() hands a
+    single unit to a long-lived pool (used by the scheduler, so a slow
+    unit never holds back the others).
+    """
+
+    def __init__(
+        self,
+        max_workers: int = INGESTION_MAX_WORKERS,
+        per_exchange_concurrency: int = INGESTION_PER_EXCHANGE_CONCURRENCY,
+        ingest_fn: Callable = ingest_unit,
+        lock_fn: Callable = candle_sync_lock,
+    ) -> None:
+        if max_workers < 1:
+            raise ValueError("max_workers must be >= 1")
+        if per_exchange_concurrency < 1:
+            raise ValueError("per_exchange_concurrency must be >= 1")
+
+        self.max_workers = max_workers
+        self.per_exchange_concurrency = per_exchange_concurrency
+        self.ingest_fn = ingest_fn
+        self.lock_fn = lock_fn
+
+        self._exchange_slots: Dict[str, threading.BoundedSemaphore] = defaultdict(
+            lambda: threading.BoundedSemaphore(self.per_exchange_concurrency)
+        )
+        self._slots_guard = threading.Lock()
+        self._pool: Optional[ThreadPoolExecutor] = None
+
+    def run(
+        self,
+        units: List[IngestionUnit],
+        cycle_id: str | None = None,
+        **ingest_kwargs,
+    ) -> ExecutionReport:
+        report = ExecutionReport()
+
+        if self.max_workers == 1:
+            statuses = [
+                self.run_unit(unit, cycle_id=cycle_id, **ingest_kwargs)
+                for unit in units
+            ]
+        else:
+            with ThreadPoolExecutor(
+                max_workers=self.max_workers,
+                thread_name_prefix="candle-ingestion",
+            ) as pool:
+                statuses = list(
+                    pool.map(
+                        lambda unit: self.run_unit(
+                            unit, cycle_id=cycle_id, **ingest_kwargs
+                        ),
+                        units,
+                    )
+                )
+
+        for status in statuses:
+            if status == UNIT_SUCCESS:
+                report.success += 1
+            elif status == UNIT_SKIPPED:
+                report.skipped += 1
+            else:
+                report.failed += 1
+
+        return report
+
+    def submit(
+        self,
+        unit: IngestionUnit,
+        cycle_id: str | None = None,
+        **ingest_kwargs,
+    ) -> Future:
+        """
+        Run one unit on the long-lived pool. The future resolves to the
+        unit status (run_unit never raises).
+        """
+        with self._slots_guard:
+            if self._pool is None:
+                self._pool = ThreadPoolExecutor(
+                    max_workers=self.max_workers,
+                    thread_name_prefix="candle-ingestion",
+                )
+            pool = self._pool
+
+        return pool.submit(self.run_unit, unit, cycle_id=cycle_id, **ingest_kwargs)
+
+    def shutdown(self, wait: bool = True) -> None:
+        with self._slots_guard:
+            pool, self._pool = self._pool, None
+
+        if pool is not None:
+            pool.shutdown(wait=wait)
+
+    def run_unit(
+        self,
+        unit: IngestionUnit,
+        cycle_id: str | None = None,
+        **ingest_kwargs,
+    ) -> str:
+        """
+        Run one unit under its exchange slot and Redis lock.
+
+        Never raises: failures are logged and reported as UNIT_FAILED
+        so one unit cannot take down the whole cycle.
+        """
+        try:
+            with self._exchange_slot(unit.exchange_name):
+                with self.lock_fn(unit) as acquired:
+                    if not acquired:
+                        logger.info(
+                            "Ingestion unit skipped because lock already exists",
+                            extra={
+                                "service": "syncer-service",
+                                "event": "syncer.unit_skipped_locked",
+                                "status": "skipped",
+                                "operation": "candle_ingestion",
+                                "exchange": unit.exchange_name,
+                                "market_type": unit.market_type,
+                                "symbol": unit.canonical_symbol,
+                                "interval": unit.interval,
+                                "cycle_id": cycle_id,
+                            },
+                        )
+                        return UNIT_SKIPPED
+
+                    # the unit runs inside the lock block so the lock is released after it
+                    self.ingest_fn(unit=unit, cycle_id=cycle_id, **ingest_kwargs)
+                    return UNIT_SUCCESS
+
+        except Exception as exc:
+            logger.exception(
+                "Ingestion failed",
+                extra={
+                    "service": "syncer-service",
+                    "event": "syncer.unit_failed",
+                    "status": "error",
+                    "operation": "fetch_candles",
+                    "exchange": unit.exchange_name,
+                    "market_type": unit.market_type,
+                    "symbol": unit.canonical_symbol,
+                    "interval": unit.interval,
+                    "error_message": str(exc),
+                    "cycle_id": cycle_id,
+                },
+            )
+            return UNIT_FAILED
+
+    def _exchange_slot(self, exchange_name: str) -> threading.BoundedSemaphore:
+        with self._slots_guard:
+            return self._exchange_slots[exchange_name]
@@ -1,14 +1,21 @@
 from __future__ import annotations
 
-from typing import List
+import asyncio
+import os
+import time
+from typing import List, Optional, Sequence
 
 from core.models.candle import Candle
+from core.models.candle_batch import CandleBatch
 from core.models.enums import MarketType, Interval
 
 from syncer_service.syncer.adapters.registry import ADAPTER_REGISTRY
 
 from .types import IngestionUnit, FetchResult
 
+# extra candles re-fetched behind the watermark (late corrections, clock skew)
+FETCH_OVERLAP_CANDLES = int(os.getenv("FETCH_OVERLAP_CANDLES", "2"))
+
 
 def build_adapter_for_unit(unit: IngestionUnit):
     """
@@ -28,15 +35,49 @@ def build_adapter_for_unit(unit: IngestionUnit):
     return adapter_cls(market_type=market_type)
 
 
-def fetch_candles_for_unit(unit: IngestionUnit) -> FetchResult:
+def compute_fetch_limit(
+    unit: IngestionUnit,
+    last_ts: Optional[int],
+    now_ms: Optional[int] = None,
+    overlap: int = FETCH_OVERLAP_CANDLES,
+) -> int:
+    """
+    Number of latest candles needed to cover everything after `last_ts`.
+
+    - no watermark (cold start) -> unit.fetch_limit
+    - otherwise candles since the watermark (incl. the open one) + overlap
+
+    Not capped: a result above unit.fetch_limit means the gap does not
+    fit in one page and must be backfilled.
+    """
+    if last_ts is None:
+        return unit.fetch_limit
+
+    if now_ms is None:
+        now_ms = int(time.time() * 1000)
+
+    # open time of the currently open candle
+    open_ts = now_ms - (now_ms % unit.interval_ms)
+    missing = max((open_ts - last_ts) // unit.interval_ms, 1)
+
+    return missing + overlap
+
+
+def fetch_candles_for_unit(
+    unit: IngestionUnit,
+    limit: Optional[int] = None,
+) -> FetchResult:
     """
     Fetch latest candles for a single ingestion unit.
 
     Responsibilities:
-    - Call adapter.fetch_candles (BaseAdapter standard pipeline)
+    - Call adapter.fetch_candle_batch (BaseAdapter standard pipeline, columnar)
     - Defensive explicit sort
     - Produce FetchResult
 
+    `limit` defaults to unit.fetch_limit (see compute_fetch_limit).
+    Invalid rows are quarantined, not fatal for the unit.
+
     No DB access.
     No incremental logic.
     """
@@ -45,12 +86,126 @@ def fetch_candles_for_unit(unit: IngestionUnit) -> FetchResult:
     # unit.interval is canonical string from DB (e.g. "1m", "5m")
     interval_enum = Interval(unit.interval)
 
-    candles: List[Candle] = adapter.fetch_candles(
+    candles: CandleBatch = adapter.fetch_candle_batch(
         symbol=unit.canonical_symbol,
         interval=interval_enum,
-        limit=unit.fetch_limit,
+        limit=unit.fetch_limit if limit is None else limit,
+        quarantine=True,
+    )
+
+    return _build_fetch_result(candles)
+
+
+def fetch_candles_range_for_unit(
+    unit: IngestionUnit,
+    start_time: int,
+    end_time: int,
+    limit: int | None = None,
+) -> FetchResult:
+    """
+    Fetch one page of candles with open time in [start_time, end_time).
+
+    Used by backfill / gap repair. No DB access.
+    """
+    adapter = build_adapter_for_unit(unit)
+
+    candles: CandleBatch = adapter.fetch_candle_batch_range(
+        symbol=unit.canonical_symbol,
+        interval=Interval(unit.interval),
+        start_time=start_time,
+        end_time=end_time,
+        limit=limit,
+        quarantine=True,
+    )
+
+    # exchanges may pad the page edges; keep strictly inside the window
+    return _build_fetch_result(candles, start_time=start_time, end_time=end_time)
+
+
+async def afetch_candles_for_unit(
+    unit: IngestionUnit,
+    limit: Optional[int] = None,
+) -> FetchResult:
+    """
+    Async variant of fetch_candles_for_unit.
+
+    Goes through adapter.afetch_candle_batch (shared keep-alive AsyncClient).
+    """
+    adapter = build_adapter_for_unit(unit)
+
+    candles: CandleBatch = await adapter.afetch_candle_batch(
+        symbol=unit.canonical_symbol,
+        interval=Interval(unit.interval),
+        limit=unit.fetch_limit if limit is None else limit,
+        quarantine=True,
     )
 
+    return _build_fetch_result(candles)
+
+
+async def afetch_candles_for_units(
+    units: Sequence[IngestionUnit],
+    concurrency: int = 20,
+) -> List[FetchResult | BaseException]:
+    """
+    Fan out fetches for many units over the shared async clients.
+
+    Result order matches `units`; a failed unit yields its exception
+    instead of cancelling the others.
+    """
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def _fetch(unit: IngestionUnit) -> FetchResult:
+        async with semaphore:
+            return await afetch_candles_for_unit(unit)
+
+    return await asyncio.gather(
+        *(_fetch(unit) for unit in units),
+        return_exceptions=True,
+    )
+
+
+def _build_fetch_result(
+    candles: Sequence[Candle],
+    start_time: Optional[int] = None,
+    end_time: Optional[int] = None,
+) -> FetchResult:
+    """
+    Defensive explicit sort + FetchResult construction.
+
+    Rows quarantined by the adapter are passed on in FetchResult.quarantined.
+
+    A CandleBatch stays columnar (sorted / windowed without building
+    Candle objects); a plain list is sorted as before.
+    """
+    if isinstance(candles, CandleBatch):
+        candles = candles.sorted()
+        if start_time is not None and end_time is not None:
+            candles = candles.between(start_time, end_time)
+
+        if not candles:
+            return FetchResult(
+                candles=candles,
+                fetched_count=0,
+                min_ts=None,
+                max_ts=None,
+                quarantined=candles.quarantined,
+            )
+
+        return FetchResult(
+            candles=candles,
+            fetched_count=len(candles),
+            min_ts=candles.open_timestamp[0],
+            max_ts=candles.open_timestamp[-1],
+            quarantined=candles.quarantined,
+        )
+
+    if start_time is not None and end_time is not None:
+        candles = [
+            c for c in candles
+            if start_time <= c.open_timestamp < end_time
+        ]
+
     if not candles:
         return FetchResult(
             candles=[],
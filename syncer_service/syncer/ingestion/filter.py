@@ -1,24 +1,33 @@
 from __future__ import annotations
 
-from typing import List, Optional, Tuple
+from typing import Iterable, List, Mapping, Optional, Sequence, Tuple
 
 from sqlalchemy.orm import Session
-from sqlalchemy import func
+from sqlalchemy import func, tuple_
 
 from database.models import Candle as CandleORM
 
 from core.models.candle import Candle
+from core.models.candle_batch import CandleBatch, QuarantinedCandle
 
-from syncer_service.syncer.ingestion.types import IngestionUnit, FetchResult, FilterResult
+from syncer_service.syncer.ingestion.types import (
+    IngestionUnit,
+    FetchResult,
+    FilterResult,
+    GapRange,
+    WatermarkKey,
+    Watermarks,
+)
 
 
 # -------------------------------------------------
 # helpers
 # -------------------------------------------------
 
-def drop_last_candle(candles: List[Candle]) -> Tuple[List[Candle], bool]:
+def drop_last_candle(candles: Sequence[Candle]) -> Tuple[Sequence[Candle], bool]:
     """
     Always drop the last fetched candle to avoid open candle ingestion.
+    (slicing keeps a CandleBatch columnar)
     """
     if not candles:
         return candles, False
@@ -41,24 +50,139 @@ def get_last_timestamp(
     ).scalar()
 
 
+def load_last_timestamps(
+    session: Session,
+    units: Iterable[IngestionUnit],
+) -> Watermarks:
+    """
+    Get last ingested candle timestamp for many units in ONE grouped query.
+
+    Units without any stored candle are absent from the result.
+    Served by the uq_candle_market_interval_ts index.
+    """
+    keys = list({unit.watermark_key for unit in units})
+
+    if not keys:
+        return {}
+
+    rows = session.query(
+        CandleORM.exchange_market_id,
+        CandleORM.interval_id,
+        func.max(CandleORM.timestamp),
+    ).filter(
+        tuple_(CandleORM.exchange_market_id, CandleORM.interval_id).in_(keys),
+    ).group_by(
+        CandleORM.exchange_market_id,
+        CandleORM.interval_id,
+    ).all()
+
+    return {
+        (exchange_market_id, interval_id): last_ts
+        for exchange_market_id, interval_id, last_ts in rows
+    }
+
+
+def resolve_last_timestamp(
+    session: Session,
+    unit: IngestionUnit,
+    watermarks: Optional[Mapping[WatermarkKey, int]] = None,
+) -> Optional[int]:
+    """
+    Last timestamp from preloaded watermarks, or from DB when none were given.
+    """
+    if watermarks is None:
+        return get_last_timestamp(session, unit)
+
+    return watermarks.get(unit.watermark_key)
+
+
 def filter_new_candles(
-    candles: List[Candle],
+    candles: Sequence[Candle],
     last_ts: Optional[int],
-) -> List[Candle]:
+) -> Sequence[Candle]:
     """
     Keep only candles with open_timestamp > last_ts.
     """
     if last_ts is None:
         return candles
 
+    if isinstance(candles, CandleBatch):
+        return candles.after(last_ts)
+
     return [
         c for c in candles
         if c.open_timestamp > last_ts
     ]
 
 
+def find_gap_ranges(
+    candles: Sequence[Candle],
+    last_ts: Optional[int],
+    interval_ms: int,
+) -> List[GapRange]:
+    """
+    Every missing [start, end) open-time range: between the stored
+    watermark and the first candle, and between consecutive candles
+    of the (ascending, already filtered) page.
+    """
+    if isinstance(candles, CandleBatch):
+        timestamps = candles.open_timestamp
+    else:
+        timestamps = [c.open_timestamp for c in candles]
+
+    ranges: List[GapRange] = []
+    previous = last_ts
+
+    for ts in timestamps:
+        if previous is not None and ts > previous + interval_ms:
+            ranges.append((previous + interval_ms, ts))
+        previous = ts
+
+    return ranges
+
+
+def quarantined_gap_ranges(
+    quarantined: Iterable[QuarantinedCandle],
+    last_ts: Optional[int],
+    newest_ts: Optional[int],
+    interval_ms: int,
+) -> List[GapRange]:
+    """
+    One-candle ranges of quarantined rows the watermark moves past
+    (last_ts < open_timestamp < newest_ts). Rows after the newest
+    stored candle are fetched again by the next cycle.
+    """
+    if newest_ts is None:
+        return []
+
+    timestamps = sorted({
+        row.open_timestamp
+        for row in quarantined
+        if row.open_timestamp is not None
+        and (last_ts is None or row.open_timestamp > last_ts)
+        and row.open_timestamp < newest_ts
+    })
+
+    return [(ts, ts + interval_ms) for ts in timestamps]
+
+
+def merge_gap_ranges(ranges: Iterable[GapRange]) -> List[GapRange]:
+    """
+    Sort ranges and merge the ones that overlap or touch.
+    """
+    merged: List[GapRange] = []
+
+    for start, end in sorted(ranges):
+        if merged and start <= merged[-1][1]:
+            merged[-1] = (merged[-1][0], max(merged[-1][1], end))
+        else:
+            merged.append((start, end))
+
+    return merged
+
+
 def sanity_check_gap(
-    candles: List[Candle],
+    candles: Sequence[Candle],
     last_ts: Optional[int],
     interval_ms: int,
 ) -> bool:
@@ -66,11 +190,7 @@ def sanity_check_gap(
     Detect potential candle gap.
     Only emits a boolean warning.
     """
-    if last_ts is None or not candles:
-        return False
-
-    min_ts = candles[0].open_timestamp
-    return min_ts > last_ts + interval_ms
+    return bool(find_gap_ranges(candles, last_ts, interval_ms))
 
 
 # -------------------------------------------------
@@ -81,33 +201,38 @@ def run_filter_stage(
     session: Session,
     unit: IngestionUnit,
     fetch_result: FetchResult,
+    watermarks: Optional[Mapping[WatermarkKey, int]] = None,
 ) -> FilterResult:
     """
     Run filter + sanity stage for one ingestion unit.
+
+    When `watermarks` (see load_last_timestamps) is given, the last
+    timestamp is read from it instead of issuing a per-unit max() query.
     """
 
     # 1) drop last candle
     candles, dropped = drop_last_candle(fetch_result.candles)
 
-    # 2) get last timestamp from DB
-    last_ts = get_last_timestamp(session, unit)
+    # 2) get last timestamp (preloaded watermarks or DB)
+    last_ts = resolve_last_timestamp(session, unit, watermarks)
 
-    # 3) gap detection (before incremental filter)
-    gap_warning = sanity_check_gap(
+    # 3) incremental filtering
+    new_candles = filter_new_candles(
         candles=candles,
         last_ts=last_ts,
-        interval_ms=unit.interval_ms,
     )
 
-    # 4) incremental filtering
-    new_candles = filter_new_candles(
-        candles=candles,
+    # 4) gap detection (leading and interior holes of what gets stored)
+    gap_ranges = find_gap_ranges(
+        candles=new_candles,
         last_ts=last_ts,
+        interval_ms=unit.interval_ms,
     )
 
     return FilterResult(
         new_candles=new_candles,
         dropped_last_open_candle=dropped,
-        gap_warning=gap_warning,
+        gap_warning=bool(gap_ranges),
         last_ts=last_ts,
+        gap_ranges=gap_ranges,
     )
@@ -1,8 +1,14 @@
 from __future__ import annotations
 
 import logging
+from typing import List
 
-from syncer_service.syncer.ingestion.types import IngestionSummary
+from core.models.candle_batch import QuarantinedCandle, reason_counts
+
+from syncer_service.syncer.ingestion.types import IngestionSummary, IngestionUnit
+
+# quarantined rows listed in full in the log record (the rest are counted)
+QUARANTINE_LOG_SAMPLE = 10
 
 
 def log_unit_summary(
@@ -28,6 +34,9 @@ def log_unit_summary(
 
             "fetched_count": summary.fetched_count,
             "inserted_count": summary.inserted_count,
+            "skipped_count": summary.skipped_count,
+            "fetch_limit": summary.fetch_limit,
+            "quarantined_count": summary.quarantined_count,
 
             "dropped_last_open_candle": summary.dropped_last_open_candle,
             "gap_warning": summary.gap_warning,
@@ -39,3 +48,35 @@ def log_unit_summary(
             "latency_ms": latency_ms,
         },
     )
+
+
+def log_quarantined_candles(
+        logger: logging.Logger,
+        unit: IngestionUnit,
+        quarantined: List[QuarantinedCandle],
+        cycle_id: str | None = None,
+        operation: str = "fetch_candles",
+        ) -> None:
+
+    logger.warning(
+        "Invalid candles quarantined",
+        extra={
+            "service": "syncer-service",
+            "event": "syncer.candles_quarantined",
+            "status": "degraded",
+            "operation": operation,
+            "cycle_id": cycle_id,
+
+            "exchange": unit.exchange_name,
+            "market_type": unit.market_type,
+            "symbol": unit.canonical_symbol,
+            "interval": unit.interval,
+
+            "quarantined_count": len(quarantined),
+            "reason_counts": reason_counts(quarantined),
+            "quarantined_sample": [
+                {"index": q.index, "open_timestamp": q.open_timestamp, "reason": q.reason}
+                for q in quarantined[:QUARANTINE_LOG_SAMPLE]
+            ],
+        },
+    )
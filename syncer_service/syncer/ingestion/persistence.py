@@ -2,63 +2,264 @@
 
 from __future__ import annotations
 
-from typing import List
+import csv
+import io
+import os
+from dataclasses import dataclass
+from typing import Iterable, List, Sequence, Tuple
 
+from sqlalchemy import literal_column
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.orm import Session
 
+from database.candle_layout import candle_conflict_constraint
 from database.models import Candle as CandleORM
 
+from core.candle_cache import append_recent_candles
 from core.models.candle import Candle
+from core.models.candle_batch import CandleBatch
 
 from .types import IngestionUnit, FilterResult, PersistResult
 
 
+# batches at or above this size go through COPY, smaller ones through INSERT
+PERSIST_COPY_THRESHOLD = int(os.getenv("PERSIST_COPY_THRESHOLD", "500"))
+
+# unique constraint (standard layout) or primary key (compact layout)
+CANDLE_UNIQUE_CONSTRAINT = candle_conflict_constraint()
+
+CANDLE_COLUMNS: Tuple[str, ...] = (
+    "exchange_market_id",
+    "interval_id",
+    "timestamp",
+    "open",
+    "high",
+    "low",
+    "close",
+    "volume",
+)
+
+ON_CONFLICT_NOTHING = "nothing"
+ON_CONFLICT_UPDATE = "update"
+
+CandleValues = Tuple[int, int, int, float, float, float, float, float]
+
+
+@dataclass
+class WriteCounts:
+    inserted: int = 0
+    updated: int = 0
+
+
 # -------------------------------------------------
 # mapping
 # -------------------------------------------------
 
-def map_candle_to_row(
+def map_candle_to_values(
     unit: IngestionUnit,
     candle: Candle,
-) -> CandleORM:
+) -> CandleValues:
     """
-    Map canonical Candle to ORM Candle row.
+    Map canonical Candle to a plain candles row tuple (CANDLE_COLUMNS order).
 
-    Append-only.
     Timestamp source = open_timestamp.
     """
-    return CandleORM(
-        exchange_market_id=unit.exchange_market_id,
-        interval_id=unit.interval_id,
-        timestamp=candle.open_timestamp,
-        open=candle.open,
-        high=candle.high,
-        low=candle.low,
-        close=candle.close,
-        volume=candle.volume,
+    return (
+        unit.exchange_market_id,
+        unit.interval_id,
+        candle.open_timestamp,
+        candle.open,
+        candle.high,
+        candle.low,
+        candle.close,
+        candle.volume,
     )
 
 
+def map_candles_to_values(
+    unit: IngestionUnit,
+    candles: Sequence[Candle],
+) -> List[CandleValues]:
+    """
+    Map a page of candles to row tuples.
+
+    A CandleBatch is zipped column-wise, without building Candle objects.
+    """
+    if isinstance(candles, CandleBatch):
+        exchange_market_id = unit.exchange_market_id
+        interval_id = unit.interval_id
+        return [
+            (exchange_market_id, interval_id, open_ts, o, h, l, c, v)
+            for open_ts, _close_ts, o, h, l, c, v in candles.rows()
+        ]
+
+    return [map_candle_to_values(unit, candle) for candle in candles]
+
+
+def build_copy_buffer(rows: Iterable[CandleValues]) -> io.StringIO:
+    """
+    Serialize rows as CSV for COPY ... FROM STDIN.
+    """
+    buffer = io.StringIO()
+    writer = csv.writer(buffer, lineterminator="\n")
+    writer.writerows(rows)
+    buffer.seek(0)
+    return buffer
+
+
 # -------------------------------------------------
 # persistence helpers
 # -------------------------------------------------
 
-def bulk_insert_candles(
+def _validate_on_conflict(on_conflict: str) -> None:
+    if on_conflict not in (ON_CONFLICT_NOTHING, ON_CONFLICT_UPDATE):
+        raise ValueError(f"Unsupported on_conflict mode: {on_conflict}")
+
+
+def dedupe_rows(rows: Iterable[CandleValues]) -> List[CandleValues]:
+    """
+    One row per (exchange_market_id, interval_id, timestamp), last one wins.
+
+    ON CONFLICT DO UPDATE cannot touch a row twice in one statement
+    (e.g. overlapping backfill pages in one buffer).
+    """
+    rows = list(rows)
+    latest = {row[:3]: row for row in rows}
+
+    if len(latest) == len(rows):
+        return rows
+
+    return list(latest.values())
+
+
+def insert_candles(
     session: Session,
-    rows: List[CandleORM],
-) -> int:
+    rows: Sequence[CandleValues],
+    on_conflict: str = ON_CONFLICT_NOTHING,
+) -> WriteCounts:
     """
-    Bulk insert candle rows.
+    Idempotent multi-row INSERT ... ON CONFLICT for small batches.
+    """
+    _validate_on_conflict(on_conflict)
+
+    if not rows:
+        return WriteCounts()
+
+    table = CandleORM.__table__
+    stmt = pg_insert(table).values([dict(zip(CANDLE_COLUMNS, row)) for row in dedupe_rows(rows)])
 
-    NOTE:
-    - Not idempotent yet (Phase 4B)
-    - IntegrityError will rollback entire unit
+    if on_conflict == ON_CONFLICT_UPDATE:
+        stmt = stmt.on_conflict_do_update(
+            constraint=CANDLE_UNIQUE_CONSTRAINT,
+            set_={
+                column: stmt.excluded[column]
+                for column in ("open", "high", "low", "close", "volume")
+            },
+        )
+    else:
+        stmt = stmt.on_conflict_do_nothing(constraint=CANDLE_UNIQUE_CONSTRAINT)
+
+    # xmax = 0 only for freshly inserted tuples
+    results = session.execute(
+        stmt.returning(literal_column("(xmax = 0)").label("inserted"))
+    ).scalars().all()
+
+    inserted = sum(1 for was_inserted in results if was_inserted)
+
+    return WriteCounts(
+        inserted=inserted,
+        updated=len(results) - inserted,
+    )
+
+
+def copy_candles(
+    session: Session,
+    rows: Iterable[CandleValues],
+    on_conflict: str = ON_CONFLICT_NOTHING,
+) -> WriteCounts:
+    """
+    High-throughput idempotent writer.
+
+    Steps:
+    1) COPY rows (one per key, see dedupe_rows) into a transaction-scoped
+       TEMP staging table
+    2) merge into candles with INSERT ... ON CONFLICT (one statement)
+
+    Runs inside the caller's transaction (commit/rollback stay with the unit).
+    """
+    _validate_on_conflict(on_conflict)
+
+    columns = ", ".join(CANDLE_COLUMNS)
+
+    if on_conflict == ON_CONFLICT_UPDATE:
+        conflict_action = (
+            "DO UPDATE SET "
+            "open = EXCLUDED.open, high = EXCLUDED.high, low = EXCLUDED.low, "
+            "close = EXCLUDED.close, volume = EXCLUDED.volume"
+        )
+    else:
+        conflict_action = "DO NOTHING"
+
+    dbapi_connection = session.connection().connection
+
+    with dbapi_connection.cursor() as cursor:
+        cursor.execute(
+            """
+            CREATE TEMP TABLE IF NOT EXISTS candles_staging (
+                exchange_market_id integer NOT NULL,
+                interval_id integer NOT NULL,
+                timestamp bigint NOT NULL,
+                open double precision NOT NULL,
+                high double precision NOT NULL,
+                low double precision NOT NULL,
+                close double precision NOT NULL,
+                volume double precision NOT NULL
+            ) ON COMMIT DROP
+            """
+        )
+        cursor.execute("TRUNCATE candles_staging")
+
+        cursor.copy_expert(
+            f"COPY candles_staging ({columns}) FROM STDIN WITH (FORMAT csv)",
+            build_copy_buffer(dedupe_rows(rows)),
+        )
+
+        # staged rows are already one per key (dedupe_rows, last one wins)
+        cursor.execute(
+            f"""
+            WITH merged AS (
+                INSERT INTO candles ({columns})
+                SELECT {columns}
+                FROM candles_staging
+                ON CONFLICT ON CONSTRAINT {CANDLE_UNIQUE_CONSTRAINT} {conflict_action}
+                RETURNING (xmax = 0) AS inserted
+            )
+            SELECT
+                count(*) FILTER (WHERE inserted),
+                count(*) FILTER (WHERE NOT inserted)
+            FROM merged
+            """
+        )
+        inserted, updated = cursor.fetchone()
+
+    return WriteCounts(inserted=inserted, updated=updated)
+
+
+def write_candles(
+    session: Session,
+    rows: Sequence[CandleValues],
+    on_conflict: str = ON_CONFLICT_NOTHING,
+) -> WriteCounts:
+    """
+    Pick the writer by batch size (COPY for large batches).
     """
     if not rows:
-        return 0
+        return WriteCounts()
 
-    session.bulk_save_objects(rows)
-    return len(rows)
+    if len(rows) >= PERSIST_COPY_THRESHOLD:
+        return copy_candles(session, rows, on_conflict=on_conflict)
+
+    return insert_candles(session, rows, on_conflict=on_conflict)
 
 
 # -------------------------------------------------
@@ -69,18 +270,39 @@ def persist_stage(
     session: Session,
     unit: IngestionUnit,
     filter_result: FilterResult,
+    on_conflict: str = ON_CONFLICT_NOTHING,
 ) -> PersistResult:
     """
     Persist filtered candles for a single ingestion unit.
+
+    Idempotent: rows that already exist are skipped (or updated with
+    on_conflict="update") instead of failing the whole unit.
     """
 
-    rows: List[CandleORM] = [
-        map_candle_to_row(unit, candle)
-        for candle in filter_result.new_candles
-    ]
+    rows: List[CandleValues] = map_candles_to_values(unit, filter_result.new_candles)
 
-    inserted = bulk_insert_candles(session, rows)
+    counts = write_candles(session, rows, on_conflict=on_conflict)
 
     return PersistResult(
-        inserted=inserted
+        inserted=counts.inserted,
+        skipped=len(rows) - counts.inserted - counts.updated,
+        updated=counts.updated,
+    )
+
+
+def cache_persisted_candles(
+    unit: IngestionUnit,
+    candles: Sequence[Candle],
+) -> None:
+    """
+    Post-commit: push newly stored candles into the recent-candles cache
+    read by the API. Best effort (a failed write only costs DB reads).
+    """
+    if not candles:
+        return
+
+    append_recent_candles(
+        unit.exchange_market_id,
+        unit.interval_id,
+        (row[2:] for row in map_candles_to_values(unit, candles)),
     )
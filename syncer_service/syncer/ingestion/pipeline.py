@@ -2,22 +2,31 @@ from __future__ import annotations
 
 import logging
 import time
-from typing import Callable
+from typing import Callable, MutableMapping, Optional
 
 from database.session import get_session
 
-from .types import IngestionUnit, IngestionSummary
-from .fetch import fetch_candles_for_unit
-from .filter import run_filter_stage
-from .persistence import persist_stage
-from .logging import log_unit_summary
+from syncer_service.syncer.backfill.gap_repair import enqueue_gap_repair
+
+from .types import IngestionUnit, IngestionSummary, WatermarkKey
+from .fetch import compute_fetch_limit, fetch_candles_for_unit
+from .filter import (
+    get_last_timestamp,
+    merge_gap_ranges,
+    quarantined_gap_ranges,
+    run_filter_stage,
+)
+from .persistence import cache_persisted_candles, persist_stage
+from .rollup import rollup_persisted
+from .logging import log_quarantined_candles, log_unit_summary
 
 
 def ingest_unit(
     session_factory: Callable = get_session,
     unit: IngestionUnit = None,
     logger: logging.Logger = None,
-    cycle_id: str | None = None
+    cycle_id: str | None = None,
+    watermarks: Optional[MutableMapping[WatermarkKey, int]] = None,
 ) -> IngestionSummary:
     """
     Run full ingestion pipeline for a single ingestion unit.
@@ -26,6 +35,16 @@ def ingest_unit(
     - Exactly ONE unit
     - Commit on success
     - Rollback on ANY exception
+
+    watermarks:
+    - optional preloaded last timestamps (see load_last_timestamps)
+    - advanced in place after commit so it stays valid across cycles
+
+    fetch size:
+    - only the candles after the watermark (+ small overlap) are fetched
+    - at most one page: the older part of a larger gap is detected by the
+      filter and handed to the gap-repair queue, so a long catch-up never
+      runs under the unit lock or blocks the worker
     """
 
     if unit is None:
@@ -52,10 +71,29 @@ def ingest_unit(
     )
 
     try:
+        # -------------------------
+        # fetch size from watermark (DB read only without preloaded map)
+        # -------------------------
+        if watermarks is None:
+            with session_factory() as session:
+                last_ts = get_last_timestamp(session, unit)
+        else:
+            last_ts = watermarks.get(unit.watermark_key)
+
+        # gap larger than one page -> newest page now, the rest via gap repair
+        fetch_limit = min(compute_fetch_limit(unit, last_ts), unit.fetch_limit)
+
+        # filter stage reuses the resolved watermark (no second max() query)
+        known = {unit.watermark_key: last_ts} if last_ts is not None else {}
+
         # -------------------------
         # fetch (no DB)
         # -------------------------
-        fetch_result = fetch_candles_for_unit(unit)
+        fetch_result = fetch_candles_for_unit(unit, limit=fetch_limit)
+
+        # bad rows were dropped by batch validation; the rest of the page is kept
+        if fetch_result.quarantined:
+            log_quarantined_candles(logger, unit, fetch_result.quarantined, cycle_id=cycle_id)
 
         with session_factory() as session:
             # -------------------------
@@ -65,6 +103,7 @@ def ingest_unit(
                 session=session,
                 unit=unit,
                 fetch_result=fetch_result,
+                watermarks=known,
             )
 
             # -------------------------
@@ -78,6 +117,44 @@ def ingest_unit(
 
         latency_ms = round((time.perf_counter() - start) * 1000, 2)
 
+        if watermarks is not None and filter_result.new_candles:
+            watermarks[unit.watermark_key] = filter_result.new_candles[-1].open_timestamp
+
+        # -------------------------
+        # recent-candles cache (post-commit, read first by the API)
+        # -------------------------
+        cache_persisted_candles(unit, filter_result.new_candles)
+
+        # -------------------------
+        # derived intervals (post-commit, touched buckets only)
+        # -------------------------
+        rollup_persisted(
+            unit,
+            filter_result.new_candles,
+            last_ts,
+            session_factory=session_factory,
+            cycle_id=cycle_id,
+        )
+
+        # -------------------------
+        # gap repair (post-commit, targeted ranges only; also the
+        # older part of a gap larger than one page and quarantined
+        # rows the watermark moved past)
+        # -------------------------
+        newest_ts = (
+            filter_result.new_candles[-1].open_timestamp
+            if filter_result.new_candles else None
+        )
+        gap_ranges = merge_gap_ranges([
+            *filter_result.gap_ranges,
+            *quarantined_gap_ranges(
+                fetch_result.quarantined, last_ts, newest_ts, unit.interval_ms
+            ),
+        ])
+
+        for gap_start, gap_end in gap_ranges:
+            enqueue_gap_repair(unit, gap_start, gap_end)
+
         # -------------------------
         # build summary (post-commit)
         # -------------------------
@@ -93,6 +170,9 @@ def ingest_unit(
             inserted_count=persist_result.inserted,
             dropped_last_open_candle=filter_result.dropped_last_open_candle,
             gap_warning=filter_result.gap_warning,
+            skipped_count=persist_result.skipped,
+            fetch_limit=fetch_limit,
+            quarantined_count=len(fetch_result.quarantined),
         )
 
         # -------------------------
@@ -0,0 +1,505 @@
+# syncer_service/syncer/ingestion/rollup.py
+"""
+Rollup of derived intervals (core/mapping/derived_interval_mapping.py).
+
+Supported markets with status "derived" are not fetched: their candles
+are resampled (core/candle_resample.py) from the stored base-interval
+candles of the same exchange market and upserted into candles under
+the derived interval_id, so the API serves them like fetched ones (a
+year of 1d is 365 stored rows, not 525k 1m rows aggregated per request).
+
+Maintained incrementally:
+- on ingest (rollup_persisted, after persist_stage commits): only the
+  buckets touched by the new base candles, from the bucket of the
+  previous watermark to the newest closed one
+- catch-up (catch_up_rollups, scheduler reload / run_candle_rollup):
+  recomputes every derived bucket from the rollup watermark up to the
+  last closed one, e.g. after an outage or a failed ingest rollup
+- backfill / gap repair rewind the watermark to the first rewritten
+  base candle, so the next catch-up rebuilds those buckets
+
+Rollup watermark: one Redis key per base series; every derived bucket
+ending at or before it is up to date. The ingest path only advances it
+when it continues from it. Redis is not the source of truth: without the
+key the catch-up continues after the newest stored derived candle.
+
+Only closed buckets are written: a bucket is closed once the base
+candle covering its last source slot is stored.
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+from dataclasses import dataclass
+from typing import Callable, Iterable, List, Optional, Sequence
+
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+from core.candle_cache import append_recent_candles, invalidate_recent_candles
+from core.candle_resample import (
+    CandleColumns,
+    align_down,
+    align_up,
+    can_resample,
+    resample_columns,
+)
+from core.mapping.derived_interval_mapping import RESAMPLE_BASE_INTERVAL
+from core.models.candle import Candle
+from core.models.enums import SupportedMarketStatus
+from core.redis_client import build_redis_client
+from database.models import Interval
+from database.session import get_session
+
+from syncer_service.syncer.ingestion.filter import get_last_timestamp
+from syncer_service.syncer.ingestion.persistence import ON_CONFLICT_UPDATE, write_candles
+from syncer_service.syncer.ingestion.targets import load_ingestion_units
+from syncer_service.syncer.ingestion.types import IngestionUnit
+
+logger = logging.getLogger(__name__)
+
+# base rows read (and resampled) per transaction
+ROLLUP_CHUNK_SOURCE_ROWS = int(os.getenv("ROLLUP_CHUNK_SOURCE_ROWS", "50000"))
+
+SOURCE_BOUNDS_QUERY = text("""
+    select min(timestamp), max(timestamp) from candles
+    where exchange_market_id = :ex_market_id
+      and interval_id = :interval
+""")
+
+SOURCE_ROWS_QUERY = text("""
+    select timestamp, open, high, low, close, volume
+    from candles
+    where exchange_market_id = :ex_market_id
+      and interval_id = :interval
+      and timestamp >= :start
+      and timestamp < :end
+    order by timestamp asc
+""")
+
+# KEYS[1] = key, ARGV = expected ('' = missing), value; returns 1 when set
+WATERMARK_CAS_SCRIPT = """
+local current = redis.call('GET', KEYS[1]) or ''
+if current == ARGV[1] then
+    redis.call('SET', KEYS[1], ARGV[2])
+    return 1
+end
+return 0
+"""
+
+# KEYS[1] = key, ARGV = value; lowers (or creates) the watermark
+WATERMARK_REWIND_SCRIPT = """
+local current = redis.call('GET', KEYS[1])
+if (not current) or tonumber(current) > tonumber(ARGV[1]) then
+    redis.call('SET', KEYS[1], ARGV[1])
+    return 1
+end
+return 0
+"""
+
+
+@dataclass(frozen=True)
+class RollupTarget:
+    """
+    A derived (exchange market, interval) and the base series it is built from.
+    """
+    unit: IngestionUnit
+    source_interval_id: int
+    source_interval_ms: int
+
+
+@dataclass
+class RollupResult:
+    written: int = 0
+    start: Optional[int] = None
+    end: Optional[int] = None
+
+
+# -------------------------------------------------
+# watermark
+# -------------------------------------------------
+
+def build_rollup_watermark_key(exchange_market_id: int, source_interval_id: int) -> str:
+    return f"rollup:watermark:{exchange_market_id}:{source_interval_id}"
+
+
+class RollupWatermark:
+    """
+    Rollup watermark of one base series (epoch ms, see module doc).
+    Reads return None and writes False when Redis is unavailable.
+    """
+
+    def __init__(self, exchange_market_id: int, source_interval_id: int):
+        self.key = build_rollup_watermark_key(exchange_market_id, source_interval_id)
+        self.redis = build_redis_client()
+
+    def get(self) -> Optional[int]:
+        try:
+            value = self.redis.get(self.key)
+        except Exception:
+            self._log_degraded("Rollup watermark read failed", "syncer.rollup.watermark_read_failed")
+            return None
+
+        return None if value is None else int(value)
+
+    def advance(self, expected: Optional[int], value: int) -> bool:
+        """
+        Set value if the watermark still equals expected (None = missing).
+        """
+        if expected is not None and value <= expected:
+            return False
+
+        return self._run(
+            WATERMARK_CAS_SCRIPT,
+            "" if expected is None else str(expected),
+            str(value),
+        )
+
+    def rewind(self, value: int) -> bool:
+        return self._run(WATERMARK_REWIND_SCRIPT, str(value))
+
+    def _run(self, script: str, *args: str) -> bool:
+        try:
+            return bool(self.redis.eval(script, 1, self.key, *args))
+        except Exception:
+            self._log_degraded("Rollup watermark write failed", "syncer.rollup.watermark_write_failed")
+            return False
+
+    def _log_degraded(self, message: str, event: str) -> None:
+        logger.exception(
+            message,
+            extra={
+                "service": "syncer-service",
+                "event": event,
+                "status": "degraded",
+                "operation": "candle_rollup",
+                "watermark_key": self.key,
+            },
+        )
+
+
+# -------------------------------------------------
+# targets
+# -------------------------------------------------
+
+def load_rollup_targets(
+    session: Session,
+    exchange_market_ids: Optional[Iterable[int]] = None,
+) -> List[RollupTarget]:
+    base = session.query(Interval).filter(
+        Interval.interval == RESAMPLE_BASE_INTERVAL.value,
+    ).one_or_none()
+
+    if base is None:
+        return []
+
+    if exchange_market_ids is not None:
+        exchange_market_ids = set(exchange_market_ids)
+
+    units = load_ingestion_units(session, status=SupportedMarketStatus.DERIVED.value)
+
+    return [
+        RollupTarget(unit=unit, source_interval_id=base.id, source_interval_ms=base.ms)
+        for unit in units
+        if (exchange_market_ids is None or unit.exchange_market_id in exchange_market_ids)
+        and can_resample(base.ms, unit.interval_ms)
+    ]
+
+
+def _is_base_unit(unit: IngestionUnit) -> bool:
+    return unit.interval == RESAMPLE_BASE_INTERVAL.value
+
+
+# -------------------------------------------------
+# rollup
+# -------------------------------------------------
+
+def rollup_range(
+    target: RollupTarget,
+    start: int,
+    end: int,
+    session_factory: Callable = get_session,
+    append_to_cache: bool = True,
+) -> int:
+    """
+    Re-derive the buckets with open time in [start, end) (both aligned,
+    every bucket closed). Returns the number of rows written.
+
+    append_to_cache: the range reaches the newest derived candle, so the
+    rows extend the recent-candles cache; otherwise the key is invalidated.
+    """
+    unit = target.unit
+    interval_ms = unit.interval_ms
+
+    if start >= end:
+        return 0
+
+    source = {"ex_market_id": unit.exchange_market_id, "interval": target.source_interval_id}
+    buckets_per_chunk = max(1, ROLLUP_CHUNK_SOURCE_ROWS * target.source_interval_ms // interval_ms)
+    step = buckets_per_chunk * interval_ms
+    written = 0
+
+    for chunk_start in range(start, end, step):
+        chunk_end = min(chunk_start + step, end)
+
+        with session_factory() as session:
+            rows = session.execute(
+                SOURCE_ROWS_QUERY, {**source, "start": chunk_start, "end": chunk_end}
+            ).mappings().all()
+
+            candles = resample_columns(CandleColumns.from_rows(rows), interval_ms)
+            values = [
+                (unit.exchange_market_id, unit.interval_id, *row)
+                for row in candles.values()
+            ]
+            write_candles(session, values, on_conflict=ON_CONFLICT_UPDATE)
+
+        written += len(values)
+
+        # post-commit, same as ingestion
+        if append_to_cache and values:
+            append_recent_candles(unit.exchange_market_id, unit.interval_id, candles.values())
+
+    if not append_to_cache and written:
+        invalidate_recent_candles(unit.exchange_market_id, unit.interval_id)
+
+    return written
+
+
+def rollup_target(
+    target: RollupTarget,
+    start: Optional[int] = None,
+    end: Optional[int] = None,
+    session_factory: Callable = get_session,
+    cycle_id: Optional[str] = None,
+) -> RollupResult:
+    """
+    Write the closed buckets of one derived series with open time in
+    [start, end). start defaults to the bucket after the newest stored
+    derived candle, end to the last closed bucket.
+    """
+    unit = target.unit
+    interval_ms = unit.interval_ms
+    source = {"ex_market_id": unit.exchange_market_id, "interval": target.source_interval_id}
+
+    with session_factory() as session:
+        first, last = session.execute(SOURCE_BOUNDS_QUERY, source).one()
+
+        if last is None:
+            return RollupResult()
+
+        closed_end = align_down(last + target.source_interval_ms, interval_ms)
+
+        if start is None:
+            stored = get_last_timestamp(session, unit)
+            # without a derived candle: first whole bucket of the base series
+            start = stored + interval_ms if stored is not None else align_up(first, interval_ms)
+        else:
+            start = align_up(max(start, first), interval_ms)
+
+    end = closed_end if end is None else min(align_up(end, interval_ms), closed_end)
+
+    written = rollup_range(
+        target, start, end,
+        session_factory=session_factory,
+        append_to_cache=end == closed_end,
+    )
+
+    if written:
+        logger.info(
+            "Derived candles rolled up",
+            extra={
+                "service": "syncer-service",
+                "event": "syncer.rollup.target_completed",
+                "status": "success",
+                "operation": "candle_rollup",
+                "cycle_id": cycle_id,
+                "exchange": unit.exchange_name,
+                "market_type": unit.market_type,
+                "symbol": unit.canonical_symbol,
+                "interval": unit.interval,
+                "written_count": written,
+                "start_ts": start,
+                "end_ts": end,
+            },
+        )
+
+    return RollupResult(written=written, start=start, end=end)
+
+
+def rollup_targets(
+    targets: Iterable[RollupTarget],
+    start: Optional[int] = None,
+    end: Optional[int] = None,
+    session_factory: Callable = get_session,
+    cycle_id: Optional[str] = None,
+) -> int:
+    """
+    Roll up every target; a failed target is logged and skipped.
+    Returns the number of rows written.
+    """
+    written = 0
+
+    for target in targets:
+        try:
+            written += rollup_target(
+                target, start, end, session_factory=session_factory, cycle_id=cycle_id
+            ).written
+        except Exception:
+            _log_target_failed(target, cycle_id)
+
+    return written
+
+
+# -------------------------------------------------
+# incremental maintenance
+# -------------------------------------------------
+
+def rollup_persisted(
+    unit: IngestionUnit,
+    candles: Sequence[Candle],
+    previous_ts: Optional[int],
+    session_factory: Callable = get_session,
+    cycle_id: Optional[str] = None,
+) -> int:
+    """
+    Ingest hook (post-commit): re-derive only the buckets touched by the
+    base candles just stored after previous_ts (the watermark they were
+    filtered against). Never raises; whatever fails is left to the catch-up.
+    """
+    if not candles or not _is_base_unit(unit):
+        return 0
+
+    first_ts = candles[0].open_timestamp
+    # the newest closed position of the base series
+    closed_before = candles[-1].open_timestamp + unit.interval_ms
+
+    watermark = RollupWatermark(unit.exchange_market_id, unit.interval_id)
+    expected = watermark.get()
+
+    written = 0
+    failed = False
+
+    try:
+        with session_factory() as session:
+            targets = load_rollup_targets(session, [unit.exchange_market_id])
+    except Exception:
+        targets = []
+        failed = True
+        logger.exception(
+            "Derived candle rollup failed",
+            extra={
+                "service": "syncer-service",
+                "event": "syncer.rollup.targets_failed",
+                "status": "degraded",
+                "operation": "candle_rollup",
+                "cycle_id": cycle_id,
+                "exchange": unit.exchange_name,
+                "market_type": unit.market_type,
+                "symbol": unit.canonical_symbol,
+            },
+        )
+
+    for target in targets:
+        interval_ms = target.unit.interval_ms
+        # the bucket of the previous watermark may have closed just now
+        start = (
+            align_down(previous_ts, interval_ms)
+            if previous_ts is not None else align_up(first_ts, interval_ms)
+        )
+
+        try:
+            written += rollup_range(
+                target, start, align_down(closed_before, interval_ms),
+                session_factory=session_factory,
+            )
+        except Exception:
+            failed = True
+            _log_target_failed(target, cycle_id)
+
+    # contiguous with the catch-up: nothing before previous_ts is pending
+    if not failed and previous_ts is not None and expected is not None and expected >= previous_ts:
+        watermark.advance(expected, closed_before)
+
+    return written
+
+
+def catch_up_rollups(
+    session_factory: Callable = get_session,
+    cycle_id: Optional[str] = None,
+    exchange_market_ids: Optional[Iterable[int]] = None,
+) -> int:
+    """
+    Recompute every derived bucket between the rollup watermark and the
+    last closed bucket, then move the watermark to the end of the stored
+    base series. Returns the number of rows written.
+    """
+    with session_factory() as session:
+        targets = load_rollup_targets(session, exchange_market_ids)
+
+    series = {}
+    for target in targets:
+        series.setdefault((target.unit.exchange_market_id, target.source_interval_id), []).append(target)
+
+    written = 0
+
+    for (exchange_market_id, source_interval_id), series_targets in series.items():
+        source_interval_ms = series_targets[0].source_interval_ms
+        watermark = RollupWatermark(exchange_market_id, source_interval_id)
+        expected = watermark.get()
+
+        with session_factory() as session:
+            _, last = session.execute(
+                SOURCE_BOUNDS_QUERY,
+                {"ex_market_id": exchange_market_id, "interval": source_interval_id},
+            ).one()
+
+        if last is None:
+            continue
+
+        closed_before = last + source_interval_ms
+        failed = False
+
+        for target in series_targets:
+            # the bucket containing the watermark is not complete yet
+            start = None if expected is None else align_down(expected, target.unit.interval_ms)
+
+            try:
+                written += rollup_target(
+                    target, start, session_factory=session_factory, cycle_id=cycle_id
+                ).written
+            except Exception:
+                failed = True
+                _log_target_failed(target, cycle_id)
+
+        if not failed:
+            watermark.advance(expected, closed_before)
+
+    return written
+
+
+def rewind_rollup_watermark(unit: IngestionUnit, start: int) -> None:
+    """
+    Base candles from start on were (re)written outside the ingest path
+    (backfill / gap repair): the next catch-up re-derives them.
+    """
+    if _is_base_unit(unit):
+        RollupWatermark(unit.exchange_market_id, unit.interval_id).rewind(start)
+
+
+def _log_target_failed(target: RollupTarget, cycle_id: Optional[str]) -> None:
+    logger.exception(
+        "Derived candle rollup failed",
+        extra={
+            "service": "syncer-service",
+            "event": "syncer.rollup.target_failed",
+            "status": "error",
+            "operation": "candle_rollup",
+            "cycle_id": cycle_id,
+            "exchange": target.unit.exchange_name,
+            "market_type": target.unit.market_type,
+            "symbol": target.unit.canonical_symbol,
+            "interval": target.unit.interval,
+        },
+    )
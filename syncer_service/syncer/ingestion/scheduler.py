@@ -0,0 +1,365 @@
+from __future__ import annotations
+
+import heapq
+import itertools
+import logging
+import os
+import random
+import time
+import threading
+import uuid
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Callable, Dict, Iterable, List, Optional, Set, Tuple
+
+from database.candle_partitions import maintain_candle_partitions
+from database.session import get_session
+
+from syncer_service.syncer.backfill.gap_repair import drain_gap_repairs, scan_unit_gaps
+from syncer_service.syncer.ingestion.executor import IngestionExecutor
+from syncer_service.syncer.ingestion.filter import load_last_timestamps
+from syncer_service.syncer.ingestion.rollup import catch_up_rollups
+from syncer_service.syncer.ingestion.targets import load_ingestion_units
+from syncer_service.syncer.ingestion.types import IngestionUnit, Watermarks
+
+logger = logging.getLogger(__name__)
+
+# fire this long after the close boundary so the exchange has published the candle
+SCHEDULER_CLOSE_DELAY_MS = int(os.getenv("SCHEDULER_CLOSE_DELAY_MS", "2000"))
+# random spread added per unit so units sharing a boundary do not burst together
+SCHEDULER_JITTER_MS = int(os.getenv("SCHEDULER_JITTER_MS", "1000"))
+# how often the unit list / watermarks are reloaded and gap repairs drained
+SCHEDULER_RELOAD_SECONDS = int(os.getenv("SCHEDULER_RELOAD_SECONDS", "300"))
+# pause after a failed scheduler step (e.g. DB unavailable during reload)
+SCHEDULER_ERROR_BACKOFF_SECONDS = 5
+
+
+# -------------------------------------------------
+# timing
+# -------------------------------------------------
+
+def next_close_boundary(interval_ms: int, now_ms: int) -> int:
+    """
+    Close time of the currently open candle (strictly after now_ms).
+    """
+    return now_ms - (now_ms % interval_ms) + interval_ms
+
+
+def next_due_ms(
+    interval_ms: int,
+    now_ms: int,
+    delay_ms: int = SCHEDULER_CLOSE_DELAY_MS,
+    jitter_ms: int = SCHEDULER_JITTER_MS,
+    rng: Callable[[], float] = random.random,
+) -> int:
+    """
+    When a unit should run next: next close boundary + delay + jitter.
+
+    Always derived from the wall clock (never from the previous due time),
+    so a slow cycle cannot accumulate drift: it simply lands on the
+    next boundary.
+    """
+    jitter = int(rng() * jitter_ms) if jitter_ms > 0 else 0
+    return next_close_boundary(interval_ms, now_ms) + delay_ms + jitter
+
+
+# -------------------------------------------------
+# scheduler
+# -------------------------------------------------
+
+def load_units_and_watermarks() -> Tuple[List[IngestionUnit], Watermarks]:
+    with get_session() as session:
+        units = load_ingestion_units(session)
+        watermarks = load_last_timestamps(session, units)
+
+    return units, watermarks
+
+
+def maintain_partitions() -> List[str]:
+    with get_session() as session:
+        return maintain_candle_partitions(session)
+
+
+def scan_stored_gaps(units: Iterable[IngestionUnit]) -> int:
+    with get_session() as session:
+        return sum(scan_unit_gaps(session, unit) for unit in units)
+
+
+class CandleScheduler:
+    """
+    Per-unit, interval-aligned ingestion scheduler.
+
+    - priority queue of (next_due_ms, unit), earliest first
+    - each unit fires shortly after its own candle close boundary
+      (1m units every minute, 1h units every hour, ...)
+    - a due unit is submitted on its own to the executor's long-lived
+      pool and rescheduled from its own completion, so a slow unit
+      (exchange timeout, large page) never delays the others
+    - a unit is rescheduled from the current time: boundaries it missed
+      while running are skipped, not replayed (the adaptive fetch covers them)
+    - unit list and watermarks are reloaded every `reload_seconds`;
+      candle partitions for the coming months are created, stored gaps
+      scanned, gap repairs drained and derived intervals caught up from
+      the rollup watermark at the same time, in the background (ingestion itself keeps the
+      touched derived buckets current)
+    """
+
+    def __init__(
+        self,
+        executor: Optional[IngestionExecutor] = None,
+        load_fn: Callable[[], Tuple[List[IngestionUnit], Watermarks]] = load_units_and_watermarks,
+        repair_fn: Callable = drain_gap_repairs,
+        scan_fn: Callable[[Iterable[IngestionUnit]], int] = scan_stored_gaps,
+        partition_fn: Callable = maintain_partitions,
+        rollup_fn: Callable = catch_up_rollups,
+        reload_seconds: int = SCHEDULER_RELOAD_SECONDS,
+        delay_ms: int = SCHEDULER_CLOSE_DELAY_MS,
+        jitter_ms: int = SCHEDULER_JITTER_MS,
+        clock: Callable[[], float] = time.time,
+        sleep: Callable[[float], None] = time.sleep,
+        rng: Callable[[], float] = random.random,
+    ) -> None:
+        self.executor = executor if executor is not None else IngestionExecutor()
+        self.load_fn = load_fn
+        self.repair_fn = repair_fn
+        self.scan_fn = scan_fn
+        self.partition_fn = partition_fn
+        self.rollup_fn = rollup_fn
+        self.reload_ms = reload_seconds * 1000
+        self.delay_ms = delay_ms
+        self.jitter_ms = jitter_ms
+        self.clock = clock
+        self.sleep = sleep
+        self.rng = rng
+
+        self.watermarks: Watermarks = {}
+        self._heap: List[Tuple[int, int, IngestionUnit]] = []
+        self._due: Dict[IngestionUnit, int] = {}
+        self._units: Set[IngestionUnit] = set()
+        self._running: Set[IngestionUnit] = set()
+        self._seq = itertools.count()
+        self._next_reload_ms = 0
+
+        # completion callbacks run on worker threads
+        self._lock = threading.RLock()
+        self._wakeup = threading.Event()
+
+        self._maintenance = ThreadPoolExecutor(
+            max_workers=1, thread_name_prefix="scheduler-maintenance"
+        )
+        self._maintenance_future: Optional[Future] = None
+
+    def now_ms(self) -> int:
+        return int(self.clock() * 1000)
+
+    # -------------------------
+    # queue
+    # -------------------------
+
+    def schedule(self, unit: IngestionUnit, due_ms: int) -> None:
+        with self._lock:
+            self._due[unit] = due_ms
+            heapq.heappush(self._heap, (due_ms, next(self._seq), unit))
+
+    def next_due(self) -> Optional[int]:
+        with self._lock:
+            self._discard_stale()
+            return self._heap[0][0] if self._heap else None
+
+    def pop_due(self, now_ms: int) -> List[IngestionUnit]:
+        """
+        Pop every unit whose due time has passed.
+        """
+        due: List[IngestionUnit] = []
+
+        with self._lock:
+            while self.next_due() is not None and self._heap[0][0] <= now_ms:
+                _, _, unit = heapq.heappop(self._heap)
+                del self._due[unit]
+                due.append(unit)
+
+        return due
+
+    def _discard_stale(self) -> None:
+        # entries of removed / rescheduled units are dropped lazily
+        while self._heap:
+            due_ms, _, unit = self._heap[0]
+            if self._due.get(unit) == due_ms:
+                return
+            heapq.heappop(self._heap)
+
+    # -------------------------
+    # reload
+    # -------------------------
+
+    def reload(self, now_ms: int) -> None:
+        """
+        Sync the queue with the current unit list.
+
+        New units are due immediately (catch-up), removed units are
+        dropped (a running one is not rescheduled), existing units keep
+        their slot. Watermarks are replaced with a fresh grouped read.
+        """
+        units, watermarks = self.load_fn()
+
+        with self._lock:
+            self.watermarks = watermarks
+            self._units = set(units)
+
+            for unit in list(self._due):
+                if unit not in self._units:
+                    del self._due[unit]
+
+            for unit in units:
+                if unit not in self._due and unit not in self._running:
+                    self.schedule(unit, now_ms)
+
+            self._next_reload_ms = now_ms + self.reload_ms
+
+    # -------------------------
+    # loop
+    # -------------------------
+
+    def tick(self) -> List[IngestionUnit]:
+        """
+        One scheduler step: reload if needed, submit due units.
+        Returns the units that were submitted.
+        """
+        now_ms = self.now_ms()
+
+        if now_ms >= self._next_reload_ms:
+            self.reload(now_ms)
+            self._start_maintenance()
+
+        units = self.pop_due(now_ms)
+
+        for unit in units:
+            self._submit(unit)
+
+        return units
+
+    def run_forever(self) -> None:
+        while True:
+            try:
+                self.tick()
+            except Exception:
+                logger.exception(
+                    "Scheduler step failed",
+                    extra={
+                        "service": "syncer-service",
+                        "event": "syncer.scheduler.tick_failed",
+                        "status": "error",
+                        "operation": "candle_scheduler",
+                    },
+                )
+                self.sleep(SCHEDULER_ERROR_BACKOFF_SECONDS)
+                continue
+
+            now_ms = self.now_ms()
+            next_due = self.next_due()
+            wake_ms = self._next_reload_ms if next_due is None else min(next_due, self._next_reload_ms)
+
+            if wake_ms > now_ms:
+                # a completed unit may schedule an earlier due time
+                self._wakeup.wait((wake_ms - now_ms) / 1000)
+                self._wakeup.clear()
+
+    def _submit(self, unit: IngestionUnit) -> None:
+        with self._lock:
+            self._running.add(unit)
+            watermarks = self.watermarks
+
+        future = self.executor.submit(
+            unit, cycle_id=str(uuid.uuid4()), watermarks=watermarks
+        )
+        future.add_done_callback(lambda done: self._on_unit_done(unit))
+
+    def _on_unit_done(self, unit: IngestionUnit) -> None:
+        due_ms = next_due_ms(
+            unit.interval_ms,
+            self.now_ms(),
+            delay_ms=self.delay_ms,
+            jitter_ms=self.jitter_ms,
+            rng=self.rng,
+        )
+
+        with self._lock:
+            self._running.discard(unit)
+            if unit in self._units and unit not in self._due:
+                self.schedule(unit, due_ms)
+
+        self._wakeup.set()
+
+    def _start_maintenance(self) -> None:
+        # partitions / gap repairs / rollup catch-up never hold up due units
+        if self._maintenance_future is not None and not self._maintenance_future.done():
+            return
+
+        self._maintenance_future = self._maintenance.submit(self._run_maintenance)
+
+    def _run_maintenance(self) -> None:
+        self._maintain_partitions()
+        self._scan_gaps()
+        self._drain_gap_repairs()
+        self._catch_up_rollups()
+
+    def _maintain_partitions(self) -> None:
+        # rows without a monthly partition land in the default one; not fatal
+        try:
+            self.partition_fn()
+        except Exception:
+            logger.exception(
+                "Candle partition maintenance failed",
+                extra={
+                    "service": "syncer-service",
+                    "event": "syncer.partitions.maintenance_failed",
+                    "status": "degraded",
+                    "operation": "candle_partitions",
+                },
+            )
+
+    def _catch_up_rollups(self) -> None:
+        # derived intervals stay behind until the next reload; not fatal
+        try:
+            self.rollup_fn()
+        except Exception:
+            logger.exception(
+                "Derived candle catch-up failed",
+                extra={
+                    "service": "syncer-service",
+                    "event": "syncer.rollup.catch_up_failed",
+                    "status": "degraded",
+                    "operation": "candle_rollup",
+                },
+            )
+
+    def _scan_gaps(self) -> None:
+        # the periodic scan: holes already stored (e.g. missed live detection)
+        with self._lock:
+            units = list(self._units)
+
+        try:
+            self.scan_fn(units)
+        except Exception:
+            logger.exception(
+                "Gap scan failed",
+                extra={
+                    "service": "syncer-service",
+                    "event": "syncer.gap_repair.scan_failed",
+                    "status": "degraded",
+                    "operation": "gap_repair",
+                },
+            )
+
+    def _drain_gap_repairs(self) -> None:
+        try:
+            self.repair_fn()
+        except Exception:
+            logger.exception(
+                "Gap repair drain failed",
+                extra={
+                    "service": "syncer-service",
+                    "event": "syncer.gap_repair.drain_failed",
+                    "status": "degraded",
+                    "operation": "gap_repair",
+                },
+            )
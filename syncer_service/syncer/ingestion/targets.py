@@ -21,6 +21,7 @@ def load_ingestion_units(
     supported_market_ids: Optional[Iterable[int]] = None,
     interval_ids: Optional[Iterable[int]] = None,
     only_active: bool = True,
+    status: Optional[str] = None,
 ) -> List[IngestionUnit]:
     """
     Load ingestion units from database metadata.
@@ -28,6 +29,7 @@ def load_ingestion_units(
     Allowed filters (Phase 4B):
     - supported_market_ids
     - interval_ids
+    - status (overrides only_active, e.g. "derived" for the rollup targets)
 
     This function:
     - does NOT manage session lifecycle
@@ -52,7 +54,11 @@ def load_ingestion_units(
         .join(CanonicalSymbol, ExchangeMarket.canonical_symbol_id == CanonicalSymbol.id)
     )
 
-    if only_active:
+    if status is not None:
+        query = query.filter(
+            SupportedMarket.status == status,
+        )
+    elif only_active:
         query = query.filter(
             SupportedMarket.status == "active",
         )
@@ -1,12 +1,13 @@
 from __future__ import annotations
 
 from dataclasses import dataclass, field
-from typing import List, Optional, Sequence
+from typing import Dict, List, Optional, Sequence, Tuple
 
 # NOTE:
 # Candle is the canonical candle object produced by adapters (core layer)
 # Do NOT import ORM models here.
 from core.models.candle import Candle
+from core.models.candle_batch import QuarantinedCandle
 
 
 # =========================
@@ -32,8 +33,21 @@ class IngestionUnit:
     interval: str  # canonical interval string from DB (e.g., "1m", "5m")
     interval_ms: int
 
+    # cold-start page size; also the largest gap fetched without backfill
     fetch_limit: int = 1000
 
+    @property
+    def watermark_key(self) -> "WatermarkKey":
+        return (self.exchange_market_id, self.interval_id)
+
+
+# (exchange_market_id, interval_id) -> last stored candle timestamp
+WatermarkKey = Tuple[int, int]
+Watermarks = Dict[WatermarkKey, int]
+
+# missing [start, end) open-time range of one unit
+GapRange = Tuple[int, int]
+
 
 # =========================
 # Fetch Stage
@@ -41,11 +55,15 @@ class IngestionUnit:
 
 @dataclass
 class FetchResult:
-    candles: List[Candle]
+    # List[Candle] or a columnar core.models.candle_batch.CandleBatch
+    candles: Sequence[Candle]
     fetched_count: int
     min_ts: Optional[int]
     max_ts: Optional[int]
 
+    # rows rejected by batch validation (not persisted)
+    quarantined: List[QuarantinedCandle] = field(default_factory=list)
+
 
 # =========================
 # Filter Stage
@@ -53,13 +71,16 @@ class FetchResult:
 
 @dataclass
 class FilterResult:
-    new_candles: List[Candle]
+    new_candles: Sequence[Candle]
 
     dropped_last_open_candle: bool
     gap_warning: bool
 
     last_ts: Optional[int]
 
+    # missing [start, end) open-time ranges when gap_warning is set
+    gap_ranges: List[GapRange] = field(default_factory=list)
+
 
 # =========================
 # Persistence Stage
@@ -68,6 +89,8 @@ class FilterResult:
 @dataclass
 class PersistResult:
     inserted: int
+    skipped: int = 0  # already stored (ON CONFLICT DO NOTHING)
+    updated: int = 0  # overwritten (ON CONFLICT DO UPDATE)
 
 
 # =========================
@@ -94,3 +117,10 @@ class IngestionSummary:
     # flags
     dropped_last_open_candle: bool
     gap_warning: bool
+
+    skipped_count: int = 0
+
+    # adaptive fetch size
+    fetch_limit: Optional[int] = None
+
+    quarantined_count: int = 0
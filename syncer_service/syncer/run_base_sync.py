@@ -8,7 +8,9 @@ from syncer_service.syncer.tasks.sync_symbols import sync_symbols
 from syncer_service.syncer.tasks.sync_intervals import sync_intervals
 from syncer_service.syncer.tasks.sync_exchange_markets import sync_exchange_markets
 from syncer_service.syncer.tasks.sync_supported_markets import sync_supported_markets
+from syncer_service.syncer.tasks.materialize_metadata import materialize_metadata
 from database.session import get_session
+from core.metadata_version import bump_metadata_version
 
 logger = logging.getLogger(__name__)
 
@@ -47,6 +49,12 @@ def run_base_sync(session):
         results["supported_markets"] = sync_supported_markets(session, cycle_id=cycle_id)
         session.commit()
 
+        # document first: a reader never sees a version newer than it
+        results["metadata_document"] = materialize_metadata(session, cycle_id=cycle_id)
+
+        # API metadata snapshots reload on the next request
+        bump_metadata_version()
+
         latency_ms = round((time.perf_counter() - start) * 1000, 2)
 
         logger.info(
@@ -0,0 +1,210 @@
+# syncer_service/syncer/run_candle_archive.py
+"""
+Move old candles from PostgreSQL into the Parquet archive
+(database/candle_archive.py).
+
+Whole UTC months older than CANDLE_ARCHIVE_AFTER_DAYS are archived per
+series, one transaction per month: DELETE ... RETURNING, write the
+month file (merged with what is already archived), raise the archive
+boundary, then commit. A crash before the commit leaves the rows in
+PostgreSQL; the next run folds them in again.
+
+Example:
+    python -m syncer_service.syncer.run_candle_archive --older-than-days 365
+"""
+
+from __future__ import annotations
+
+import argparse
+import logging
+import time
+import uuid
+from typing import Callable, Optional
+
+from sqlalchemy import text
+
+from database.candle_archive import (
+    ARCHIVE_AVAILABLE,
+    CANDLE_ARCHIVE_AFTER_DAYS,
+    CANDLE_ARCHIVE_DIR,
+    CandleArchive,
+)
+from database.candle_partitions import month_bounds_ms, month_of, months_between
+from database.session import get_session
+
+from syncer_service.syncer.ingestion.targets import load_ingestion_units
+from syncer_service.syncer.ingestion.types import IngestionUnit
+
+logger = logging.getLogger(__name__)
+
+DAY_MS = 24 * 60 * 60 * 1000
+
+OLDEST_BELOW_QUERY = text("""
+    select min(timestamp) from candles
+    where exchange_market_id = :ex_market_id
+      and interval_id = :interval
+      and timestamp < :cutoff
+""")
+
+DELETE_RANGE_QUERY = text("""
+    delete from candles
+    where exchange_market_id = :ex_market_id
+      and interval_id = :interval
+      and timestamp >= :start
+      and timestamp < :end
+    returning timestamp, open, high, low, close, volume
+""")
+
+
+def archive_cutoff_ms(now_ms: int, older_than_days: int) -> int:
+    """
+    Start of the month containing now - older_than_days: only whole
+    months before it are archived.
+    """
+    start, _ = month_bounds_ms(month_of(now_ms - older_than_days * DAY_MS))
+    return start
+
+
+def archive_unit(
+    unit: IngestionUnit,
+    cutoff: int,
+    archive: CandleArchive,
+    session_factory: Callable = get_session,
+    cycle_id: str | None = None,
+) -> int:
+    """
+    Archive every stored candle of the unit older than cutoff.
+    Returns the number of rows moved.
+    """
+    series = {"ex_market_id": unit.exchange_market_id, "interval": unit.interval_id}
+
+    with session_factory() as session:
+        oldest = session.execute(OLDEST_BELOW_QUERY, {**series, "cutoff": cutoff}).scalar()
+
+    if oldest is None:
+        return 0
+
+    moved = 0
+
+    for month in months_between(oldest, cutoff):
+        start, end = month_bounds_ms(month)
+
+        with session_factory() as session:
+            rows = session.execute(
+                DELETE_RANGE_QUERY, {**series, "start": start, "end": end}
+            ).mappings().all()
+
+            if rows:
+                archive.write_month(unit.exchange_market_id, unit.interval_id, month, rows)
+
+            # raised before the commit: readers never miss the deleted rows
+            archive.set_boundary(unit.exchange_market_id, unit.interval_id, end)
+
+        moved += len(rows)
+
+    logger.info(
+        "Candles archived",
+        extra={
+            "service": "syncer-service",
+            "event": "syncer.archive.unit_completed",
+            "status": "success",
+            "operation": "candle_archive",
+            "cycle_id": cycle_id,
+            "exchange": unit.exchange_name,
+            "market_type": unit.market_type,
+            "symbol": unit.canonical_symbol,
+            "interval": unit.interval,
+            "archived_count": moved,
+            "archived_before": cutoff,
+        },
+    )
+
+    return moved
+
+
+def main(
+    cycle_id: str,
+    older_than_days: int = CANDLE_ARCHIVE_AFTER_DAYS,
+    archive_dir: str = CANDLE_ARCHIVE_DIR,
+    now_ms: Optional[int] = None,
+) -> None:
+    if not ARCHIVE_AVAILABLE or not archive_dir:
+        raise RuntimeError("Candle archive needs pyarrow and CANDLE_ARCHIVE_DIR")
+
+    if now_ms is None:
+        now_ms = int(time.time() * 1000)
+
+    archive = CandleArchive(archive_dir)
+    cutoff = archive_cutoff_ms(now_ms, older_than_days)
+
+    with get_session() as session:
+        units = load_ingestion_units(session, only_active=False)
+
+    logger.info(
+        "Starting candle archive job",
+        extra={
+            "service": "syncer-service",
+            "event": "syncer.archive.job_started",
+            "status": "started",
+            "operation": "candle_archive",
+            "cycle_id": cycle_id,
+            "unit_count": len(units),
+            "archived_before": cutoff,
+        },
+    )
+
+    job_start = time.perf_counter()
+    moved = 0
+    failed = 0
+
+    for unit in units:
+        try:
+            moved += archive_unit(unit, cutoff, archive, cycle_id=cycle_id)
+        except Exception:
+            failed += 1
+            logger.exception(
+                "Candle archive unit failed",
+                extra={
+                    "service": "syncer-service",
+                    "event": "syncer.archive.unit_failed",
+                    "status": "error",
+                    "operation": "candle_archive",
+                    "cycle_id": cycle_id,
+                    "exchange": unit.exchange_name,
+                    "market_type": unit.market_type,
+                    "symbol": unit.canonical_symbol,
+                    "interval": unit.interval,
+                },
+            )
+
+    logger.info(
+        "Candle archive job completed",
+        extra={
+            "service": "syncer-service",
+            "event": "syncer.archive.job_completed",
+            "status": "success" if failed == 0 else "partial_success",
+            "operation": "candle_archive",
+            "cycle_id": cycle_id,
+            "unit_count": len(units),
+            "failed_count": failed,
+            "archived_count": moved,
+            "latency_ms": round((time.perf_counter() - job_start) * 1000, 2),
+        },
+    )
+
+
+if __name__ == "__main__":
+    from core.observability.logging_config import configure_logging
+
+    parser = argparse.ArgumentParser(description="Archive old candles to Parquet")
+    parser.add_argument("--older-than-days", type=int, default=CANDLE_ARCHIVE_AFTER_DAYS)
+    parser.add_argument("--dir", default=CANDLE_ARCHIVE_DIR, help="archive root directory")
+    args = parser.parse_args()
+
+    configure_logging()
+
+    main(
+        cycle_id=str(uuid.uuid4()),
+        older_than_days=args.older_than_days,
+        archive_dir=args.dir,
+    )
@@ -0,0 +1,160 @@
+# syncer_service/syncer/run_candle_backfill.py
+"""
+One-shot historical backfill.
+
+Example:
+    python -m syncer_service.syncer.run_candle_backfill \
+        --start 2024-01-01 --end 2024-07-01 --exchange hyperliquid --interval 1m
+"""
+
+from __future__ import annotations
+
+import argparse
+import logging
+import time
+import uuid
+from datetime import datetime, timezone
+from typing import List, Optional
+
+from database.candle_partitions import ensure_candle_partitions
+from database.session import get_session
+
+from syncer_service.syncer.backfill.engine import BACKFILL_MAX_WORKERS, backfill_unit
+from syncer_service.syncer.ingestion.targets import load_ingestion_units
+from syncer_service.syncer.ingestion.types import IngestionUnit
+
+logger = logging.getLogger(__name__)
+
+
+def parse_timestamp_ms(value: str) -> int:
+    """
+    Accept epoch milliseconds or an ISO-8601 date/datetime (UTC if naive).
+    """
+    if value.isdigit():
+        return int(value)
+
+    parsed = datetime.fromisoformat(value)
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+
+    return int(parsed.timestamp() * 1000)
+
+
+def select_units(
+    units: List[IngestionUnit],
+    exchange: Optional[str] = None,
+    market_type: Optional[str] = None,
+    symbol: Optional[str] = None,
+    interval: Optional[str] = None,
+) -> List[IngestionUnit]:
+    return [
+        unit for unit in units
+        if (exchange is None or unit.exchange_name == exchange)
+        and (market_type is None or unit.market_type == market_type)
+        and (symbol is None or unit.canonical_symbol == symbol)
+        and (interval is None or unit.interval == interval)
+    ]
+
+
+def main(
+    start: int,
+    end: int,
+    cycle_id: str,
+    exchange: Optional[str] = None,
+    market_type: Optional[str] = None,
+    symbol: Optional[str] = None,
+    interval: Optional[str] = None,
+    max_workers: int = BACKFILL_MAX_WORKERS,
+) -> None:
+    with get_session() as session:
+        units = load_ingestion_units(session)
+        # history goes straight into monthly partitions, not the default one
+        ensure_candle_partitions(session, start, end)
+
+    units = select_units(units, exchange, market_type, symbol, interval)
+
+    logger.info(
+        "Starting candle backfill job",
+        extra={
+            "service": "syncer-service",
+            "event": "syncer.backfill.job_started",
+            "status": "started",
+            "operation": "backfill",
+            "cycle_id": cycle_id,
+            "unit_count": len(units),
+            "start_ts": start,
+            "end_ts": end,
+        },
+    )
+
+    job_start = time.perf_counter()
+    failed = 0
+
+    for unit in units:
+        try:
+            result = backfill_unit(
+                unit,
+                start,
+                end,
+                max_workers=max_workers,
+                cycle_id=cycle_id,
+            )
+            if result.windows_failed:
+                failed += 1
+        except Exception:
+            failed += 1
+            logger.exception(
+                "Backfill unit failed",
+                extra={
+                    "service": "syncer-service",
+                    "event": "syncer.backfill.unit_failed",
+                    "status": "error",
+                    "operation": "backfill",
+                    "cycle_id": cycle_id,
+                    "exchange": unit.exchange_name,
+                    "market_type": unit.market_type,
+                    "symbol": unit.canonical_symbol,
+                    "interval": unit.interval,
+                },
+            )
+
+    logger.info(
+        "Candle backfill job completed",
+        extra={
+            "service": "syncer-service",
+            "event": "syncer.backfill.job_completed",
+            "status": "success" if failed == 0 else "partial_success",
+            "operation": "backfill",
+            "cycle_id": cycle_id,
+            "unit_count": len(units),
+            "failed_count": failed,
+            "latency_ms": round((time.perf_counter() - job_start) * 1000, 2),
+        },
+    )
+
+
+if __name__ == "__main__":
+    from core.observability.logging_config import configure_logging
+
+    parser = argparse.ArgumentParser(description="Backfill historical candles")
+    parser.add_argument("--start", required=True, help="epoch ms or ISO date (inclusive)")
+    parser.add_argument("--end", help="epoch ms or ISO date (exclusive), default now")
+    parser.add_argument("--exchange")
+    parser.add_argument("--market-type")
+    parser.add_argument("--symbol", help="canonical symbol, e.g. BTC/USDC")
+    parser.add_argument("--interval")
+    parser.add_argument("--workers", type=int, default=BACKFILL_MAX_WORKERS)
+    args = parser.parse_args()
+
+    configure_logging()
+
+    main(
+        start=parse_timestamp_ms(args.start),
+        end=parse_timestamp_ms(args.end) if args.end else int(time.time() * 1000),
+        cycle_id=str(uuid.uuid4()),
+        exchange=args.exchange,
+        market_type=args.market_type,
+        symbol=args.symbol,
+        interval=args.interval,
+        max_workers=args.workers,
+    )
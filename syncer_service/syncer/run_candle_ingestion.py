@@ -6,8 +6,9 @@ from database.session import get_session
 from database.models import Exchange
 
 from syncer_service.syncer.ingestion.targets import load_ingestion_units
-from syncer_service.syncer.ingestion.pipeline import ingest_unit
-from syncer_service.syncer.redis_lock import candle_sync_lock
+from syncer_service.syncer.ingestion.filter import load_last_timestamps
+from syncer_service.syncer.ingestion.executor import IngestionExecutor
+from syncer_service.syncer.backfill.gap_repair import drain_gap_repairs
 
 
 def preflight_validation() -> None:
@@ -23,7 +24,7 @@ def preflight_validation() -> None:
             )
 
 
-def main(cycle_id: str) -> None:
+def main(cycle_id: str, executor: IngestionExecutor | None = None) -> None:
     # -------------------------
     # bootstrap
     # -------------------------
@@ -45,10 +46,11 @@ def main(cycle_id: str) -> None:
     preflight_validation()
 
     # -------------------------
-    # load ingestion units
+    # load ingestion units + watermarks (one grouped query)
     # -------------------------
     with get_session() as session:
         units = load_ingestion_units(session)
+        watermarks = load_last_timestamps(session, units)
 
     if not units:
         logger.warning(
@@ -77,54 +79,30 @@ def main(cycle_id: str) -> None:
         )
 
     # -------------------------
-    # run ingestion per unit
+    # run ingestion per unit (bounded concurrency)
     # -------------------------
-    success = 0
-    failed = 0
-    skipped = 0
-
-    for unit in units:
-        try:
-            with candle_sync_lock(unit) as acquired:
-                if not acquired:
-                    skipped += 1
-                    logger.info(
-                        "Ingestion unit skipped because lock already exists",
-                        extra={
-                            "service": "syncer-service",
-                            "event": "syncer.unit_skipped_locked",
-                            "status": "skipped",
-                            "operation": "candle_ingestion",
-                            "exchange": unit.exchange_name,
-                            "market_type": unit.market_type,
-                            "symbol": unit.canonical_symbol,
-                            "interval": unit.interval,
-                            "cycle_id": cycle_id,
-                        },
-                    )
-                    continue
-                
-                # اینجا توی باکس اکوایر اجرا رو ادامه میدیم که بعد از اجرای این فانالی ردیس لاک اجرا شه
-                ingest_unit(unit=unit, cycle_id= cycle_id)
-                success += 1
-
-        except Exception as exc:
-            failed += 1
-            logger.exception(
-                "Ingestion failed",
-                extra={
-                    "service": "syncer-service",
-                    "event": "syncer.unit_failed",
-                    "status": "error",
-                    "operation": "fetch_candles",
-                    "exchange": unit.exchange_name,
-                    "market_type": unit.market_type,
-                    "symbol": unit.canonical_symbol,
-                    "interval": unit.interval,
-                    "error_message": str(exc),
-                    "cycle_id": cycle_id,
-                },
-            )
+    if executor is None:
+        executor = IngestionExecutor()
+
+    report = executor.run(units, cycle_id=cycle_id, watermarks=watermarks)
+
+    # -------------------------
+    # repair queued gaps (targeted range fetches)
+    # -------------------------
+    try:
+        repaired = drain_gap_repairs(cycle_id=cycle_id)
+    except Exception:
+        repaired = 0
+        logger.exception(
+            "Gap repair drain failed",
+            extra={
+                "service": "syncer-service",
+                "event": "syncer.gap_repair.drain_failed",
+                "status": "degraded",
+                "operation": "gap_repair",
+                "cycle_id": cycle_id,
+            },
+        )
 
     # -------------------------
     # job summary
@@ -134,11 +112,14 @@ def main(cycle_id: str) -> None:
         extra={
             "service": "syncer-service",
             "event": "syncer.job_completed",
-            "status": "success" if failed == 0 else "partial_success",
+            "status": "success" if report.failed == 0 else "partial_success",
             "operation": "candle_ingestion",
-            "success_count": success,
-            "failed_count": failed,
-            "skipped_count": skipped,
+            "success_count": report.success,
+            "failed_count": report.failed,
+            "skipped_count": report.skipped,
+            "gap_repaired_count": repaired,
+            "max_workers": executor.max_workers,
+            "per_exchange_concurrency": executor.per_exchange_concurrency,
             "cycle_id": cycle_id,
         },
     )
@@ -0,0 +1,113 @@
+# syncer_service/syncer/run_candle_rollup.py
+"""
+Rebuild derived intervals from stored base candles
+(syncer_service/syncer/ingestion/rollup.py), e.g. after a base backfill.
+
+Without --start the derived intervals catch up from the rollup
+watermark (same as the scheduler); with --start the range is re-derived.
+
+Example:
+    python -m syncer_service.syncer.run_candle_rollup \
+        --start 2024-01-01 --end 2024-07-01 --interval 1h
+"""
+
+from __future__ import annotations
+
+import argparse
+import logging
+import time
+import uuid
+from typing import Optional
+
+from database.session import get_session
+
+from syncer_service.syncer.ingestion.rollup import (
+    catch_up_rollups,
+    load_rollup_targets,
+    rollup_targets,
+)
+from syncer_service.syncer.run_candle_backfill import parse_timestamp_ms, select_units
+
+logger = logging.getLogger(__name__)
+
+
+def main(
+    cycle_id: str,
+    start: Optional[int] = None,
+    end: Optional[int] = None,
+    exchange: Optional[str] = None,
+    market_type: Optional[str] = None,
+    symbol: Optional[str] = None,
+    interval: Optional[str] = None,
+) -> None:
+    with get_session() as session:
+        targets = load_rollup_targets(session)
+
+    selected = set(select_units(
+        [target.unit for target in targets], exchange, market_type, symbol, interval
+    ))
+    targets = [target for target in targets if target.unit in selected]
+
+    logger.info(
+        "Starting candle rollup job",
+        extra={
+            "service": "syncer-service",
+            "event": "syncer.rollup.job_started",
+            "status": "started",
+            "operation": "candle_rollup",
+            "cycle_id": cycle_id,
+            "target_count": len(targets),
+            "start_ts": start,
+            "end_ts": end,
+        },
+    )
+
+    job_start = time.perf_counter()
+
+    if start is None:
+        # whole markets: the watermark covers every derived interval
+        written = catch_up_rollups(
+            cycle_id=cycle_id,
+            exchange_market_ids={target.unit.exchange_market_id for target in targets},
+        )
+    else:
+        written = rollup_targets(targets, start, end, cycle_id=cycle_id)
+
+    logger.info(
+        "Candle rollup job completed",
+        extra={
+            "service": "syncer-service",
+            "event": "syncer.rollup.job_completed",
+            "status": "success",
+            "operation": "candle_rollup",
+            "cycle_id": cycle_id,
+            "target_count": len(targets),
+            "written_count": written,
+            "latency_ms": round((time.perf_counter() - job_start) * 1000, 2),
+        },
+    )
+
+
+if __name__ == "__main__":
+    from core.observability.logging_config import configure_logging
+
+    parser = argparse.ArgumentParser(description="Rebuild derived candle intervals")
+    parser.add_argument("--start", help="epoch ms or ISO date (inclusive), default: rollup watermark")
+    parser.add_argument("--end", help="epoch ms or ISO date (exclusive), default: last closed bucket")
+    parser.add_argument("--exchange")
+    parser.add_argument("--market-type")
+    parser.add_argument("--symbol", help="canonical symbol, e.g. BTC/USDC")
+    parser.add_argument("--interval", help="derived interval, e.g. 1h (with --start)")
+    args = parser.parse_args()
+
+    configure_logging()
+
+    main(
+        cycle_id=str(uuid.uuid4()),
+        start=parse_timestamp_ms(args.start) if args.start else None,
+        end=parse_timestamp_ms(args.end) if args.end else None,
+        exchange=args.exchange,
+        market_type=args.market_type,
+        symbol=args.symbol,
+        interval=args.interval,
+    )
@@ -0,0 +1,57 @@
+# syncer_service/syncer/run_gap_repair.py
+"""
+Periodic gap scan + repair.
+
+Scans the last GAP_SCAN_LOOKBACK_HOURS of every active unit for holes
+between stored candles, enqueues them and drains up to
+GAP_REPAIR_MAX_PER_CYCLE jobs from the repair queue.
+"""
+
+from __future__ import annotations
+
+import logging
+import time
+
+from database.session import get_session
+
+from syncer_service.syncer.backfill.gap_repair import drain_gap_repairs, scan_unit_gaps
+from syncer_service.syncer.ingestion.targets import load_ingestion_units
+
+logger = logging.getLogger(__name__)
+
+
+def main(cycle_id: str) -> None:
+    start = time.perf_counter()
+    enqueued = 0
+
+    with get_session() as session:
+        units = load_ingestion_units(session)
+
+        for unit in units:
+            enqueued += scan_unit_gaps(session, unit)
+
+    # the queue also holds ranges from live detection and earlier failures
+    repaired = drain_gap_repairs(cycle_id=cycle_id)
+
+    logger.info(
+        "Gap scan completed",
+        extra={
+            "service": "syncer-service",
+            "event": "syncer.gap_repair.scan_completed",
+            "status": "success",
+            "operation": "gap_repair",
+            "cycle_id": cycle_id,
+            "unit_count": len(units),
+            "enqueued_count": enqueued,
+            "repaired_count": repaired,
+            "latency_ms": round((time.perf_counter() - start) * 1000, 2),
+        },
+    )
+
+
+if __name__ == "__main__":
+    import uuid
+    from core.observability.logging_config import configure_logging
+
+    configure_logging()
+    main(cycle_id=str(uuid.uuid4()))
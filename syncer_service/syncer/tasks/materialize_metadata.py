@@ -0,0 +1,57 @@
+import logging
+
+from sqlalchemy import text
+
+from core.metadata_document import group_metadata_rows, write_metadata_document
+
+logger = logging.getLogger(__name__)
+
+
+# same rows as the API metadata query, unfiltered (no REPLACE in WHERE)
+METADATA_ROWS_QUERY = text("""
+    select
+        e.name as exchange,
+        REPLACE(cs.symbol, '/', '-') AS symbol,
+        em.exchange_symbol,
+        i.interval,
+        em.market_type,
+        s.status
+    from supported_markets s
+    join intervals i on s.interval_id = i.id
+    join exchange_markets em on s.exchange_market_id = em.id
+    join exchanges e on em.exchange_id = e.id
+    join canonical_symbols cs on em.canonical_symbol_id = cs.id
+""")
+
+
+def materialize_metadata(session, cycle_id: str | None = None):
+    """
+    Build the grouped metadata document from the committed metadata
+    tables and store it for the API (core.metadata_document).
+    """
+
+    rows = session.execute(METADATA_ROWS_QUERY).mappings().all()
+    document = group_metadata_rows(rows)
+    stored = write_metadata_document(document)
+
+    market_count = sum(len(exchange["markets"]) for exchange in document["exchanges"])
+
+    logger.info(
+        "Metadata document materialized",
+        extra={
+            "service": "syncer-service",
+            "event": "syncer.base_sync.metadata_materialized",
+            "status": "success" if stored else "degraded",
+            "operation": "materialize_metadata",
+            "cycle_id": cycle_id,
+            "row_count": len(rows),
+            "exchange_count": len(document["exchanges"]),
+            "market_count": market_count,
+        },
+    )
+
+    return {
+        "rows": len(rows),
+        "markets": market_count,
+        "stored": stored,
+    }
@@ -4,6 +4,7 @@ from core.mapping.interval_mapping import INTERVAL_MAPPING
 from database.models import Interval
 from core.models.enums import Interval as EnumInterval
 from core.mapping.interval_ms_mapping import INTERVAL_MS_MAPPING
+from core.mapping.derived_interval_mapping import DERIVED_INTERVALS
 
 logger = logging.getLogger(__name__)
 
@@ -14,6 +15,9 @@ def _extract_core_intervals() -> set[EnumInterval]:
     for exchange_map in INTERVAL_MAPPING.values():
         intervals.update(exchange_map.keys())
 
+    # stored by the rollup even when no exchange serves them
+    intervals.update(DERIVED_INTERVALS)
+
     return intervals
 
 
@@ -1,6 +1,8 @@
 import logging
 
+from core.mapping.derived_interval_mapping import DERIVED_INTERVALS, RESAMPLE_BASE_INTERVAL
 from core.mapping.supported_market_mapping import SUPPORTED_MARKET_MAPPING
+from core.models.enums import SupportedMarketStatus
 from database.models import ExchangeMarket, Interval, SupportedMarket
 
 logger = logging.getLogger(__name__)
@@ -43,8 +45,31 @@ def sync_supported_markets(session, cycle_id: str | None = None):
 
         core_set.add((em.id, interval.id))
 
+    # markets ingesting the base interval get every derived interval
+    # that is not fetched directly (built by the rollup)
+    base_interval = interval_lookup.get(RESAMPLE_BASE_INTERVAL.value)
+    derived_set = set()
+
+    if base_interval is not None:
+        for exchange_market_id, interval_id in core_set:
+            if interval_id != base_interval.id:
+                continue
+
+            for interval_enum in DERIVED_INTERVALS:
+                interval = interval_lookup.get(interval_enum.value)
+                if interval is None:
+                    raise RuntimeError(f"Interval not found: {interval_enum.value}")
+
+                derived_set.add((exchange_market_id, interval.id))
+
+    derived_set -= core_set
+
+    desired = {key: SupportedMarketStatus.ACTIVE.value for key in core_set}
+    desired.update({key: SupportedMarketStatus.DERIVED.value for key in derived_set})
+
     added = 0
     activated = 0
+    derived = 0
     deactivated = 0
 
     logger.info(
@@ -56,11 +81,12 @@ def sync_supported_markets(session, cycle_id: str | None = None):
             "operation": "sync_supported_markets",
             "cycle_id": cycle_id,
             "core_count": len(core_set),
+            "derived_count": len(derived_set),
             "db_count": len(db_rows),
         },
     )
-    # INSERT or ACTIVATE
-    for exchange_market_id, interval_id in core_set:
+    # INSERT or ACTIVATE / mark DERIVED
+    for (exchange_market_id, interval_id), status in desired.items():
         row = next(
             (
                 r for r in db_rows
@@ -75,7 +101,7 @@ def sync_supported_markets(session, cycle_id: str | None = None):
                 SupportedMarket(
                     exchange_market_id=exchange_market_id,
                     interval_id=interval_id,
-                    status="active",
+                    status=status,
                 )
             )
             added += 1
@@ -90,11 +116,28 @@ def sync_supported_markets(session, cycle_id: str | None = None):
                     "cycle_id": cycle_id,
                     "exchange_market_id": exchange_market_id,
                     "interval_id": interval_id,
+                    "supported_market_status": status,
+                },
+            )
+
+        elif row.status != status and status == SupportedMarketStatus.DERIVED.value:
+            row.status = status
+            derived += 1
+            logger.info(
+                "Supported market derived",
+                extra={
+                    "service": "syncer-service",
+                    "event": "syncer.base_sync.supported_market_derived",
+                    "status": "success",
+                    "operation": "sync_supported_markets",
+                    "cycle_id": cycle_id,
+                    "exchange_market_id": row.exchange_market_id,
+                    "interval_id": row.interval_id,
                 },
             )
 
-        elif row.status != "active":
-            row.status = "active"
+        elif row.status != status:
+            row.status = status
             activated += 1
             logger.info(
                 "Supported market activated",
@@ -112,8 +155,8 @@ def sync_supported_markets(session, cycle_id: str | None = None):
     # DEACTIVATE (anything not in allow-list)
     for row in db_rows:
         key = (row.exchange_market_id, row.interval_id)
-        if key not in core_set and row.status == "active":
-            row.status = "inactive"
+        if key not in desired and row.status != SupportedMarketStatus.INACTIVE.value:
+            row.status = SupportedMarketStatus.INACTIVE.value
             deactivated += 1
             logger.info(
                 "Supported market deactivated",
@@ -138,16 +181,18 @@ def sync_supported_markets(session, cycle_id: str | None = None):
             "cycle_id": cycle_id,
             "added_count": added,
             "activated_count": activated,
+            "derived_count": derived,
             "deactivated_count": deactivated,
-            "total_count": len(core_set),
+            "total_count": len(desired),
         },
     )
 
     return {
         "added": added,
         "activated": activated,
+        "derived": derived,
         "deactivated": deactivated,
-        "total": len(core_set),
+        "total": len(desired),
     }
 
 if __name__ == "__main__":
@@ -0,0 +1,53 @@
+import pytest
+
+from core.adapters.hyperliquid import HyperliquidAdapter
+from core.exceptions import AdapterError
+from core.models.enums import Interval, MarketType
+
+
+RAW_ITEMS = [
+    {"t": 1000, "T": 60999, "o": "10", "h": "12", "l": "9", "c": "11", "v": "5"},
+    {"t": 61000, "T": 120999, "o": "11", "h": "13", "l": "10", "c": "12", "v": "6"},
+]
+
+
+class FakeAsyncHyperliquidAdapter(HyperliquidAdapter):
+    def __init__(self, raw_items=None, error=None):
+        super().__init__(market_type=MarketType.FUTURES)
+        self.raw_items = raw_items
+        self.error = error
+        self.calls = []
+
+    async def afetch_raw_candles(self, exchange_symbol, exchange_interval, limit):
+        self.calls.append((exchange_symbol, exchange_interval, limit))
+        if self.error is not None:
+            raise self.error
+        return self.raw_items
+
+
+@pytest.mark.asyncio
+async def test_afetch_candles_runs_standard_pipeline():
+    adapter = FakeAsyncHyperliquidAdapter(raw_items=RAW_ITEMS)
+
+    candles = await adapter.afetch_candles(
+        symbol="BTC/USDC",
+        interval=Interval.M1,
+        limit=2,
+    )
+
+    assert adapter.calls == [("BTC", "1m", 2)]
+    assert [c.open_timestamp for c in candles] == [1000, 61000]
+    assert candles[0].high == 12.0
+    assert candles[0].symbol == "BTC/USDC"
+
+
+@pytest.mark.asyncio
+async def test_afetch_candles_wraps_transport_errors_in_adapter_error():
+    adapter = FakeAsyncHyperliquidAdapter(error=ConnectionError("reset by peer"))
+
+    with pytest.raises(AdapterError):
+        await adapter.afetch_candles(
+            symbol="BTC/USDC",
+            interval=Interval.M1,
+            limit=2,
+        )
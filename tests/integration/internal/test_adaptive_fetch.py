@@ -0,0 +1,174 @@
+import time
+from contextlib import contextmanager
+
+from core.models.candle import Candle
+from core.models.candle_batch import QuarantinedCandle, REASON_HIGH_BELOW_BODY
+from core.models.enums import Exchange, Interval, MarketType
+
+from syncer_service.syncer.ingestion import pipeline
+from syncer_service.syncer.ingestion.fetch import compute_fetch_limit
+from syncer_service.syncer.ingestion.types import FetchResult, IngestionUnit, PersistResult
+
+MINUTE = 60_000
+
+
+def make_unit():
+    return IngestionUnit(
+        supported_market_id=1,
+        exchange_market_id=1,
+        interval_id=1,
+        exchange_name="hyperliquid",
+        market_type="futures",
+        canonical_symbol="BTC/USDC",
+        interval="1m",
+        interval_ms=MINUTE,
+    )
+
+
+def make_candle(open_ts):
+    return Candle(
+        open_timestamp=open_ts, close_timestamp=open_ts + MINUTE - 1,
+        open=1.0, high=2.0, low=0.5, close=1.5, volume=1.0,
+        exchange=Exchange.HYPERLIQUID, market_type=MarketType.FUTURES,
+        symbol="BTC/USDC", interval=Interval.M1,
+    )
+
+
+@contextmanager
+def fake_session():
+    yield object()
+
+
+def patch_stages(monkeypatch, fetch_limits, stored_last_ts):
+    def fake_fetch(unit, limit=None):
+        fetch_limits.append(limit)
+        return FetchResult(candles=[], fetched_count=0, min_ts=None, max_ts=None)
+
+    monkeypatch.setattr(pipeline, "fetch_candles_for_unit", fake_fetch)
+    monkeypatch.setattr(pipeline, "get_last_timestamp", lambda session, unit: stored_last_ts)
+    monkeypatch.setattr(
+        pipeline, "persist_stage", lambda **kwargs: PersistResult(inserted=0)
+    )
+
+
+def test_compute_fetch_limit_covers_only_candles_after_watermark():
+    unit = make_unit()
+    now = 1_000 * MINUTE + 30_000
+
+    assert compute_fetch_limit(unit, None, now_ms=now) == unit.fetch_limit
+    # 995..999 closed + open 1000 -> 6 missing, + 2 overlap
+    assert compute_fetch_limit(unit, 994 * MINUTE, now_ms=now) == 8
+    assert compute_fetch_limit(unit, 1_000 * MINUTE, now_ms=now) == 3
+
+
+def test_ingest_unit_fetches_small_page_in_steady_state(monkeypatch):
+    unit = make_unit()
+    fetch_limits = []
+    patch_stages(monkeypatch, fetch_limits, stored_last_ts=None)
+
+    now = int(time.time() * 1000)
+    watermarks = {unit.watermark_key: now - 3 * MINUTE}
+
+    summary = pipeline.ingest_unit(
+        session_factory=fake_session,
+        unit=unit,
+        watermarks=watermarks,
+    )
+
+    assert fetch_limits[0] <= 6
+    assert summary.fetch_limit == fetch_limits[0]
+
+
+def test_ingest_unit_queues_gap_larger_than_one_page(monkeypatch):
+    unit = make_unit()
+    now = int(time.time() * 1000)
+    stale_ts = now - 2 * 24 * 60 * MINUTE
+    open_ts = now - now % MINUTE
+    page = [make_candle(ts) for ts in range(open_ts - 3 * MINUTE, open_ts + MINUTE, MINUTE)]
+
+    fetch_limits = []
+
+    def fake_fetch(unit, limit=None):
+        fetch_limits.append(limit)
+        return FetchResult(
+            candles=page,
+            fetched_count=len(page),
+            min_ts=page[0].open_timestamp,
+            max_ts=page[-1].open_timestamp,
+        )
+
+    queued = []
+
+    monkeypatch.setattr(pipeline, "fetch_candles_for_unit", fake_fetch)
+    monkeypatch.setattr(pipeline, "persist_stage", lambda **kwargs: PersistResult(inserted=3))
+    monkeypatch.setattr(pipeline, "cache_persisted_candles", lambda unit, candles: None)
+    monkeypatch.setattr(pipeline, "rollup_persisted", lambda *args, **kwargs: None)
+    monkeypatch.setattr(
+        pipeline, "enqueue_gap_repair", lambda unit, start, end: queued.append((start, end))
+    )
+
+    watermarks = {unit.watermark_key: stale_ts}
+
+    summary = pipeline.ingest_unit(
+        session_factory=fake_session,
+        unit=unit,
+        watermarks=watermarks,
+    )
+
+    # only the newest page is fetched; the older part goes to gap repair
+    assert fetch_limits == [unit.fetch_limit]
+    assert queued == [(stale_ts + MINUTE, open_ts - 3 * MINUTE)]
+    assert summary.gap_warning is True
+    assert watermarks[unit.watermark_key] == open_ts - MINUTE
+
+
+def run_page_with_quarantined_row(monkeypatch, watermark_ts, page, bad_ts):
+    quarantined = [QuarantinedCandle(index=1, open_timestamp=bad_ts, reason=REASON_HIGH_BELOW_BODY)]
+    queued = []
+
+    monkeypatch.setattr(
+        pipeline,
+        "fetch_candles_for_unit",
+        lambda unit, limit=None: FetchResult(
+            candles=page,
+            fetched_count=len(page) + 1,
+            min_ts=page[0].open_timestamp,
+            max_ts=page[-1].open_timestamp,
+            quarantined=quarantined,
+        ),
+    )
+    monkeypatch.setattr(pipeline, "persist_stage", lambda **kwargs: PersistResult(inserted=len(page) - 1))
+    monkeypatch.setattr(pipeline, "cache_persisted_candles", lambda unit, candles: None)
+    monkeypatch.setattr(pipeline, "rollup_persisted", lambda *args, **kwargs: None)
+    monkeypatch.setattr(
+        pipeline, "enqueue_gap_repair", lambda unit, start, end: queued.append((start, end))
+    )
+
+    unit = make_unit()
+    watermarks = {unit.watermark_key: watermark_ts} if watermark_ts is not None else {}
+
+    pipeline.ingest_unit(session_factory=fake_session, unit=unit, watermarks=watermarks)
+
+    return queued
+
+
+def test_quarantined_row_mid_page_is_queued_for_repair(monkeypatch):
+    now = int(time.time() * 1000)
+    open_ts = now - now % MINUTE
+    bad_ts = open_ts - 3 * MINUTE
+    page = [make_candle(ts) for ts in (open_ts - 4 * MINUTE, open_ts - 2 * MINUTE, open_ts - MINUTE, open_ts)]
+
+    queued = run_page_with_quarantined_row(monkeypatch, open_ts - 5 * MINUTE, page, bad_ts)
+
+    assert queued == [(bad_ts, bad_ts + MINUTE)]
+
+
+def test_quarantined_first_row_on_cold_start_is_queued_for_repair(monkeypatch):
+    now = int(time.time() * 1000)
+    open_ts = now - now % MINUTE
+    bad_ts = open_ts - 3 * MINUTE
+    page = [make_candle(ts) for ts in (open_ts - 2 * MINUTE, open_ts - MINUTE, open_ts)]
+
+    queued = run_page_with_quarantined_row(monkeypatch, None, page, bad_ts)
+
+    assert queued == [(bad_ts, bad_ts + MINUTE)]
@@ -26,6 +26,9 @@ class FakeOrchestrator:
             },
         }
 
+    async def ahandle_request(self, request, route=None, payload=None):
+        return self.handle_request(request, route=route, payload=payload)
+
 def test_metadata_endpoint_passes_expected_route_and_payload(monkeypatch):
     fake_orchestrator = FakeOrchestrator()
 
@@ -0,0 +1,129 @@
+from contextlib import asynccontextmanager
+from types import SimpleNamespace
+
+import pytest
+
+from api_service.app.api.flow.consumption.redis_consumption import (
+    RedisSlidingWindowConsumptionState,
+)
+from api_service.app.api.flow.consumption.snapshot import ConsumptionSnapshot
+from api_service.app.api.flow.execution import ExecutionOrchestrator
+from api_service.app.attribution.http_impl import HttpAttributionResolver
+from api_service.app.dataAccess.base import DataResault, DataAccessor
+from api_service.app.dataAccess.mock_impl import MockDataAccessor, MockMetaDataAccessor
+from api_service.app.policy.mock_impl import MockPolicyEngine
+from api_service.app.semantics.mock_impl import MockSemanticAnnotator
+from core.redis_client import aclose_async_redis_client
+
+
+def make_request(path="/candles/binance/spot/BTC-USDT/1m"):
+    return SimpleNamespace(
+        url=SimpleNamespace(path=path),
+        method="GET",
+        headers={},
+        client=SimpleNamespace(host="127.0.0.1"),
+    )
+
+
+class FakeAsyncResult:
+    def __init__(self, rows):
+        self.rows = rows
+
+    def mappings(self):
+        return self
+
+    def all(self):
+        return self.rows
+
+
+class FakeAsyncSession:
+    def __init__(self, responses):
+        self.responses = responses
+        self.calls = []
+
+    async def execute(self, query, params=None):
+        self.calls.append((str(query), params or {}))
+        return FakeAsyncResult(self.responses.pop(0))
+
+
+class AsyncOnlyDataAccessor(DataAccessor):
+    def __init__(self):
+        self.calls = []
+
+    def fetch(self, request, payload):
+        raise AssertionError("async path must not call the blocking fetch")
+
+    async def afetch(self, request, payload):
+        self.calls.append(payload)
+        return DataResault(available=True, message="success", payload=[{"timestamp": 1}])
+
+
+class FakeAsyncConsumption:
+    async def aobserve_and_update(self, consumer_ref, units=1):
+        return ConsumptionSnapshot(
+            consumer_ref=consumer_ref,
+            consumed_units=1,
+            remaining_window_seconds=60,
+        )
+
+
+@pytest.mark.asyncio
+async def test_ahandle_request_awaits_async_data_path():
+    data = AsyncOnlyDataAccessor()
+    orchestrator = ExecutionOrchestrator(
+        attribution=HttpAttributionResolver(),
+        policy=MockPolicyEngine(),
+        data=data,
+        metadata=MockMetaDataAccessor(),
+        semantics=MockSemanticAnnotator(),
+    )
+    orchestrator.consumption_state = FakeAsyncConsumption()
+
+    payload = {"exchange": "binance", "market": "spot", "symbol": "BTC-USDT", "interval": "1m", "limit": 5}
+
+    result = await orchestrator.ahandle_request(make_request(), route="get_candles", payload=payload)
+
+    assert data.calls == [payload]
+    assert result.data == [{"timestamp": 1}]
+
+
+@pytest.mark.asyncio
+async def test_async_data_accessor_runs_same_lookups_on_async_session(monkeypatch):
+    session = FakeAsyncSession(responses=[
+        [{"id": 1, "name": "binance"}],      # exchanges
+        [{"id": 10, "symbol": "BTC/USDT"}],  # canonical_symbols
+        [],                                  # exchange_markets
+    ])
+
+    @asynccontextmanager
+    async def fake_get_async_session():
+        yield session
+
+    monkeypatch.setattr(
+        "api_service.app.dataAccess.mock_impl.get_async_session",
+        fake_get_async_session,
+    )
+
+    result = await MockDataAccessor().afetch(
+        request=None,
+        payload={"exchange": "binance", "symbol": "BTC-USDT", "market": "SPOT", "interval": "1m"},
+    )
+
+    assert result.available is False
+    assert result.message == "exchange_market not find"
+    assert session.calls[1][1] == {"symbol": "BTC/USDT"}
+    assert session.calls[2][1]["market_type"] == "spot"
+
+
+@pytest.mark.asyncio
+async def test_async_sliding_window_counts_units_in_one_round_trip():
+    state = RedisSlidingWindowConsumptionState(window_seconds=60)
+
+    try:
+        await state.aobserve_and_update("ip:10.0.0.1")
+        snapshot = await state.aobserve_and_update("ip:10.0.0.1", units=2)
+    finally:
+        await aclose_async_redis_client()
+
+    assert snapshot.consumed_units == 3
+    assert 0 < snapshot.remaining_window_seconds <= 60
@@ -0,0 +1,132 @@
+from contextlib import contextmanager
+
+from core.models.candle import Candle
+from core.models.enums import Exchange, Interval, MarketType
+
+from syncer_service.syncer.backfill import engine
+from syncer_service.syncer.backfill.engine import backfill_unit, plan_backfill_windows
+from syncer_service.syncer.backfill.types import BackfillWindow
+from syncer_service.syncer.ingestion.persistence import WriteCounts
+from syncer_service.syncer.ingestion.types import FetchResult, IngestionUnit
+
+MINUTE = 60_000
+
+
+def make_unit():
+    return IngestionUnit(
+        supported_market_id=1,
+        exchange_market_id=7,
+        interval_id=3,
+        exchange_name="hyperliquid",
+        market_type="futures",
+        canonical_symbol="BTC/USDC",
+        interval="1m",
+        interval_ms=MINUTE,
+    )
+
+
+def make_candle(open_timestamp):
+    return Candle(
+        open_timestamp=open_timestamp,
+        close_timestamp=open_timestamp + MINUTE - 1,
+        open=1.0,
+        high=2.0,
+        low=0.5,
+        close=1.5,
+        volume=10.0,
+        exchange=Exchange.HYPERLIQUID,
+        market_type=MarketType.FUTURES,
+        symbol="BTC/USDC",
+        interval=Interval.M1,
+    )
+
+
+def fake_fetch(unit, start_time, end_time, limit):
+    candles = [make_candle(ts) for ts in range(start_time, end_time, unit.interval_ms)]
+    return FetchResult(
+        candles=candles,
+        fetched_count=len(candles),
+        min_ts=candles[0].open_timestamp if candles else None,
+        max_ts=candles[-1].open_timestamp if candles else None,
+    )
+
+
+@contextmanager
+def fake_session_factory():
+    yield None
+
+
+def test_plan_backfill_windows_aligns_start_and_clamps_to_closed_candles():
+    windows = plan_backfill_windows(
+        start=30_000,
+        end=10 * MINUTE,
+        interval_ms=MINUTE,
+        page_size=3,
+        now_ms=7 * MINUTE + 5_000,
+    )
+
+    assert windows == [
+        BackfillWindow(start=0, end=3 * MINUTE),
+        BackfillWindow(start=3 * MINUTE, end=6 * MINUTE),
+        BackfillWindow(start=6 * MINUTE, end=7 * MINUTE),
+    ]
+
+
+def test_backfill_unit_writes_every_window_in_batches(monkeypatch):
+    batches = []
+
+    def fake_write(session, rows):
+        batches.append(list(rows))
+        return WriteCounts(inserted=len(rows))
+
+    monkeypatch.setattr(engine, "write_candles", fake_write)
+
+    result = backfill_unit(
+        make_unit(),
+        start=0,
+        end=10 * MINUTE,
+        max_workers=2,
+        batch_rows=4,
+        page_size=2,
+        use_checkpoint=False,
+        session_factory=fake_session_factory,
+        fetch_fn=fake_fetch,
+    )
+
+    written = sorted(row[2] for batch in batches for row in batch)
+
+    assert written == [ts * MINUTE for ts in range(10)]
+    assert len(batches) > 1
+    assert result.windows_total == 5
+    assert result.windows_done == 5
+    assert result.inserted_count == 10
+
+
+def test_backfill_unit_resumes_from_checkpoint(monkeypatch):
+    monkeypatch.setattr(engine, "write_candles", lambda session, rows: WriteCounts(inserted=len(rows)))
+
+    calls = []
+
+    def failing_once_fetch(unit, start_time, end_time, limit):
+        calls.append(start_time)
+        if start_time == 2 * MINUTE and calls.count(start_time) == 1:
+            raise ConnectionError("exchange timeout")
+        return fake_fetch(unit, start_time, end_time, limit)
+
+    kwargs = dict(
+        start=0,
+        end=6 * MINUTE,
+        max_workers=1,
+        page_size=2,
+        session_factory=fake_session_factory,
+        fetch_fn=failing_once_fetch,
+    )
+
+    first = backfill_unit(make_unit(), **kwargs)
+    second = backfill_unit(make_unit(), **kwargs)
+
+    assert first.windows_failed == 1
+    assert first.windows_done == 2
+    assert second.windows_checkpointed == 2
+    assert second.windows_done == 1
+    assert calls.count(0) == 1
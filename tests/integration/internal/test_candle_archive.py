@@ -0,0 +1,185 @@
+from contextlib import contextmanager
+from datetime import datetime, timezone
+
+import pytest
+
+from api_service.app.dataAccess.identifier_resolver import Resolution
+from api_service.app.dataAccess.mock_impl import MockDataAccessor
+from api_service.app.dataAccess.pagination import CandlePage, archive_needed, merge_page_rows
+from database.candle_archive import CandleArchive
+from syncer_service.syncer.ingestion.types import IngestionUnit
+from syncer_service.syncer.run_candle_archive import archive_cutoff_ms, archive_unit
+
+
+def ms(*args):
+    return int(datetime(*args, tzinfo=timezone.utc).timestamp() * 1000)
+
+
+def candle(ts, close=1.0):
+    return {"timestamp": ts, "open": 1.0, "high": 1.0, "low": 1.0, "close": close, "volume": 1.0}
+
+
+class FakeResult:
+    def __init__(self, rows):
+        self.rows = rows
+
+    def mappings(self):
+        return self
+
+    def all(self):
+        return self.rows
+
+    def scalar(self):
+        return self.rows
+
+
+class FakeArchive:
+    def __init__(self, boundary, rows):
+        self.boundary_ts = boundary
+        self.rows = rows
+        self.reads = []
+
+    def boundary(self, exchange_market_id, interval_id):
+        return self.boundary_ts
+
+    def read_range(self, exchange_market_id, interval_id, start=None, end=None,
+                   limit=None, descending=False):
+        self.reads.append((start, end, limit, descending))
+        rows = [
+            row for row in sorted(self.rows, key=lambda r: r["timestamp"], reverse=descending)
+            if (start is None or row["timestamp"] >= start) and (end is None or row["timestamp"] < end)
+        ]
+        return rows[:limit]
+
+
+class StaticResolver:
+    def resolve(self, exchange, market, symbol, interval):
+        return Resolution(exchange_market_id=7, interval_id=3)
+
+
+def make_accessor(monkeypatch, db_rows, archive):
+    class CandleSession:
+        def execute(self, query, params=None):
+            sql = str(query)
+            rows = [
+                row for row in db_rows
+                if ("start" not in params or row["timestamp"] >= params["start"])
+                and ("after" not in params or row["timestamp"] > params["after"])
+                and ("end" not in params or row["timestamp"] < params["end"])
+            ]
+            rows.sort(key=lambda r: r["timestamp"], reverse="desc" in sql)
+            return FakeResult(rows[:params["limit"]])
+
+    @contextmanager
+    def fake_session():
+        yield CandleSession()
+
+    monkeypatch.setattr("api_service.app.dataAccess.mock_impl.get_session", fake_session)
+    return MockDataAccessor(resolver=StaticResolver(), archive=archive)
+
+
+PAYLOAD = {"exchange": "binance", "market": "spot", "symbol": "BTC-USDT", "interval": "1m"}
+
+
+def test_archive_is_skipped_for_pages_above_the_boundary():
+    page = CandlePage(limit=2)
+    rows = [candle(300), candle(200)]
+
+    assert not archive_needed(page, None, rows)
+    assert not archive_needed(CandlePage(start=150), 100, [])
+    assert not archive_needed(page, 100, rows)
+    assert archive_needed(page, 250, rows)
+    assert archive_needed(CandlePage(limit=5), 100, rows)
+    assert archive_needed(CandlePage(start=50), 100, rows)
+
+
+def test_merged_rows_prefer_the_database():
+    page = CandlePage(limit=2, start=0)
+    merged = merge_page_rows([candle(20, close=2.0)], [candle(10), candle(20), candle(30)], page)
+
+    assert [(r["timestamp"], r["close"]) for r in merged] == [(10, 1.0), (20, 2.0), (30, 1.0)]
+
+
+def test_latest_page_continues_into_the_archive(monkeypatch):
+    archive = FakeArchive(boundary=300, rows=[candle(100), candle(200)])
+    accessor = make_accessor(monkeypatch, [candle(300), candle(400)], archive)
+
+    result = accessor.fetch(None, {**PAYLOAD, "limit": 3})
+
+    assert [row["timestamp"] for row in result.payload] == [200, 300, 400]
+    assert archive.reads == [(None, 300, 3, True)]
+
+
+def test_forward_page_reads_archive_then_database(monkeypatch):
+    archive = FakeArchive(boundary=300, rows=[candle(100), candle(200)])
+    accessor = make_accessor(monkeypatch, [candle(300), candle(400), candle(500)], archive)
+
+    first = accessor.fetch(None, {**PAYLOAD, "start": 150, "limit": 2})
+    second = accessor.fetch(None, {**PAYLOAD, "cursor": first.next_cursor, "limit": 2})
+
+    assert [row["timestamp"] for row in first.payload] == [200, 300]
+    assert [row["timestamp"] for row in second.payload] == [400, 500]
+    assert second.next_cursor is None
+    # the second page starts above the boundary: no archive read
+    assert len(archive.reads) == 1
+
+
+def test_cutoff_is_a_month_start():
+    assert archive_cutoff_ms(ms(2026, 10, 18), older_than_days=365) == ms(2025, 10, 1)
+
+
+def test_archive_unit_moves_whole_months():
+    unit = IngestionUnit(
+        supported_market_id=1, exchange_market_id=7, interval_id=3,
+        exchange_name="binance", market_type="spot", canonical_symbol="BTC/USDT",
+        interval="1m", interval_ms=60_000,
+    )
+    db = [candle(ms(2025, 1, 5)), candle(ms(2025, 1, 9)), candle(ms(2025, 2, 2))]
+    calls = []
+
+    class ArchiveSession:
+        def execute(self, query, params=None):
+            sql = str(query)
+            if "min(timestamp)" in sql:
+                return FakeResult(min(row["timestamp"] for row in db))
+            moved = [row for row in db if params["start"] <= row["timestamp"] < params["end"]]
+            return FakeResult(moved)
+
+    @contextmanager
+    def session_factory():
+        yield ArchiveSession()
+
+    class RecordingArchive:
+        def write_month(self, exchange_market_id, interval_id, month, rows):
+            calls.append(("write", month, len(rows)))
+
+        def set_boundary(self, exchange_market_id, interval_id, archived_before):
+            calls.append(("boundary", archived_before))
+
+    moved = archive_unit(unit, ms(2025, 3, 1), RecordingArchive(), session_factory=session_factory)
+
+    assert moved == 3
+    assert calls == [
+        ("write", (2025, 1), 2), ("boundary", ms(2025, 2, 1)),
+        ("write", (2025, 2), 1), ("boundary", ms(2025, 3, 1)),
+    ]
+
+
+def test_parquet_month_files_round_trip(tmp_path):
+    pytest.importorskip("pyarrow")
+    archive = CandleArchive(str(tmp_path))
+
+    archive.write_month(7, 3, (2025, 1), [candle(ms(2025, 1, 2)), candle(ms(2025, 1, 1))])
+    archive.write_month(7, 3, (2025, 1), [candle(ms(2025, 1, 2), close=2.0)])
+    archive.write_month(7, 3, (2025, 2), [candle(ms(2025, 2, 1))])
+    archive.set_boundary(7, 3, ms(2025, 3, 1))
+
+    rows = archive.read_range(7, 3, start=ms(2025, 1, 2), limit=2)
+
+    assert archive.boundary(7, 3) == ms(2025, 3, 1)
+    assert [(r["timestamp"], r["close"]) for r in rows] == [
+        (ms(2025, 1, 2), 2.0), (ms(2025, 2, 1), 1.0),
+    ]
+    assert [r["timestamp"] for r in archive.read_range(7, 3, descending=True)] == [
+        ms(2025, 2, 1), ms(2025, 1, 2), ms(2025, 1, 1),
+    ]
@@ -0,0 +1,156 @@
+import pytest
+
+from core.adapters.hyperliquid import HyperliquidAdapter
+from core.exceptions import CandleValidationError
+from core.models.candle_batch import (
+    REASON_CLOSE_TIMESTAMP,
+    REASON_HIGH_BELOW_BODY,
+    REASON_PRICE_NOT_FINITE,
+    REASON_UNPARSEABLE,
+    REASON_VOLUME_NEGATIVE,
+    CandleBatch,
+    QuarantinedCandle,
+)
+from core.models.enums import Exchange, Interval, MarketType
+
+from syncer_service.syncer.ingestion.filter import run_filter_stage
+from syncer_service.syncer.ingestion.persistence import map_candles_to_values
+from syncer_service.syncer.ingestion.types import FetchResult, IngestionUnit
+
+MINUTE = 60_000
+
+
+def raw_item(open_ts, high="12"):
+    return {"t": open_ts, "T": open_ts + MINUTE - 1, "o": "10", "h": high, "l": "9", "c": "11", "v": "5"}
+
+
+class FakeHyperliquidAdapter(HyperliquidAdapter):
+    def __init__(self, raw_items):
+        super().__init__(market_type=MarketType.FUTURES)
+        self.raw_items = raw_items
+
+    def fetch_raw_candles(self, exchange_symbol, exchange_interval, limit):
+        return self.raw_items
+
+
+def make_unit():
+    return IngestionUnit(
+        supported_market_id=1,
+        exchange_market_id=7,
+        interval_id=3,
+        exchange_name="hyperliquid",
+        market_type="futures",
+        canonical_symbol="BTC/USDC",
+        interval="1m",
+        interval_ms=MINUTE,
+    )
+
+
+def test_adapter_emits_columnar_batch_matching_candles():
+    raw = [raw_item(ts * MINUTE) for ts in range(1, 4)]
+    adapter = FakeHyperliquidAdapter(raw)
+
+    batch = adapter.fetch_candle_batch(symbol="BTC/USDC", interval=Interval.M1, limit=3)
+    candles = adapter.fetch_candles(symbol="BTC/USDC", interval=Interval.M1, limit=3)
+
+    assert isinstance(batch, CandleBatch)
+    assert batch.exchange == Exchange.HYPERLIQUID
+    assert list(batch.open_timestamp) == [MINUTE, 2 * MINUTE, 3 * MINUTE]
+    assert batch.to_candles() == candles
+
+
+def test_batch_validation_rejects_inconsistent_row():
+    adapter = FakeHyperliquidAdapter([raw_item(MINUTE), raw_item(2 * MINUTE, high="1")])
+
+    with pytest.raises(CandleValidationError, match="row 1"):
+        adapter.fetch_candle_batch(symbol="BTC/USDC", interval=Interval.M1, limit=2)
+
+
+def test_batch_flows_through_filter_and_persistence_columnar():
+    batch = CandleBatch.from_rows(
+        ((ts * MINUTE, ts * MINUTE + MINUTE - 1, 10.0, 12.0, 9.0, 11.0, 5.0) for ts in range(1, 6)),
+        Exchange.HYPERLIQUID,
+        MarketType.FUTURES,
+        "BTC/USDC",
+        Interval.M1,
+    )
+    unit = make_unit()
+
+    result = run_filter_stage(
+        session=None,
+        unit=unit,
+        fetch_result=FetchResult(candles=batch, fetched_count=5, min_ts=MINUTE, max_ts=5 * MINUTE),
+        watermarks={unit.watermark_key: 2 * MINUTE},
+    )
+
+    # open candle (5m) dropped, 1m/2m already stored
+    assert isinstance(result.new_candles, CandleBatch)
+    assert list(result.new_candles.open_timestamp) == [3 * MINUTE, 4 * MINUTE]
+    assert map_candles_to_values(unit, result.new_candles) == [
+        (7, 3, 3 * MINUTE, 10.0, 12.0, 9.0, 11.0, 5.0),
+        (7, 3, 4 * MINUTE, 10.0, 12.0, 9.0, 11.0, 5.0),
+    ]
+
+
+def test_batch_check_returns_mask_and_reason_codes():
+    batch = CandleBatch.from_rows(
+        [
+            (MINUTE, 2 * MINUTE - 1, 10.0, 12.0, 9.0, 11.0, 5.0),
+            (2 * MINUTE, 2 * MINUTE, 10.0, 12.0, 9.0, 11.0, 5.0),
+            (3 * MINUTE, 4 * MINUTE - 1, 10.0, 12.0, 9.0, 11.0, -1.0),
+            (4 * MINUTE, 5 * MINUTE - 1, float("nan"), 12.0, 9.0, 11.0, 5.0),
+            (5 * MINUTE, 6 * MINUTE - 1, 10.0, 12.0, 9.0, 11.0, 5.0),
+        ],
+        Exchange.HYPERLIQUID,
+        MarketType.FUTURES,
+        "BTC/USDC",
+        Interval.M1,
+    )
+
+    validation = batch.check()
+
+    assert list(validation.mask) == [1, 0, 0, 0, 1]
+    assert validation.reasons == {
+        1: REASON_CLOSE_TIMESTAMP,
+        2: REASON_VOLUME_NEGATIVE,
+        3: REASON_PRICE_NOT_FINITE,
+    }
+
+
+@pytest.mark.parametrize(
+    "row",
+    [
+        (0, MINUTE - 1, 10.0, 12.0, 9.0, 11.0, 5.0),
+        (MINUTE, MINUTE, 10.0, 12.0, 9.0, 11.0, 5.0),
+        (MINUTE, 2 * MINUTE - 1, 10.0, float("inf"), 9.0, 11.0, 5.0),
+        (MINUTE, 2 * MINUTE - 1, 10.0, 10.5, 9.0, 11.0, 5.0),
+        (MINUTE, 2 * MINUTE - 1, 10.0, 12.0, 10.5, 11.0, 5.0),
+        (MINUTE, 2 * MINUTE - 1, 10.0, 12.0, 9.0, 11.0, float("nan")),
+    ],
+)
+def test_column_wise_check_catches_every_invariant(row):
+    clean = (2 * MINUTE, 3 * MINUTE - 1, 10.0, 12.0, 9.0, 11.0, 5.0)
+    batch = CandleBatch.from_rows(
+        [clean, row], Exchange.HYPERLIQUID, MarketType.FUTURES, "BTC/USDC", Interval.M1
+    )
+
+    assert CandleBatch.from_rows(
+        [clean], Exchange.HYPERLIQUID, MarketType.FUTURES, "BTC/USDC", Interval.M1
+    ).all_valid() is True
+    assert batch.all_valid() is False
+    assert list(batch.check().mask) == [1, 0]
+
+
+def test_adapter_quarantines_bad_rows_instead_of_failing_the_page():
+    raw = [raw_item(MINUTE), raw_item(2 * MINUTE, high="1"), {"t": 3 * MINUTE}, raw_item(4 * MINUTE)]
+    adapter = FakeHyperliquidAdapter(raw)
+
+    batch = adapter.fetch_candle_batch(
+        symbol="BTC/USDC", interval=Interval.M1, limit=4, quarantine=True
+    )
+
+    assert list(batch.open_timestamp) == [MINUTE, 4 * MINUTE]
+    assert batch.quarantined == [
+        QuarantinedCandle(index=1, open_timestamp=2 * MINUTE, reason=REASON_HIGH_BELOW_BODY),
+        QuarantinedCandle(index=2, open_timestamp=None, reason=REASON_UNPARSEABLE),
+    ]
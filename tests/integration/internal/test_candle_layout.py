@@ -0,0 +1,57 @@
+import os
+import subprocess
+import sys
+
+from database.candle_layout import (
+    CANDLE_LAYOUT_COMPACT,
+    CANDLE_LAYOUT_STANDARD,
+    candle_conflict_constraint,
+)
+
+# the layout is read at import time, so the compact model is built in a fresh interpreter
+PRINT_CANDLE_DDL = """
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.schema import CreateIndex, CreateTable
+
+from database.models import Candle
+from syncer_service.syncer.ingestion.persistence import CANDLE_UNIQUE_CONSTRAINT
+
+dialect = postgresql.dialect()
+print(CreateTable(Candle.__table__).compile(dialect=dialect))
+for index in Candle.__table__.indexes:
+    print(CreateIndex(index).compile(dialect=dialect))
+print("conflict:", CANDLE_UNIQUE_CONSTRAINT)
+"""
+
+
+def candle_ddl(layout):
+    return subprocess.run(
+        [sys.executable, "-c", PRINT_CANDLE_DDL],
+        env={**os.environ, "CANDLE_STORAGE_LAYOUT": layout},
+        capture_output=True,
+        text=True,
+        check=True,
+    ).stdout
+
+
+def test_conflict_target_follows_the_layout():
+    assert candle_conflict_constraint(CANDLE_LAYOUT_STANDARD) == "uq_candle_market_interval_ts"
+    assert candle_conflict_constraint(CANDLE_LAYOUT_COMPACT) == "candles_pkey"
+
+
+def test_compact_layout_uses_the_natural_key_and_a_brin_index():
+    ddl = candle_ddl(CANDLE_LAYOUT_COMPACT)
+
+    assert "id BIGSERIAL" not in ddl
+    assert "created_at" not in ddl
+    assert "CONSTRAINT candles_pkey PRIMARY KEY (exchange_market_id, interval_id, timestamp)" in ddl
+    assert "CREATE INDEX ix_candles_timestamp_brin ON candles USING brin (timestamp)" in ddl
+    assert "conflict: candles_pkey" in ddl
+
+
+def test_standard_layout_keeps_the_surrogate_key():
+    ddl = candle_ddl(CANDLE_LAYOUT_STANDARD)
+
+    assert "CONSTRAINT candles_pkey PRIMARY KEY (id, timestamp)" in ddl
+    assert "UNIQUE (exchange_market_id, interval_id, timestamp)" in ddl
+    assert "conflict: uq_candle_market_interval_ts" in ddl
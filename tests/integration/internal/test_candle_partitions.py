@@ -0,0 +1,99 @@
+from datetime import datetime, timezone
+
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.schema import CreateTable
+
+from database.candle_partitions import (
+    ensure_candle_partitions,
+    maintain_candle_partitions,
+    month_bounds_ms,
+    months_between,
+    partition_name,
+)
+from database.models import Candle
+
+
+def ms(*args):
+    return int(datetime(*args, tzinfo=timezone.utc).timestamp() * 1000)
+
+
+class FakeResult:
+    def __init__(self, rows):
+        self.rows = rows
+
+    def first(self):
+        return self.rows[0] if self.rows else None
+
+    def all(self):
+        return self.rows
+
+
+class PartitionSession:
+    def __init__(self, partitioned=True, existing=()):
+        self.partitioned = partitioned
+        self.existing = list(existing)
+        self.statements = []
+        self.commits = 0
+
+    def execute(self, query, params=None):
+        sql = " ".join(str(query).split())
+        if "pg_partitioned_table" in sql:
+            return FakeResult([(1,)] if self.partitioned else [])
+        if "pg_inherits" in sql:
+            return FakeResult([(name,) for name in self.existing])
+        self.statements.append((sql, params))
+        return FakeResult([])
+
+    def commit(self):
+        self.commits += 1
+
+
+def test_month_bounds_and_names_are_utc_months():
+    assert month_bounds_ms((2025, 12)) == (ms(2025, 12, 1), ms(2026, 1, 1))
+    assert partition_name((2026, 1)) == "candles_p2026_01"
+    assert list(months_between(ms(2025, 11, 15), ms(2026, 1, 1))) == [(2025, 11), (2025, 12)]
+
+
+def test_ensure_creates_only_missing_partitions_and_moves_default_rows():
+    session = PartitionSession(existing=["candles_default", "candles_p2026_01"])
+
+    created = ensure_candle_partitions(session, ms(2026, 1, 10), ms(2026, 3, 1))
+
+    assert created == ["candles_p2026_02"]
+    assert session.commits == 1
+
+    sqls = [sql for sql, _ in session.statements]
+    assert sqls[0].startswith("create table candles_p2026_02 (like candles")
+    assert "from candles_default" in sqls[1]
+    assert sqls[2].startswith("delete from candles_default")
+    assert sqls[3] == (
+        f"alter table candles attach partition candles_p2026_02 "
+        f"for values from ({ms(2026, 2, 1)}) to ({ms(2026, 3, 1)})"
+    )
+    assert session.statements[1][1] == {"start": ms(2026, 2, 1), "end": ms(2026, 3, 1)}
+
+
+def test_ensure_is_a_noop_before_the_migration():
+    session = PartitionSession(partitioned=False)
+
+    assert ensure_candle_partitions(session, ms(2026, 1, 1), ms(2026, 6, 1)) == []
+    assert session.statements == []
+
+
+def test_maintenance_covers_the_months_around_now():
+    session = PartitionSession()
+
+    created = maintain_candle_partitions(
+        session, now_ms=ms(2026, 10, 18), back_months=1, ahead_months=2
+    )
+
+    assert created == [
+        "candles_p2026_09", "candles_p2026_10", "candles_p2026_11", "candles_p2026_12",
+    ]
+
+
+def test_candles_model_is_range_partitioned_by_timestamp():
+    ddl = str(CreateTable(Candle.__table__).compile(dialect=postgresql.dialect()))
+
+    assert "PARTITION BY RANGE (timestamp)" in ddl
+    assert "PRIMARY KEY (id, timestamp)" in ddl
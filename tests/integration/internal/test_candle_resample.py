@@ -0,0 +1,177 @@
+from contextlib import contextmanager
+from datetime import datetime, timezone
+
+from api_service.app.dataAccess.identifier_resolver import Resolution
+from api_service.app.dataAccess.mock_impl import MockDataAccessor
+from api_service.app.dataAccess.resampling import plan_resample
+from core.candle_resample import align_down, parse_interval_ms, resample_rows
+from syncer_service.syncer.ingestion.rollup import RollupTarget, rollup_target
+from syncer_service.syncer.ingestion.types import IngestionUnit
+
+MINUTE = 60_000
+HOUR = 60 * MINUTE
+
+
+def ms(*args):
+    return int(datetime(*args, tzinfo=timezone.utc).timestamp() * 1000)
+
+
+def minute_candle(ts):
+    # open/close/high/low derived from the minute index, volume 1 per minute
+    i = ts // MINUTE
+    return {"timestamp": ts, "open": i, "high": i + 0.5, "low": i - 0.5, "close": i + 0.25, "volume": 1.0}
+
+
+def minutes(start, count):
+    return [minute_candle(start + i * MINUTE) for i in range(count)]
+
+
+class FakeResult:
+    def __init__(self, rows):
+        self.rows = rows
+
+    def mappings(self):
+        return self
+
+    def all(self):
+        return self.rows
+
+    def one(self):
+        return self.rows
+
+
+def test_buckets_aggregate_ohlcv():
+    rows = minutes(0, 10)
+
+    buckets = resample_rows(rows, 5 * MINUTE)
+
+    assert buckets == [
+        {"timestamp": 0, "open": 0, "high": 4.5, "low": -0.5, "close": 4.25, "volume": 5.0},
+        {"timestamp": 5 * MINUTE, "open": 5, "high": 9.5, "low": 4.5, "close": 9.25, "volume": 5.0},
+    ]
+
+
+def test_open_bucket_is_dropped_and_gaps_are_kept():
+    rows = minutes(0, 3) + minutes(4 * MINUTE, 3)
+
+    buckets = resample_rows(rows, 5 * MINUTE, closed_before=7 * MINUTE)
+
+    # 0..4 with minute 3 missing; 5..6 is still open
+    assert [(b["timestamp"], b["volume"]) for b in buckets] == [(0, 4.0)]
+
+
+def test_weeks_open_on_monday():
+    week = parse_interval_ms("1w")
+
+    assert align_down(ms(2026, 10, 18, 12), week) == ms(2026, 10, 12)
+    assert parse_interval_ms("4h") == 4 * HOUR
+    assert plan_resample("2h").ratio == 120
+    assert plan_resample("90s") is None
+    assert plan_resample("1m") is None
+
+
+class StaticResolver:
+    def resolve(self, exchange, market, symbol, interval):
+        if interval != "1m":
+            return Resolution(message="Interval not find")
+        return Resolution(exchange_market_id=7, interval_id=1)
+
+
+def make_accessor(monkeypatch, db_rows):
+    class CandleSession:
+        def execute(self, query, params=None):
+            rows = [
+                row for row in db_rows
+                if ("start" not in params or row["timestamp"] >= params["start"])
+                and ("after" not in params or row["timestamp"] > params["after"])
+                and ("end" not in params or row["timestamp"] < params["end"])
+            ]
+            rows.sort(key=lambda r: r["timestamp"], reverse="desc" in str(query))
+            return FakeResult(rows[:params["limit"]])
+
+    @contextmanager
+    def fake_session():
+        yield CandleSession()
+
+    monkeypatch.setattr("api_service.app.dataAccess.mock_impl.get_session", fake_session)
+    return MockDataAccessor(resolver=StaticResolver(), resample=True)
+
+
+PAYLOAD = {"exchange": "hyperliquid", "market": "futures", "symbol": "BTC-USDC"}
+
+
+def test_latest_page_is_resampled_from_the_base_interval(monkeypatch):
+    # 10:00 .. 12:29 stored: 12:00 is still open
+    accessor = make_accessor(monkeypatch, minutes(10 * HOUR, 150))
+
+    result = accessor.fetch(None, {**PAYLOAD, "interval": "1h", "limit": 5})
+
+    assert [row["timestamp"] for row in result.payload] == [10 * HOUR, 11 * HOUR]
+    assert result.payload[0]["volume"] == 60.0
+    assert result.payload[0]["open"] == 600
+    assert result.payload[0]["close"] == 659.25
+
+
+def test_forward_pages_walk_whole_buckets(monkeypatch):
+    accessor = make_accessor(monkeypatch, minutes(0, 60))
+
+    first = accessor.fetch(None, {**PAYLOAD, "interval": "10m", "start": 1, "limit": 2})
+    second = accessor.fetch(None, {**PAYLOAD, "interval": "10m", "cursor": first.next_cursor, "limit": 2})
+    third = accessor.fetch(None, {**PAYLOAD, "interval": "10m", "cursor": second.next_cursor, "limit": 2})
+
+    assert [row["timestamp"] for row in first.payload] == [10 * MINUTE, 20 * MINUTE]
+    assert [row["timestamp"] for row in second.payload] == [30 * MINUTE, 40 * MINUTE]
+    assert [row["timestamp"] for row in third.payload] == [50 * MINUTE]
+    assert third.next_cursor is None
+
+
+def test_unknown_intervals_still_fail_without_resampling(monkeypatch):
+    accessor = make_accessor(monkeypatch, minutes(0, 60))
+    accessor.resample = False
+
+    result = accessor.fetch(None, {**PAYLOAD, "interval": "10m"})
+
+    assert result.available is False
+    assert result.message == "Interval not find"
+
+
+def test_rollup_writes_closed_buckets_after_the_watermark(monkeypatch):
+    source = minutes(0, 3 * 60 + 20)
+    written, cached = [], []
+
+    class SourceSession:
+        def execute(self, query, params=None):
+            if "min(timestamp)" in str(query):
+                return FakeResult((source[0]["timestamp"], source[-1]["timestamp"]))
+            return FakeResult([
+                row for row in source if params["start"] <= row["timestamp"] < params["end"]
+            ])
+
+    @contextmanager
+    def session_factory():
+        yield SourceSession()
+
+    monkeypatch.setattr("syncer_service.syncer.ingestion.rollup.get_last_timestamp", lambda s, u: 0)
+    monkeypatch.setattr(
+        "syncer_service.syncer.ingestion.rollup.write_candles",
+        lambda session, rows, on_conflict: written.extend(rows),
+    )
+    monkeypatch.setattr(
+        "syncer_service.syncer.ingestion.rollup.append_recent_candles",
+        lambda em, iv, rows: cached.extend(rows),
+    )
+
+    unit = IngestionUnit(
+        supported_market_id=3, exchange_market_id=7, interval_id=5,
+        exchange_name="hyperliquid", market_type="futures", canonical_symbol="BTC/USDC",
+        interval="1h", interval_ms=HOUR,
+    )
+    target = RollupTarget(unit=unit, source_interval_id=1, source_interval_ms=MINUTE)
+
+    result = rollup_target(target, session_factory=session_factory)
+
+    # 00:00 already stored, 03:00 still open
+    assert (result.start, result.end, result.written) == (HOUR, 3 * HOUR, 2)
+    assert [row[:3] for row in written] == [(7, 5, HOUR), (7, 5, 2 * HOUR)]
+    assert written[0][3:] == (60, 119.5, 59.5, 119.25, 60.0)
+    assert [row[0] for row in cached] == [HOUR, 2 * HOUR]
@@ -0,0 +1,162 @@
+from contextlib import contextmanager
+
+import pytest
+
+from core.models.candle import Candle
+from core.models.enums import Exchange, Interval, MarketType
+from syncer_service.syncer.ingestion import rollup
+from syncer_service.syncer.ingestion.rollup import (
+    RollupTarget,
+    RollupWatermark,
+    catch_up_rollups,
+    rewind_rollup_watermark,
+    rollup_persisted,
+)
+from syncer_service.syncer.ingestion.types import IngestionUnit
+
+MINUTE = 60_000
+HOUR = 60 * MINUTE
+EXCHANGE_MARKET_ID = 9001
+
+
+def make_unit(interval, interval_ms, interval_id):
+    return IngestionUnit(
+        supported_market_id=interval_id,
+        exchange_market_id=EXCHANGE_MARKET_ID,
+        interval_id=interval_id,
+        exchange_name="hyperliquid",
+        market_type="futures",
+        canonical_symbol="BTC/USDC",
+        interval=interval,
+        interval_ms=interval_ms,
+    )
+
+
+BASE = make_unit("1m", MINUTE, 1)
+TARGETS = [
+    RollupTarget(unit=make_unit("5m", 5 * MINUTE, 2), source_interval_id=1, source_interval_ms=MINUTE),
+    RollupTarget(unit=make_unit("1h", HOUR, 5), source_interval_id=1, source_interval_ms=MINUTE),
+]
+
+
+def base_row(ts):
+    return {"timestamp": ts, "open": 1.0, "high": 2.0, "low": 0.5, "close": 1.5, "volume": 1.0}
+
+
+def candle(ts):
+    return Candle(
+        open_timestamp=ts, close_timestamp=ts + MINUTE - 1,
+        open=1.0, high=2.0, low=0.5, close=1.5, volume=1.0,
+        exchange=Exchange.HYPERLIQUID, market_type=MarketType.FUTURES,
+        symbol="BTC/USDC", interval=Interval.M1,
+    )
+
+
+class FakeResult:
+    def __init__(self, rows):
+        self.rows = rows
+
+    def mappings(self):
+        return self
+
+    def all(self):
+        return self.rows
+
+    def one(self):
+        return self.rows
+
+
+@pytest.fixture
+def store(monkeypatch):
+    """
+    Base rows served by a fake session; derived writes and range reads recorded.
+    """
+    state = {"base": [], "reads": [], "written": []}
+
+    class SourceSession:
+        def execute(self, query, params=None):
+            base = state["base"]
+            if "min(timestamp)" in str(query):
+                if not base:
+                    return FakeResult((None, None))
+                return FakeResult((base[0]["timestamp"], base[-1]["timestamp"]))
+
+            state["reads"].append((params["start"], params["end"]))
+            return FakeResult([
+                row for row in base if params["start"] <= row["timestamp"] < params["end"]
+            ])
+
+    @contextmanager
+    def session_factory():
+        yield SourceSession()
+
+    state["session_factory"] = session_factory
+
+    monkeypatch.setattr(rollup, "load_rollup_targets", lambda session, ids=None: TARGETS)
+    monkeypatch.setattr(rollup, "get_last_timestamp", lambda session, unit: None)
+    monkeypatch.setattr(
+        rollup, "write_candles",
+        lambda session, rows, on_conflict: state["written"].extend(rows),
+    )
+    monkeypatch.setattr(rollup, "append_recent_candles", lambda em, iv, rows: None)
+    monkeypatch.setattr(rollup, "invalidate_recent_candles", lambda em, iv: None)
+
+    watermark = RollupWatermark(EXCHANGE_MARKET_ID, 1)
+    watermark.redis.delete(watermark.key)
+    state["watermark"] = watermark
+
+    yield state
+
+    watermark.redis.delete(watermark.key)
+
+
+def written_keys(state):
+    return [(row[1], row[2]) for row in state["written"]]
+
+
+def test_ingest_rewrites_only_the_touched_buckets(store):
+    store["base"] = [base_row(ts) for ts in range(0, 62 * MINUTE, MINUTE)]
+    store["watermark"].advance(None, 59 * MINUTE)
+
+    new = [candle(60 * MINUTE), candle(61 * MINUTE)]
+    rollup_persisted(BASE, new, previous_ts=59 * MINUTE, session_factory=store["session_factory"])
+
+    # 5m: the 55m bucket closed with 59m; 1h: the first hour closed
+    assert store["reads"] == [(55 * MINUTE, 60 * MINUTE), (0, HOUR)]
+    assert written_keys(store) == [(2, 55 * MINUTE), (5, 0)]
+    assert store["written"][1][3:] == (1.0, 2.0, 0.5, 1.5, 60.0)
+    # continued from the watermark -> advanced to the newest closed position
+    assert store["watermark"].get() == 62 * MINUTE
+
+
+def test_ingest_does_not_advance_past_pending_work(store):
+    store["base"] = [base_row(ts) for ts in range(0, 62 * MINUTE, MINUTE)]
+    store["watermark"].advance(None, 30 * MINUTE)
+
+    rollup_persisted(BASE, [candle(61 * MINUTE)], previous_ts=60 * MINUTE, session_factory=store["session_factory"])
+
+    assert store["watermark"].get() == 30 * MINUTE
+
+
+def test_catch_up_recomputes_from_the_watermark(store):
+    store["base"] = [base_row(ts) for ts in range(0, 3 * HOUR + 7 * MINUTE, MINUTE)]
+    store["watermark"].advance(None, HOUR + 2 * MINUTE)
+
+    catch_up_rollups(session_factory=store["session_factory"])
+
+    five_minute = [ts for iv, ts in written_keys(store) if iv == 2]
+    hourly = [ts for iv, ts in written_keys(store) if iv == 5]
+
+    assert five_minute[0] == HOUR and five_minute[-1] == 3 * HOUR
+    assert hourly == [HOUR, 2 * HOUR]
+    assert store["watermark"].get() == 3 * HOUR + 7 * MINUTE
+
+
+def test_backfill_rewinds_the_watermark(store):
+    store["watermark"].advance(None, 5 * HOUR)
+
+    rewind_rollup_watermark(BASE, 2 * HOUR)
+    rewind_rollup_watermark(BASE, 3 * HOUR)
+    rewind_rollup_watermark(TARGETS[1].unit, HOUR)
+
+    assert store["watermark"].get() == 2 * HOUR
@@ -0,0 +1,154 @@
+from concurrent.futures import Future
+
+from syncer_service.syncer.ingestion.executor import UNIT_SUCCESS
+from syncer_service.syncer.ingestion.scheduler import CandleScheduler, next_due_ms
+from syncer_service.syncer.ingestion.types import IngestionUnit
+
+MINUTE = 60_000
+HOUR = 60 * MINUTE
+
+
+def make_unit(interval, interval_ms):
+    return IngestionUnit(
+        supported_market_id=1,
+        exchange_market_id=1,
+        interval_id=interval_ms,
+        exchange_name="hyperliquid",
+        market_type="futures",
+        canonical_symbol="BTC/USDC",
+        interval=interval,
+        interval_ms=interval_ms,
+    )
+
+
+class FakeClock:
+    def __init__(self, now_ms):
+        self.now_ms = now_ms
+
+    def __call__(self):
+        return self.now_ms / 1000
+
+
+class RecordingExecutor:
+    """
+    Holds every submitted unit until the test finishes it.
+    """
+
+    def __init__(self):
+        self.submitted = []
+        self.running = {}
+
+    def submit(self, unit, cycle_id=None, **kwargs):
+        future = Future()
+        self.submitted.append(unit.interval)
+        self.running[unit.interval] = future
+        return future
+
+    def finish(self, *intervals):
+        for interval in intervals:
+            self.running.pop(interval).set_result(UNIT_SUCCESS)
+
+
+def make_scheduler(clock, executor, units, scan_fn=lambda units: 0):
+    return CandleScheduler(
+        executor=executor,
+        load_fn=lambda: (units, {}),
+        repair_fn=lambda: 0,
+        scan_fn=scan_fn,
+        partition_fn=lambda: [],
+        rollup_fn=lambda: 0,
+        reload_seconds=3600,
+        delay_ms=2_000,
+        jitter_ms=0,
+        clock=clock,
+        sleep=lambda seconds: None,
+    )
+
+
+def test_next_due_is_aligned_to_the_close_boundary():
+    now = 10 * MINUTE + 12_345
+
+    assert next_due_ms(MINUTE, now, delay_ms=2_000, jitter_ms=0) == 11 * MINUTE + 2_000
+    assert next_due_ms(HOUR, now, delay_ms=2_000, jitter_ms=0) == HOUR + 2_000
+    assert next_due_ms(
+        MINUTE, now, delay_ms=2_000, jitter_ms=1_000, rng=lambda: 0.5
+    ) == 11 * MINUTE + 2_500
+
+
+def test_scheduler_fires_each_unit_after_its_own_boundary():
+    clock = FakeClock(10 * MINUTE + 5_000)
+    executor = RecordingExecutor()
+    scheduler = make_scheduler(
+        clock, executor, [make_unit("1m", MINUTE), make_unit("1h", HOUR)]
+    )
+
+    # first tick catches every unit up immediately
+    scheduler.tick()
+    executor.finish("1m", "1h")
+    assert executor.submitted == ["1m", "1h"]
+    assert scheduler.next_due() == 11 * MINUTE + 2_000
+
+    # nothing is due before the next 1m boundary
+    clock.now_ms = 11 * MINUTE
+    assert scheduler.tick() == []
+
+    clock.now_ms = 11 * MINUTE + 2_000
+    scheduler.tick()
+    executor.finish("1m")
+    assert executor.submitted[-1:] == ["1m"]
+
+    clock.now_ms = HOUR + 2_000
+    scheduler.tick()
+    assert executor.submitted[-2:] == ["1m", "1h"]
+
+
+def test_scheduler_realigns_after_a_long_run():
+    clock = FakeClock(10 * MINUTE + 2_000)
+    executor = RecordingExecutor()
+    scheduler = make_scheduler(clock, executor, [make_unit("1m", MINUTE)])
+
+    scheduler.tick()
+
+    # the unit takes 2.5 minutes: boundaries 11m and 12m are missed
+    clock.now_ms = 12 * MINUTE + 32_000
+    executor.finish("1m")
+
+    assert scheduler.next_due() == 13 * MINUTE + 2_000
+
+
+def test_slow_unit_does_not_delay_the_others():
+    clock = FakeClock(10 * MINUTE + 5_000)
+    executor = RecordingExecutor()
+    scheduler = make_scheduler(
+        clock, executor, [make_unit("1m", MINUTE), make_unit("1h", HOUR)]
+    )
+
+    scheduler.tick()
+    executor.finish("1m")  # 1h is still running (e.g. exchange timeout)
+
+    clock.now_ms = 11 * MINUTE + 2_000
+    assert [unit.interval for unit in scheduler.tick()] == ["1m"]
+
+    # a reload does not submit the running unit a second time
+    scheduler.reload(clock.now_ms)
+    executor.finish("1m")
+    clock.now_ms = 12 * MINUTE + 2_000
+    assert [unit.interval for unit in scheduler.tick()] == ["1m"]
+
+    # 1m is running again; the finished 1h unit waits for its own boundary
+    executor.finish("1h")
+    assert scheduler.next_due() == HOUR + 2_000
+
+
+def test_reload_scans_stored_gaps_in_the_background():
+    clock = FakeClock(10 * MINUTE)
+    scanned = []
+    units = [make_unit("1m", MINUTE), make_unit("1h", HOUR)]
+    scheduler = make_scheduler(
+        clock, RecordingExecutor(), units, scan_fn=lambda units: scanned.append(set(units))
+    )
+
+    scheduler.tick()
+    scheduler._maintenance_future.result(timeout=5)
+
+    assert scanned == [set(units)]
@@ -0,0 +1,127 @@
+import asyncio
+
+import pytest
+from fastapi.testclient import TestClient
+
+import api_service.app.api.export as export
+import api_service.app.api.main as api_main
+from api_service.app.dataAccess.identifier_resolver import Resolution
+from api_service.app.dataAccess.mock_impl import MockDataAccessor
+from api_service.app.semantics.base import SemanticResult
+
+ROWS = [
+    {"timestamp": 60, "open": 1.0, "high": 2.0, "low": 0.5, "close": 1.5, "volume": 10.0},
+    {"timestamp": 120, "open": 1.5, "high": 2.5, "low": 1.0, "close": 2.0, "volume": 12.0},
+]
+
+
+async def chunks(*parts):
+    for part in parts:
+        yield part
+
+
+async def collect(stream):
+    return b"".join([block async for block in stream])
+
+
+class ExportOrchestrator:
+    def __init__(self, result):
+        self.result = result
+        self.routes = []
+
+    async def ahandle_request(self, request, route, payload):
+        self.routes.append(route)
+        return self.result
+
+
+def test_export_format_comes_from_param_then_accept_header():
+    assert export.negotiate_export_format("csv", "application/x-ndjson") == "csv"
+    assert export.negotiate_export_format("json", "text/csv") is None
+    assert export.negotiate_export_format(None, "application/x-ndjson;q=0.9, */*") == "ndjson"
+    assert export.negotiate_export_format(None, "application/json") is None
+    assert export.negotiate_export_format(None, None) is None
+
+
+def test_ndjson_and_csv_encode_chunk_by_chunk():
+    ndjson = asyncio.run(collect(export.encode_ndjson(chunks(ROWS[:1], ROWS[1:]))))
+    csv_body = asyncio.run(collect(export.encode_csv(chunks(ROWS[:1], ROWS[1:]))))
+
+    assert ndjson.decode().splitlines()[1] == (
+        '{"timestamp": 120, "open": 1.5, "high": 2.5, "low": 1.0, "close": 2.0, "volume": 12.0}'
+    )
+    assert csv_body.decode().splitlines() == [
+        "timestamp,open,high,low,close,volume",
+        "60,1.0,2.0,0.5,1.5,10.0",
+        "120,1.5,2.5,1.0,2.0,12.0",
+    ]
+
+
+def test_candles_endpoint_streams_export_via_accept_header(monkeypatch):
+    orchestrator = ExportOrchestrator(
+        SemanticResult(type="success", data=chunks(ROWS))
+    )
+    monkeypatch.setattr(api_main, "orchestrator", orchestrator)
+    client = TestClient(api_main.app)
+
+    response = client.get(
+        "/candles/binance/spot/BTC-USDT/1m?start=0",
+        headers={"Accept": "text/csv"},
+    )
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/csv")
+    assert response.text.splitlines()[0] == "timestamp,open,high,low,close,volume"
+    assert orchestrator.routes == ["export_candles"]
+
+
+def test_candles_export_errors_keep_json_shape(monkeypatch):
+    orchestrator = ExportOrchestrator(
+        SemanticResult(type="error", message="Interval not find")
+    )
+    monkeypatch.setattr(api_main, "orchestrator", orchestrator)
+    client = TestClient(api_main.app)
+
+    response = client.get("/candles/binance/spot/BTC-USDT/4h?format=ndjson")
+
+    assert response.json()["type"] == "error"
+    assert response.json()["message"] == "Interval not find"
+
+
+def test_arrow_export_without_pyarrow_is_not_acceptable(monkeypatch):
+    orchestrator = ExportOrchestrator(None)
+    monkeypatch.setattr(api_main, "orchestrator", orchestrator)
+    monkeypatch.setattr(export, "ARROW_AVAILABLE", False)
+    client = TestClient(api_main.app)
+
+    response = client.get("/candles/binance/spot/BTC-USDT/1m?format=arrow")
+
+    assert response.status_code == 406
+    assert response.json()["data"] is None
+    assert orchestrator.routes == []
+
+
+@pytest.mark.asyncio
+async def test_data_accessor_stream_resolves_ids_before_streaming(monkeypatch):
+    class StaticResolver:
+        async def aresolve(self, exchange, market, symbol, interval):
+            if interval != "1m":
+                return Resolution(message="Interval not find")
+            return Resolution(exchange_market_id=7, interval_id=3)
+
+    streamed = []
+
+    def fake_stream(resolution, page, archive=None):
+        streamed.append((resolution.exchange_market_id, page.start, page.end))
+        return chunks(ROWS)
+
+    monkeypatch.setattr("api_service.app.dataAccess.mock_impl.stream_candle_rows", fake_stream)
+    accessor = MockDataAccessor(resolver=StaticResolver())
+    payload = {"exchange": "binance", "market": "spot", "symbol": "BTC-USDT", "start": 0, "end": 600}
+
+    missing = await accessor.astream(None, {**payload, "interval": "4h"})
+    found = await accessor.astream(None, {**payload, "interval": "1m"})
+
+    assert missing.available is False
+    assert missing.message == "Interval not find"
+    assert [rows async for rows in found.payload] == [ROWS]
+    assert streamed == [(7, 0, 600)]
@@ -0,0 +1,153 @@
+from contextlib import contextmanager
+
+from fastapi.testclient import TestClient
+
+import api_service.app.api.main as api_main
+from api_service.app.dataAccess.identifier_resolver import IdentifierSnapshot
+from api_service.app.dataAccess.mock_impl import MockDataAccessor
+from api_service.app.dataAccess.pagination import (
+    CandlePage,
+    build_candles_query,
+    decode_cursor,
+    encode_cursor,
+    parse_candle_page,
+)
+
+PAYLOAD = {"exchange": "binance", "market": "spot", "symbol": "BTC-USDT", "interval": "1m"}
+
+
+class FakeResult:
+    def __init__(self, rows):
+        self.rows = rows
+
+    def mappings(self):
+        return self
+
+    def all(self):
+        return self.rows
+
+
+class CandleTable:
+    """
+    Evaluates the keyset query params against an in-memory series.
+    """
+
+    def __init__(self, timestamps):
+        self.timestamps = timestamps
+        self.queries = []
+
+    def execute(self, query, params=None):
+        sql = str(query)
+        self.queries.append((sql, params))
+
+        ts = [t for t in self.timestamps if
+              ("after" not in params or t > params["after"]) and
+              ("start" not in params or t >= params["start"]) and
+              ("end" not in params or t < params["end"])]
+        ts.sort(reverse="desc" in sql)
+
+        return FakeResult([{"timestamp": t} for t in ts[:params["limit"]]])
+
+
+class StaticResolver:
+    def resolve(self, exchange, market, symbol, interval):
+        snapshot = IdentifierSnapshot(
+            exchanges={"binance": 1},
+            markets={("binance", "spot", "BTC/USDT"): 7},
+            intervals={"1m": 3},
+        )
+        return snapshot.resolve(exchange, market, symbol, interval)
+
+
+def make_accessor(monkeypatch, table):
+    @contextmanager
+    def fake_get_session():
+        yield table
+
+    monkeypatch.setattr("api_service.app.dataAccess.mock_impl.get_session", fake_get_session)
+    return MockDataAccessor(resolver=StaticResolver())
+
+
+def test_cursor_round_trip_and_invalid_cursor():
+    assert decode_cursor(encode_cursor(120, 600)) == (120, 600)
+    assert decode_cursor(encode_cursor(120, None)) == (120, None)
+
+    page = parse_candle_page({**PAYLOAD, "cursor": encode_cursor(120, 600), "start": 0})
+    assert page == CandlePage(limit=100, end=600, after=120)
+
+
+def test_latest_page_scans_index_backwards_and_returns_ascending(monkeypatch):
+    table = CandleTable([60, 120, 180, 240])
+    accessor = make_accessor(monkeypatch, table)
+
+    result = accessor.fetch(request=None, payload={**PAYLOAD, "limit": 2})
+
+    assert [row["timestamp"] for row in result.payload] == [180, 240]
+    assert result.next_cursor is None
+    assert "order by timestamp desc" in table.queries[0][0]
+
+
+def test_forward_pages_follow_the_cursor_until_exhausted(monkeypatch):
+    table = CandleTable([60, 120, 180, 240, 300])
+    accessor = make_accessor(monkeypatch, table)
+
+    first = accessor.fetch(request=None, payload={**PAYLOAD, "limit": 2, "start": 60, "end": 300})
+    second = accessor.fetch(request=None, payload={**PAYLOAD, "limit": 2, "cursor": first.next_cursor})
+
+    assert [row["timestamp"] for row in first.payload] == [60, 120]
+    assert [row["timestamp"] for row in second.payload] == [180, 240]
+    assert second.next_cursor is None
+    assert table.queries[1][1] == {"ex_market_id": 7, "interval": 3, "after": 120, "end": 300, "limit": 3}
+
+
+def test_invalid_cursor_is_reported_without_querying(monkeypatch):
+    table = CandleTable([60])
+    accessor = make_accessor(monkeypatch, table)
+
+    result = accessor.fetch(request=None, payload={**PAYLOAD, "cursor": "not-a-cursor"})
+
+    assert result.available is False
+    assert result.message == "invalid cursor"
+    assert table.queries == []
+
+
+def test_range_query_uses_bounds_in_sql():
+    query, params = build_candles_query(7, 3, CandlePage(limit=10, start=0, end=600))
+
+    assert "timestamp >= :start" in str(query)
+    assert "timestamp < :end" in str(query)
+    assert "order by timestamp asc" in str(query)
+    assert params["limit"] == 11
+
+
+def test_candles_endpoint_forwards_range_and_cursor(monkeypatch):
+    calls = []
+
+    class FakeOrchestrator:
+        async def ahandle_request(self, request, route, payload):
+            calls.append(payload)
+            return {"type": "success", "message": None, "data": [], "next_cursor": None}
+
+    monkeypatch.setattr(api_main, "orchestrator", FakeOrchestrator())
+    client = TestClient(api_main.app)
+
+    response = client.get("/candles/binance/spot/BTC-USDT/1m?start=60&end=600&cursor=abc")
+
+    assert response.status_code == 200
+    assert calls[0] == {**PAYLOAD, "limit": 100, "start": 60, "end": 600, "cursor": "abc"}
+
+
+def test_candles_endpoint_rejects_limit_above_max(monkeypatch):
+    calls = []
+
+    class FakeOrchestrator:
+        async def ahandle_request(self, request, route, payload):
+            calls.append(payload)
+
+    monkeypatch.setattr(api_main, "orchestrator", FakeOrchestrator())
+    client = TestClient(api_main.app)
+
+    response = client.get("/candles/binance/spot/BTC-USDT/1m?limit=100000")
+
+    assert response.status_code == 422
+    assert calls == []
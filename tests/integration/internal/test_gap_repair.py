@@ -0,0 +1,86 @@
+from types import SimpleNamespace
+
+from core.redis_client import build_redis_client
+
+from syncer_service.syncer.backfill.gap_repair import (
+    GAP_REPAIR_MAX_ATTEMPTS,
+    GAP_REPAIR_QUEUE_KEY,
+    drain_gap_repairs,
+    enqueue_gap_repair,
+)
+from syncer_service.syncer.ingestion.types import IngestionUnit
+
+MINUTE = 60_000
+
+
+def make_unit():
+    return IngestionUnit(
+        supported_market_id=1,
+        exchange_market_id=7,
+        interval_id=3,
+        exchange_name="hyperliquid",
+        market_type="futures",
+        canonical_symbol="BTC/USDC",
+        interval="1m",
+        interval_ms=MINUTE,
+    )
+
+
+def test_enqueue_gap_repair_deduplicates_identical_ranges():
+    unit = make_unit()
+
+    assert enqueue_gap_repair(unit, 2 * MINUTE, 4 * MINUTE) is True
+    assert enqueue_gap_repair(unit, 2 * MINUTE, 4 * MINUTE) is False
+    assert enqueue_gap_repair(unit, 4 * MINUTE, 4 * MINUTE) is False
+
+    assert build_redis_client().zcard(GAP_REPAIR_QUEUE_KEY) == 1
+
+
+def test_drain_gap_repairs_fetches_only_queued_ranges_and_requeues_failures():
+    unit = make_unit()
+    enqueue_gap_repair(unit, 2 * MINUTE, 4 * MINUTE)
+    enqueue_gap_repair(unit, 8 * MINUTE, 9 * MINUTE)
+
+    calls = []
+
+    def fake_repair(unit, start, end, use_checkpoint, cycle_id):
+        calls.append((unit.exchange_market_id, start, end))
+        if start == 8 * MINUTE:
+            raise ConnectionError("exchange timeout")
+        return SimpleNamespace(windows_failed=0)
+
+    repaired = drain_gap_repairs(max_jobs=10, repair_fn=fake_repair)
+
+    assert repaired == 1
+    assert calls == [(7, 2 * MINUTE, 4 * MINUTE), (7, 8 * MINUTE, 9 * MINUTE)]
+    assert build_redis_client().zcard(GAP_REPAIR_QUEUE_KEY) == 1
+
+
+def test_unfillable_gap_stops_after_max_attempts():
+    unit = make_unit()
+    calls = []
+
+    def empty_repair(unit, start, end, use_checkpoint, cycle_id):
+        # the exchange has no candles for the range; the scan keeps finding it
+        calls.append(start)
+        return SimpleNamespace(windows_failed=0)
+
+    for _ in range(GAP_REPAIR_MAX_ATTEMPTS):
+        assert enqueue_gap_repair(unit, 2 * MINUTE, 4 * MINUTE) is True
+        drain_gap_repairs(max_jobs=10, repair_fn=empty_repair)
+
+    assert enqueue_gap_repair(unit, 2 * MINUTE, 4 * MINUTE) is False
+    assert len(calls) == GAP_REPAIR_MAX_ATTEMPTS
+
+
+def test_failing_gap_is_not_requeued_after_max_attempts():
+    unit = make_unit()
+    enqueue_gap_repair(unit, 2 * MINUTE, 4 * MINUTE)
+
+    def failing_repair(unit, start, end, use_checkpoint, cycle_id):
+        raise ConnectionError("exchange timeout")
+
+    for _ in range(GAP_REPAIR_MAX_ATTEMPTS):
+        drain_gap_repairs(max_jobs=10, repair_fn=failing_repair)
+
+    assert build_redis_client().zcard(GAP_REPAIR_QUEUE_KEY) == 0
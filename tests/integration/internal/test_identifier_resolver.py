@@ -0,0 +1,119 @@
+from contextlib import contextmanager
+
+from api_service.app.dataAccess.identifier_resolver import IdentifierResolver
+from api_service.app.dataAccess.mock_impl import MockDataAccessor
+
+
+class FakeResult:
+    def __init__(self, rows):
+        self.rows = rows
+
+    def mappings(self):
+        return self
+
+    def all(self):
+        return self.rows
+
+
+class SnapshotSession:
+    def __init__(self, markets):
+        self.markets = markets
+        self.calls = 0
+
+    def execute(self, query, params=None):
+        self.calls += 1
+        sql = str(query)
+        if "from exchange_markets" in sql:
+            return FakeResult(self.markets)
+        if "from intervals" in sql:
+            return FakeResult([{"id": 3, "interval": "1m"}])
+        return FakeResult([{"id": 1, "name": "binance"}])
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def make_resolver(session, version, clock):
+    @contextmanager
+    def session_factory():
+        yield session
+
+    return IdentifierResolver(
+        ttl_seconds=300,
+        version_check_seconds=5,
+        miss_refresh_seconds=5,
+        session_factory=session_factory,
+        version_fn=lambda: version["value"],
+        clock=clock,
+    )
+
+
+BTC_SPOT = {"exchange": "binance", "market_type": "spot", "symbol": "BTC/USDT", "exchange_market_id": 7}
+
+
+def test_resolver_serves_ids_from_one_snapshot():
+    session = SnapshotSession([BTC_SPOT])
+    resolver = make_resolver(session, {"value": "1"}, FakeClock())
+
+    first = resolver.resolve("binance", "SPOT", "BTC-USDT", "1m")
+    second = resolver.resolve("binance", "spot", "BTC-USDT", "1m")
+
+    assert (first.exchange_market_id, first.interval_id) == (7, 3)
+    assert second == first
+    assert session.calls == 3  # one snapshot load
+
+
+def test_resolver_reports_first_missing_identifier():
+    clock = FakeClock()
+    resolver = make_resolver(SnapshotSession([BTC_SPOT]), {"value": "1"}, clock)
+
+    assert resolver.resolve("kraken", "spot", "BTC-USDT", "1m").message == "exchange not find"
+    assert resolver.resolve("binance", "futures", "BTC-USDT", "1m").message == "exchange_market not find"
+    assert resolver.resolve("binance", "spot", "BTC-USDT", "4h").message == "Interval not find"
+
+
+def test_resolver_reloads_when_metadata_version_changes():
+    clock = FakeClock()
+    version = {"value": "1"}
+    session = SnapshotSession([BTC_SPOT])
+    resolver = make_resolver(session, version, clock)
+
+    resolver.resolve("binance", "spot", "BTC-USDT", "1m")
+
+    eth = {"exchange": "binance", "market_type": "spot", "symbol": "ETH/USDT", "exchange_market_id": 8}
+    session.markets = [BTC_SPOT, eth]
+    version["value"] = "2"
+    clock.now = 6
+
+    assert resolver.resolve("binance", "spot", "ETH-USDT", "1m").exchange_market_id == 8
+
+
+def test_data_accessor_with_resolver_runs_only_the_candles_query(monkeypatch):
+    resolver = make_resolver(SnapshotSession([BTC_SPOT]), {"value": "1"}, FakeClock())
+    resolver.reload()
+
+    executed = []
+
+    class CandleSession:
+        def execute(self, query, params=None):
+            executed.append(params)
+            return FakeResult([{"timestamp": 1}])
+
+    @contextmanager
+    def fake_get_session():
+        yield CandleSession()
+
+    monkeypatch.setattr("api_service.app.dataAccess.mock_impl.get_session", fake_get_session)
+
+    result = MockDataAccessor(resolver=resolver).fetch(
+        request=None,
+        payload={"exchange": "binance", "market": "spot", "symbol": "BTC-USDT", "interval": "1m"},
+    )
+
+    assert result.available is True
+    assert executed == [{"ex_market_id": 7, "interval": 3, "limit": 100}]
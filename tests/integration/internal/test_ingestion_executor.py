@@ -0,0 +1,97 @@
+import threading
+import time
+from contextlib import contextmanager
+
+from syncer_service.syncer.ingestion.executor import IngestionExecutor
+from syncer_service.syncer.ingestion.types import IngestionUnit
+
+
+def make_unit(exchange_name="hyperliquid", symbol="BTC/USDC", interval="1m"):
+    return IngestionUnit(
+        supported_market_id=1,
+        exchange_market_id=1,
+        interval_id=1,
+        exchange_name=exchange_name,
+        market_type="futures",
+        canonical_symbol=symbol,
+        interval=interval,
+        interval_ms=60_000,
+    )
+
+
+@contextmanager
+def always_acquired(unit):
+    yield True
+
+
+@contextmanager
+def never_acquired(unit):
+    yield False
+
+
+def test_executor_counts_success_failed_and_skipped():
+    def ingest(unit, cycle_id=None):
+        if unit.canonical_symbol == "ETH/USDC":
+            raise RuntimeError("exchange down")
+
+    executor = IngestionExecutor(
+        max_workers=4,
+        ingest_fn=ingest,
+        lock_fn=always_acquired,
+    )
+
+    report = executor.run(
+        [make_unit(symbol="BTC/USDC"), make_unit(symbol="ETH/USDC")],
+        cycle_id="cycle-1",
+    )
+
+    assert report.success == 1
+    assert report.failed == 1
+    assert report.skipped == 0
+
+
+def test_executor_skips_units_when_lock_is_held():
+    calls = []
+
+    executor = IngestionExecutor(
+        max_workers=2,
+        ingest_fn=lambda unit, cycle_id=None: calls.append(unit),
+        lock_fn=never_acquired,
+    )
+
+    report = executor.run([make_unit(), make_unit(interval="5m")])
+
+    assert report.skipped == 2
+    assert calls == []
+
+
+def test_executor_caps_concurrency_per_exchange():
+    active = {"binance": 0, "hyperliquid": 0}
+    peak = {"binance": 0, "hyperliquid": 0}
+    guard = threading.Lock()
+
+    def ingest(unit, cycle_id=None):
+        with guard:
+            active[unit.exchange_name] += 1
+            peak[unit.exchange_name] = max(
+                peak[unit.exchange_name], active[unit.exchange_name]
+            )
+        time.sleep(0.02)
+        with guard:
+            active[unit.exchange_name] -= 1
+
+    executor = IngestionExecutor(
+        max_workers=8,
+        per_exchange_concurrency=2,
+        ingest_fn=ingest,
+        lock_fn=always_acquired,
+    )
+
+    units = [make_unit(exchange_name="hyperliquid") for _ in range(6)]
+    units += [make_unit(exchange_name="binance") for _ in range(6)]
+
+    report = executor.run(units)
+
+    assert report.success == 12
+    assert peak["hyperliquid"] <= 2
+    assert peak["binance"] <= 2
@@ -0,0 +1,102 @@
+from core.models.candle import Candle
+from core.models.enums import Exchange, Interval, MarketType
+
+from syncer_service.syncer.ingestion.filter import (
+    load_last_timestamps,
+    run_filter_stage,
+)
+from syncer_service.syncer.ingestion.types import FetchResult, IngestionUnit
+
+
+def make_unit(exchange_market_id=1, interval_id=1):
+    return IngestionUnit(
+        supported_market_id=1,
+        exchange_market_id=exchange_market_id,
+        interval_id=interval_id,
+        exchange_name="hyperliquid",
+        market_type="futures",
+        canonical_symbol="BTC/USDC",
+        interval="1m",
+        interval_ms=60_000,
+    )
+
+
+def make_candle(open_timestamp):
+    return Candle(
+        open_timestamp=open_timestamp,
+        close_timestamp=open_timestamp + 59_999,
+        open=1.0,
+        high=2.0,
+        low=0.5,
+        close=1.5,
+        volume=10.0,
+        exchange=Exchange.HYPERLIQUID,
+        market_type=MarketType.FUTURES,
+        symbol="BTC/USDC",
+        interval=Interval.M1,
+    )
+
+
+def make_fetch_result(timestamps):
+    candles = [make_candle(ts) for ts in timestamps]
+    return FetchResult(
+        candles=candles,
+        fetched_count=len(candles),
+        min_ts=timestamps[0],
+        max_ts=timestamps[-1],
+    )
+
+
+class ExplodingSession:
+    def query(self, *args, **kwargs):
+        raise AssertionError("filter stage must not query when watermarks are given")
+
+
+def test_filter_stage_reads_last_timestamp_from_watermarks():
+    unit = make_unit()
+
+    result = run_filter_stage(
+        session=ExplodingSession(),
+        unit=unit,
+        fetch_result=make_fetch_result([60_000, 120_000, 180_000, 240_000]),
+        watermarks={unit.watermark_key: 120_000},
+    )
+
+    assert result.last_ts == 120_000
+    assert [c.open_timestamp for c in result.new_candles] == [180_000]
+    assert result.dropped_last_open_candle is True
+    assert result.gap_warning is False
+
+
+def test_filter_stage_treats_missing_watermark_as_empty_history():
+    result = run_filter_stage(
+        session=ExplodingSession(),
+        unit=make_unit(),
+        fetch_result=make_fetch_result([60_000, 120_000, 180_000]),
+        watermarks={},
+    )
+
+    assert result.last_ts is None
+    assert [c.open_timestamp for c in result.new_candles] == [60_000, 120_000]
+
+
+def test_load_last_timestamps_skips_query_for_no_units():
+    assert load_last_timestamps(ExplodingSession(), []) == {}
+
+
+def test_filter_stage_reports_leading_and_interior_gaps():
+    unit = make_unit()
+
+    result = run_filter_stage(
+        session=ExplodingSession(),
+        unit=unit,
+        fetch_result=make_fetch_result([240_000, 300_000, 480_000, 540_000, 720_000, 780_000]),
+        watermarks={unit.watermark_key: 120_000},
+    )
+
+    assert result.gap_warning is True
+    assert result.gap_ranges == [
+        (180_000, 240_000),
+        (360_000, 480_000),
+        (600_000, 720_000),
+    ]
@@ -0,0 +1,185 @@
+from types import SimpleNamespace
+
+from core.models.candle import Candle
+from core.models.enums import Exchange, Interval, MarketType
+
+from syncer_service.syncer.ingestion import persistence
+from syncer_service.syncer.ingestion.persistence import (
+    WriteCounts,
+    build_copy_buffer,
+    map_candle_to_values,
+    persist_stage,
+)
+from syncer_service.syncer.ingestion.types import FilterResult, IngestionUnit
+
+
+def make_unit():
+    return IngestionUnit(
+        supported_market_id=1,
+        exchange_market_id=7,
+        interval_id=3,
+        exchange_name="hyperliquid",
+        market_type="futures",
+        canonical_symbol="BTC/USDC",
+        interval="1m",
+        interval_ms=60_000,
+    )
+
+
+def make_candle(open_timestamp):
+    return Candle(
+        open_timestamp=open_timestamp,
+        close_timestamp=open_timestamp + 59_999,
+        open=1.5,
+        high=2.25,
+        low=0.5,
+        close=1.75,
+        volume=10.0,
+        exchange=Exchange.HYPERLIQUID,
+        market_type=MarketType.FUTURES,
+        symbol="BTC/USDC",
+        interval=Interval.M1,
+    )
+
+
+def test_map_candle_to_values_uses_unit_ids_and_open_timestamp():
+    values = map_candle_to_values(make_unit(), make_candle(60_000))
+
+    assert values == (7, 3, 60_000, 1.5, 2.25, 0.5, 1.75, 10.0)
+
+
+def test_build_copy_buffer_writes_one_csv_line_per_row():
+    buffer = build_copy_buffer([
+        (7, 3, 60_000, 1.5, 2.25, 0.5, 1.75, 10.0),
+        (7, 3, 120_000, 1.75, 2.0, 1.0, 1.25, 0.0),
+    ])
+
+    assert buffer.read() == (
+        "7,3,60000,1.5,2.25,0.5,1.75,10.0\n"
+        "7,3,120000,1.75,2.0,1.0,1.25,0.0\n"
+    )
+
+
+def test_persist_stage_reports_skipped_duplicates(monkeypatch):
+    captured = {}
+
+    def fake_write_candles(session, rows, on_conflict):
+        captured["rows"] = rows
+        captured["on_conflict"] = on_conflict
+        return WriteCounts(inserted=1)
+
+    monkeypatch.setattr(persistence, "write_candles", fake_write_candles)
+
+    result = persist_stage(
+        session=None,
+        unit=make_unit(),
+        filter_result=FilterResult(
+            new_candles=[make_candle(60_000), make_candle(120_000)],
+            dropped_last_open_candle=True,
+            gap_warning=False,
+            last_ts=None,
+        ),
+    )
+
+    assert len(captured["rows"]) == 2
+    assert captured["on_conflict"] == "nothing"
+    assert result.inserted == 1
+    assert result.skipped == 1
+    assert result.updated == 0
+
+
+def test_write_candles_routes_large_batches_through_copy(monkeypatch):
+    calls = []
+
+    monkeypatch.setattr(persistence, "PERSIST_COPY_THRESHOLD", 2)
+    monkeypatch.setattr(
+        persistence,
+        "copy_candles",
+        lambda session, rows, on_conflict: calls.append("copy") or WriteCounts(),
+    )
+    monkeypatch.setattr(
+        persistence,
+        "insert_candles",
+        lambda session, rows, on_conflict: calls.append("insert") or WriteCounts(),
+    )
+
+    row = (7, 3, 60_000, 1.5, 2.25, 0.5, 1.75, 10.0)
+
+    persistence.write_candles(None, [row])
+    persistence.write_candles(None, [row, row])
+
+    assert calls == ["insert", "copy"]
+
+
+def test_insert_candles_keeps_the_last_row_per_key():
+    captured = {}
+
+    class FakeSession:
+        def execute(self, stmt):
+            captured["params"] = stmt.compile().params
+
+            class Result:
+                def scalars(self):
+                    return self
+
+                def all(self):
+                    return [True, True]
+
+            return Result()
+
+    first = (7, 3, 60_000, 1.5, 2.25, 0.5, 1.75, 10.0)
+    overlap = (7, 3, 60_000, 1.5, 2.5, 0.5, 2.0, 12.0)
+    second = (7, 3, 120_000, 1.75, 2.0, 1.0, 1.25, 0.0)
+
+    counts = persistence.insert_candles(
+        FakeSession(), [first, second, overlap], on_conflict="update"
+    )
+
+    timestamps = sorted(
+        value for key, value in captured["params"].items() if key.startswith("timestamp")
+    )
+    closes = {
+        value for key, value in captured["params"].items() if key.startswith("close")
+    }
+
+    assert timestamps == [60_000, 120_000]
+    assert closes == {2.0, 1.25}
+    assert counts.inserted == 2
+
+
+def test_copy_candles_stages_the_last_row_per_key():
+    staged = {}
+
+    class FakeCursor:
+        def __enter__(self):
+            return self
+
+        def __exit__(self, *exc):
+            return False
+
+        def execute(self, sql):
+            pass
+
+        def copy_expert(self, sql, buffer):
+            staged["csv"] = buffer.read()
+
+        def fetchone(self):
+            return (2, 0)
+
+    class FakeSession:
+        def connection(self):
+            return SimpleNamespace(connection=SimpleNamespace(cursor=FakeCursor))
+
+    stale = (7, 3, 60_000, 1.5, 2.25, 0.5, 1.75, 10.0)
+    other = (7, 3, 120_000, 1.75, 2.0, 1.0, 1.25, 0.0)
+    refetched = (7, 3, 60_000, 1.5, 2.5, 0.5, 2.0, 12.0)
+
+    counts = persistence.copy_candles(
+        FakeSession(), [stale, other, refetched], on_conflict="update"
+    )
+
+    assert staged["csv"] == (
+        "7,3,60000,1.5,2.5,0.5,2.0,12.0\n"
+        "7,3,120000,1.75,2.0,1.0,1.25,0.0\n"
+    )
+    assert counts.inserted == 2
@@ -0,0 +1,120 @@
+import pytest
+
+from api_service.app.api.flow.consumption.leased_consumption import LeasedConsumptionState
+from api_service.app.api.flow.consumption.redis_consumption import (
+    RATE_LIMIT_MODE_SLIDING_LOG,
+    RATE_LIMIT_MODE_TOKEN_BUCKET,
+    RedisSlidingWindowConsumptionState,
+)
+from api_service.app.api.flow.consumption.snapshot import ConsumptionSnapshot
+from core.redis_client import build_redis_client
+
+
+class CountingState:
+    """
+    Stands in for the Redis limiter: a plain counter per consumer.
+    """
+
+    window_seconds = 60
+    capacity = 50
+
+    def __init__(self, consumed=0):
+        self.consumed = consumed
+        self.calls = []
+
+    def observe_and_reserve(self, consumer_ref, units=1, lease_units=0):
+        if lease_units > units and self.consumed + lease_units <= self.capacity:
+            units = lease_units
+
+        self.calls.append(units)
+        self.consumed += units
+        return ConsumptionSnapshot(consumer_ref, self.consumed, 60), units
+
+    async def aobserve_and_reserve(self, consumer_ref, units=1, lease_units=0):
+        return self.observe_and_reserve(consumer_ref, units, lease_units)
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def make_state(inner, clock=None):
+    return LeasedConsumptionState(
+        inner, capacity=50, lease_units=10, lease_max_share=0.5, clock=clock or FakeClock()
+    )
+
+
+def test_requests_are_admitted_from_the_local_lease():
+    inner = CountingState()
+    state = make_state(inner)
+
+    consumed = [state.observe_and_update("ip:1").consumed_units for _ in range(12)]
+
+    assert consumed == list(range(1, 13))
+    assert inner.calls == [10, 10]
+
+
+def test_near_capacity_every_request_goes_to_redis_exactly():
+    inner = CountingState()
+    state = make_state(inner)
+
+    for _ in range(40):
+        state.observe_and_update("ip:1")
+
+    # past half of the capacity leases stop; the count stays exact
+    assert inner.calls[-5:] == [1, 1, 1, 1, 1]
+    assert state.observe_and_update("ip:1").consumed_units == inner.consumed
+
+
+def test_slice_that_does_not_fit_falls_back_to_exact_units():
+    inner = CountingState(consumed=45)  # traffic from other workers
+    state = make_state(inner)
+
+    snapshot = state.observe_and_update("ip:1")
+
+    assert inner.calls == [1]
+    assert snapshot.consumed_units == 46
+
+
+@pytest.mark.parametrize("mode", [RATE_LIMIT_MODE_SLIDING_LOG, RATE_LIMIT_MODE_TOKEN_BUCKET])
+def test_consumer_near_the_limit_is_not_charged_for_a_rejected_slice(mode):
+    inner = RedisSlidingWindowConsumptionState(window_seconds=60, mode=mode, capacity=50)
+    # another worker raised the count close to the limit
+    inner.observe_and_update("ip:2", units=45)
+
+    state = make_state(inner)
+    consumed = [state.observe_and_update("ip:2").consumed_units for _ in range(5)]
+
+    assert consumed == [46, 47, 48, 49, 50]
+    assert state.observe_and_update("ip:2").consumed_units == 51
+    if mode == RATE_LIMIT_MODE_SLIDING_LOG:
+        assert build_redis_client().zcard("rate_limit:ip:2") == 51
+
+
+def test_lease_expires_after_one_window():
+    inner = CountingState()
+    clock = FakeClock()
+    state = make_state(inner, clock)
+
+    state.observe_and_update("ip:1")
+    clock.now = 61
+
+    state.observe_and_update("ip:1")
+
+    assert inner.calls == [10, 10]
+
+
+@pytest.mark.asyncio
+async def test_async_path_shares_the_lease():
+    inner = CountingState()
+    state = make_state(inner)
+
+    await state.aobserve_and_update("ip:1")
+    snapshot = state.observe_and_update("ip:1", units=2)
+
+    assert inner.calls == [10]
+    assert snapshot.consumed_units == 3
@@ -0,0 +1,86 @@
+from contextlib import contextmanager
+
+from api_service.app.dataAccess.metadata_snapshot import MetadataStore
+from core.metadata_document import (
+    flatten_metadata_document,
+    group_metadata_rows,
+    read_metadata_document,
+)
+from core.redis_client import build_redis_client
+from syncer_service.syncer.tasks.materialize_metadata import materialize_metadata
+
+
+ROWS = [
+    {"exchange": "binance", "symbol": "BTC-USDT", "exchange_symbol": "BTCUSDT",
+     "interval": "1m", "market_type": "spot", "status": "active"},
+    {"exchange": "binance", "symbol": "BTC-USDT", "exchange_symbol": "BTCUSDT",
+     "interval": "1h", "market_type": "spot", "status": "active"},
+    {"exchange": "kucoin", "symbol": "ETH-USDT", "exchange_symbol": "ETH-USDT",
+     "interval": "1m", "market_type": "futures", "status": "active"},
+]
+
+
+class FakeResult:
+    def __init__(self, rows):
+        self.rows = rows
+
+    def mappings(self):
+        return self
+
+    def all(self):
+        return self.rows
+
+
+class FakeSession:
+    def __init__(self):
+        self.calls = 0
+
+    def execute(self, query, params=None):
+        self.calls += 1
+        return FakeResult(ROWS)
+
+
+def test_materialize_stores_the_grouped_document():
+    result = materialize_metadata(FakeSession(), cycle_id="c1")
+
+    assert result == {"rows": 3, "markets": 2, "stored": True}
+    assert read_metadata_document() == group_metadata_rows(ROWS)
+
+
+def test_flattened_document_regroups_to_the_same_tree():
+    document = group_metadata_rows(ROWS)
+
+    assert group_metadata_rows(flatten_metadata_document(document)) == document
+
+
+def test_store_builds_from_the_document_without_the_join():
+    materialize_metadata(FakeSession())
+    session = FakeSession()
+
+    @contextmanager
+    def session_factory():
+        yield session
+
+    store = MetadataStore(session_factory=session_factory, version_fn=lambda: "1")
+
+    available, tree = store.lookup({"exchange": "kucoin"})
+
+    assert available
+    assert tree["exchanges"][0]["markets"][0]["symbol"] == "ETH-USDT"
+    assert store.current().source == "document"
+    assert session.calls == 0
+
+
+def test_store_falls_back_to_the_join_without_a_document():
+    build_redis_client().set("metadata:document", "not json")
+    session = FakeSession()
+
+    @contextmanager
+    def session_factory():
+        yield session
+
+    store = MetadataStore(session_factory=session_factory, version_fn=lambda: "1")
+
+    assert store.lookup({"interval": "1h"})[0]
+    assert store.current().source == "database"
+    assert session.calls == 1
@@ -0,0 +1,195 @@
+import asyncio
+from contextlib import asynccontextmanager, contextmanager
+
+import pytest
+
+from api_service.app.dataAccess.metadata_snapshot import MetadataSnapshot, MetadataStore
+from api_service.app.dataAccess.mock_impl import MockMetaDataAccessor
+from core.metadata_version import alisten_metadata_versions, bump_metadata_version
+from core.redis_client import aclose_async_redis_client
+
+
+ROWS = [
+    {"exchange": "binance", "symbol": "BTC-USDT", "exchange_symbol": "BTCUSDT",
+     "interval": "1m", "market_type": "spot", "status": "active"},
+    {"exchange": "binance", "symbol": "BTC-USDT", "exchange_symbol": "BTCUSDT",
+     "interval": "1h", "market_type": "spot", "status": "active"},
+    {"exchange": "binance", "symbol": "ETH-USDT", "exchange_symbol": "ETHUSDT",
+     "interval": "1m", "market_type": "futures", "status": "active"},
+    {"exchange": "kucoin", "symbol": "BTC-USDT", "exchange_symbol": "BTC-USDT",
+     "interval": "1m", "market_type": "spot", "status": "active"},
+]
+
+
+class FakeResult:
+    def __init__(self, rows):
+        self.rows = rows
+
+    def mappings(self):
+        return self
+
+    def all(self):
+        return self.rows
+
+
+class FakeSession:
+    def __init__(self):
+        self.calls = 0
+
+    def execute(self, query, params=None):
+        self.calls += 1
+        return FakeResult(ROWS)
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def make_store(session, version, clock):
+    @contextmanager
+    def session_factory():
+        yield session
+
+    return MetadataStore(
+        ttl_seconds=300,
+        version_check_seconds=5,
+        session_factory=session_factory,
+        version_fn=lambda: version["value"],
+        clock=clock,
+    )
+
+
+def test_snapshot_filters_like_the_metadata_query():
+    snapshot = MetadataSnapshot(ROWS)
+
+    available, tree = snapshot.lookup({"exchange": "binance", "market": "spot", "symbol": None})
+    assert available
+    assert tree == {"exchanges": [{"name": "binance", "markets": [{
+        "symbol": "BTC-USDT", "exchange_symbol": "BTCUSDT",
+        "market_type": "spot", "intervals": ["1h", "1m"],
+    }]}]}
+
+    _, tree = snapshot.lookup({"interval": "1m"})
+    assert [e["name"] for e in tree["exchanges"]] == ["binance", "kucoin"]
+
+    assert snapshot.lookup({"exchange": "okx"}) == (False, {"exchanges": []})
+
+
+def test_snapshot_keeps_a_bounded_number_of_results():
+    snapshot = MetadataSnapshot(ROWS, max_results=2)
+
+    for exchange in ("binance", "kucoin", "okx"):
+        snapshot.lookup({"exchange": exchange})
+
+    assert len(snapshot._results) == 2
+
+
+def test_store_loads_once_and_reloads_on_pushed_version():
+    session = FakeSession()
+    version = {"value": "1"}
+    store = make_store(session, version, FakeClock())
+
+    store.lookup({"exchange": "binance"})
+    store.lookup({"exchange": "kucoin"})
+    assert session.calls == 1
+
+    # older or equal pushes (late messages) are ignored
+    store.invalidate("1")
+    store.lookup({})
+    assert session.calls == 1
+
+    version["value"] = "2"
+    store.invalidate("2")
+    store.lookup({})
+    assert session.calls == 2
+    assert store.current().version == "2"
+
+
+def test_store_polls_the_version_key_between_pushes():
+    session = FakeSession()
+    version = {"value": "1"}
+    clock = FakeClock()
+    store = make_store(session, version, clock)
+
+    store.lookup({})
+    version["value"] = "2"
+
+    clock.now = 1
+    store.lookup({})
+    assert session.calls == 1
+
+    clock.now = 6
+    store.lookup({})
+    assert session.calls == 2
+
+
+def test_metadata_accessor_answers_from_the_store(monkeypatch):
+    def fail(*args, **kwargs):
+        raise AssertionError("store must answer without Redis or the DB")
+
+    monkeypatch.setattr("api_service.app.dataAccess.mock_impl.get_cached_metadata", fail)
+    monkeypatch.setattr("api_service.app.dataAccess.mock_impl.get_session", fail)
+
+    accessor = MockMetaDataAccessor(store=make_store(FakeSession(), {"value": "1"}, FakeClock()))
+
+    result = accessor.fetch(None, {"exchange": "kucoin"})
+
+    assert result.available
+    assert result.payload["exchanges"][0]["name"] == "kucoin"
+    assert not accessor.fetch(None, {"symbol": "SOL-USDT"}).available
+
+
+@pytest.mark.asyncio
+async def test_async_store_shares_one_reload():
+    loads = []
+
+    class AsyncSession:
+        async def execute(self, query, params=None):
+            loads.append(1)
+            await asyncio.sleep(0.01)
+            return FakeResult(ROWS)
+
+    @asynccontextmanager
+    async def async_session_factory():
+        yield AsyncSession()
+
+    async def aversion():
+        return "1"
+
+    store = MetadataStore(async_session_factory=async_session_factory, aversion_fn=aversion)
+
+    try:
+        results = await asyncio.gather(*[store.alookup({"exchange": "binance"}) for _ in range(5)])
+    finally:
+        await aclose_async_redis_client()
+
+    assert len(loads) == 1
+    assert all(available for available, _ in results)
+
+
+@pytest.mark.asyncio
+async def test_bumped_version_is_pushed_to_listeners():
+    received = asyncio.Queue()
+    listener = asyncio.create_task(alisten_metadata_versions(received.put_nowait))
+
+    try:
+        bumped, pushed = [], None
+        # the subscription is set up asynchronously; bump until it is seen
+        for _ in range(50):
+            bumped.append(str(bump_metadata_version()))
+            try:
+                pushed = await asyncio.wait_for(received.get(), timeout=0.1)
+                break
+            except asyncio.TimeoutError:
+                continue
+
+        assert pushed in bumped
+    finally:
+        listener.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await listener
+        await aclose_async_redis_client()
@@ -0,0 +1,93 @@
+import pytest
+
+from api_service.app.api.flow.consumption import redis_consumption
+from api_service.app.api.flow.consumption.redis_consumption import (
+    RATE_LIMIT_MODE_TOKEN_BUCKET,
+    RedisSlidingWindowConsumptionState,
+)
+from core.redis_client import aclose_async_redis_client, build_redis_client
+
+
+def freeze_time(monkeypatch, clock):
+    monkeypatch.setattr(redis_consumption.time, "time", lambda: clock["now"])
+
+
+def test_sliding_log_counts_units_in_one_script_call(monkeypatch):
+    clock = {"now": 1000.0}
+    freeze_time(monkeypatch, clock)
+    state = RedisSlidingWindowConsumptionState(window_seconds=60)
+
+    state.observe_and_update("ip:127.0.0.1")
+    clock["now"] = 1010.0
+    snapshot = state.observe_and_update("ip:127.0.0.1", units=2)
+
+    assert snapshot.consumed_units == 3
+    assert snapshot.remaining_window_seconds == 50
+    assert build_redis_client().zcard("rate_limit:ip:127.0.0.1") == 3
+
+
+def test_sliding_log_drops_units_outside_the_window(monkeypatch):
+    clock = {"now": 1000.0}
+    freeze_time(monkeypatch, clock)
+    state = RedisSlidingWindowConsumptionState(window_seconds=60)
+
+    state.observe_and_update("ip:127.0.0.1", units=5)
+    clock["now"] = 1061.0
+
+    assert state.observe_and_update("ip:127.0.0.1").consumed_units == 1
+
+
+def test_token_bucket_keeps_one_value_and_does_not_charge_rejections(monkeypatch):
+    clock = {"now": 1000.0}
+    freeze_time(monkeypatch, clock)
+    state = RedisSlidingWindowConsumptionState(
+        window_seconds=60, mode=RATE_LIMIT_MODE_TOKEN_BUCKET, capacity=3
+    )
+
+    consumed = [state.observe_and_update("ip:127.0.0.1").consumed_units for _ in range(4)]
+
+    assert consumed == [1, 2, 3, 4]
+    assert build_redis_client().type("rate_limit:bucket:ip:127.0.0.1") == "string"
+
+    # one emission interval (60 s / 3) frees exactly one unit
+    clock["now"] = 1020.0
+    snapshot = state.observe_and_update("ip:127.0.0.1")
+
+    assert snapshot.consumed_units == 3
+    assert snapshot.remaining_window_seconds == 60
+
+
+def test_unknown_rate_limit_mode_is_rejected():
+    with pytest.raises(ValueError):
+        RedisSlidingWindowConsumptionState(window_seconds=60, mode="fixed")
+
+
+@pytest.mark.asyncio
+async def test_async_token_bucket_uses_the_same_script():
+    state = RedisSlidingWindowConsumptionState(
+        window_seconds=60, mode=RATE_LIMIT_MODE_TOKEN_BUCKET, capacity=50
+    )
+
+    try:
+        await state.aobserve_and_update("ip:10.0.0.1")
+        snapshot = await state.aobserve_and_update("ip:10.0.0.1", units=2)
+    finally:
+        await aclose_async_redis_client()
+
+    assert snapshot.consumed_units == 3
+    assert 0 < snapshot.remaining_window_seconds <= 60
+
+
+@pytest.mark.asyncio
+async def test_async_script_is_registered_once_per_client():
+    state = RedisSlidingWindowConsumptionState(window_seconds=60)
+
+    try:
+        await state.aobserve_and_update("ip:10.0.0.2")
+        script = state._async_script
+        snapshot = await state.aobserve_and_update("ip:10.0.0.2")
+    finally:
+        await aclose_async_redis_client()
+
+    assert state._async_script is script
+    assert snapshot.consumed_units == 2
@@ -0,0 +1,167 @@
+from contextlib import contextmanager
+
+import pytest
+
+from core import candle_cache
+from core.candle_cache import (
+    append_recent_candles,
+    invalidate_recent_candles,
+    read_recent_candles,
+    recent_candles_key,
+)
+from core.models.candle import Candle
+from core.models.enums import Exchange, Interval, MarketType
+from core.redis_client import aclose_async_redis_client, build_redis_client
+from api_service.app.dataAccess.identifier_resolver import Resolution
+from api_service.app.dataAccess.mock_impl import MockDataAccessor
+from syncer_service.syncer.ingestion.persistence import cache_persisted_candles
+from syncer_service.syncer.ingestion.types import IngestionUnit
+
+PAYLOAD = {"exchange": "binance", "market": "spot", "symbol": "BTC-USDT", "interval": "1m"}
+
+
+def row(ts):
+    return (ts, 1.0, 2.0, 0.5, 1.5, 10.0)
+
+
+def timestamps(rows):
+    return [r["timestamp"] for r in rows]
+
+
+def test_latest_read_needs_a_full_page_and_keeps_newest_rows():
+    append_recent_candles(7, 3, [row(ts) for ts in (60, 120, 180)], size=2)
+
+    assert timestamps(read_recent_candles(7, 3, limit=2)) == [180, 120]
+    assert read_recent_candles(7, 3, limit=3) is None
+    assert build_redis_client().zcard(recent_candles_key(7, 3)) == 2
+    assert build_redis_client().ttl(recent_candles_key(7, 3)) > 0
+
+
+def test_forward_read_is_served_only_at_or_above_the_floor():
+    append_recent_candles(7, 3, [row(ts) for ts in (120, 180, 240)])
+
+    assert timestamps(read_recent_candles(7, 3, limit=3, start=120, end=240)) == [120, 180]
+    assert timestamps(read_recent_candles(7, 3, limit=3, after=120)) == [180, 240]
+    assert read_recent_candles(7, 3, limit=3, start=60) is None
+
+
+def test_rewritten_candle_replaces_the_cached_member():
+    append_recent_candles(7, 3, [row(60), row(120)])
+    append_recent_candles(7, 3, [(120, 9.0, 9.0, 9.0, 9.0, 9.0)])
+
+    rows = read_recent_candles(7, 3, limit=2)
+
+    assert timestamps(rows) == [120, 60]
+    assert rows[0]["close"] == 9.0
+
+
+def test_failed_append_rebuilds_the_key_on_next_write(monkeypatch):
+    append_recent_candles(7, 3, [row(60)])
+
+    class BrokenRedis:
+        def pipeline(self, transaction=True):
+            raise ConnectionError("redis down")
+
+    monkeypatch.setattr(candle_cache, "build_redis_client", lambda: BrokenRedis())
+    assert append_recent_candles(7, 3, [row(120)]) is False
+
+    monkeypatch.undo()
+    append_recent_candles(7, 3, [row(180)])
+
+    # 120 was never cached, so the old floor must not be served across the hole
+    assert read_recent_candles(7, 3, limit=3, start=60) is None
+    assert timestamps(read_recent_candles(7, 3, limit=1)) == [180]
+
+
+def test_invalidate_drops_the_key():
+    append_recent_candles(7, 3, [row(60)])
+    invalidate_recent_candles(7, 3)
+
+    assert read_recent_candles(7, 3, limit=1) is None
+
+
+def test_ingestion_caches_persisted_candles():
+    unit = IngestionUnit(
+        supported_market_id=1,
+        exchange_market_id=7,
+        interval_id=3,
+        exchange_name="hyperliquid",
+        market_type="futures",
+        canonical_symbol="BTC/USDC",
+        interval="1m",
+        interval_ms=60_000,
+    )
+    candle = Candle(
+        open_timestamp=60_000,
+        close_timestamp=119_999,
+        open=1.5,
+        high=2.25,
+        low=0.5,
+        close=1.75,
+        volume=10.0,
+        exchange=Exchange.HYPERLIQUID,
+        market_type=MarketType.FUTURES,
+        symbol="BTC/USDC",
+        interval=Interval.M1,
+    )
+
+    cache_persisted_candles(unit, [candle])
+
+    assert read_recent_candles(7, 3, limit=1) == [
+        {"timestamp": 60_000, "open": 1.5, "high": 2.25, "low": 0.5, "close": 1.75, "volume": 10.0}
+    ]
+
+
+class StaticResolver:
+    def resolve(self, exchange, market, symbol, interval):
+        return Resolution(exchange_market_id=7, interval_id=3)
+
+    async def aresolve(self, exchange, market, symbol, interval):
+        return self.resolve(exchange, market, symbol, interval)
+
+
+class FakeResult:
+    def __init__(self, rows):
+        self.rows = rows
+
+    def mappings(self):
+        return self
+
+    def all(self):
+        return self.rows
+
+
+def test_accessor_seeds_cache_on_miss_then_skips_the_database(monkeypatch):
+    queries = []
+    db_rows = [dict(zip(candle_cache.RECENT_CANDLE_FIELDS, row(ts))) for ts in (120, 60)]
+
+    class CandleSession:
+        def execute(self, query, params=None):
+            queries.append(params)
+            return FakeResult(db_rows)
+
+    @contextmanager
+    def fake_get_session():
+        yield CandleSession()
+
+    monkeypatch.setattr("api_service.app.dataAccess.mock_impl.get_session", fake_get_session)
+    accessor = MockDataAccessor(resolver=StaticResolver(), recent_cache=True)
+
+    first = accessor.fetch(None, {**PAYLOAD, "limit": 2})
+    second = accessor.fetch(None, {**PAYLOAD, "limit": 2})
+
+    assert timestamps(first.payload) == timestamps(second.payload) == [60, 120]
+    assert len(queries) == 1
+
+
+@pytest.mark.asyncio
+async def test_async_accessor_reads_cache_first():
+    append_recent_candles(7, 3, [row(ts) for ts in (60, 120, 180)])
+    accessor = MockDataAccessor(resolver=StaticResolver(), recent_cache=True)
+
+    try:
+        result = await accessor.afetch(None, {**PAYLOAD, "limit": 2})
+    finally:
+        await aclose_async_redis_client()
+
+    assert timestamps(result.payload) == [120, 180]
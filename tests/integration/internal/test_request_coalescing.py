@@ -0,0 +1,153 @@
+import asyncio
+from contextlib import asynccontextmanager
+
+import pytest
+
+from api_service.app.cache.fill_lock import afill_with_lock, build_fill_lock_key
+from api_service.app.dataAccess.mock_impl import MockMetaDataAccessor
+from api_service.app.dataAccess.single_flight import SingleFlight, payload_flight_key
+from core.redis_client import aclose_async_redis_client, build_redis_client
+
+
+@pytest.mark.asyncio
+async def test_single_flight_shares_one_call_per_key():
+    flights = SingleFlight()
+    calls = []
+
+    async def fetch(name):
+        calls.append(name)
+        await asyncio.sleep(0.01)
+        return name.upper()
+
+    results = await asyncio.gather(
+        flights.do("a", lambda: fetch("a")),
+        flights.do("a", lambda: fetch("a")),
+        flights.do("b", lambda: fetch("b")),
+    )
+
+    assert results == ["A", "A", "B"]
+    assert calls == ["a", "b"]
+    assert not flights.in_flight("a")
+
+
+@pytest.mark.asyncio
+async def test_single_flight_propagates_errors_to_every_waiter():
+    flights = SingleFlight()
+
+    async def failing():
+        await asyncio.sleep(0.01)
+        raise RuntimeError("db down")
+
+    results = await asyncio.gather(
+        flights.do("k", failing),
+        flights.do("k", failing),
+        return_exceptions=True,
+    )
+
+    assert [str(r) for r in results] == ["db down", "db down"]
+
+
+def test_flight_key_ignores_parameter_order_and_unset_values():
+    assert payload_flight_key("get_candles", {"symbol": "BTC-USDT", "limit": 100, "end": None}) == \
+        payload_flight_key("get_candles", {"limit": 100, "symbol": "BTC-USDT"})
+
+
+@pytest.mark.asyncio
+async def test_metadata_stampede_runs_one_query(monkeypatch):
+    executed = []
+
+    class FakeResult:
+        def mappings(self):
+            return self
+
+        def all(self):
+            return [{
+                "exchange": "binance", "symbol": "BTC-USDT", "exchange_symbol": "BTCUSDT",
+                "interval": "1m", "market_type": "spot", "status": "active",
+            }]
+
+    class FakeSession:
+        async def execute(self, query, params=None):
+            executed.append(params)
+            await asyncio.sleep(0.01)
+            return FakeResult()
+
+    @asynccontextmanager
+    async def fake_session():
+        yield FakeSession()
+
+    monkeypatch.setattr("api_service.app.dataAccess.mock_impl.get_async_session", fake_session)
+    accessor = MockMetaDataAccessor()
+
+    try:
+        results = await asyncio.gather(*[
+            accessor.afetch(None, {"exchange": "binance"}) for _ in range(10)
+        ])
+    finally:
+        await aclose_async_redis_client()
+
+    assert len(executed) == 1
+    assert all(r.available for r in results)
+
+
+@pytest.mark.asyncio
+async def test_fill_lock_waiter_reads_the_cache_filled_by_the_holder():
+    lock_key = build_fill_lock_key("test")
+    build_redis_client().set(lock_key, "other-process", ex=5)
+    cache = {}
+    loads = []
+    polling = asyncio.Event()
+
+    async def read():
+        polling.set()
+        return cache.get("value")
+
+    async def load():
+        loads.append(1)
+        return "from-db"
+
+    async def holder_fills_cache():
+        await polling.wait()
+        cache["value"] = "from-cache"
+        build_redis_client().delete(lock_key)
+
+    try:
+        result, _ = await asyncio.gather(
+            afill_with_lock(lock_key, read, load, wait_seconds=1, poll_seconds=0.01),
+            holder_fills_cache(),
+        )
+    finally:
+        await aclose_async_redis_client()
+
+    assert result == "from-cache"
+    assert loads == []
+
+
+@pytest.mark.asyncio
+async def test_fill_lock_loads_when_holder_left_no_entry():
+    lock_key = build_fill_lock_key("test")
+    build_redis_client().set(lock_key, "other-process", ex=5)
+
+    polling = asyncio.Event()
+
+    async def read():
+        polling.set()
+        return None
+
+    async def load():
+        return "from-db"
+
+    async def holder_gives_up():
+        await polling.wait()
+        build_redis_client().delete(lock_key)
+
+    try:
+        result, _ = await asyncio.gather(
+            afill_with_lock(lock_key, read, load, wait_seconds=1, poll_seconds=0.01),
+            holder_gives_up(),
+        )
+    finally:
+        await aclose_async_redis_client()
+
+    assert result == "from-db"
+    assert build_redis_client().get(lock_key) is None